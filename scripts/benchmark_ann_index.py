@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Recall/latency benchmark for the on-disk ANN index used by Inquire Mode.
+
+Compares IVF search against exact full-precision brute-force search, either on
+synthetic clustered embeddings or on a real user's transcript chunks. With
+--dtype float16/int8 the reported recall also includes quantization loss.
+
+Usage:
+    python scripts/benchmark_ann_index.py --rows 50000
+    python scripts/benchmark_ann_index.py --user-id 1 --nprobe 5 10 20
+    python scripts/benchmark_ann_index.py --rows 50000 --dtype int8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+# Add project root to path so 'src' can be imported when run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ann_index import AnnIndexStore
+from src.embedding_index import normalize_rows
+
+
+def synthetic_embeddings(rows, dim, clusters, seed=0):
+    """Clustered unit vectors, roughly shaped like sentence embeddings of meetings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=rows)
+    vectors = centers[labels] + 2.0 * rng.normal(size=(rows, dim))
+    queries = centers[rng.integers(0, clusters, size=200)] + 2.0 * rng.normal(size=(200, dim))
+    return vectors.astype(np.float32), queries.astype(np.float32), labels % 500
+
+
+def user_embeddings(user_id, query_count=200, seed=0):
+    """Load a real user's chunk embeddings; queries are perturbed chunk vectors."""
+    from src.app import app, load_chunk_embedding_rows, deserialize_embedding
+
+    with app.app_context():
+        rows = load_chunk_embedding_rows(user_id)
+    if not rows:
+        raise SystemExit(f"User {user_id} has no embedded chunks")
+
+    vectors = np.vstack([deserialize_embedding(row.embedding, row.embedding_dtype) for row in rows])
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(vectors), size=query_count)
+    queries = vectors[picks] + 0.05 * rng.normal(size=(query_count, vectors.shape[1])).astype(np.float32)
+    return vectors, queries, np.array([row.recording_id for row in rows])
+
+
+def run(vectors, queries, recording_ids, nprobes, top_k, dtype='float32'):
+    with tempfile.TemporaryDirectory() as base_dir:
+        store = AnnIndexStore(base_dir)
+
+        started = time.time()
+        store.publish(0, np.arange(len(vectors)), recording_ids, np.full(len(vectors), -1), vectors, dtype=dtype)
+        index = store.get(0)
+        print(f"Built {dtype} IVF index: {len(index)} rows, {index.nlist} lists in {time.time() - started:.2f}s")
+
+        # Ground truth is always full-precision, so recall includes any quantization loss
+        normalized = normalize_rows(vectors)
+        exact_results = []
+        for query in queries:
+            scores = normalized @ (query / np.linalg.norm(query))
+            exact_results.append(set(np.argpartition(-scores, top_k)[:top_k].tolist()))
+
+        hits = 0
+        started = time.time()
+        for query, expected in zip(queries, exact_results):
+            hits += len({cid for cid, _ in index.exact_search(query, top_k)} & expected)
+        exact_ms = (time.time() - started) * 1000 / len(queries)
+        recall = hits / sum(len(expected) for expected in exact_results)
+        print(f"\n{'method':<14}{'recall@' + str(top_k):>12}{'ms/query':>12}")
+        print(f"{'exact':<14}{recall:>12.3f}{exact_ms:>12.2f}")
+
+        for nprobe in nprobes:
+            hits = 0
+            started = time.time()
+            for query, expected in zip(queries, exact_results):
+                found = {cid for cid, _ in index.search(query, top_k, nprobe=nprobe)}
+                hits += len(found & expected)
+            ann_ms = (time.time() - started) * 1000 / len(queries)
+            recall = hits / sum(len(expected) for expected in exact_results)
+            print(f"{'ivf nprobe=' + str(nprobe):<14}{recall:>12.3f}{ann_ms:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ANN index recall and latency against exact search')
+    parser.add_argument('--user-id', type=int, help='Benchmark on this user\'s chunks instead of synthetic data')
+    parser.add_argument('--rows', type=int, default=50000, help='Synthetic rows (default: 50000)')
+    parser.add_argument('--dim', type=int, default=384, help='Synthetic embedding dimension (default: 384)')
+    parser.add_argument('--clusters', type=int, default=300, help='Synthetic topic clusters (default: 300)')
+    parser.add_argument('--top-k', type=int, default=8, help='Results per query (default: 8)')
+    parser.add_argument('--dtype', choices=['float32', 'float16', 'int8'], default='float32',
+                        help='Stored vector precision (default: float32)')
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[5, 10, 20, 40], help='nprobe values to test')
+    args = parser.parse_args()
+
+    if args.user_id is not None:
+        vectors, queries, recording_ids = user_embeddings(args.user_id)
+    else:
+        vectors, queries, recording_ids = synthetic_embeddings(args.rows, args.dim, args.clusters)
+
+    run(vectors, queries, recording_ids, args.nprobe, args.top_k, args.dtype)
+
+
+if __name__ == '__main__':
+    main()
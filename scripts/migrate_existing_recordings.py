@@ -3,88 +3,65 @@
 Migration script to process existing recordings for Inquire Mode.
 This script will chunk and vectorize all existing recordings that haven't been processed yet.
 """
-import os
 import sys
-from src.app import app, db, Recording, TranscriptChunk, process_recording_chunks
+from src.app import app, db, Recording, recordings_needing_chunks_query, run_inquire_backfill
 
 def count_recordings_needing_processing():
     """Count how many recordings need chunk processing."""
     with app.app_context():
-        # Get all completed recordings
-        completed_recordings = Recording.query.filter_by(status='COMPLETED').all()
-        
-        # Check which ones don't have chunks
-        recordings_needing_processing = []
-        for recording in completed_recordings:
-            if recording.transcription:  # Has transcription
-                chunk_count = TranscriptChunk.query.filter_by(recording_id=recording.id).count()
-                if chunk_count == 0:  # No chunks yet
-                    recordings_needing_processing.append(recording)
-        
-        return recordings_needing_processing
+        return recordings_needing_chunks_query().count()
 
-def migrate_existing_recordings(batch_size=10, dry_run=False):
+def migrate_existing_recordings(batch_size=256, dry_run=False, max_recordings=None, pause=0.0):
     """
-    Process existing recordings in batches to create chunks and embeddings.
+    Process existing recordings to create chunks and embeddings.
+    
+    Chunks from several recordings are embedded together, and progress is
+    checkpointed so an interrupted run resumes where it stopped.
     
     Args:
-        batch_size (int): Number of recordings to process at once
+        batch_size (int): Number of chunks to embed at once
         dry_run (bool): If True, just show what would be processed
+        max_recordings (int): Stop after this many recordings (None for all)
+        pause (float): Seconds to pause between batches
     """
     with app.app_context():
-        recordings_to_process = count_recordings_needing_processing()
+        pending = count_recordings_needing_processing()
         
-        print(f"🔍 Found {len(recordings_to_process)} recordings that need chunk processing")
+        print(f"🔍 Found {pending} recordings that need chunk processing")
         
-        if len(recordings_to_process) == 0:
+        if pending == 0:
             print("✅ All recordings are already processed!")
             return True
         
         if dry_run:
             print("\n📋 Recordings that would be processed:")
-            for i, recording in enumerate(recordings_to_process, 1):
-                print(f"  {i}. {recording.title} (ID: {recording.id}) - {len(recording.transcription)} chars")
+            recordings = recordings_needing_chunks_query().order_by(Recording.id).with_entities(
+                Recording.id, Recording.title, db.func.length(Recording.transcription)
+            )
+            for i, (recording_id, title, length) in enumerate(recordings, 1):
+                print(f"  {i}. {title} (ID: {recording_id}) - {length} chars")
             print(f"\nThis is a dry run. Use --process to actually run the migration.")
             return True
         
-        print(f"🚀 Processing {len(recordings_to_process)} recordings in batches of {batch_size}")
+        print(f"🚀 Processing recordings in embedding batches of {batch_size} chunks")
         
-        processed = 0
-        errors = 0
+        def report(status):
+            print(f"  💾 {status['processed']}/{status['total']} recordings, {status['chunks']} chunks "
+                  f"(checkpoint: recording {status['checkpoint']})")
         
-        for i in range(0, len(recordings_to_process), batch_size):
-            batch = recordings_to_process[i:i + batch_size]
-            print(f"\n📦 Processing batch {i//batch_size + 1} ({len(batch)} recordings)...")
-            
-            for recording in batch:
-                try:
-                    print(f"  ⏳ Processing: {recording.title} (ID: {recording.id})")
-                    
-                    success = process_recording_chunks(recording.id)
-                    if success:
-                        processed += 1
-                        # Get chunk count to report
-                        chunk_count = TranscriptChunk.query.filter_by(recording_id=recording.id).count()
-                        print(f"    ✅ Created {chunk_count} chunks")
-                    else:
-                        errors += 1
-                        print(f"    ❌ Failed to process recording {recording.id}")
-                        
-                except Exception as e:
-                    errors += 1
-                    print(f"    ❌ Error processing recording {recording.id}: {e}")
-            
-            # Commit batch
-            try:
-                db.session.commit()
-                print(f"  💾 Batch committed successfully")
-            except Exception as e:
-                db.session.rollback()
-                print(f"  ❌ Error committing batch: {e}")
-                errors += len(batch)
+        status = run_inquire_backfill(max_recordings, progress=report, batch_chunks=batch_size, pause_seconds=pause)
+        if status is None:
+            print("⏳ A backfill is already running (started from the admin page or another script); try again later")
+            return False
+        
+        processed = status['processed']
+        errors = len(status['failed'])
+        for failure in status['failed']:
+            print(f"    ❌ Error processing recording {failure['id']}: {failure['reason']}")
         
         print(f"\n📊 Migration Summary:")
         print(f"  ✅ Successfully processed: {processed}")
+        print(f"  🧩 Chunks created: {status['chunks']}")
         print(f"  ❌ Errors: {errors}")
         print(f"  📈 Success rate: {(processed/(processed+errors)*100):.1f}%" if (processed+errors) > 0 else "N/A")
         
@@ -99,8 +76,12 @@ def main():
                        help='Show what would be processed without actually processing')
     parser.add_argument('--process', action='store_true',
                        help='Actually process the recordings')
-    parser.add_argument('--batch-size', type=int, default=10,
-                       help='Number of recordings to process in each batch (default: 10)')
+    parser.add_argument('--batch-size', type=int, default=256,
+                       help='Number of chunks to embed in each batch (default: 256)')
+    parser.add_argument('--max-recordings', type=int, default=None,
+                       help='Stop after this many recordings; the next run continues from there')
+    parser.add_argument('--pause', type=float, default=0.0,
+                       help='Seconds to pause between batches to leave CPU for a running app (default: 0)')
     
     args = parser.parse_args()
     
@@ -124,7 +105,8 @@ def main():
                 print("❌ Migration cancelled by user")
                 return False
             
-            success = migrate_existing_recordings(args.batch_size, dry_run=False)
+            success = migrate_existing_recordings(args.batch_size, dry_run=False,
+                                                  max_recordings=args.max_recordings, pause=args.pause)
         
         return success
         
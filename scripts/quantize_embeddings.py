@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Migration script to convert stored Inquire Mode chunk embeddings to a smaller format.
+Rows are re-encoded in place from their current format, so the embedding model is not needed.
+"""
+import os
+import sys
+
+# Add project root to path so 'src' can be imported when run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, or_, text
+from src.app import app, db, TranscriptChunk, deserialize_embedding, serialize_embedding
+from src.embedding_index import STORAGE_DTYPES
+
+def embedding_bytes():
+    """Total size of all stored chunk embeddings in bytes."""
+    return int(db.session.query(func.coalesce(func.sum(func.length(TranscriptChunk.embedding)), 0)).scalar())
+
+def chunks_needing_conversion(target_dtype):
+    """Query for embedded chunks that are not stored as target_dtype yet."""
+    query = TranscriptChunk.query.filter(TranscriptChunk.embedding.isnot(None))
+    if target_dtype == 'float32':
+        # NULL means legacy float32
+        return query.filter(TranscriptChunk.embedding_dtype.isnot(None), TranscriptChunk.embedding_dtype != 'float32')
+    return query.filter(or_(TranscriptChunk.embedding_dtype.is_(None), TranscriptChunk.embedding_dtype != target_dtype))
+
+def quantize_embeddings(target_dtype, batch_size=1000, dry_run=False, vacuum=False):
+    """
+    Re-encode stored chunk embeddings as target_dtype in batches.
+
+    Args:
+        target_dtype (str): float32, float16 or int8
+        batch_size (int): Number of chunks to convert per commit
+        dry_run (bool): If True, just report what would be converted
+        vacuum (bool): Run VACUUM afterwards so SQLite returns the freed space
+    """
+    with app.app_context():
+        pending = chunks_needing_conversion(target_dtype).count()
+        before = embedding_bytes()
+        print(f"🔍 {pending} chunks need conversion to {target_dtype} ({before / 1024 / 1024:.1f} MB of embeddings stored)")
+
+        if pending == 0:
+            print("✅ All embeddings are already converted!")
+            return True
+
+        if dry_run:
+            print(f"\nThis is a dry run. Use --process to actually run the migration.")
+            return True
+
+        converted = 0
+        last_id = 0
+        while True:
+            # Keyset pagination: converted rows drop out of the filter, so offsets would skip rows
+            batch = chunks_needing_conversion(target_dtype).filter(
+                TranscriptChunk.id > last_id
+            ).order_by(TranscriptChunk.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            for chunk in batch:
+                chunk.embedding = serialize_embedding(deserialize_embedding(chunk.embedding, chunk.embedding_dtype), target_dtype)
+                chunk.embedding_dtype = target_dtype
+            last_id = batch[-1].id
+
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"  ❌ Error committing batch ending at chunk {last_id}: {e}")
+                return False
+
+            converted += len(batch)
+            print(f"  💾 Converted {converted}/{pending} chunks")
+
+        after = embedding_bytes()
+        print(f"\n📊 Migration Summary:")
+        print(f"  ✅ Converted: {converted}")
+        print(f"  📉 Embedding storage: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB")
+
+        if vacuum and db.engine.dialect.name == 'sqlite':
+            print("  🧹 Running VACUUM...")
+            with db.engine.connect() as conn:
+                conn.execute(text("VACUUM"))
+
+        print("  ℹ️  Restart the app so cached search indexes are rebuilt from the converted rows.")
+        return True
+
+def main():
+    """Main function to handle command line arguments."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert stored chunk embeddings to float16 or int8')
+    parser.add_argument('--dtype', choices=STORAGE_DTYPES, default='int8',
+                       help='Target storage format (default: int8)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Show what would be converted without changing anything')
+    parser.add_argument('--process', action='store_true',
+                       help='Actually convert the embeddings')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                       help='Number of chunks to convert in each batch (default: 1000)')
+    parser.add_argument('--vacuum', action='store_true',
+                       help='Run VACUUM afterwards to shrink the SQLite database file')
+
+    args = parser.parse_args()
+
+    if not args.dry_run and not args.process:
+        print("❌ Please specify either --dry-run or --process")
+        print("Use --help for more information")
+        return False
+
+    print("🎯 Embedding Quantization Tool")
+    print("=" * 40)
+    print("ℹ️  Set EMBEDDING_STORAGE_DTYPE to the same format so new chunks are stored the same way.")
+
+    try:
+        return quantize_embeddings(args.dtype, args.batch_size, dry_run=args.dry_run, vacuum=args.vacuum)
+    except KeyboardInterrupt:
+        print("\n❌ Migration cancelled by user")
+        return False
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
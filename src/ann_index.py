@@ -0,0 +1,322 @@
+"""
+On-disk Approximate Nearest Neighbour Index for Large Transcript Corpora
+
+This module builds an inverted-file (IVF) index over a user's transcript chunk
+embeddings and stores it as plain ``.npy`` files that are opened with
+``mmap_mode='r'``. Every gunicorn worker maps the same files, so the vectors live
+once in the OS page cache instead of once per process.
+
+Layout on disk (one directory per user)::
+
+    <base>/user_<id>/CURRENT              name of the active generation
+    <base>/user_<id>/gen_<timestamp>/     one immutable, fully written generation
+        meta.json                         counts, dimension, build cut-off
+        centroids.npy                     (nlist, dim) unit-length list centroids
+        list_offsets.npy                  (nlist + 1,) row offsets of each list
+        vectors.npy                       (rows, dim) unit vectors or int8 codes, grouped by list
+        row_factors.npy                   (rows,) per-row score factors (1 for float32)
+        chunk_ids.npy / recording_ids.npy / meeting_dates.npy
+
+Generations are never modified after they are published. New chunks are served
+from a small in-memory delta until a background rebuild publishes a new
+generation and atomically swaps the ``CURRENT`` pointer.
+"""
+
+import os
+import json
+import time
+import shutil
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.embedding_index import build_row_mask, normalize_rows, prepare_matrix, score_rows, top_k_positions
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = 'CURRENT'
+LOCK_FILE = '.build.lock'
+ARRAY_FILES = ('centroids', 'list_offsets', 'vectors', 'row_factors', 'chunk_ids', 'recording_ids', 'meeting_dates')
+
+
+def default_nlist(rows: int) -> int:
+    """Number of inverted lists for ``rows`` vectors (about sqrt(rows))."""
+    return max(1, min(rows, int(round(np.sqrt(rows)))))
+
+
+def assign_to_centroids(matrix: np.ndarray, centroids: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+    """Return the index of the most similar centroid for every row, in batches."""
+    assignments = np.empty(len(matrix), dtype=np.int32)
+    for start in range(0, len(matrix), batch_size):
+        block = np.asarray(matrix[start:start + batch_size], dtype=np.float32)
+        assignments[start:start + batch_size] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_kmeans(matrix: np.ndarray, nlist: int, iterations: int = 10,
+                 sample_size: Optional[int] = None, seed: int = 0) -> np.ndarray:
+    """
+    Train spherical k-means centroids on (a sample of) unit-length vectors.
+
+    Args:
+        matrix: Unit-length vectors, shape (rows, dim)
+        nlist: Number of centroids
+        iterations: Lloyd iterations
+        sample_size: Rows used for training (default: 64 per centroid)
+        seed: Random seed for reproducible builds
+
+    Returns:
+        Unit-length centroids, shape (nlist, dim)
+    """
+    rng = np.random.default_rng(seed)
+    rows = len(matrix)
+    sample_size = min(rows, sample_size or max(nlist * 64, 10000))
+    sample = matrix[np.sort(rng.choice(rows, sample_size, replace=False))] if sample_size < rows else matrix
+    sample = np.asarray(sample, dtype=np.float32)
+
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = assign_to_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+
+        # Re-seed empty lists from random sample rows
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+class IVFIndex:
+    """Read-only, memory-mapped view of one published index generation."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        for name in ARRAY_FILES:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+        self.created_until = datetime.fromisoformat(self.meta['created_until']) if self.meta.get('created_until') else None
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    @property
+    def nlist(self) -> int:
+        return self.meta['nlist']
+
+    def build_mask(self, recording_ids=None, date_from=None, date_to=None) -> Optional[np.ndarray]:
+        """Build a boolean row mask over the memory-mapped metadata arrays."""
+        return build_row_mask(self.recording_ids, self.meeting_dates, recording_ids, date_from, date_to)
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5, mask: Optional[np.ndarray] = None,
+               nprobe: int = 10, exact_threshold: int = 4096) -> List[Tuple[int, float]]:
+        """
+        Approximate top-k search.
+
+        Only the ``nprobe`` lists whose centroids are closest to the query are
+        scored. When a filter leaves at most ``exact_threshold`` rows, those rows
+        are scored exactly instead, because probing would likely miss them.
+
+        Returns:
+            List of (chunk_id, cosine similarity) sorted by descending similarity
+        """
+        if len(self) == 0 or top_k <= 0:
+            return []
+
+        query = normalize_rows(query_embedding)[0]
+
+        if mask is not None:
+            allowed = np.flatnonzero(mask)
+            if len(allowed) == 0:
+                return []
+            if len(allowed) <= exact_threshold:
+                return self._score_rows(allowed, query, top_k)
+
+        nprobe = max(1, min(nprobe, self.nlist))
+        probe = top_k_positions(self.centroids @ query, nprobe)
+        rows = np.concatenate([
+            np.arange(self.list_offsets[c], self.list_offsets[c + 1]) for c in np.sort(probe)
+        ])
+        if mask is not None:
+            rows = rows[mask[rows]]
+        return self._score_rows(rows, query, top_k)
+
+    def exact_search(self, query_embedding: np.ndarray, top_k: int = 5,
+                     mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Brute-force search over the same vectors (used for recall benchmarks)."""
+        query = normalize_rows(query_embedding)[0]
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        return self._score_rows(rows, query, top_k)
+
+    def _score_rows(self, rows: np.ndarray, query: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        if len(rows) == 0:
+            return []
+        scores = score_rows(self.vectors, self.row_factors, query, rows)
+        best = top_k_positions(scores, top_k)
+        return [(int(self.chunk_ids[rows[i]]), float(scores[i])) for i in best]
+
+
+def build_ivf_generation(directory: str, chunk_ids: Sequence[int], recording_ids: Sequence[int],
+                         meeting_dates: Sequence[int], embeddings: np.ndarray,
+                         created_until: Optional[datetime] = None, nlist: Optional[int] = None,
+                         seed: int = 0, dtype: str = 'float32') -> str:
+    """
+    Train and write a new, immutable index generation below ``directory``.
+
+    Centroids are always trained on float32 unit vectors; with ``dtype='int8'``
+    the stored vectors are quantized codes, a quarter of the size on disk and
+    in the page cache.
+
+    Returns:
+        Name of the generation sub-directory (not yet published)
+    """
+    started = time.time()
+    matrix = normalize_rows(embeddings)
+    rows = len(matrix)
+    nlist = min(rows, nlist or default_nlist(rows))
+
+    centroids = train_kmeans(matrix, nlist, seed=seed)
+    assignments = assign_to_centroids(matrix, centroids)
+    order = np.argsort(assignments, kind='stable')
+    vectors, row_factors = prepare_matrix(matrix[order], dtype)
+    list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=nlist))]).astype(np.int64)
+
+    name = f"gen_{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}"
+    tmp_path = os.path.join(directory, f'.{name}.tmp')
+    os.makedirs(tmp_path, exist_ok=True)
+
+    arrays = {
+        'centroids': centroids,
+        'list_offsets': list_offsets,
+        'vectors': vectors,
+        'row_factors': row_factors,
+        'chunk_ids': np.asarray(chunk_ids, dtype=np.int64)[order],
+        'recording_ids': np.asarray(recording_ids, dtype=np.int64)[order],
+        'meeting_dates': np.asarray(meeting_dates, dtype=np.int32)[order],
+    }
+    for array_name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f'{array_name}.npy'), np.ascontiguousarray(array))
+
+    with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+        json.dump({
+            'count': rows,
+            'dim': int(matrix.shape[1]),
+            'nlist': int(nlist),
+            'dtype': str(vectors.dtype),
+            'created_until': created_until.isoformat() if created_until else None,
+            'built_at': datetime.utcnow().isoformat(),
+            'build_seconds': round(time.time() - started, 3),
+        }, f)
+
+    os.replace(tmp_path, os.path.join(directory, name))
+    return name
+
+
+class AnnIndexStore:
+    """Locates, publishes and caches memory-mapped IVF indexes for all users."""
+
+    def __init__(self, base_dir: str, keep_generations: int = 2):
+        """
+        Initialize the store.
+
+        Args:
+            base_dir: Directory holding one sub-directory per user
+            keep_generations: Published generations kept on disk. Older ones are
+                removed; workers still mapping them keep valid pages until they
+                switch, because unlinking does not invalidate existing mappings.
+        """
+        self.base_dir = base_dir
+        self.keep_generations = max(1, keep_generations)
+        self._open = {}  # user_id -> (generation name, IVFIndex)
+        self._lock = threading.Lock()
+
+    def user_dir(self, user_id: int) -> str:
+        return os.path.join(self.base_dir, f'user_{user_id}')
+
+    def current_generation(self, user_id: int) -> Optional[str]:
+        try:
+            with open(os.path.join(self.user_dir(user_id), POINTER_FILE), 'r') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def get(self, user_id: int) -> Optional[IVFIndex]:
+        """Return the user's current index, re-opening it if another process published a new one."""
+        generation = self.current_generation(user_id)
+        if generation is None:
+            return None
+
+        with self._lock:
+            cached = self._open.get(user_id)
+            if cached and cached[0] == generation:
+                return cached[1]
+
+        try:
+            index = IVFIndex(os.path.join(self.user_dir(user_id), generation))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not open ANN index {generation} for user {user_id}: {e}")
+            return None
+
+        with self._lock:
+            self._open[user_id] = (generation, index)
+        return index
+
+    def publish(self, user_id: int, chunk_ids: Sequence[int], recording_ids: Sequence[int],
+                meeting_dates: Sequence[int], embeddings: np.ndarray,
+                created_until: Optional[datetime] = None, nlist: Optional[int] = None,
+                dtype: str = 'float32') -> str:
+        """Build a new generation for a user and make it the current one."""
+        directory = self.user_dir(user_id)
+        os.makedirs(directory, exist_ok=True)
+        generation = build_ivf_generation(directory, chunk_ids, recording_ids, meeting_dates,
+                                          embeddings, created_until=created_until, nlist=nlist, dtype=dtype)
+
+        pointer_tmp = os.path.join(directory, f'.{POINTER_FILE}.tmp')
+        with open(pointer_tmp, 'w') as f:
+            f.write(generation)
+        os.replace(pointer_tmp, os.path.join(directory, POINTER_FILE))
+
+        self._remove_old_generations(directory)
+        logger.info(f"Published ANN index {generation} for user {user_id} ({len(chunk_ids)} chunks)")
+        return generation
+
+    def remove(self, user_id: int):
+        """Delete every generation of a user's index."""
+        with self._lock:
+            self._open.pop(user_id, None)
+        shutil.rmtree(self.user_dir(user_id), ignore_errors=True)
+
+    @contextmanager
+    def build_lock(self, user_id: int):
+        """
+        Cross-process, non-blocking build lock for one user.
+
+        Yields True if this process holds the lock, False if another process is
+        already rebuilding the same index.
+        """
+        directory = self.user_dir(user_id)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, LOCK_FILE), 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _remove_old_generations(self, directory: str):
+        generations = sorted(name for name in os.listdir(directory) if name.startswith('gen_'))
+        for name in generations[:-self.keep_generations]:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
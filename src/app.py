@@ -14,9 +14,15 @@ import json
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.middleware.proxy_fix import ProxyFix
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import event as sa_event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 import threading
+import fcntl
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv # Import load_dotenv
 import httpx 
 import re
@@ -38,19 +44,36 @@ from flask_wtf.csrf import CSRFProtect
 from wtforms import StringField, PasswordField, SubmitField, BooleanField
 from wtforms.validators import DataRequired, Length, Email, EqualTo, ValidationError
 import pytz
+from babel import Locale
 from babel.dates import format_datetime
 import ast
 import logging
 import secrets
 import time
+import random
 from src.audio_chunking import AudioChunkingService, ChunkProcessingError, ChunkingNotSupportedError
 from src.extensions import db, bcrypt, login_manager, limiter, jwt
+from src.rank_fusion import fuse_results, merge_fused_results, reciprocal_rank_fusion
+from src.chunk_fts import ensure_chunk_fts, search_chunk_fts
+from src.transcript_chunking import chunk_transcription, content_hash, expand_chunk_indexes
+from src.participants import name_matcher, parse_participants
+from src.query_router import DIRECT, RAG, QueryRouter, RouterStats
+from src.stream_processor import MarkerLineDetector, StreamProcessor
+from src.settings_cache import SettingsCache
+from src.resumable_upload import DEFAULT_CHUNK_SIZE, LiveTranscriptions, UploadHashes, parse_content_range, part_file_lock, write_range
+from src.change_feed import DEFAULT_PAGE_SIZE, DELETE, ENTITY_TYPES, MAX_PAGE_SIZE, UPSERT, compact_changes, split_actions
+from src.chat_history import MAX_MESSAGE_CHARS, clean_history, estimate_tokens, compaction_split, history_messages, strip_thinking, summary_request
 
 # Optional imports for embedding functionality
 try:
     import numpy as np
     from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
+    from src.embedding_index import (
+        EmbeddingIndexCache, UserEmbeddingIndex, STORAGE_DTYPES, date_to_ordinal, decode_embedding, encode_embedding
+    )
+    from src.ann_index import AnnIndexStore
+    from src.embedding_service import BACKENDS as EMBEDDING_BACKENDS, EmbeddingServiceError, ServiceBackedModel, ensure_service_running, load_model
     EMBEDDINGS_AVAILABLE = True
 except ImportError as e:
     EMBEDDINGS_AVAILABLE = False
@@ -472,69 +495,22 @@ def extract_thinking_content(text):
     
     return (thinking_content, main_content)
 
-def process_streaming_with_thinking(stream):
+# SSE frames of streamed answers are coalesced: queued text is sent at most every
+# STREAM_FLUSH_INTERVAL_MS milliseconds, or sooner once STREAM_FLUSH_CHARS characters are waiting
+STREAM_FLUSH_INTERVAL_MS = int(os.environ.get('STREAM_FLUSH_INTERVAL_MS', '50'))
+STREAM_FLUSH_CHARS = int(os.environ.get('STREAM_FLUSH_CHARS', '256'))
+
+def process_streaming_with_thinking(stream, response_parts=None):
     """
     Generator that processes a streaming response and separates thinking content.
     Yields SSE-formatted data with 'delta' for regular content and 'thinking' for thinking content.
+    If response_parts is a list, the visible answer is appended to it.
     """
-    content_buffer = ""
-    in_thinking = False
-    thinking_buffer = ""
-    
-    for chunk in stream:
-        content = chunk.choices[0].delta.content
-        if content:
-            content_buffer += content
-            
-            # Process the buffer to detect and handle thinking tags
-            while True:
-                if not in_thinking:
-                    # Look for opening thinking tag
-                    think_start = re.search(r'<think(?:ing)?>', content_buffer, re.IGNORECASE)
-                    if think_start:
-                        # Send any content before the thinking tag
-                        before_thinking = content_buffer[:think_start.start()]
-                        if before_thinking:
-                            yield f"data: {json.dumps({'delta': before_thinking})}\n\n"
-                        
-                        # Start capturing thinking content
-                        in_thinking = True
-                        content_buffer = content_buffer[think_start.end():]
-                        thinking_buffer = ""
-                    else:
-                        # No thinking tag found, send accumulated content
-                        if content_buffer:
-                            yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
-                        content_buffer = ""
-                        break
-                else:
-                    # We're inside a thinking tag, look for closing tag
-                    think_end = re.search(r'</think(?:ing)?>', content_buffer, re.IGNORECASE)
-                    if think_end:
-                        # Capture thinking content up to the closing tag
-                        thinking_buffer += content_buffer[:think_end.start()]
-                        
-                        # Send the thinking content as a special type
-                        if thinking_buffer.strip():
-                            yield f"data: {json.dumps({'thinking': thinking_buffer.strip()})}\n\n"
-                        
-                        # Continue processing after the closing tag
-                        in_thinking = False
-                        content_buffer = content_buffer[think_end.end():]
-                        thinking_buffer = ""
-                    else:
-                        # Still inside thinking tag, accumulate content
-                        thinking_buffer += content_buffer
-                        content_buffer = ""
-                        break
-    
-    # Handle any remaining content
-    if in_thinking and thinking_buffer:
-        # Unclosed thinking tag - send as thinking content
-        yield f"data: {json.dumps({'thinking': thinking_buffer.strip()})}\n\n"
-    elif content_buffer:
-        # Regular content
-        yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
+    processor = StreamProcessor(flush_interval=STREAM_FLUSH_INTERVAL_MS / 1000, flush_chars=STREAM_FLUSH_CHARS)
+    for frame in processor.frames(stream):
+        yield frame
+    if response_parts is not None:
+        response_parts.append(processor.text)
     
     # Signal the end of the stream
     yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
@@ -546,6 +522,21 @@ app = Flask(__name__,
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('SQLALCHEMY_DATABASE_URI', 'sqlite:////data/instance/transcriptions.db')
 app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', '/data/uploads')
 # MAX_CONTENT_LENGTH will be set dynamically after database initialization
+# System settings are cached per worker; other workers' changes are picked up within this many seconds
+SETTINGS_CACHE_CHECK_SECONDS = float(os.environ.get('SETTINGS_CACHE_CHECK_SECONDS', '1.0'))
+# Sync change feed entries older than this are pruned; clients with older cursors reload everything
+CHANGE_FEED_RETENTION_DAYS = int(os.environ.get('CHANGE_FEED_RETENTION_DAYS', '30'))
+CHANGE_FEED_PRUNED_KEY = 'change_feed_pruned_through'
+# Resumable uploads: suggested range size, and hours after which unfinished sessions
+# (and the idempotency keys of finished ones) are discarded
+RESUMABLE_UPLOAD_CHUNK_MB = int(os.environ.get('RESUMABLE_UPLOAD_CHUNK_MB', str(DEFAULT_CHUNK_SIZE // (1024 * 1024))))
+RESUMABLE_UPLOAD_TTL_HOURS = int(os.environ.get('RESUMABLE_UPLOAD_TTL_HOURS', '24'))
+# ffmpeg conversions of uploads run in the background, at most this many at a time on the host (all workers)
+AUDIO_CONVERSION_CONCURRENCY = int(os.environ.get('AUDIO_CONVERSION_CONCURRENCY', str(max(1, (os.cpu_count() or 2) // 2))))
+# Live uploads (recordings uploaded while in progress): length of the segments transcribed
+# before the recording ends, and the least time between checks for a completed segment
+LIVE_TRANSCRIPTION_SEGMENT_SECONDS = float(os.environ.get('LIVE_TRANSCRIPTION_SEGMENT_SECONDS', '300'))
+LIVE_TRANSCRIPTION_CHECK_SECONDS = float(os.environ.get('LIVE_TRANSCRIPTION_CHECK_SECONDS', '30'))
 # Set a secret key for session management and CSRF protection
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'default-dev-key-change-in-production')
 app.config.setdefault('JWT_SECRET_KEY', os.environ.get('JWT_SECRET_KEY', app.config['SECRET_KEY']))
@@ -592,6 +583,17 @@ def inject_now():
     return {'now': datetime.now()}
 
 # --- Timezone Formatting Filter ---
+@lru_cache(maxsize=8)
+def get_display_timezone(user_tz_name):
+    """Resolve a TIMEZONE name once instead of on every formatted datetime."""
+    try:
+        return pytz.timezone(user_tz_name)
+    except pytz.UnknownTimeZoneError:
+        app.logger.warning(f"Invalid TIMEZONE '{user_tz_name}' in .env. Defaulting to UTC.")
+        return pytz.utc
+
+DISPLAY_LOCALE = Locale.parse('en_US')
+
 @app.template_filter('localdatetime')
 def local_datetime_filter(dt):
     """Format a UTC datetime object to the user's local timezone."""
@@ -599,12 +601,7 @@ def local_datetime_filter(dt):
         return ""
     
     # Get timezone from .env, default to UTC
-    user_tz_name = os.environ.get('TIMEZONE', 'UTC')
-    try:
-        user_tz = pytz.timezone(user_tz_name)
-    except pytz.UnknownTimeZoneError:
-        user_tz = pytz.utc
-        app.logger.warning(f"Invalid TIMEZONE '{user_tz_name}' in .env. Defaulting to UTC.")
+    user_tz = get_display_timezone(os.environ.get('TIMEZONE', 'UTC'))
 
     # If the datetime object is naive, assume it's UTC
     if dt.tzinfo is None:
@@ -614,7 +611,7 @@ def local_datetime_filter(dt):
     local_dt = dt.astimezone(user_tz)
     
     # Format it nicely
-    return format_datetime(local_dt, format='medium', locale='en_US')
+    return format_datetime(local_dt, format='medium', locale=DISPLAY_LOCALE)
 
 # Ensure upload and instance directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -639,69 +636,172 @@ def load_user(user_id):
 
 # Initialize embedding model (lazy loading)
 _embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+# CPU inference options for the embedding model
+EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'torch').lower()  # torch or onnx
+EMBEDDING_THREADS = int(os.environ.get('EMBEDDING_THREADS', '0'))  # 0 = library default
+EMBEDDING_QUANTIZE = os.environ.get('EMBEDDING_QUANTIZE', 'false').lower() == 'true'  # int8 weights
+if EMBEDDINGS_AVAILABLE and EMBEDDING_BACKEND not in EMBEDDING_BACKENDS:
+    app.logger.warning(f"Invalid EMBEDDING_BACKEND '{EMBEDDING_BACKEND}'. Defaulting to torch.")
+    EMBEDDING_BACKEND = 'torch'
+
+# Run the model once in a shared local service process instead of once per worker
+EMBEDDING_SERVICE = os.environ.get('EMBEDDING_SERVICE', 'false').lower() == 'true'
+EMBEDDING_SERVICE_ADDRESS = os.environ.get('EMBEDDING_SERVICE_ADDRESS', '/tmp/speakr-embeddings.sock')
+EMBEDDING_BATCH_SIZE = int(os.environ.get('EMBEDDING_BATCH_SIZE', '32'))
+EMBEDDING_BATCH_WAIT_MS = float(os.environ.get('EMBEDDING_BATCH_WAIT_MS', '5'))
+
+# Storage format for new chunk embeddings: float32 (default), float16 (2x smaller) or int8 (~4x smaller)
+EMBEDDING_STORAGE_DTYPE = os.environ.get('EMBEDDING_STORAGE_DTYPE', 'float32').lower()
+if EMBEDDINGS_AVAILABLE and EMBEDDING_STORAGE_DTYPE not in STORAGE_DTYPES:
+    app.logger.warning(f"Invalid EMBEDDING_STORAGE_DTYPE '{EMBEDDING_STORAGE_DTYPE}'. Defaulting to float32.")
+    EMBEDDING_STORAGE_DTYPE = 'float32'
+# Search indexes score int8 codes directly when embeddings are stored as int8
+EMBEDDING_INDEX_DTYPE = 'int8' if EMBEDDING_STORAGE_DTYPE == 'int8' else 'float32'
+# int8 scoring is not re-ranked at full precision: that would mean re-encoding the
+# candidates' text on every query (or storing a float32 copy, undoing the savings).
+# Its cosine error stays below about 2e-3, enough to swap near-tied neighbours only.
+
+# Fuse BM25 keyword ranking with vector ranking in Inquire Mode search (needs SQLite FTS5)
+INQUIRE_HYBRID_SEARCH = os.environ.get('INQUIRE_HYBRID_SEARCH', 'true').lower() == 'true'
+# Set at startup once the full-text chunk index has been verified
+CHUNK_FTS_AVAILABLE = False
+
+# Per-user in-memory embedding indexes for semantic search (LRU, bounded by memory)
+EMBEDDING_INDEX_MAX_MB = int(os.environ.get('EMBEDDING_INDEX_MAX_MB', '256'))
+embedding_index_cache = EmbeddingIndexCache(max_bytes=EMBEDDING_INDEX_MAX_MB * 1024 * 1024) if EMBEDDINGS_AVAILABLE else None
+
+# Coarse-to-fine retrieval: each recording also gets one profile embedding (title,
+# participants, summary). For users with at least INQUIRE_COARSE_MIN_RECORDINGS
+# profiled recordings, a query first picks its INQUIRE_COARSE_RECORDINGS best
+# recordings and only their chunks are scored. Variants whose restricted results
+# are too few or too weak (below INQUIRE_COARSE_MIN_SIMILARITY) fall back to a
+# full search when INQUIRE_COARSE_FALLBACK is on.
+INQUIRE_COARSE_RECORDINGS = int(os.environ.get('INQUIRE_COARSE_RECORDINGS', '20'))  # 0 disables
+INQUIRE_COARSE_MIN_RECORDINGS = int(os.environ.get('INQUIRE_COARSE_MIN_RECORDINGS', '200'))
+INQUIRE_COARSE_FALLBACK = os.environ.get('INQUIRE_COARSE_FALLBACK', 'true').lower() == 'true'
+INQUIRE_COARSE_MIN_SIMILARITY = float(os.environ.get('INQUIRE_COARSE_MIN_SIMILARITY', '0.25'))
+# Longest profile text sent to the embedding model (it truncates long input anyway)
+RECORDING_PROFILE_MAX_CHARS = 2000
+recording_index_cache = EmbeddingIndexCache(max_bytes=EMBEDDING_INDEX_MAX_MB * 1024 * 1024 // 8) if EMBEDDINGS_AVAILABLE else None
+
+# On-disk, memory-mapped ANN indexes for users with very large chunk counts.
+# All workers map the same files, so the vectors are held once in the OS page cache.
+ANN_INDEX_DIR = os.environ.get('ANN_INDEX_DIR', '/data/instance/ann_index')
+ANN_INDEX_MIN_CHUNKS = int(os.environ.get('ANN_INDEX_MIN_CHUNKS', '20000'))  # 0 disables ANN indexes
+ANN_INDEX_NPROBE = int(os.environ.get('ANN_INDEX_NPROBE', '10'))
+ANN_INDEX_REBUILD_FRACTION = float(os.environ.get('ANN_INDEX_REBUILD_FRACTION', '0.1'))
+ann_index_store = AnnIndexStore(ANN_INDEX_DIR) if EMBEDDINGS_AVAILABLE and ANN_INDEX_MIN_CHUNKS > 0 else None
+# Vector searches that lost results to stale index ids are repeated with twice the depth, at most this often
+ANN_STALE_RESULT_RETRIES = 3
+_ann_rebuilds_in_progress = set()
+_ann_rebuild_lock = threading.Lock()
+
+# Inquire chat runs its router and query-enrichment LLM calls alongside a speculative
+# search for the raw question; each chat request uses at most three of these workers
+INQUIRE_PIPELINE_WORKERS = 16
+inquire_executor = ThreadPoolExecutor(max_workers=INQUIRE_PIPELINE_WORKERS, thread_name_prefix='inquire')
+
+# Inquire messages are routed to RAG or DIRECT locally (keyword heuristics, then the
+# nearest centroid of labelled examples) and the LLM router is only asked when the
+# centroid margin is below INQUIRE_ROUTER_MIN_MARGIN. A sample of local decisions
+# (INQUIRE_ROUTER_AUDIT_RATE) is re-checked by the LLM router in the background so
+# agreement can be tracked.
+INQUIRE_LOCAL_ROUTER = os.environ.get('INQUIRE_LOCAL_ROUTER', 'true').lower() == 'true'
+INQUIRE_ROUTER_MIN_MARGIN = float(os.environ.get('INQUIRE_ROUTER_MIN_MARGIN', '0.05'))
+INQUIRE_ROUTER_AUDIT_RATE = float(os.environ.get('INQUIRE_ROUTER_AUDIT_RATE', '0.05'))
+router_stats = RouterStats()
+_query_router = None
+
+# Chat sessions (/chat and Inquire Mode) are held on the server. Recent turns are kept
+# verbatim and older ones are folded into a running summary in the background once
+# they exceed CHAT_HISTORY_TOKEN_BUDGET tokens; the last CHAT_HISTORY_KEEP_MESSAGES
+# messages are never summarized.
+CHAT_HISTORY_TOKEN_BUDGET = int(os.environ.get('CHAT_HISTORY_TOKEN_BUDGET', '4000'))
+CHAT_HISTORY_KEEP_MESSAGES = int(os.environ.get('CHAT_HISTORY_KEEP_MESSAGES', '4'))
+# History writes are compare-and-set against the stored value; attempts before giving up
+CHAT_HISTORY_WRITE_ATTEMPTS = 5
+_history_compactions_in_progress = set()
+_history_compaction_lock = threading.Lock()
+
+# /chat answers questions about recordings whose formatted transcript is longer than
+# CHAT_RETRIEVAL_MIN_CHARS (or longer than the transcript length limit) from their most
+# relevant chunks instead of the full text: the CHAT_RETRIEVAL_CHUNKS best chunks, each
+# with CHAT_RETRIEVAL_NEIGHBORS chunks of surrounding context. Needs Inquire Mode chunks.
+CHAT_RETRIEVAL_MIN_CHARS = int(os.environ.get('CHAT_RETRIEVAL_MIN_CHARS', '30000'))  # 0 disables
+CHAT_RETRIEVAL_CHUNKS = int(os.environ.get('CHAT_RETRIEVAL_CHUNKS', '8'))
+CHAT_RETRIEVAL_NEIGHBORS = int(os.environ.get('CHAT_RETRIEVAL_NEIGHBORS', '1'))
+
+# Background backfill of recordings that have never been chunked. Embeddings are
+# encoded in cross-recording batches of about INQUIRE_BACKFILL_BATCH_CHUNKS chunks,
+# with a pause between batches so the job does not starve live requests.
+INQUIRE_BACKFILL_BATCH_CHUNKS = int(os.environ.get('INQUIRE_BACKFILL_BATCH_CHUNKS', '256'))
+INQUIRE_BACKFILL_PAUSE_SECONDS = float(os.environ.get('INQUIRE_BACKFILL_PAUSE_SECONDS', '1.0'))
+# The running job holds a lease on the shared InquireBackfillJob row, renewed after
+# every batch; the job of a worker that died is taken over once its lease expires
+INQUIRE_BACKFILL_LEASE_SECONDS = 600
 
 def get_embedding_model():
-    """Get or initialize the sentence transformer model."""
+    """
+    Get or initialize the sentence transformer model.
+    
+    With EMBEDDING_SERVICE enabled this encodes through the shared embedding
+    service (started on first use, and again if it dies), offering the same
+    encode() call. If the service cannot be started the model is loaded in this
+    process instead.
+    """
     global _embedding_model
     
     if not EMBEDDINGS_AVAILABLE:
         return None
-        
+    
     if _embedding_model is None:
-        try:
-            _embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            app.logger.info("Embedding model loaded successfully")
-        except Exception as e:
-            app.logger.error(f"Failed to load embedding model: {e}")
-            return None
+        with _embedding_model_lock:
+            if _embedding_model is not None:
+                return _embedding_model
+            try:
+                if EMBEDDING_SERVICE:
+                    service_args = get_embedding_service_args()
+                    client = ensure_service_running(EMBEDDING_SERVICE_ADDRESS, service_args)
+                    if client is not None:
+                        app.logger.info(f"Connected to embedding service at {EMBEDDING_SERVICE_ADDRESS}")
+                        _embedding_model = ServiceBackedModel(EMBEDDING_SERVICE_ADDRESS, service_args,
+                                                              load_local_embedding_model, client)
+                        return _embedding_model
+                    app.logger.warning("Embedding service unavailable - loading the model in this process")
+                _embedding_model = load_local_embedding_model()
+            except Exception as e:
+                app.logger.error(f"Failed to load embedding model: {e}")
+                return None
     return _embedding_model
 
-def chunk_transcription(transcription, max_chunk_length=500, overlap=50):
-    """
-    Split transcription into overlapping chunks for better context retrieval.
-    
-    Args:
-        transcription (str): The full transcription text
-        max_chunk_length (int): Maximum characters per chunk
-        overlap (int): Character overlap between chunks
-    
-    Returns:
-        list: List of text chunks
-    """
-    if not transcription or len(transcription) <= max_chunk_length:
-        return [transcription] if transcription else []
-    
-    chunks = []
-    start = 0
-    
-    while start < len(transcription):
-        end = start + max_chunk_length
-        
-        # Try to break at sentence boundaries
-        if end < len(transcription):
-            # Look for sentence endings within the last 100 characters
-            sentence_end = -1
-            for i in range(max(0, end - 100), end):
-                if transcription[i] in '.!?':
-                    # Check if it's not an abbreviation
-                    if i + 1 < len(transcription) and transcription[i + 1].isspace():
-                        sentence_end = i + 1
-            
-            if sentence_end > start:
-                end = sentence_end
-        
-        chunk = transcription[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        
-        # Move start position with overlap
-        start = max(start + 1, end - overlap)
-        
-        # Prevent infinite loop
-        if start >= len(transcription):
-            break
-    
-    return chunks
+def load_local_embedding_model():
+    """Load the sentence transformer into this process with the configured CPU settings."""
+    model = load_model('all-MiniLM-L6-v2', EMBEDDING_BACKEND, EMBEDDING_THREADS, EMBEDDING_QUANTIZE)
+    app.logger.info("Embedding model loaded successfully")
+    return model
+
+def get_embedding_service_args():
+    """Command line for the shared embedding service, mirroring this app's settings."""
+    service_args = [
+        '--backend', EMBEDDING_BACKEND,
+        '--threads', str(EMBEDDING_THREADS),
+        '--max-batch', str(EMBEDDING_BATCH_SIZE),
+        '--max-wait-ms', str(EMBEDDING_BATCH_WAIT_MS),
+    ]
+    if EMBEDDING_QUANTIZE:
+        service_args.append('--quantize')
+    return service_args
+
+def get_embedding_service_stats():
+    """Throughput metrics of the shared embedding service, or None when it is not in use."""
+    if not EMBEDDINGS_AVAILABLE or not EMBEDDING_SERVICE or not hasattr(_embedding_model, 'stats'):
+        return None
+    try:
+        return _embedding_model.stats()
+    except EmbeddingServiceError as e:
+        return {'error': str(e)}
 
 def generate_embeddings(texts):
     """
@@ -728,53 +828,184 @@ def generate_embeddings(texts):
         app.logger.error(f"Error generating embeddings: {e}")
         return []
 
-def serialize_embedding(embedding):
-    """Convert numpy array to binary for database storage."""
+def serialize_embedding(embedding, dtype=None):
+    """Convert numpy array to binary for database storage (EMBEDDING_STORAGE_DTYPE by default)."""
     if embedding is None or not EMBEDDINGS_AVAILABLE:
         return None
-    return embedding.tobytes()
+    return encode_embedding(embedding, dtype or EMBEDDING_STORAGE_DTYPE)
 
-def deserialize_embedding(binary_data):
-    """Convert binary data back to numpy array."""
+def deserialize_embedding(binary_data, dtype=None):
+    """Convert binary data back to a float32 numpy array. A dtype of None means legacy float32."""
     if binary_data is None or not EMBEDDINGS_AVAILABLE:
         return None
-    return np.frombuffer(binary_data, dtype=np.float32)
+    return decode_embedding(binary_data, dtype)
+
+def build_transcript_chunk(recording, chunk_index, chunk_data, embedding, chunk_hash=None):
+    """Create (but do not add) a TranscriptChunk row from a chunk_transcription() entry."""
+    return TranscriptChunk(
+        recording_id=recording.id,
+        user_id=recording.user_id,
+        chunk_index=chunk_index,
+        content=chunk_data['content'],
+        content_hash=chunk_hash or content_hash(chunk_data['content']),
+        start_time=chunk_data['start_time'],
+        end_time=chunk_data['end_time'],
+        speaker_name=chunk_data['speaker_name'],
+        embedding=serialize_embedding(embedding) if embedding is not None else None,
+        embedding_dtype=EMBEDDING_STORAGE_DTYPE if embedding is not None else None
+    )
+
+def update_cached_recording_index(recording, chunk_rows):
+    """
+    Patch this worker's cached index with a recording's committed chunks instead of forcing a rebuild.
+    
+    Args:
+        recording: The Recording the chunks belong to
+        chunk_rows: List of (TranscriptChunk, embedding or None) for all of the recording's chunks
+    """
+    if embedding_index_cache is None:
+        return
+    if not chunk_rows:
+        embedding_index_cache.remove_recording(recording.user_id, recording.id)
+        return
+    embedded = [(chunk.id, embedding) for chunk, embedding in chunk_rows if embedding is not None]
+    embedding_index_cache.replace_recording(
+        recording.user_id,
+        recording.id,
+        [chunk_id for chunk_id, _ in embedded],
+        np.vstack([embedding for _, embedding in embedded]) if embedded else None,
+        recording.meeting_date
+    )
+    index = embedding_index_cache.get(recording.user_id)
+    if index is not None:
+        index.version = get_chunk_index_version(recording.user_id, index.created_after)
+
+def recording_profile_text(recording, opening_text=''):
+    """
+    Text embedded as a recording's profile for coarse retrieval.
+    
+    Title, participants and summary describe what a meeting was about; recordings
+    without a real summary fall back to the opening of their transcript.
+    """
+    parts = []
+    if recording.title:
+        parts.append(recording.title)
+    if recording.participants:
+        parts.append(f"Participants: {recording.participants}")
+    # Placeholders such as "[Summary not generated]" carry no meaning
+    if recording.summary and not recording.summary.startswith('['):
+        parts.append(recording.summary)
+    elif opening_text:
+        parts.append(opening_text)
+    return '\n'.join(parts)[:RECORDING_PROFILE_MAX_CHARS]
+
+def set_recording_profile(recording, profile_hash, embedding):
+    """Create or update a recording's profile embedding row (caller commits)."""
+    profile = recording.profile_embedding
+    if profile is None:
+        profile = RecordingEmbedding(user_id=recording.user_id)
+        recording.profile_embedding = profile
+    profile.embedding = serialize_embedding(embedding)
+    profile.embedding_dtype = EMBEDDING_STORAGE_DTYPE
+    profile.content_hash = profile_hash
+    profile.updated_at = datetime.utcnow()
+
+def update_cached_recording_profile(recording, embedding):
+    """Patch this worker's cached recording-profile index after a profile was committed."""
+    if recording_index_cache is None:
+        return
+    recording_index_cache.replace_recording(
+        recording.user_id, recording.id, [recording.id], np.asarray(embedding).reshape(1, -1), recording.meeting_date
+    )
+    index = recording_index_cache.get(recording.user_id)
+    if index is not None:
+        index.version = get_recording_index_version(recording.user_id)
 
 def process_recording_chunks(recording_id):
     """
     Process a recording by creating chunks and generating embeddings.
-    This should be called after a recording is transcribed.
+    This should be called after a recording is transcribed or edited.
+    
+    Existing chunks are matched to the new chunk set by content hash. Unchanged
+    chunks keep their row and embedding (only their position and timing are
+    updated), so after an edit only new or changed chunks are encoded.
     """
     try:
         recording = db.session.get(Recording, recording_id)
         if not recording or not recording.transcription:
             return False
         
-        # Delete existing chunks for this recording
-        TranscriptChunk.query.filter_by(recording_id=recording_id).delete()
-        
         # Create chunks
         chunks = chunk_transcription(recording.transcription)
         
-        if not chunks:
-            return True
-        
-        # Generate embeddings
-        embeddings = generate_embeddings(chunks)
+        # Embedded chunks from the previous run can be reused if their text is unchanged
+        reusable = {}
+        stale = []
+        for row in TranscriptChunk.query.filter_by(recording_id=recording_id).order_by(TranscriptChunk.chunk_index).all():
+            if row.embedding is None:
+                stale.append(row)
+            else:
+                reusable.setdefault(row.content_hash or content_hash(row.content), []).append(row)
+        
+        plan = []
+        for chunk_data in chunks:
+            chunk_hash = content_hash(chunk_data['content'])
+            candidates = reusable.get(chunk_hash)
+            plan.append((chunk_data, chunk_hash, candidates.pop(0) if candidates else None))
+        stale.extend(row for rows in reusable.values() for row in rows)
+        
+        # Generate embeddings for new or changed chunks only, plus the recording profile if it changed
+        to_encode = [chunk_data['content'] for chunk_data, _, row in plan if row is None]
+        profile_text = recording_profile_text(recording, ' '.join(chunk_data['content'] for chunk_data in chunks[:2]))
+        profile_hash = content_hash(profile_text) if profile_text else None
+        profile = recording.profile_embedding
+        refresh_profile = profile_hash is not None and (profile is None or profile.content_hash != profile_hash)
+        texts = to_encode + [profile_text] if refresh_profile else to_encode
+        embeddings = generate_embeddings(texts) if texts else []
+        if len(embeddings) != len(texts):
+            # Still store the chunks so keyword search works without the embedding model
+            embeddings = [None] * len(texts)
+        profile_embedding = embeddings[-1] if refresh_profile else None
+        new_embeddings = iter(embeddings)
+        
+        if profile_embedding is not None:
+            set_recording_profile(recording, profile_hash, profile_embedding)
+        elif profile_hash is None and profile is not None:
+            recording.profile_embedding = None
+        
+        # Remove every chunk not reused, including any a concurrent backfill stored after
+        # the read above, so the recording never ends up with two sets of chunks
+        kept_ids = [row.id for _, _, row in plan if row is not None]
+        TranscriptChunk.query.filter(
+            TranscriptChunk.recording_id == recording_id,
+            ~TranscriptChunk.id.in_(kept_ids)
+        ).delete(synchronize_session=False)
         
         # Store chunks in database
-        for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk = TranscriptChunk(
-                recording_id=recording_id,
-                user_id=recording.user_id,
-                chunk_index=i,
-                content=chunk_text,
-                embedding=serialize_embedding(embedding) if embedding is not None else None
-            )
-            db.session.add(chunk)
+        chunk_rows = []
+        for i, (chunk_data, chunk_hash, row) in enumerate(plan):
+            if row is None:
+                embedding = next(new_embeddings)
+                row = build_transcript_chunk(recording, i, chunk_data, embedding, chunk_hash)
+                db.session.add(row)
+            else:
+                embedding = deserialize_embedding(row.embedding, row.embedding_dtype)
+                row.content_hash = chunk_hash
+                row.chunk_index = i
+                row.start_time = chunk_data['start_time']
+                row.end_time = chunk_data['end_time']
+                row.speaker_name = chunk_data['speaker_name']
+            chunk_rows.append((row, embedding))
         
         db.session.commit()
-        app.logger.info(f"Created {len(chunks)} chunks for recording {recording_id}")
+        app.logger.info(f"Chunked recording {recording_id}: {len(chunks)} chunks, {len(to_encode)} encoded, "
+                        f"{len(chunks) - len(to_encode)} reused, {len(stale)} removed")
+        
+        update_cached_recording_index(recording, chunk_rows)
+        if profile_embedding is not None:
+            update_cached_recording_profile(recording, profile_embedding)
+        elif profile_hash is None and recording_index_cache is not None:
+            recording_index_cache.remove_recording(recording.user_id, recording_id)
         return True
         
     except Exception as e:
@@ -782,6 +1013,445 @@ def process_recording_chunks(recording_id):
         db.session.rollback()
         return False
 
+# Recordings with a re-chunk in flight; True means another edit arrived meanwhile
+_chunk_refresh_pending = {}
+_chunk_refresh_lock = threading.Lock()
+
+def _claim_chunk_refresh(recording_id):
+    """Register a re-chunk; returns False if one is already running (it will then run once more)."""
+    with _chunk_refresh_lock:
+        if recording_id in _chunk_refresh_pending:
+            _chunk_refresh_pending[recording_id] = True
+            return False
+        _chunk_refresh_pending[recording_id] = False
+        return True
+
+def _run_claimed_chunk_refresh(recording_id):
+    while True:
+        process_recording_chunks(recording_id)
+        with _chunk_refresh_lock:
+            if not _chunk_refresh_pending.get(recording_id):
+                _chunk_refresh_pending.pop(recording_id, None)
+                return
+            _chunk_refresh_pending[recording_id] = False
+
+def refresh_recording_chunks(recording_id):
+    """Re-chunk a recording now, unless another thread is already doing so (which then runs again)."""
+    if _claim_chunk_refresh(recording_id):
+        _run_claimed_chunk_refresh(recording_id)
+
+def refresh_recording_chunks_task(app_context, recording_id):
+    """Background task: bring a recording's chunks up to date after its transcript was edited."""
+    with app_context:
+        try:
+            _run_claimed_chunk_refresh(recording_id)
+        finally:
+            db.session.remove()
+
+def schedule_chunk_refresh(recording_id):
+    """Re-chunk an edited recording in the background, coalescing rapid successive edits."""
+    if not ENABLE_INQUIRE_MODE or not _claim_chunk_refresh(recording_id):
+        return
+    thread = threading.Thread(
+        target=refresh_recording_chunks_task,
+        args=(app.app_context(), recording_id)
+    )
+    thread.start()
+
+def recordings_needing_chunks_query():
+    """Completed, transcribed recordings that have no chunks yet, found with a single anti-join."""
+    has_chunks = db.session.query(TranscriptChunk.id).filter(TranscriptChunk.recording_id == Recording.id).exists()
+    return Recording.query.filter(
+        Recording.status == 'COMPLETED',
+        Recording.transcription.isnot(None),
+        Recording.transcription != '',
+        ~has_chunks
+    )
+
+def _store_backfill_batch(batch, run):
+    """
+    Embed and store the chunks of several recordings with one embedding call.
+    
+    Renewing the run's lease is the first write of the transaction, which (with
+    SQLite's single writer) keeps any other worker from committing chunks until
+    this batch commits. Recordings that gained chunks since they were read, from
+    a concurrent re-chunk, are then skipped instead of getting a second set.
+    
+    Args:
+        batch: List of (Recording, chunk_transcription() result) for recordings without chunks
+        run (BackfillRun): The run storing the batch; its progress is saved with the chunks
+    
+    Returns:
+        int: Number of chunks stored
+    """
+    contents = [chunk_data['content'] for _, chunks in batch for chunk_data in chunks]
+    profiles = [
+        (recording, recording_profile_text(recording, ' '.join(chunk_data['content'] for chunk_data in chunks[:2])))
+        for recording, chunks in batch
+    ]
+    profiles = [(recording, text) for recording, text in profiles if text]
+    texts = contents + [text for _, text in profiles]
+    embeddings = generate_embeddings(texts) if texts else []
+    if len(embeddings) != len(texts):
+        embeddings = [None] * len(texts)
+    new_embeddings = iter(embeddings)
+    
+    if not run.save() or run.stopping:
+        # Lease lost or stop requested while embedding: leave the batch for the next run
+        db.session.rollback()
+        return 0
+    chunked = {
+        row[0] for row in db.session.query(TranscriptChunk.recording_id).filter(
+            TranscriptChunk.recording_id.in_([recording.id for recording, _ in batch])
+        ).distinct()
+    }
+    
+    stored = []
+    stored_chunks = 0
+    for recording, chunks in batch:
+        chunk_rows = []
+        for i, chunk_data in enumerate(chunks):
+            embedding = next(new_embeddings)
+            if recording.id in chunked:
+                continue
+            chunk = build_transcript_chunk(recording, i, chunk_data, embedding)
+            db.session.add(chunk)
+            chunk_rows.append((chunk, embedding))
+        stored.append((recording, chunk_rows))
+        stored_chunks += len(chunk_rows)
+    profile_rows = []
+    for recording, text in profiles:
+        embedding = next(new_embeddings)
+        if embedding is not None and recording.id not in chunked:
+            set_recording_profile(recording, content_hash(text), embedding)
+            profile_rows.append((recording, embedding))
+    
+    run.processed += len(batch)
+    run.chunks += stored_chunks
+    run.profiles += len(profile_rows)
+    run.checkpoint = batch[-1][0].id
+    run.save()
+    db.session.commit()
+    
+    for recording, chunk_rows in stored:
+        if chunk_rows:
+            update_cached_recording_index(recording, chunk_rows)
+    for recording, embedding in profile_rows:
+        update_cached_recording_profile(recording, embedding)
+    return stored_chunks
+
+def recordings_needing_profile_query():
+    """Chunked recordings that have no profile embedding yet (processed before profiles existed)."""
+    has_chunks = db.session.query(TranscriptChunk.id).filter(TranscriptChunk.recording_id == Recording.id).exists()
+    has_profile = db.session.query(RecordingEmbedding.recording_id).filter(RecordingEmbedding.recording_id == Recording.id).exists()
+    return Recording.query.filter(
+        Recording.status == 'COMPLETED',
+        has_chunks,
+        ~has_profile
+    )
+
+def backfill_recording_profiles(run, batch_size=256):
+    """Embed profiles for chunked recordings that lack one, one model call per batch."""
+    if not EMBEDDINGS_AVAILABLE:
+        return
+    last_id = 0
+    while not run.stopping:
+        recordings = recordings_needing_profile_query().filter(
+            Recording.id > last_id
+        ).order_by(Recording.id).limit(batch_size).all()
+        if not recordings:
+            return
+        last_id = recordings[-1].id
+        
+        openings = {}
+        for chunk in TranscriptChunk.query.filter(
+            TranscriptChunk.recording_id.in_([recording.id for recording in recordings]),
+            TranscriptChunk.chunk_index < 2
+        ).order_by(TranscriptChunk.chunk_index):
+            openings.setdefault(chunk.recording_id, []).append(chunk.content)
+        profiles = [(recording, recording_profile_text(recording, ' '.join(openings.get(recording.id, []))))
+                    for recording in recordings]
+        profiles = [(recording, text) for recording, text in profiles if text]
+        embeddings = generate_embeddings([text for _, text in profiles]) if profiles else []
+        if len(embeddings) != len(profiles):
+            return
+        
+        run.profiles += len(profiles)
+        if not run.save():
+            db.session.rollback()
+            return
+        for (recording, text), embedding in zip(profiles, embeddings):
+            set_recording_profile(recording, content_hash(text), embedding)
+        db.session.commit()
+        for (recording, _), embedding in zip(profiles, embeddings):
+            update_cached_recording_profile(recording, embedding)
+        time.sleep(INQUIRE_BACKFILL_PAUSE_SECONDS)
+
+class BackfillRun:
+    """
+    One backfill run holding the lease on the shared InquireBackfillJob row.
+    
+    Progress is kept here and written to the row by save(), which also renews
+    the lease and picks up stop requests made through any worker.
+    """
+    
+    def __init__(self, owner, checkpoint=0):
+        self.owner = owner
+        self.checkpoint = checkpoint
+        self.total = self.processed = self.chunks = self.profiles = 0
+        self.failed = []
+        self.stopping = False
+    
+    def record_failure(self, recording, reason):
+        app.logger.error(f"Inquire backfill: failed to process recording {recording.id}: {reason}")
+        # Keep the status payload small on very large backfills
+        if len(self.failed) < 100:
+            self.failed.append({'id': recording.id, 'title': recording.title, 'reason': reason})
+    
+    def save(self):
+        """
+        Write progress and renew the lease, without committing.
+        
+        Returns:
+            bool: False if the lease was lost; stopping is then set, as it is
+            when a stop was requested
+        """
+        result = db.session.execute(
+            update(InquireBackfillJob)
+            .where(InquireBackfillJob.id == 1, InquireBackfillJob.owner == self.owner)
+            .values(lease_until=datetime.utcnow() + timedelta(seconds=INQUIRE_BACKFILL_LEASE_SECONDS),
+                    total=self.total, processed=self.processed, chunks=self.chunks, profiles=self.profiles,
+                    checkpoint=self.checkpoint, failed=json.dumps(self.failed))
+        )
+        if result.rowcount != 1:
+            app.logger.warning("Inquire backfill: lease lost to another run; stopping")
+            self.stopping = True
+            return False
+        self.poll_stop()
+        return True
+    
+    def poll_stop(self):
+        """Pick up a stop request made through any worker; returns stopping."""
+        if db.session.execute(
+            select(InquireBackfillJob.stop_requested).where(InquireBackfillJob.id == 1)
+        ).scalar():
+            self.stopping = True
+        return self.stopping
+    
+    def release(self, error=None):
+        """Save final progress and give up the lease."""
+        db.session.rollback()
+        db.session.execute(
+            update(InquireBackfillJob)
+            .where(InquireBackfillJob.id == 1, InquireBackfillJob.owner == self.owner)
+            .values(owner=None, lease_until=None, stop_requested=False, finished_at=datetime.utcnow(), error=error,
+                    total=self.total, processed=self.processed, chunks=self.chunks, profiles=self.profiles,
+                    checkpoint=self.checkpoint, failed=json.dumps(self.failed))
+        )
+        db.session.commit()
+    
+    def status(self):
+        """Status snapshot of this run, in the format of get_inquire_backfill_status()."""
+        return dict(get_inquire_backfill_status(), total=self.total, processed=self.processed, chunks=self.chunks,
+                    profiles=self.profiles, checkpoint=self.checkpoint, failed=list(self.failed))
+
+def claim_inquire_backfill():
+    """
+    Take the backfill lease unless a run in any worker holds a live one.
+    
+    A run whose worker died stops renewing its lease and is taken over once
+    the lease has expired. The checkpoint of the previous run is kept.
+    
+    Returns:
+        str or None: Owner token for the new run, or None if a backfill is already running
+    """
+    now = datetime.utcnow()
+    owner = secrets.token_hex(16)
+    claimed = db.session.execute(
+        update(InquireBackfillJob)
+        .where(InquireBackfillJob.id == 1,
+               db.or_(InquireBackfillJob.owner.is_(None), InquireBackfillJob.lease_until < now))
+        .values(owner=owner, lease_until=now + timedelta(seconds=INQUIRE_BACKFILL_LEASE_SECONDS),
+                stop_requested=False, started_at=now, finished_at=None, error=None,
+                total=0, processed=0, chunks=0, profiles=0, failed='[]')
+    ).rowcount == 1
+    db.session.commit()
+    return owner if claimed else None
+
+def run_inquire_backfill(max_recordings=None, progress=None, batch_chunks=None, pause_seconds=None, owner=None):
+    """
+    Chunk and embed every recording that has no chunks yet. Must run in an app context.
+    
+    Only one run at a time is allowed across all workers and scripts: the run
+    holds a lease on the InquireBackfillJob row (claimed here unless owner is
+    given), renewed after every batch. Recordings are walked in id order and
+    the id of the last stored batch is checkpointed with the batch, so an
+    interrupted or limited run resumes where it stopped (and skips recordings
+    that failed) instead of starting over. The checkpoint is cleared once the
+    whole backlog has been walked, so the next run retries earlier failures.
+    
+    Args:
+        max_recordings (int): Stop after this many recordings (None for all)
+        progress (callable): Called with a status snapshot after every batch
+        batch_chunks (int): Chunks per embedding batch (default INQUIRE_BACKFILL_BATCH_CHUNKS)
+        pause_seconds (float): Pause between batches (default INQUIRE_BACKFILL_PAUSE_SECONDS)
+        owner (str): Lease token from claim_inquire_backfill(), if already claimed
+    
+    Returns:
+        dict: Final status snapshot, or None if another backfill is already running
+    """
+    owner = owner or claim_inquire_backfill()
+    if owner is None:
+        return None
+    batch_chunks = batch_chunks or INQUIRE_BACKFILL_BATCH_CHUNKS
+    pause_seconds = INQUIRE_BACKFILL_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    checkpoint = db.session.execute(
+        select(InquireBackfillJob.checkpoint).where(InquireBackfillJob.id == 1)
+    ).scalar() or 0
+    run = BackfillRun(owner, checkpoint)
+    try:
+        _walk_inquire_backfill(run, max_recordings, progress, batch_chunks, pause_seconds)
+    except Exception as e:
+        run.release(error=str(e))
+        raise
+    run.release()
+    
+    status = run.status()
+    app.logger.info(f"Inquire backfill finished: {status['processed']} recordings, {status['chunks']} chunks, "
+                    f"{len(status['failed'])} failed")
+    return status
+
+def _walk_inquire_backfill(run, max_recordings, progress, batch_chunks, pause_seconds):
+    pending = recordings_needing_chunks_query().filter(Recording.id > run.checkpoint)
+    run.total = pending.count()
+    if max_recordings:
+        run.total = min(run.total, max_recordings)
+    run.save()
+    db.session.commit()
+    app.logger.info(f"Inquire backfill: {run.total} recordings to process, resuming after recording {run.checkpoint}")
+    
+    seen = 0
+    last_id = run.checkpoint
+    batch = []
+    pending_chunks = 0
+    exhausted = False
+    
+    def flush():
+        nonlocal batch, pending_chunks
+        if not batch or run.poll_stop():
+            return
+        try:
+            _store_backfill_batch(batch, run)
+        except Exception as e:
+            db.session.rollback()
+            for recording, _ in batch:
+                run.record_failure(recording, str(e))
+            run.checkpoint = batch[-1][0].id
+            run.save()
+            db.session.commit()
+        batch, pending_chunks = [], 0
+        if progress:
+            progress(run.status())
+        if not run.stopping:
+            time.sleep(pause_seconds)
+    
+    while not run.stopping:
+        page_size = 100 if not max_recordings else min(100, max_recordings - seen)
+        if page_size <= 0:
+            break
+        ids = [row.id for row in recordings_needing_chunks_query().filter(
+            Recording.id > last_id
+        ).order_by(Recording.id).with_entities(Recording.id).limit(page_size)]
+        if not ids:
+            exhausted = True
+            break
+        
+        for recording_id in ids:
+            if run.stopping:
+                break
+            recording = db.session.get(Recording, recording_id)
+            last_id = recording_id
+            seen += 1
+            try:
+                chunks = chunk_transcription(recording.transcription)
+            except Exception as e:
+                run.record_failure(recording, str(e))
+                continue
+            batch.append((recording, chunks))
+            pending_chunks += len(chunks)
+            if pending_chunks >= batch_chunks:
+                flush()
+    
+    if not run.stopping:
+        flush()
+    if exhausted and not batch and not run.stopping:
+        run.checkpoint = 0
+        run.save()
+        db.session.commit()
+        # Recordings chunked before profile embeddings existed
+        backfill_recording_profiles(run)
+
+def inquire_backfill_task(app_context, owner, max_recordings=None):
+    """Background task: run the Inquire Mode backfill under an already claimed lease."""
+    with app_context:
+        try:
+            run_inquire_backfill(max_recordings, owner=owner)
+        except Exception as e:
+            app.logger.error(f"Inquire backfill failed: {e}", exc_info=True)
+        finally:
+            db.session.remove()
+
+def start_inquire_backfill(max_recordings=None):
+    """
+    Start the backfill job in a background thread.
+    
+    Returns:
+        bool: False if a backfill is already running in any worker
+    """
+    owner = claim_inquire_backfill()
+    if owner is None:
+        return False
+    thread = threading.Thread(
+        target=inquire_backfill_task,
+        args=(app.app_context(), owner, max_recordings),
+        daemon=True
+    )
+    thread.start()
+    return True
+
+def stop_inquire_backfill():
+    """Ask the running backfill, in whichever worker it runs, to stop after its current batch."""
+    db.session.execute(
+        update(InquireBackfillJob).where(InquireBackfillJob.id == 1, InquireBackfillJob.owner.isnot(None))
+        .values(stop_requested=True)
+    )
+    db.session.commit()
+
+def get_inquire_backfill_status():
+    """Progress of the current or last backfill run, read from the job row shared by all workers."""
+    job = db.session.execute(
+        select(InquireBackfillJob).where(InquireBackfillJob.id == 1).execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if job is None:
+        job = InquireBackfillJob(total=0, processed=0, chunks=0, profiles=0, checkpoint=0)
+    running = job.owner is not None and job.lease_until is not None and job.lease_until > datetime.utcnow()
+    error = job.error
+    if job.owner is not None and not running:
+        error = error or 'The backfill stopped responding; starting it again resumes from the checkpoint'
+    return {
+        'running': running,
+        'stop_requested': bool(job.stop_requested) and running,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'total': job.total,
+        'processed': job.processed,
+        'chunks': job.chunks,
+        'profiles': job.profiles,
+        'failed': json.loads(job.failed) if job.failed else [],
+        'checkpoint': job.checkpoint,
+        'error': error
+    }
+
 def basic_text_search_chunks(user_id, query, filters=None, top_k=5):
     """
     Basic text search fallback when embeddings are not available.
@@ -799,18 +1469,10 @@ def basic_text_search_chunks(user_id, query, filters=None, top_k=5):
                 ).filter(RecordingTag.tag_id.in_(filters['tag_ids']))
             
             if filters.get('speaker_names'):
-                # Filter by participants field in recordings instead of chunk speaker_name
-                if not any(hasattr(desc, 'name') and desc.name == 'recording' for desc in chunks_query.column_descriptions):
-                    chunks_query = chunks_query.join(Recording)
-                
-                # Build OR conditions for each speaker name in participants
-                speaker_conditions = []
-                for speaker_name in filters['speaker_names']:
-                    speaker_conditions.append(
-                        Recording.participants.ilike(f'%{speaker_name}%')
-                    )
-                
-                chunks_query = chunks_query.filter(db.or_(*speaker_conditions))
+                # Filter by recording participants instead of chunk speaker_name
+                chunks_query = chunks_query.filter(TranscriptChunk.recording_id.in_(
+                    recordings_with_speakers_query(user_id, filters['speaker_names'])
+                ))
                 app.logger.info(f"Applied speaker filter for: {filters['speaker_names']}")
             
             if filters.get('recording_ids'):
@@ -844,8 +1506,531 @@ def basic_text_search_chunks(user_id, query, filters=None, top_k=5):
         return [(chunk, 1.0) for chunk in chunks]
         
     except Exception as e:
-        app.logger.error(f"Error in basic text search: {e}")
-        return []
+        app.logger.error(f"Error in basic text search: {e}")
+        return []
+
+def sync_recording_participants(recording):
+    """Bring the participant index rows in line with recording.participants (caller commits)."""
+    names = parse_participants(recording.participants) if recording.user_id else []
+    existing = {entry.name: entry for entry in recording.participant_entries}
+    for name, entry in existing.items():
+        if name not in names:
+            recording.participant_entries.remove(entry)
+    for name in names:
+        if name not in existing:
+            recording.participant_entries.append(RecordingParticipant(user_id=recording.user_id, name=name))
+
+def get_user_speaker_names(user_id):
+    """Sorted distinct participant names across a user's recordings."""
+    rows = db.session.query(RecordingParticipant.name).filter(
+        RecordingParticipant.user_id == user_id
+    ).distinct().order_by(RecordingParticipant.name)
+    return [row[0] for row in rows]
+
+def recordings_with_speakers_query(user_id, speaker_names):
+    """Query of IDs of the user's recordings with any of the given participants."""
+    return db.session.query(RecordingParticipant.recording_id).filter(
+        RecordingParticipant.user_id == user_id,
+        RecordingParticipant.name.in_(list(speaker_names))
+    ).distinct()
+
+def resolve_filtered_recording_ids(user_id, filters):
+    """
+    Resolve the tag, speaker and recording filters to the set of allowed recording IDs.
+    
+    Returns:
+        set or None: Allowed recording IDs, or None if none of these filters are set
+    """
+    if not filters:
+        return None
+    
+    allowed = None
+    
+    if filters.get('tag_ids'):
+        tagged = db.session.query(RecordingTag.recording_id).join(
+            Recording, Recording.id == RecordingTag.recording_id
+        ).filter(
+            Recording.user_id == user_id,
+            RecordingTag.tag_id.in_(filters['tag_ids'])
+        )
+        allowed = {row[0] for row in tagged}
+    
+    if filters.get('speaker_names'):
+        # Filter by recording participants instead of chunk speaker_name
+        speaker_ids = {row[0] for row in recordings_with_speakers_query(user_id, filters['speaker_names'])}
+        allowed = speaker_ids if allowed is None else allowed & speaker_ids
+        app.logger.info(f"Applied speaker filter for: {filters['speaker_names']}")
+    
+    if filters.get('recording_ids'):
+        requested = {int(rid) for rid in filters['recording_ids']}
+        allowed = requested if allowed is None else allowed & requested
+    
+    return allowed
+
+def get_chunk_index_version(user_id, created_after=None):
+    """
+    Cheap change detector for a user's chunks: (count, max id, newest created_at).
+    
+    Including created_at catches re-chunked recordings even when SQLite reuses the
+    deleted chunk ids. Served entirely from the (user_id, created_at, id) index.
+    """
+    from sqlalchemy import func
+    
+    version_query = db.session.query(
+        func.count(TranscriptChunk.id), func.max(TranscriptChunk.id), func.max(TranscriptChunk.created_at)
+    ).filter(TranscriptChunk.user_id == user_id)
+    if created_after is not None:
+        version_query = version_query.filter(TranscriptChunk.created_at > created_after)
+    return tuple(version_query.one())
+
+def load_chunk_embedding_rows(user_id, created_after=None):
+    """Load id, recording, date and embedding columns (never content) for a user's chunks."""
+    rows_query = db.session.query(
+        TranscriptChunk.id,
+        TranscriptChunk.recording_id,
+        TranscriptChunk.embedding,
+        TranscriptChunk.embedding_dtype,
+        TranscriptChunk.created_at,
+        Recording.meeting_date
+    ).join(Recording, Recording.id == TranscriptChunk.recording_id).filter(
+        TranscriptChunk.user_id == user_id,
+        TranscriptChunk.embedding.isnot(None)
+    )
+    if created_after is not None:
+        rows_query = rows_query.filter(TranscriptChunk.created_at > created_after)
+    return rows_query.order_by(TranscriptChunk.id).all()
+
+def get_user_embedding_index(user_id):
+    """
+    Return the search indexes for a user as (ann_index, in_memory_index).
+    
+    ann_index is the memory-mapped on-disk index, or None for users below
+    ANN_INDEX_MIN_CHUNKS. The in-memory index holds every chunk when there is no
+    ANN index, otherwise only the chunks created after the ANN index was built.
+    The cached in-memory index is validated with one aggregate query so chunks
+    written by other worker processes are picked up without rescanning embeddings.
+    """
+    ann = ann_index_store.get(user_id) if ann_index_store is not None else None
+    created_after = ann.created_until if ann is not None else None
+    version = get_chunk_index_version(user_id, created_after)
+    
+    index = embedding_index_cache.get(user_id)
+    if index is not None and index.version == version and index.created_after == created_after:
+        return ann, index
+    
+    started = time.time()
+    rows = load_chunk_embedding_rows(user_id, created_after)
+    embeddings = [deserialize_embedding(row.embedding, row.embedding_dtype) for row in rows]
+    index = UserEmbeddingIndex(
+        user_id,
+        chunk_ids=[row.id for row in rows],
+        recording_ids=[row.recording_id for row in rows],
+        meeting_dates=[date_to_ordinal(row.meeting_date) for row in rows],
+        embeddings=np.vstack(embeddings) if embeddings else None,
+        created_after=created_after,
+        dtype=EMBEDDING_INDEX_DTYPE
+    )
+    index.version = version
+    embedding_index_cache.put(index)
+    app.logger.info(f"Built embedding index for user {user_id}: {len(index)} chunks, "
+                    f"{index.nbytes / 1024 / 1024:.1f}MB in {time.time() - started:.2f}s")
+    
+    maybe_schedule_ann_rebuild(user_id, ann, index)
+    return ann, index
+
+def get_recording_index_version(user_id):
+    """Cheap change detector for a user's recording profiles: (count, newest updated_at)."""
+    from sqlalchemy import func
+    
+    return tuple(db.session.query(
+        func.count(RecordingEmbedding.recording_id), func.max(RecordingEmbedding.updated_at)
+    ).filter(RecordingEmbedding.user_id == user_id).one())
+
+def get_user_recording_index(user_id):
+    """
+    Return the in-memory index of a user's recording profile embeddings.
+    
+    Rows are keyed by recording id. The index also carries unprofiled_ids, the
+    completed recordings that had no profile when it was built; the coarse stage
+    always passes those through so they stay searchable until backfilled.
+    """
+    version = get_recording_index_version(user_id)
+    index = recording_index_cache.get(user_id)
+    if index is not None and index.version == version:
+        return index
+    
+    rows = db.session.query(
+        RecordingEmbedding.recording_id,
+        RecordingEmbedding.embedding,
+        RecordingEmbedding.embedding_dtype,
+        Recording.meeting_date
+    ).join(Recording, Recording.id == RecordingEmbedding.recording_id).filter(
+        RecordingEmbedding.user_id == user_id
+    ).order_by(RecordingEmbedding.recording_id).all()
+    embeddings = [deserialize_embedding(row.embedding, row.embedding_dtype) for row in rows]
+    index = UserEmbeddingIndex(
+        user_id,
+        chunk_ids=[row.recording_id for row in rows],
+        recording_ids=[row.recording_id for row in rows],
+        meeting_dates=[date_to_ordinal(row.meeting_date) for row in rows],
+        embeddings=np.vstack(embeddings) if embeddings else None,
+        dtype=EMBEDDING_INDEX_DTYPE
+    )
+    has_profile = db.session.query(RecordingEmbedding.recording_id).filter(RecordingEmbedding.recording_id == Recording.id).exists()
+    index.unprofiled_ids = {
+        row.id for row in db.session.query(Recording.id).filter(
+            Recording.user_id == user_id,
+            Recording.status == 'COMPLETED',
+            ~has_profile
+        )
+    }
+    index.version = version
+    recording_index_cache.put(index)
+    return index
+
+def select_candidate_recordings(user_id, query_embeddings, resolved_filters):
+    """
+    Coarse retrieval stage: the recordings whose profiles best match any query under any filter variant.
+    
+    Returns:
+        set or None: Recording IDs to restrict chunk search to, or None when the
+        coarse stage does not apply (disabled, or too few profiled recordings)
+    """
+    if recording_index_cache is None or INQUIRE_COARSE_RECORDINGS <= 0:
+        return None
+    index = get_user_recording_index(user_id)
+    if len(index) < INQUIRE_COARSE_MIN_RECORDINGS:
+        return None
+    
+    snapshot = index.snapshot()
+    masks = [snapshot.build_mask(**constraints) for constraints in resolved_filters.values()]
+    results = snapshot.search_many(query_embeddings, INQUIRE_COARSE_RECORDINGS, masks)
+    candidates = {recording_id for per_variant in results for per_query in per_variant for recording_id, _ in per_query}
+    return candidates | index.unprofiled_ids
+
+def maybe_schedule_ann_rebuild(user_id, ann, delta_index):
+    """Start a background ANN build when a user crosses the size threshold or the delta grows too large."""
+    if ann_index_store is None:
+        return
+    
+    if ann is None:
+        if len(delta_index) < ANN_INDEX_MIN_CHUNKS:
+            return
+    else:
+        # Chunks deleted since the build are still on disk until the next rebuild
+        live_rows = TranscriptChunk.query.filter(
+            TranscriptChunk.user_id == user_id,
+            TranscriptChunk.created_at <= ann.created_until,
+            TranscriptChunk.embedding.isnot(None)
+        ).count()
+        stale_rows = max(0, len(ann) - live_rows)
+        if len(delta_index) + stale_rows <= ANN_INDEX_REBUILD_FRACTION * len(ann):
+            return
+    
+    with _ann_rebuild_lock:
+        if user_id in _ann_rebuilds_in_progress:
+            return
+        _ann_rebuilds_in_progress.add(user_id)
+    
+    thread = threading.Thread(target=rebuild_ann_index_task, args=(app.app_context(), user_id), daemon=True)
+    thread.start()
+    app.logger.info(f"Scheduled background ANN index rebuild for user {user_id}")
+
+def rebuild_ann_index_task(app_context, user_id):
+    """Background task: rebuild and publish a user's on-disk ANN index."""
+    with app_context:
+        try:
+            with ann_index_store.build_lock(user_id) as acquired:
+                if not acquired:
+                    app.logger.info(f"ANN index for user {user_id} is already being rebuilt by another worker")
+                    return
+                
+                rows = load_chunk_embedding_rows(user_id)
+                if not rows:
+                    ann_index_store.remove(user_id)
+                    return
+                
+                ann_index_store.publish(
+                    user_id,
+                    chunk_ids=[row.id for row in rows],
+                    recording_ids=[row.recording_id for row in rows],
+                    meeting_dates=[date_to_ordinal(row.meeting_date) for row in rows],
+                    embeddings=np.vstack([deserialize_embedding(row.embedding, row.embedding_dtype) for row in rows]),
+                    created_until=max(row.created_at for row in rows),
+                    dtype=EMBEDDING_INDEX_DTYPE
+                )
+        except Exception as e:
+            app.logger.error(f"Error rebuilding ANN index for user {user_id}: {e}", exc_info=True)
+        finally:
+            with _ann_rebuild_lock:
+                _ann_rebuilds_in_progress.discard(user_id)
+            db.session.remove()
+
+def resolve_filter_variants(user_id, filter_variants):
+    """
+    Resolve each variant's filters to recording_ids/date_from/date_to constraints.
+    
+    A date range is resolved to the recordings whose meeting date is in it now,
+    read from the database: cached in-memory indexes and ANN builds may still
+    hold a meeting date that was edited through another worker, so their date
+    arrays are not used for filtering. date_from/date_to are therefore None.
+    
+    Returns:
+        dict: Variant name -> keyword arguments for build_mask() and search_chunk_fts()
+    """
+    resolved = {}
+    for name, filters in filter_variants.items():
+        filters = filters or {}
+        recording_ids = resolve_filtered_recording_ids(user_id, filters)
+        date_from, date_to = filters.get('date_from'), filters.get('date_to')
+        if date_from or date_to:
+            dated_query = db.session.query(Recording.id).filter(
+                Recording.user_id == user_id,
+                Recording.meeting_date.isnot(None)
+            )
+            if date_from:
+                dated_query = dated_query.filter(Recording.meeting_date >= date_from)
+            if date_to:
+                dated_query = dated_query.filter(Recording.meeting_date <= date_to)
+            dated = {row[0] for row in dated_query}
+            recording_ids = dated if recording_ids is None else recording_ids & dated
+        resolved[name] = dict(recording_ids=recording_ids, date_from=None, date_to=None)
+    return resolved
+
+def search_user_lexical(user_id, queries, resolved_filters, top_k=5):
+    """
+    BM25 keyword search for each query under each filter variant.
+    
+    Returns:
+        dict: Variant name -> one best-first list of (chunk_id, relevance) per query
+    """
+    return {
+        name: [search_chunk_fts(db.session, user_id, query, top_k, **constraints) for query in queries]
+        for name, constraints in resolved_filters.items()
+    }
+
+def search_user_embeddings(user_id, query_embeddings, resolved_filters, top_k=5, candidate_recordings=None):
+    """
+    Score a batch of query embeddings against all of a user's chunks under each filter variant.
+    
+    The in-memory index scores every query with one matrix product shared by all
+    variants; each variant only contributes a boolean mask.
+    
+    Args:
+        user_id (int): User ID
+        query_embeddings: (n_queries, dim) query vectors
+        resolved_filters (dict): Variant name -> constraints from resolve_filter_variants()
+        top_k (int): Results per query and variant
+        candidate_recordings (set): Only score chunks of these recordings (coarse stage result)
+    
+    Returns:
+        dict: Variant name -> one best-first list of (chunk_id, similarity) per query.
+        When an ANN index is in use the lists are over-fetched because some ids
+        may belong to deleted chunks.
+    """
+    ann, index = get_user_embedding_index(user_id)
+    
+    # Apply filters as boolean masks over the index metadata arrays
+    names = list(resolved_filters)
+    mask_args = [resolved_filters[name] for name in names]
+    
+    # Row positions and masks must come from the same rows as the search, even if
+    # another thread patches the index meanwhile
+    snapshot = index.snapshot()
+    rows = snapshot.rows_for_recordings(candidate_recordings) if candidate_recordings is not None else None
+    results = snapshot.search_many(query_embeddings, top_k, [snapshot.build_mask(**args) for args in mask_args],
+                                   rows=rows)
+    if ann is not None:
+        if candidate_recordings is not None:
+            mask_args = [
+                dict(args, recording_ids=candidate_recordings if args['recording_ids'] is None
+                     else args['recording_ids'] & candidate_recordings)
+                for args in mask_args
+            ]
+        # Chunks re-created since the build are served by the delta; skip their stale on-disk copies
+        superseded = set(snapshot.chunk_ids.tolist())
+        for variant_results, args in zip(results, mask_args):
+            ann_mask = ann.build_mask(**args)
+            for query_results, query_embedding in zip(variant_results, query_embeddings):
+                ann_results = ann.search(query_embedding, top_k * 2, ann_mask, nprobe=ANN_INDEX_NPROBE)
+                query_results.extend(result for result in ann_results if result[0] not in superseded)
+                query_results.sort(key=lambda x: x[1], reverse=True)
+                del query_results[top_k * 2:]
+    
+    return dict(zip(names, results))
+
+def chunk_matches_constraints(chunk, recording_ids=None, date_from=None, date_to=None):
+    """Check a loaded chunk against resolved filter constraints, as the index masks do."""
+    if recording_ids is not None and chunk.recording_id not in recording_ids:
+        return False
+    if date_from is not None or date_to is not None:
+        meeting_date = chunk.recording.meeting_date
+        if meeting_date is None:
+            return False
+        if date_from is not None and meeting_date < date_from:
+            return False
+        if date_to is not None and meeting_date > date_to:
+            return False
+    return True
+
+def load_search_chunks(user_id, scored_ids, resolved_filters, chunks_by_id):
+    """
+    Resolve scored chunk ids to the user's chunk rows and drop stale ids.
+    
+    Index ids can be out of date: the chunk may have been deleted since an ANN
+    build, SQLite may have reused its id for another user's chunk, or its
+    recording may no longer match the variant's filters. Rows are loaded with an
+    owner check into chunks_by_id, which is shared between calls so each id is
+    fetched once (ids without a row map to None).
+    
+    Returns:
+        dict: Variant name -> per query, the (chunk_id, score) pairs that are still valid
+    """
+    missing = {
+        chunk_id for per_query in scored_ids.values() for results in per_query for chunk_id, _ in results
+    } - chunks_by_id.keys()
+    if missing:
+        chunks_by_id.update(dict.fromkeys(missing))
+        chunks_by_id.update({
+            chunk.id: chunk for chunk in TranscriptChunk.query.options(
+                joinedload(TranscriptChunk.recording)
+            ).filter(TranscriptChunk.user_id == user_id, TranscriptChunk.id.in_(missing)).all()
+        })
+    
+    return {
+        name: [
+            [(chunk_id, score) for chunk_id, score in results
+             if chunks_by_id[chunk_id] is not None
+             and chunk_matches_constraints(chunks_by_id[chunk_id], **resolved_filters[name])]
+            for results in per_query
+        ]
+        for name, per_query in scored_ids.items()
+    }
+
+def search_vector_chunks(user_id, query_embeddings, resolved_filters, top_k, chunks_by_id, candidate_recordings=None):
+    """
+    Vector search with the results validated against the database.
+    
+    When stale ids were dropped from a result list that the index returned in
+    full, live chunks ranked just below the cut may have been missed, so the
+    search is repeated with twice the depth (up to ANN_STALE_RESULT_RETRIES times).
+    
+    Returns:
+        dict: Variant name -> per query, at most top_k valid (chunk_id, similarity) pairs, best first
+    """
+    depth = top_k
+    for attempt in range(ANN_STALE_RESULT_RETRIES + 1):
+        scored_ids = search_user_embeddings(user_id, query_embeddings, resolved_filters, depth, candidate_recordings)
+        valid_ids = load_search_chunks(user_id, scored_ids, resolved_filters, chunks_by_id)
+        truncated = any(
+            len(valid) < top_k and len(scored) >= depth
+            for name in scored_ids
+            for scored, valid in zip(scored_ids[name], valid_ids[name])
+        )
+        if not truncated:
+            break
+        depth *= 2
+    return {name: [results[:top_k] for results in per_query] for name, per_query in valid_ids.items()}
+
+def multi_query_search_chunks(user_id, queries, filter_variants=None, top_k=5, fusion='max'):
+    """
+    Search several queries under several filter variants in one pass.
+    
+    All queries are encoded in a single model batch and scored against the user's
+    index with one matrix product; filter variants are masks over that same score
+    matrix, and only the winning chunks of the variants are fetched, with an
+    owner and filter check that drops stale index ids.
+    With the full-text index available, each query's vector ranking is fused with
+    its BM25 keyword ranking by reciprocal rank fusion (hybrid search); without
+    embeddings the BM25 ranking is used on its own.
+    
+    Args:
+        user_id (int): User ID for permission filtering
+        queries (list): Search query strings
+        filter_variants (dict): Variant name -> filters dict; defaults to one unfiltered variant 'default'
+        top_k (int): Number of chunks retrieved per query; the fused list is their union
+        fusion (str): How queries are combined: 'max' (best score) or 'rrf' (reciprocal rank fusion)
+    
+    Returns:
+        dict: Variant name -> list of (chunk, fused score, matched) best first, where
+        matched maps each query that retrieved the chunk to its score. Scores are
+        cosine similarities for pure vector search and rank-fusion scores in 0..1
+        otherwise.
+    """
+    filter_variants = filter_variants if filter_variants is not None else {'default': None}
+    queries = [query for query in queries if query]
+    empty = {name: [] for name in filter_variants}
+    if not queries:
+        return empty
+    
+    try:
+        model = get_embedding_model() if EMBEDDINGS_AVAILABLE else None
+        use_lexical = CHUNK_FTS_AVAILABLE and (INQUIRE_HYBRID_SEARCH or not model)
+        if not model and not use_lexical:
+            # Fall back to basic text search, query by query
+            app.logger.info("Embeddings not available - using basic text search as fallback")
+            fused = {}
+            for name, filters in filter_variants.items():
+                per_query = [basic_text_search_chunks(user_id, query, filters, top_k) for query in queries]
+                chunks = {chunk.id: chunk for results in per_query for chunk, _ in results}
+                fused[name] = [
+                    (chunks[chunk_id], score, {queries[i]: similarity for i, similarity in matched.items()})
+                    for chunk_id, score, matched in fuse_results(
+                        [[(chunk.id, similarity) for chunk, similarity in results] for results in per_query], fusion
+                    )
+                ]
+            return fused
+        
+        resolved_filters = resolve_filter_variants(user_id, filter_variants)
+        
+        # Only the winning rows of all variants are loaded, once each, with stale ids dropped
+        chunks_by_id = {}
+        vector_ids = lexical_ids = None
+        if model:
+            query_embeddings = np.asarray(model.encode(queries), dtype=np.float32)
+            # Coarse stage: restrict chunk scoring to the best-matching recordings
+            candidate_recordings = select_candidate_recordings(user_id, query_embeddings, resolved_filters)
+            vector_ids = search_vector_chunks(user_id, query_embeddings, resolved_filters, top_k,
+                                              chunks_by_id, candidate_recordings)
+            if candidate_recordings is not None and INQUIRE_COARSE_FALLBACK:
+                weak = [
+                    name for name, per_query in vector_ids.items()
+                    if any(len(results) < top_k or results[0][1] < INQUIRE_COARSE_MIN_SIMILARITY
+                           for results in per_query)
+                ]
+                if weak:
+                    app.logger.info(f"Coarse retrieval too narrow for {weak}; falling back to full search")
+                    vector_ids.update(search_vector_chunks(
+                        user_id, query_embeddings, {name: resolved_filters[name] for name in weak}, top_k,
+                        chunks_by_id
+                    ))
+        if use_lexical:
+            lexical_ids = load_search_chunks(user_id, search_user_lexical(user_id, queries, resolved_filters, top_k),
+                                             resolved_filters, chunks_by_id)
+        
+        fused = {}
+        for name in filter_variants:
+            per_query_ids = None
+            if vector_ids is not None:
+                per_query_ids = [results[:top_k] for results in vector_ids[name]]
+            if lexical_ids is not None:
+                per_query_lexical = lexical_ids[name]
+                if per_query_ids is None:
+                    per_query_ids = [reciprocal_rank_fusion([results]) for results in per_query_lexical]
+                else:
+                    per_query_ids = [
+                        reciprocal_rank_fusion([vector_results, lexical_results])[:top_k]
+                        for vector_results, lexical_results in zip(per_query_ids, per_query_lexical)
+                    ]
+            fused[name] = [
+                (chunks_by_id[chunk_id], score, {queries[i]: similarity for i, similarity in matched.items()})
+                for chunk_id, score, matched in fuse_results(per_query_ids, fusion)
+            ]
+        return fused
+        
+    except Exception as e:
+        app.logger.error(f"Error in multi-query semantic search: {e}")
+        return empty
 
 def semantic_search_chunks(user_id, query, filters=None, top_k=5):
     """
@@ -860,85 +2045,101 @@ def semantic_search_chunks(user_id, query, filters=None, top_k=5):
     Returns:
         list: List of relevant chunks with similarity scores
     """
+    results = multi_query_search_chunks(user_id, [query], {'default': filters}, top_k)['default']
+    return [(chunk, similarity) for chunk, similarity, _ in results[:top_k]]
+
+def get_query_router():
+    """Return the shared local query router, built with the embedding model when it is available."""
+    global _query_router
+    if _query_router is None:
+        _query_router = QueryRouter(get_embedding_model() if EMBEDDINGS_AVAILABLE else None, INQUIRE_ROUTER_MIN_MARGIN)
+    return _query_router
+
+def llm_route_query(user_message):
+    """Ask the LLM whether an inquire message needs a transcript search; returns its raw decision."""
+    router_prompt = f"""Analyze this user query to determine if it requires searching through transcription content or if it's a simple formatting/clarification request.
+
+User query: "{user_message}"
+
+Respond with ONLY "RAG" if the query requires searching transcriptions (asking about content, conversations, specific information from recordings).
+Respond with ONLY "DIRECT" if it's a formatting request, clarification about previous responses, or doesn't require searching transcriptions.
+
+Examples:
+- "What did Beth say about the budget?" → RAG
+- "Can you format this in separate headings?" → DIRECT  
+- "Who mentioned the timeline?" → RAG
+- "Make this more structured" → DIRECT"""
+
+    router_response = call_llm_completion(
+        messages=[
+            {"role": "system", "content": "You are a query router. Respond with only 'RAG' or 'DIRECT'."},
+            {"role": "user", "content": router_prompt}
+        ],
+        temperature=0.1,
+        max_tokens=10
+    )
+    return router_response.choices[0].message.content.strip().upper()
+
+def audit_local_route(user_message, decision, method):
+    """Compare a local routing decision with the LLM router's and record the agreement."""
     try:
-        # If embeddings are not available, fall back to basic text search
-        if not EMBEDDINGS_AVAILABLE:
-            app.logger.info("Embeddings not available - using basic text search as fallback")
-            return basic_text_search_chunks(user_id, query, filters, top_k)
-        
-        # Generate embedding for the query
-        model = get_embedding_model()
-        if not model:
-            return basic_text_search_chunks(user_id, query, filters, top_k)
-        
-        query_embedding = model.encode([query])[0]
-        
-        # Build base query for chunks with eager loading of recording relationship
-        chunks_query = TranscriptChunk.query.options(joinedload(TranscriptChunk.recording)).filter_by(user_id=user_id)
-        
-        # Apply filters if provided
-        if filters:
-            if filters.get('tag_ids'):
-                # Join with recordings that have specified tags
-                chunks_query = chunks_query.join(Recording).join(
-                    RecordingTag, Recording.id == RecordingTag.recording_id
-                ).filter(RecordingTag.tag_id.in_(filters['tag_ids']))
-            
-            if filters.get('speaker_names'):
-                # Filter by participants field in recordings instead of chunk speaker_name
-                if not any(hasattr(desc, 'name') and desc.name == 'recording' for desc in chunks_query.column_descriptions):
-                    chunks_query = chunks_query.join(Recording)
-                
-                # Build OR conditions for each speaker name in participants
-                speaker_conditions = []
-                for speaker_name in filters['speaker_names']:
-                    speaker_conditions.append(
-                        Recording.participants.ilike(f'%{speaker_name}%')
-                    )
-                
-                chunks_query = chunks_query.filter(db.or_(*speaker_conditions))
-                app.logger.info(f"Applied speaker filter for: {filters['speaker_names']}")
-            
-            if filters.get('recording_ids'):
-                chunks_query = chunks_query.filter(
-                    TranscriptChunk.recording_id.in_(filters['recording_ids'])
-                )
-            
-            if filters.get('date_from') or filters.get('date_to'):
-                chunks_query = chunks_query.join(Recording)
-                if filters.get('date_from'):
-                    chunks_query = chunks_query.filter(Recording.meeting_date >= filters['date_from'])
-                if filters.get('date_to'):
-                    chunks_query = chunks_query.filter(Recording.meeting_date <= filters['date_to'])
-        
-        # Get chunks that have embeddings
-        chunks = chunks_query.filter(TranscriptChunk.embedding.isnot(None)).all()
-        
-        if not chunks:
-            return []
-        
-        # Calculate similarities
-        chunk_similarities = []
-        for chunk in chunks:
-            try:
-                chunk_embedding = deserialize_embedding(chunk.embedding)
-                if chunk_embedding is not None:
-                    similarity = cosine_similarity(
-                        query_embedding.reshape(1, -1),
-                        chunk_embedding.reshape(1, -1)
-                    )[0][0]
-                    chunk_similarities.append((chunk, float(similarity)))
-            except Exception as e:
-                app.logger.warning(f"Error calculating similarity for chunk {chunk.id}: {e}")
-                continue
-        
-        # Sort by similarity and return top k
-        chunk_similarities.sort(key=lambda x: x[1], reverse=True)
-        return chunk_similarities[:top_k]
-        
+        llm_decision = DIRECT if llm_route_query(user_message) == DIRECT else RAG
     except Exception as e:
-        app.logger.error(f"Error in semantic search: {e}")
-        return []
+        app.logger.warning(f"Router audit failed: {e}")
+        return
+    router_stats.record_audit(llm_decision == decision)
+    if llm_decision != decision:
+        app.logger.info(f"Router audit: {method} router chose {decision}, LLM chose {llm_decision} for '{user_message}'")
+
+def record_route_decision(user_message, decision, method, confidence, started):
+    """Log and count a routing decision, occasionally auditing local decisions against the LLM router."""
+    latency_ms = (time.perf_counter() - started) * 1000
+    total = router_stats.record_decision(method, latency_ms)
+    app.logger.info(f"Router decision: {decision} ({method}, confidence {confidence:.3f}, {latency_ms:.1f} ms)")
+    if total % 100 == 0:
+        app.logger.info(f"Router stats: {router_stats.snapshot()}")
+    if method != 'llm' and random.random() < INQUIRE_ROUTER_AUDIT_RATE:
+        inquire_executor.submit(audit_local_route, user_message, decision, method)
+
+def route_query_locally(user_message, has_previous_answer=False):
+    """
+    Decide whether an inquire message needs a transcript search without an LLM call.
+    
+    Args:
+        user_message (str): The inquire message
+        has_previous_answer (bool): Whether the session already has an assistant answer to rework
+    
+    Returns:
+        str: 'RAG' or 'DIRECT', or None when the local router is disabled or
+        not confident enough and the LLM router should decide
+    """
+    if not INQUIRE_LOCAL_ROUTER:
+        return None
+    started = time.perf_counter()
+    try:
+        decision, confidence, method = get_query_router().route(user_message, has_previous_answer)
+    except Exception as e:
+        app.logger.warning(f"Local query router failed: {e}")
+        return None
+    if decision is not None:
+        record_route_decision(user_message, decision, method, confidence, started)
+    return decision
+
+def route_query_with_llm(user_message):
+    """Decide whether an inquire message needs a transcript search with the LLM router, defaulting to RAG."""
+    started = time.perf_counter()
+    try:
+        decision = DIRECT if llm_route_query(user_message) == DIRECT else RAG
+    except Exception as e:
+        app.logger.warning(f"Router failed, defaulting to RAG: {e}")
+        decision = RAG
+    record_route_decision(user_message, decision, 'llm', 0.0, started)
+    return decision
+
+def run_with_app_context(function, *args, **kwargs):
+    """Call function inside an application context, for work submitted to a thread pool."""
+    with app.app_context():
+        return function(*args, **kwargs)
 
 # --- Helper Functions for Document Processing ---
 
@@ -1279,25 +2480,8 @@ class SystemSetting(db.Model):
     
     @staticmethod
     def get_setting(key, default_value=None):
-        """Get a system setting value by key, with optional default."""
-        setting = SystemSetting.query.filter_by(key=key).first()
-        if setting:
-            # Convert value based on type
-            if setting.setting_type == 'integer':
-                try:
-                    return int(setting.value) if setting.value is not None else default_value
-                except (ValueError, TypeError):
-                    return default_value
-            elif setting.setting_type == 'boolean':
-                return setting.value.lower() in ('true', '1', 'yes') if setting.value else default_value
-            elif setting.setting_type == 'float':
-                try:
-                    return float(setting.value) if setting.value is not None else default_value
-                except (ValueError, TypeError):
-                    return default_value
-            else:  # string
-                return setting.value if setting.value is not None else default_value
-        return default_value
+        """Get a system setting value by key, with optional default (served from the settings cache)."""
+        return settings_cache.get(key, default_value)
     
     @staticmethod
     def set_setting(key, value, description=None, setting_type='string'):
@@ -1318,9 +2502,59 @@ class SystemSetting(db.Model):
                 setting_type=setting_type
             )
             db.session.add(setting)
+        # Bump the version in the same transaction so every worker reloads its cache
+        db.session.execute(update(SettingsVersion).where(SettingsVersion.id == 1)
+                           .values(version=SettingsVersion.version + 1))
         db.session.commit()
+        settings_cache.invalidate()
         return setting
 
+class InquireBackfillJob(db.Model):
+    """
+    Single-row state of the Inquire Mode backfill, shared by all worker processes.
+    
+    owner is the lease token of the running job (None when idle); the job renews
+    lease_until after every batch and writes its progress in the same update.
+    """
+    __tablename__ = 'inquire_backfill_job'
+    id = db.Column(db.Integer, primary_key=True)
+    owner = db.Column(db.String(32), nullable=True)
+    lease_until = db.Column(db.DateTime, nullable=True)
+    stop_requested = db.Column(db.Boolean, nullable=False, default=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    chunks = db.Column(db.Integer, nullable=False, default=0)
+    profiles = db.Column(db.Integer, nullable=False, default=0)
+    checkpoint = db.Column(db.Integer, nullable=False, default=0)  # Last recording id walked; 0 starts over
+    failed = db.Column(db.Text, nullable=True)  # JSON list of {id, title, reason}, at most 100
+    error = db.Column(db.Text, nullable=True)
+
+class SettingsVersion(db.Model):
+    """Single-row counter incremented on every settings change; workers compare it to detect stale caches."""
+    __tablename__ = 'settings_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+def load_settings_version():
+    """Stored settings version (a column query, so it is never answered from the session identity map)."""
+    return db.session.execute(select(SettingsVersion.version).where(SettingsVersion.id == 1)).scalar()
+
+def load_system_settings():
+    """All settings as (key, value, setting_type) rows."""
+    return db.session.execute(select(SystemSetting.key, SystemSetting.value, SystemSetting.setting_type)).all()
+
+def apply_system_settings(cache):
+    """Apply settings that live in the app config, so admin changes take effect without a restart."""
+    max_file_size_mb = cache.get('max_file_size_mb', 250)
+    if app.config.get('MAX_CONTENT_LENGTH') != max_file_size_mb * 1024 * 1024:
+        app.config['MAX_CONTENT_LENGTH'] = max_file_size_mb * 1024 * 1024
+        app.logger.info(f"Set MAX_CONTENT_LENGTH to {max_file_size_mb}MB from database setting")
+
+settings_cache = SettingsCache(load_settings_version, load_system_settings,
+                               check_interval=SETTINGS_CACHE_CHECK_SECONDS, on_reload=apply_system_settings)
+
 # Many-to-many relationship table for recordings and tags
 class RecordingTag(db.Model):
     __tablename__ = 'recording_tags'
@@ -1356,7 +2590,10 @@ class Tag(db.Model):
     # Unique constraint: tag name must be unique per user
     __table_args__ = (db.UniqueConstraint('name', 'user_id', name='_user_tag_uc'),)
     
-    def to_dict(self):
+    def to_dict(self, recording_count=None):
+        """Serialize the tag; recording_count comes from tag_recording_counts() (use serialize_tags() for several tags)."""
+        if recording_count is None:
+            recording_count = tag_recording_counts([self.id]).get(self.id, 0)
         return {
             'id': self.id,
             'name': self.name,
@@ -1366,9 +2603,25 @@ class Tag(db.Model):
             'default_min_speakers': self.default_min_speakers,
             'default_max_speakers': self.default_max_speakers,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'recording_count': len(self.recording_associations)
+            'recording_count': recording_count
         }
 
+def tag_recording_counts(tag_ids):
+    """Number of recordings per tag id, counted in one grouped query without loading the associations."""
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return {}
+    return dict(db.session.execute(
+        select(RecordingTag.tag_id, db.func.count())
+        .where(RecordingTag.tag_id.in_(tag_ids))
+        .group_by(RecordingTag.tag_id)
+    ).all())
+
+def serialize_tags(tags):
+    """Serialize tags with their recording counts from a single query."""
+    counts = tag_recording_counts(tag.id for tag in tags)
+    return [tag.to_dict(counts.get(tag.id, 0)) for tag in tags]
+
 class Event(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     recording_id = db.Column(db.Integer, db.ForeignKey('recording.id'), nullable=False)
@@ -1431,7 +2684,7 @@ class Recording(db.Model):
     notes = db.Column(db.Text)
     transcription = db.Column(db.Text, nullable=True)
     summary = db.Column(db.Text, nullable=True) # <-- ADDED: Summary field
-    status = db.Column(db.String(50), default='PENDING') # PENDING, PROCESSING, SUMMARIZING, COMPLETED, FAILED
+    status = db.Column(db.String(50), default='PENDING') # PENDING, CONVERTING, PROCESSING, SUMMARIZING, COMPLETED, FAILED
     audio_path = db.Column(db.String(500))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     meeting_date = db.Column(db.Date, nullable=True) # <-- ADDED: Meeting Date field
@@ -1444,6 +2697,10 @@ class Recording(db.Model):
     processing_time_seconds = db.Column(db.Integer, nullable=True)
     processing_source = db.Column(db.String(50), default='upload')  # upload, auto_process, recording
     error_message = db.Column(db.Text, nullable=True)  # Store detailed error messages
+    # LLM-ready plain text of the transcription, re-rendered whenever the transcription is set
+    formatted_transcription = db.deferred(db.Column(db.Text, nullable=True))
+    formatted_transcription_chars = db.Column(db.Integer, nullable=True)
+    formatted_transcription_tokens = db.Column(db.Integer, nullable=True)  # Approximate LLM tokens
     
     # Relationships
     tag_associations = db.relationship('RecordingTag', back_populates='recording', cascade='all, delete-orphan', order_by='RecordingTag.order')
@@ -1474,10 +2731,35 @@ class Recording(db.Model):
             'is_inbox': self.is_inbox,
             'is_highlighted': self.is_highlighted,
             'mime_type': self.mime_type,
-            'tags': [tag.to_dict() for tag in self.tags] if self.tags else [],
+            'tags': serialize_tags(self.tags) if self.tags else [],
             'events': [event.to_dict() for event in self.events] if self.events else []
         }
 
+
+
+def set_formatted_transcription(recording, transcription):
+    """Store the LLM-ready rendering of transcription and its length on the recording."""
+    formatted = format_transcription_for_llm(transcription) if transcription else None
+    recording.formatted_transcription = formatted
+    recording.formatted_transcription_chars = len(formatted) if formatted is not None else None
+    recording.formatted_transcription_tokens = estimate_tokens(formatted) if formatted is not None else None
+
+@sa_event.listens_for(Recording.transcription, 'set')
+def _sync_formatted_transcription(target, value, oldvalue, initiator):
+    """Keep the stored rendering in step with every change of the transcription."""
+    set_formatted_transcription(target, value)
+
+def get_formatted_transcription(recording):
+    """
+    LLM-ready text of a recording's transcription without re-parsing its JSON.
+    
+    Recordings stored before the rendering was kept are rendered here and
+    persisted with the caller's next commit.
+    """
+    if recording.formatted_transcription is None and recording.transcription:
+        set_formatted_transcription(recording, recording.transcription)
+    return recording.formatted_transcription
+
 class TranscriptChunk(db.Model):
     """Stores chunked transcription segments for efficient retrieval and embedding."""
     id = db.Column(db.Integer, primary_key=True)
@@ -1489,12 +2771,17 @@ class TranscriptChunk(db.Model):
     end_time = db.Column(db.Float, nullable=True)  # End time in seconds (if available)
     speaker_name = db.Column(db.String(100), nullable=True)  # Speaker for this chunk
     embedding = db.Column(db.LargeBinary, nullable=True)  # Stored as binary vector
+    embedding_dtype = db.Column(db.String(10), nullable=True)  # float32 (NULL for legacy rows), float16 or int8
+    content_hash = db.Column(db.String(64), nullable=True)  # sha256 of content, for reusing embeddings on re-chunk
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     recording = db.relationship('Recording', backref=db.backref('chunks', lazy=True, cascade='all, delete-orphan'))
     user = db.relationship('User', backref=db.backref('transcript_chunks', lazy=True, cascade='all, delete-orphan'))
     
+    # Covering index for the per-search index version check (see get_chunk_index_version)
+    __table_args__ = (db.Index('ix_transcript_chunk_user_created', 'user_id', 'created_at', 'id'),)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -1507,6 +2794,34 @@ class TranscriptChunk(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class RecordingParticipant(db.Model):
+    """Normalized index of Recording.participants: one row per named participant."""
+    id = db.Column(db.Integer, primary_key=True)
+    recording_id = db.Column(db.Integer, db.ForeignKey('recording.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    
+    # Relationships
+    recording = db.relationship('Recording', backref=db.backref('participant_entries', lazy=True, cascade='all, delete-orphan'))
+    
+    # Speaker filters are equality joins on (user_id, name)
+    __table_args__ = (
+        db.UniqueConstraint('recording_id', 'name', name='uq_recording_participant'),
+        db.Index('ix_recording_participant_user_name', 'user_id', 'name'),
+    )
+
+class RecordingEmbedding(db.Model):
+    """Recording-level profile embedding (title, participants, summary) for coarse retrieval."""
+    recording_id = db.Column(db.Integer, db.ForeignKey('recording.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    embedding = db.Column(db.LargeBinary, nullable=False)
+    embedding_dtype = db.Column(db.String(10), nullable=True)  # float32, float16 or int8
+    content_hash = db.Column(db.String(64), nullable=True)  # sha256 of the profile text
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    recording = db.relationship('Recording', backref=db.backref('profile_embedding', uselist=False, cascade='all, delete-orphan'))
+
 class TranscriptTemplate(db.Model):
     """Stores user-defined templates for transcript formatting."""
     id = db.Column(db.Integer, primary_key=True)
@@ -1545,6 +2860,10 @@ class InquireSession(db.Model):
     filter_date_to = db.Column(db.Date, nullable=True)
     filter_recording_ids = db.Column(db.Text, nullable=True)  # JSON array of specific recording IDs
     
+    # Conversation held on the server: recent messages verbatim, older ones summarized
+    chat_history = db.Column(db.Text, nullable=True)  # JSON array of {role, content}
+    history_summary = db.Column(db.Text, nullable=True)
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_used = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -1564,6 +2883,108 @@ class InquireSession(db.Model):
             'last_used': self.last_used.isoformat() if self.last_used else None
         }
 
+class RecordingChatSession(db.Model):
+    """Server-held conversation about a single recording (the /chat endpoint)."""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    recording_id = db.Column(db.Integer, db.ForeignKey('recording.id'), nullable=False, index=True)
+    chat_history = db.Column(db.Text, nullable=True)  # JSON array of {role, content}
+    history_summary = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = db.relationship('User', backref=db.backref('recording_chat_sessions', lazy=True, cascade='all, delete-orphan'))
+    recording = db.relationship('Recording', backref=db.backref('chat_sessions', lazy=True, cascade='all, delete-orphan'))
+
+class RecordingChange(db.Model):
+    """Change log behind the sync feed; the id is the client's cursor."""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)  # no foreign key: tombstones outlive their entities
+    entity_type = db.Column(db.String(20), nullable=False)  # recording, tag, share or event
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)  # upsert or delete
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    # AUTOINCREMENT keeps SQLite from reusing ids after pruning, which would move cursors backwards
+    __table_args__ = (db.Index('ix_recording_change_user_cursor', 'user_id', 'id'), {'sqlite_autoincrement': True})
+
+class UploadSession(db.Model):
+    """A resumable upload: the byte ranges received so far and the options for the recording it becomes."""
+    id = db.Column(db.String(32), primary_key=True, default=lambda: secrets.token_urlsafe(16))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    idempotency_key = db.Column(db.String(100), nullable=True)
+    original_filename = db.Column(db.String(500), nullable=False)
+    file_path = db.Column(db.String(500), nullable=False)  # final path; ranges go to file_path + '.part'
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received_bytes = db.Column(db.BigInteger, nullable=False, default=0)
+    options = db.Column(db.Text, nullable=True)  # JSON of the upload form fields (notes, tag_ids[n], language, ...)
+    status = db.Column(db.String(20), nullable=False, default='uploading')  # uploading, completing, completed
+    sha256 = db.Column(db.String(64), nullable=True)
+    recording_id = db.Column(db.Integer, nullable=True)
+    # Live uploads grow while the recording is in progress; total_size follows received_bytes
+    live = db.Column(db.Boolean, nullable=False, default=False)
+    transcribed_seconds = db.Column(db.Float, nullable=False, default=0)  # audio covered by live_chunks
+    live_chunks = db.Column(db.Text, nullable=True)  # JSON list of chunk results transcribed during the upload
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    __table_args__ = (db.UniqueConstraint('user_id', 'idempotency_key', name='_user_upload_key_uc'),)
+    
+    @property
+    def part_path(self):
+        return f"{self.file_path}.part"
+    
+    def to_dict(self):
+        return {
+            'upload_id': self.id,
+            'filename': self.original_filename,
+            'size': self.total_size,
+            'offset': self.received_bytes,
+            'status': self.status,
+            'chunk_size': RESUMABLE_UPLOAD_CHUNK_MB * 1024 * 1024,
+            'sha256': self.sha256,
+            'recording_id': self.recording_id,
+            'live': self.live,
+            'transcribed_seconds': self.transcribed_seconds
+        }
+
+def flushed_recording_owner(session, recording_id):
+    """Owner of a recording during a flush (relationships of pending objects are not loaded yet)."""
+    recording = session.identity_map.get(Session.identity_key(Recording, recording_id))
+    if recording is not None:
+        return recording.user_id
+    return session.connection().execute(select(Recording.user_id).where(Recording.id == recording_id)).scalar()
+
+def change_feed_entries(session, obj, action):
+    """Change log entries (user_id, entity_type, entity_id, action) for one flushed object."""
+    if isinstance(obj, Recording):
+        return [(obj.user_id, 'recording', obj.id, action)]
+    if isinstance(obj, Tag):
+        return [(obj.user_id, 'tag', obj.id, action)]
+    if isinstance(obj, Share):
+        return [(obj.user_id, 'share', obj.id, action)]
+    if isinstance(obj, Event):
+        return [(flushed_recording_owner(session, obj.recording_id), 'event', obj.id, action)]
+    if isinstance(obj, RecordingTag):
+        # Tagging changes the recording's tag list and the tag's recording count
+        user_id = flushed_recording_owner(session, obj.recording_id)
+        return [(user_id, 'recording', obj.recording_id, UPSERT), (user_id, 'tag', obj.tag_id, UPSERT)]
+    return []
+
+@sa_event.listens_for(Session, 'after_flush')
+def record_feed_changes(session, flush_context):
+    """Append the flushed inserts, updates and deletes of synced entities to the change log."""
+    changed = [(obj, UPSERT) for obj in session.new]
+    changed += [(obj, UPSERT) for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    changed += [(obj, DELETE) for obj in session.deleted]
+    entries = [entry for obj, action in changed for entry in change_feed_entries(session, obj, action)]
+    rows = [{'user_id': user_id, 'entity_type': entity_type, 'entity_id': entity_id, 'action': action,
+             'created_at': datetime.utcnow()}
+            for user_id, entity_type, entity_id, action in entries if user_id is not None and entity_id is not None]
+    if rows:
+        session.connection().execute(RecordingChange.__table__.insert(), rows)
+
 # --- Forms for Authentication ---
 # --- Custom Password Validator ---
 def password_check(form, field):
@@ -1757,7 +3178,7 @@ def get_system_info():
 def get_tags():
     """Get all tags for the current user."""
     tags = Tag.query.filter_by(user_id=current_user.id).order_by(Tag.name).all()
-    return jsonify([tag.to_dict() for tag in tags])
+    return jsonify(serialize_tags(tags))
 
 @app.route('/api/tags', methods=['POST'])
 @login_required
@@ -1786,7 +3207,7 @@ def create_tag():
     db.session.add(tag)
     db.session.commit()
     
-    return jsonify(tag.to_dict()), 201
+    return jsonify(tag.to_dict(recording_count=0)), 201
 
 @app.route('/api/tags/<int:tag_id>', methods=['PUT'])
 @login_required
@@ -1856,7 +3277,7 @@ def add_tag_to_recording(recording_id):
         db.session.add(new_association)
         db.session.commit()
     
-    return jsonify({'success': True, 'tags': [t.to_dict() for t in recording.tags]})
+    return jsonify({'success': True, 'tags': serialize_tags(recording.tags)})
 
 @app.route('/api/recordings/<int:recording_id>/tags/<int:tag_id>', methods=['DELETE'])
 @login_required
@@ -1871,7 +3292,7 @@ def remove_tag_from_recording(recording_id, tag_id):
         db.session.delete(association)
         db.session.commit()
     
-    return jsonify({'success': True, 'tags': [t.to_dict() for t in recording.tags]})
+    return jsonify({'success': True, 'tags': serialize_tags(recording.tags)})
 
 class RegistrationForm(FlaskForm):
     username = StringField('Username', validators=[DataRequired(), Length(min=2, max=20)])
@@ -1962,6 +3383,26 @@ with app.app_context():
             app.logger.info("Added processing_source column to recording table")
         if add_column_if_not_exists(engine, 'recording', 'error_message', 'TEXT'):
             app.logger.info("Added error_message column to recording table")
+        if add_column_if_not_exists(engine, 'transcript_chunk', 'embedding_dtype', 'VARCHAR(10)'):
+            app.logger.info("Added embedding_dtype column to transcript_chunk table")
+        if add_column_if_not_exists(engine, 'transcript_chunk', 'content_hash', 'VARCHAR(64)'):
+            app.logger.info("Added content_hash column to transcript_chunk table")
+        if add_column_if_not_exists(engine, 'recording', 'formatted_transcription', 'TEXT'):
+            app.logger.info("Added formatted_transcription column to recording table")
+        if add_column_if_not_exists(engine, 'recording', 'formatted_transcription_chars', 'INTEGER'):
+            app.logger.info("Added formatted_transcription_chars column to recording table")
+        if add_column_if_not_exists(engine, 'recording', 'formatted_transcription_tokens', 'INTEGER'):
+            app.logger.info("Added formatted_transcription_tokens column to recording table")
+        if add_column_if_not_exists(engine, 'upload_session', 'live', 'BOOLEAN DEFAULT 0'):
+            app.logger.info("Added live column to upload_session table")
+        if add_column_if_not_exists(engine, 'upload_session', 'transcribed_seconds', 'FLOAT DEFAULT 0'):
+            app.logger.info("Added transcribed_seconds column to upload_session table")
+        if add_column_if_not_exists(engine, 'upload_session', 'live_chunks', 'TEXT'):
+            app.logger.info("Added live_chunks column to upload_session table")
+        if add_column_if_not_exists(engine, 'inquire_session', 'chat_history', 'TEXT'):
+            app.logger.info("Added chat_history column to inquire_session table")
+        if add_column_if_not_exists(engine, 'inquire_session', 'history_summary', 'TEXT'):
+            app.logger.info("Added history_summary column to inquire_session table")
             
         # Add columns to recording_tags for order tracking
         if add_column_if_not_exists(engine, 'recording_tags', 'added_at', 'DATETIME'):
@@ -1993,6 +3434,112 @@ with app.app_context():
             except Exception as e:
                 app.logger.warning(f"Could not update existing tag order values: {e}")
         
+        # Index used by the semantic search version check on every inquire query
+        try:
+            from sqlalchemy import text
+            with engine.connect() as conn:
+                conn.execute(text(
+                    'CREATE INDEX IF NOT EXISTS ix_transcript_chunk_user_created '
+                    'ON transcript_chunk (user_id, created_at, id)'
+                ))
+                conn.commit()
+        except Exception as e:
+            app.logger.warning(f"Could not create transcript_chunk index: {e}")
+        
+        # Full-text index for keyword and hybrid chunk search
+        CHUNK_FTS_AVAILABLE = ensure_chunk_fts(engine)
+        
+        # Populate the participant index for recordings that predate it
+        try:
+            if RecordingParticipant.query.first() is None:
+                unindexed = Recording.query.filter(
+                    Recording.user_id.isnot(None),
+                    Recording.participants.isnot(None),
+                    Recording.participants != ''
+                ).all()
+                for recording in unindexed:
+                    sync_recording_participants(recording)
+                db.session.commit()
+                if unindexed:
+                    app.logger.info(f"Indexed participants for {len(unindexed)} existing recordings")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not index existing recording participants: {e}")
+        
+        # Render the LLM text of recordings transcribed before it was stored
+        try:
+            rendered = 0
+            last_id = 0
+            while True:
+                # Keyset pagination keeps each batch small on large installs
+                batch = Recording.query.filter(
+                    Recording.id > last_id,
+                    Recording.formatted_transcription_chars.is_(None),
+                    Recording.transcription.isnot(None),
+                    # Empty transcriptions render to nothing and would be rescanned on every start
+                    Recording.transcription != ''
+                ).order_by(Recording.id).limit(100).all()
+                if not batch:
+                    break
+                for recording in batch:
+                    set_formatted_transcription(recording, recording.transcription)
+                db.session.commit()
+                rendered += len(batch)
+                last_id = batch[-1].id
+            if rendered:
+                app.logger.info(f"Stored formatted transcriptions for {rendered} existing recordings")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not store formatted transcriptions: {e}")
+        
+        # Settings cache version counter
+        if db.session.get(SettingsVersion, 1) is None:
+            try:
+                db.session.add(SettingsVersion(id=1, version=0))
+                db.session.commit()
+            except IntegrityError:
+                # Another worker created it first
+                db.session.rollback()
+        
+        # Shared state row of the Inquire Mode backfill job
+        if db.session.get(InquireBackfillJob, 1) is None:
+            try:
+                db.session.add(InquireBackfillJob(id=1))
+                db.session.commit()
+            except IntegrityError:
+                # Another worker created it first
+                db.session.rollback()
+        
+        # Prune the sync change feed
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=CHANGE_FEED_RETENTION_DAYS)
+            pruned_through = db.session.execute(
+                select(db.func.max(RecordingChange.id)).where(RecordingChange.created_at < cutoff)
+            ).scalar()
+            if pruned_through:
+                RecordingChange.query.filter(RecordingChange.id <= pruned_through).delete()
+                SystemSetting.set_setting(CHANGE_FEED_PRUNED_KEY, pruned_through,
+                                          'Highest change feed cursor removed by retention pruning', 'integer')
+                app.logger.info(f"Pruned change feed entries up to cursor {pruned_through}")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not prune change feed: {e}")
+        
+        # Discard abandoned resumable uploads and expired idempotency keys
+        try:
+            cutoff = datetime.utcnow() - timedelta(hours=RESUMABLE_UPLOAD_TTL_HOURS)
+            expired = UploadSession.query.filter(UploadSession.updated_at < cutoff).all()
+            for upload in expired:
+                if upload.status != 'completed' and os.path.exists(upload.part_path):
+                    os.remove(upload.part_path)
+                db.session.delete(upload)
+            db.session.commit()
+            if expired:
+                app.logger.info(f"Discarded {len(expired)} expired upload sessions")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not clean up upload sessions: {e}")
+        
         # Initialize default system settings
         if not SystemSetting.query.filter_by(key='transcript_length_limit').first():
             SystemSetting.set_setting(
@@ -2043,63 +3590,17 @@ with app.app_context():
             )
             app.logger.info("Initialized recording_disclaimer setting")
         
-        # Process existing recordings for inquire mode (chunk and embed them)
-        # Only run if inquire mode is enabled
+        # Chunk and embed existing recordings for inquire mode in the background backfill job
         if ENABLE_INQUIRE_MODE:
-            # Use a file lock to prevent multiple workers from running this simultaneously
-            import fcntl
-            import tempfile
-            lock_file_path = os.path.join(tempfile.gettempdir(), 'inquire_migration.lock')
-            
             try:
-                with open(lock_file_path, 'w') as lock_file:
-                    # Try to acquire exclusive lock (non-blocking)
-                    try:
-                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                        app.logger.info("Acquired migration lock, checking for existing recordings that need chunking for inquire mode...")
-                        
-                        completed_recordings = Recording.query.filter_by(status='COMPLETED').all()
-                        recordings_needing_processing = []
-                        
-                        for recording in completed_recordings:
-                            if recording.transcription:  # Has transcription
-                                chunk_count = TranscriptChunk.query.filter_by(recording_id=recording.id).count()
-                                if chunk_count == 0:  # No chunks yet
-                                    recordings_needing_processing.append(recording)
-                        
-                        if recordings_needing_processing:
-                            app.logger.info(f"Found {len(recordings_needing_processing)} recordings that need chunking for inquire mode")
-                            app.logger.info("Processing first 10 recordings automatically. Use admin API or migration script for remaining recordings.")
-                            
-                            # Process first 10 recordings automatically to avoid long startup times
-                            batch_size = min(10, len(recordings_needing_processing))
-                            processed = 0
-                            
-                            for i in range(batch_size):
-                                recording = recordings_needing_processing[i]
-                                try:
-                                    success = process_recording_chunks(recording.id)
-                                    if success:
-                                        processed += 1
-                                        app.logger.info(f"Processed chunks for recording: {recording.title} ({recording.id})")
-                                except Exception as e:
-                                    app.logger.warning(f"Failed to process chunks for recording {recording.id}: {e}")
-                            
-                            remaining = len(recordings_needing_processing) - processed
-                            if remaining > 0:
-                                app.logger.info(f"Successfully processed {processed} recordings. {remaining} recordings remaining.")
-                                app.logger.info("Use the admin migration API or run 'python migrate_existing_recordings.py' to process remaining recordings.")
-                            else:
-                                app.logger.info(f"Successfully processed all {processed} recordings for inquire mode.")
-                        else:
-                            app.logger.info("All existing recordings are already processed for inquire mode.")
-                        
-                    except BlockingIOError:
-                        app.logger.info("Migration already running in another worker, skipping...")
-                    
+                if recordings_needing_chunks_query().first() is not None:
+                    if start_inquire_backfill():
+                        app.logger.info("Started inquire backfill for existing recordings without chunks")
+                    else:
+                        app.logger.info("Inquire backfill already running in another worker, skipping...")
             except Exception as e:
-                app.logger.warning(f"Error during existing recordings migration: {e}")
-                app.logger.info("Existing recordings can be migrated later using the admin API or migration script.")
+                db.session.rollback()
+                app.logger.warning(f"Could not start inquire backfill for existing recordings: {e}")
             
     except Exception as e:
         app.logger.error(f"Error during database migration: {e}")
@@ -2320,13 +3821,11 @@ def generate_title_task(app_context, recording_id):
         
         # Get configurable transcript length limit and format transcription for LLM
         transcript_limit = SystemSetting.get_setting('transcript_length_limit', 30000)
-        if transcript_limit == -1:
-            raw_transcription = recording.transcription
-        else:
-            raw_transcription = recording.transcription[:transcript_limit]
-            
-        # Convert ASR JSON to clean text format
-        transcript_text = format_transcription_for_llm(raw_transcription)
+        
+        # ASR JSON as clean text, truncated after formatting so the JSON is never cut mid-segment
+        transcript_text = get_formatted_transcription(recording)
+        if transcript_limit != -1:
+            transcript_text = transcript_text[:transcript_limit]
         
         
         # Get user language preference
@@ -2401,7 +3900,7 @@ Title:"""
         # Process chunks for semantic search after completion (if inquire mode is enabled)
         if ENABLE_INQUIRE_MODE:
             try:
-                process_recording_chunks(recording_id)
+                refresh_recording_chunks(recording_id)
             except Exception as e:
                 app.logger.error(f"Error processing chunks for completed recording {recording_id}: {e}")
 
@@ -2474,7 +3973,7 @@ def generate_summary_only_task(app_context, recording_id):
             user_output_language = recording.owner.output_language
         
         # Format transcription for LLM (convert JSON to clean text format like clipboard copy)
-        formatted_transcription = format_transcription_for_llm(recording.transcription)
+        formatted_transcription = get_formatted_transcription(recording)
         
         # Get configurable transcript length limit
         transcript_limit = SystemSetting.get_setting('transcript_length_limit', 30000)
@@ -2577,6 +4076,8 @@ Summarization Instructions:
                 recording.summary = summary
                 db.session.commit()
                 app.logger.info(f"Summary generated successfully for recording {recording_id}")
+                # The summary feeds the recording's profile embedding
+                schedule_chunk_refresh(recording_id)
 
                 # Extract events if enabled for this user BEFORE marking as completed
                 if recording.owner and recording.owner.extract_events:
@@ -3150,7 +4651,7 @@ def transcribe_audio_asr(app_context, recording_id, filepath, original_filename,
                 recording.transcription = user_error_msg
                 db.session.commit()
 
-def transcribe_audio_task(app_context, recording_id, filepath, filename_for_asr, start_time, language=None, min_speakers=None, max_speakers=None, tag_id=None):
+def transcribe_audio_task(app_context, recording_id, filepath, filename_for_asr, start_time, language=None, min_speakers=None, max_speakers=None, tag_id=None, live_upload_id=None):
     """Runs the transcription and summarization in a background thread.
     
     Args:
@@ -3163,6 +4664,7 @@ def transcribe_audio_task(app_context, recording_id, filepath, filename_for_asr,
         min_speakers: Optional minimum speakers override (from upload form)
         max_speakers: Optional maximum speakers override (from upload form)
         tag_id: Optional tag ID to apply custom prompt from
+        live_upload_id: Optional live upload the file came from, whose segments were transcribed during the upload
     """
     if USE_ASR_ENDPOINT:
         with app_context:
@@ -3214,12 +4716,18 @@ def transcribe_audio_task(app_context, recording_id, filepath, filename_for_asr,
             recording.status = 'PROCESSING'
             db.session.commit()
 
+            # Most of a live upload was transcribed while it was being recorded
+            transcription_text = finish_live_transcription(live_upload_id, filepath) if live_upload_id else None
+            
             # Check if chunking is needed for large files
-            needs_chunking = (chunking_service and 
+            needs_chunking = (transcription_text is None and
+                            chunking_service and 
                             ENABLE_CHUNKING and 
                             chunking_service.needs_chunking(filepath, USE_ASR_ENDPOINT))
             
-            if needs_chunking:
+            if transcription_text is not None:
+                app.logger.info(f"Using the segments of live upload {live_upload_id} for recording {recording_id}")
+            elif needs_chunking:
                 app.logger.info(f"File {filepath} is large ({os.path.getsize(filepath)/1024/1024:.1f}MB), using chunking for transcription")
                 transcription_text = transcribe_with_chunking(app_context, recording_id, filepath, filename_for_asr)
             else:
@@ -3381,6 +4889,154 @@ def transcribe_single_file(filepath, recording):
             # Re-raise if it's not a format error
             raise
 
+def chunk_transcription_client():
+    """OpenAI client for transcribing chunks, with timeouts sized for large audio files."""
+    # Create HTTP client with proper timeouts
+    timeout_config = httpx.Timeout(
+        connect=30.0,    # 30 seconds to establish connection
+        read=300.0,      # 5 minutes to read response (for large audio files)
+        write=60.0,      # 1 minute to write request
+        pool=10.0        # 10 seconds to get connection from pool
+    )
+    
+    http_client_with_timeout = httpx.Client(
+        verify=True,
+        timeout=timeout_config,
+        limits=httpx.Limits(max_connections=5, max_keepalive_connections=2)
+    )
+    
+    return OpenAI(
+        api_key=transcription_api_key,
+        base_url=transcription_base_url,
+        http_client=http_client_with_timeout,
+        max_retries=3,  # Increased retries for better reliability
+        timeout=300.0   # 5 minute timeout for API calls
+    )
+
+def transcribe_chunk(transcription_client, whisper_model, chunk, i, total, language=None):
+    """
+    Transcribe one chunk, retrying failed attempts with a delay.
+    
+    Returns:
+        Chunk result with the chunk's timing and its transcription; after the
+        last failed attempt the transcription is a failure marker instead
+    """
+    max_chunk_retries = 3
+    chunk_retry_count = 0
+    chunk_success = False
+    
+    while chunk_retry_count < max_chunk_retries and not chunk_success:
+        try:
+            retry_suffix = f" (retry {chunk_retry_count + 1}/{max_chunk_retries})" if chunk_retry_count > 0 else ""
+            app.logger.info(f"Processing chunk {i+1}/{total}: {chunk['filename']} ({chunk['size_mb']:.1f}MB){retry_suffix}")
+            
+            # Log detailed timing for each step
+            step_start_time = time.time()
+            
+            # Step 1: File opening
+            file_open_start = time.time()
+            with open(chunk['path'], 'rb') as chunk_file:
+                file_open_time = time.time() - file_open_start
+                app.logger.info(f"Chunk {i+1}: File opened in {file_open_time:.2f}s")
+                
+                # Step 2: Prepare transcription parameters
+                param_start = time.time()
+                transcription_params = {
+                    "model": whisper_model,
+                    "file": chunk_file
+                }
+                
+                if language:
+                    transcription_params["language"] = language
+                
+                param_time = time.time() - param_start
+                app.logger.info(f"Chunk {i+1}: Parameters prepared in {param_time:.2f}s")
+                
+                # Step 3: API call with detailed timing
+                api_start = time.time()
+                app.logger.info(f"Chunk {i+1}: Starting API call to {transcription_base_url}")
+                
+                # Log connection details
+                app.logger.info(f"Chunk {i+1}: Using timeout config - connect: 30s, read: 300s, write: 60s")
+                app.logger.info(f"Chunk {i+1}: Max retries: 2, API timeout: 300s")
+                
+                try:
+                    transcript = transcription_client.audio.transcriptions.create(**transcription_params)
+                except Exception as chunk_error:
+                    # Check if it's a format error (unlikely for chunks since they're MP3, but handle it)
+                    error_msg = str(chunk_error)
+                    if "Invalid file format" in error_msg or "Supported formats" in error_msg:
+                        app.logger.warning(f"Chunk {i+1} format issue, attempting conversion...")
+                        # Convert chunk to MP3 if needed
+                        import tempfile
+                        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_mp3:
+                            temp_mp3_path = temp_mp3.name
+                        try:
+                            subprocess.run(
+                                ['ffmpeg', '-i', chunk['path'], '-y', '-acodec', 'libmp3lame', '-b:a', '128k', '-ar', '44100', temp_mp3_path],
+                                check=True,
+                                capture_output=True
+                            )
+                            with open(temp_mp3_path, 'rb') as converted_chunk:
+                                transcription_params['file'] = converted_chunk
+                                transcript = transcription_client.audio.transcriptions.create(**transcription_params)
+                        finally:
+                            if os.path.exists(temp_mp3_path):
+                                os.unlink(temp_mp3_path)
+                    else:
+                        raise
+                
+                api_time = time.time() - api_start
+                app.logger.info(f"Chunk {i+1}: API call completed in {api_time:.2f}s")
+                
+                # Step 4: Process response
+                response_start = time.time()
+                chunk_result = {
+                    'index': chunk['index'],
+                    'start_time': chunk['start_time'],
+                    'end_time': chunk['end_time'],
+                    'duration': chunk['duration'],
+                    'size_mb': chunk['size_mb'],
+                    'transcription': transcript.text,
+                    'filename': chunk['filename'],
+                    'processing_time': api_time  # Store the actual API processing time
+                }
+                response_time = time.time() - response_start
+                
+                total_time = time.time() - step_start_time
+                app.logger.info(f"Chunk {i+1}: Response processed in {response_time:.2f}s")
+                app.logger.info(f"Chunk {i+1}: Total processing time: {total_time:.2f}s")
+                app.logger.info(f"Chunk {i+1} transcribed successfully: {len(transcript.text)} characters")
+                chunk_success = True
+        
+        except Exception as chunk_error:
+            chunk_retry_count += 1
+            error_msg = str(chunk_error)
+            
+            if chunk_retry_count < max_chunk_retries:
+                # Determine wait time based on error type
+                if "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
+                    wait_time = 30  # 30 seconds for timeout errors
+                elif "rate limit" in error_msg.lower():
+                    wait_time = 60  # 1 minute for rate limit errors
+                else:
+                    wait_time = 15  # 15 seconds for other errors
+                
+                app.logger.warning(f"Chunk {i+1} failed (attempt {chunk_retry_count}/{max_chunk_retries}): {chunk_error}. Retrying in {wait_time} seconds...")
+                time.sleep(wait_time)
+            else:
+                app.logger.error(f"Chunk {i+1} failed after {max_chunk_retries} attempts: {chunk_error}")
+                # Add failed chunk to results
+                chunk_result = {
+                    'index': chunk['index'],
+                    'start_time': chunk['start_time'],
+                    'end_time': chunk['end_time'],
+                    'transcription': f"[Chunk {i+1} transcription failed after {max_chunk_retries} attempts: {str(chunk_error)}]",
+                    'filename': chunk['filename']
+                }
+    
+    return chunk_result
+
 def transcribe_with_chunking(app_context, recording_id, filepath, filename_for_asr):
     """Transcribe a large audio file using chunking."""
     import tempfile
@@ -3405,27 +5061,7 @@ def transcribe_with_chunking(app_context, recording_id, filepath, filename_for_a
             # Process each chunk with proper timeout and retry handling
             chunk_results = []
             
-            # Create HTTP client with proper timeouts
-            timeout_config = httpx.Timeout(
-                connect=30.0,    # 30 seconds to establish connection
-                read=300.0,      # 5 minutes to read response (for large audio files)
-                write=60.0,      # 1 minute to write request
-                pool=10.0        # 10 seconds to get connection from pool
-            )
-            
-            http_client_with_timeout = httpx.Client(
-                verify=True,
-                timeout=timeout_config,
-                limits=httpx.Limits(max_connections=5, max_keepalive_connections=2)
-            )
-            
-            transcription_client = OpenAI(
-                api_key=transcription_api_key,
-                base_url=transcription_base_url,
-                http_client=http_client_with_timeout,
-                max_retries=3,  # Increased retries for better reliability
-                timeout=300.0   # 5 minute timeout for API calls
-            )
+            transcription_client = chunk_transcription_client()
             whisper_model = os.environ.get("WHISPER_MODEL", "Systran/faster-distil-whisper-large-v3")
             
             # Get user language preference
@@ -3435,122 +5071,9 @@ def transcribe_with_chunking(app_context, recording_id, filepath, filename_for_a
                 if recording and recording.owner:
                     user_transcription_language = recording.owner.transcription_language
             
-            for i, chunk in enumerate(chunks):
-                max_chunk_retries = 3
-                chunk_retry_count = 0
-                chunk_success = False
-                
-                while chunk_retry_count < max_chunk_retries and not chunk_success:
-                    try:
-                        retry_suffix = f" (retry {chunk_retry_count + 1}/{max_chunk_retries})" if chunk_retry_count > 0 else ""
-                        app.logger.info(f"Processing chunk {i+1}/{len(chunks)}: {chunk['filename']} ({chunk['size_mb']:.1f}MB){retry_suffix}")
-                        
-                        # Log detailed timing for each step
-                        step_start_time = time.time()
-                        
-                        # Step 1: File opening
-                        file_open_start = time.time()
-                        with open(chunk['path'], 'rb') as chunk_file:
-                            file_open_time = time.time() - file_open_start
-                            app.logger.info(f"Chunk {i+1}: File opened in {file_open_time:.2f}s")
-                            
-                            # Step 2: Prepare transcription parameters
-                            param_start = time.time()
-                            transcription_params = {
-                                "model": whisper_model,
-                                "file": chunk_file
-                            }
-                            
-                            if user_transcription_language:
-                                transcription_params["language"] = user_transcription_language
-                            
-                            param_time = time.time() - param_start
-                            app.logger.info(f"Chunk {i+1}: Parameters prepared in {param_time:.2f}s")
-                            
-                            # Step 3: API call with detailed timing
-                            api_start = time.time()
-                            app.logger.info(f"Chunk {i+1}: Starting API call to {transcription_base_url}")
-                            
-                            # Log connection details
-                            app.logger.info(f"Chunk {i+1}: Using timeout config - connect: 30s, read: 300s, write: 60s")
-                            app.logger.info(f"Chunk {i+1}: Max retries: 2, API timeout: 300s")
-                            
-                            try:
-                                transcript = transcription_client.audio.transcriptions.create(**transcription_params)
-                            except Exception as chunk_error:
-                                # Check if it's a format error (unlikely for chunks since they're MP3, but handle it)
-                                error_msg = str(chunk_error)
-                                if "Invalid file format" in error_msg or "Supported formats" in error_msg:
-                                    app.logger.warning(f"Chunk {i+1} format issue, attempting conversion...")
-                                    # Convert chunk to MP3 if needed
-                                    import tempfile
-                                    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_mp3:
-                                        temp_mp3_path = temp_mp3.name
-                                    try:
-                                        subprocess.run(
-                                            ['ffmpeg', '-i', chunk['path'], '-y', '-acodec', 'libmp3lame', '-b:a', '128k', '-ar', '44100', temp_mp3_path],
-                                            check=True,
-                                            capture_output=True
-                                        )
-                                        with open(temp_mp3_path, 'rb') as converted_chunk:
-                                            transcription_params['file'] = converted_chunk
-                                            transcript = transcription_client.audio.transcriptions.create(**transcription_params)
-                                    finally:
-                                        if os.path.exists(temp_mp3_path):
-                                            os.unlink(temp_mp3_path)
-                                else:
-                                    raise
-                            
-                            api_time = time.time() - api_start
-                            app.logger.info(f"Chunk {i+1}: API call completed in {api_time:.2f}s")
-                            
-                            # Step 4: Process response
-                            response_start = time.time()
-                            chunk_result = {
-                                'index': chunk['index'],
-                                'start_time': chunk['start_time'],
-                                'end_time': chunk['end_time'],
-                                'duration': chunk['duration'],
-                                'size_mb': chunk['size_mb'],
-                                'transcription': transcript.text,
-                                'filename': chunk['filename'],
-                                'processing_time': api_time  # Store the actual API processing time
-                            }
-                            chunk_results.append(chunk_result)
-                            response_time = time.time() - response_start
-                            
-                            total_time = time.time() - step_start_time
-                            app.logger.info(f"Chunk {i+1}: Response processed in {response_time:.2f}s")
-                            app.logger.info(f"Chunk {i+1}: Total processing time: {total_time:.2f}s")
-                            app.logger.info(f"Chunk {i+1} transcribed successfully: {len(transcript.text)} characters")
-                            chunk_success = True
-                            
-                    except Exception as chunk_error:
-                        chunk_retry_count += 1
-                        error_msg = str(chunk_error)
-                        
-                        if chunk_retry_count < max_chunk_retries:
-                            # Determine wait time based on error type
-                            if "timeout" in error_msg.lower() or "timed out" in error_msg.lower():
-                                wait_time = 30  # 30 seconds for timeout errors
-                            elif "rate limit" in error_msg.lower():
-                                wait_time = 60  # 1 minute for rate limit errors
-                            else:
-                                wait_time = 15  # 15 seconds for other errors
-                            
-                            app.logger.warning(f"Chunk {i+1} failed (attempt {chunk_retry_count}/{max_chunk_retries}): {chunk_error}. Retrying in {wait_time} seconds...")
-                            time.sleep(wait_time)
-                        else:
-                            app.logger.error(f"Chunk {i+1} failed after {max_chunk_retries} attempts: {chunk_error}")
-                            # Add failed chunk to results
-                            chunk_result = {
-                                'index': chunk['index'],
-                                'start_time': chunk['start_time'],
-                                'end_time': chunk['end_time'],
-                                'transcription': f"[Chunk {i+1} transcription failed after {max_chunk_retries} attempts: {str(chunk_error)}]",
-                                'filename': chunk['filename']
-                            }
-                            chunk_results.append(chunk_result)
+            for i, chunk in enumerate(chunks):
+                chunk_results.append(transcribe_chunk(transcription_client, whisper_model, chunk, i, len(chunks),
+                                                      user_transcription_language))
                 
                 # Add small delay between chunks to avoid overwhelming the API
                 if i < len(chunks) - 1:  # Don't delay after the last chunk
@@ -3587,6 +5110,124 @@ def transcribe_with_chunking(app_context, recording_id, filepath, filename_for_a
             # Cleanup is handled by tempfile.TemporaryDirectory context manager
             pass
 
+# --- Live Upload Transcription ---
+# Recordings uploaded while they are being made are transcribed segment by
+# segment as the audio arrives; completing the upload only transcribes the rest.
+live_transcriptions = LiveTranscriptions(LIVE_TRANSCRIPTION_CHECK_SECONDS)
+
+def live_transcription_enabled():
+    """Whether live uploads are transcribed while they arrive (chunked Whisper transcription only)."""
+    return bool(ENABLE_CHUNKING and chunking_service and not USE_ASR_ENDPOINT)
+
+def transcribe_live_segments(upload_id, source_path, final=False):
+    """
+    Transcribe the segments of a live upload that are not transcribed yet.
+    
+    Segments overlap like the chunks of a finished file. A segment is only
+    transcribed once it is complete, i.e. once audio after it has arrived;
+    with final the rest of the file is transcribed as well. Results are stored
+    on the upload only if no other worker stored the same segment first.
+    Call with the upload's live_transcriptions lock held.
+    
+    Returns:
+        The chunk results of the upload so far
+    """
+    import tempfile
+    
+    upload = db.session.get(UploadSession, upload_id)
+    if not upload:
+        return []
+    chunk_results = json.loads(upload.live_chunks or '[]')
+    transcribed = upload.transcribed_seconds or 0
+    owner = db.session.get(User, upload.user_id)
+    language = owner.transcription_language if owner else None
+    segment_seconds = chunking_service.segment_duration(LIVE_TRANSCRIPTION_SEGMENT_SECONDS)
+    whisper_model = os.environ.get("WHISPER_MODEL", "Systran/faster-distil-whisper-large-v3")
+    transcription_client = None
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        while True:
+            start = max(0, transcribed - chunking_service.overlap_seconds) if chunk_results else 0
+            chunk = chunking_service.extract_segment(source_path, start, segment_seconds, temp_dir, len(chunk_results))
+            if not chunk or chunk['end_time'] <= transcribed + 1:
+                break  # nothing new beyond the overlap
+            complete = chunk['duration'] >= segment_seconds - 1
+            if not complete and not final:
+                break
+            
+            if transcription_client is None:
+                transcription_client = chunk_transcription_client()
+            result = transcribe_chunk(transcription_client, whisper_model, chunk, chunk['index'], chunk['index'] + 1, language)
+            os.remove(chunk['path'])
+            if 'processing_time' not in result and not final:
+                break  # failed after retries; try again at the next check
+            
+            stored = db.session.execute(
+                update(UploadSession)
+                .where(UploadSession.id == upload_id, UploadSession.transcribed_seconds == transcribed)
+                .values(transcribed_seconds=chunk['end_time'], live_chunks=json.dumps(chunk_results + [result]))
+            ).rowcount == 1
+            db.session.commit()
+            if stored:
+                chunk_results.append(result)
+                transcribed = chunk['end_time']
+            else:
+                # Another worker got there first; continue from its results
+                db.session.expire_all()
+                upload = db.session.get(UploadSession, upload_id)
+                if not upload:
+                    break
+                chunk_results = json.loads(upload.live_chunks or '[]')
+                transcribed = upload.transcribed_seconds or 0
+                continue
+            if not complete:
+                break
+            app.logger.info(f"Live upload {upload_id}: transcribed {transcribed:.0f}s in {len(chunk_results)} segments")
+    
+    return chunk_results
+
+def live_transcription_task(app_context, upload_id):
+    """Background task transcribing the completed segments of a live upload."""
+    lock = live_transcriptions.lock(upload_id)
+    if not lock.acquire(blocking=False):
+        return  # this process is already transcribing the upload
+    try:
+        with app_context:
+            try:
+                upload = db.session.get(UploadSession, upload_id)
+                if upload and upload.status == 'uploading':
+                    transcribe_live_segments(upload_id, upload.part_path)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.warning(f"Live transcription of upload {upload_id} failed; the rest is transcribed on completion: {e}")
+    finally:
+        lock.release()
+
+def finish_live_transcription(upload_id, filepath):
+    """
+    Transcribe the rest of a completed live upload and merge it with its earlier segments.
+    
+    Returns:
+        The merged transcription, or None if nothing was transcribed during the
+        upload (the file is then transcribed like any other)
+    """
+    if not live_transcription_enabled():
+        return None
+    # Wait for a segment this process is still transcribing
+    with live_transcriptions.lock(upload_id):
+        upload = db.session.get(UploadSession, upload_id)
+        if not upload or not upload.live_chunks:
+            return None
+        chunk_results = transcribe_live_segments(upload_id, filepath, final=True)
+    live_transcriptions.discard(upload_id)
+    
+    merged_transcription = chunking_service.merge_transcriptions(chunk_results)
+    if not merged_transcription.strip():
+        raise ChunkProcessingError("Merged transcription is empty")
+    chunking_service.log_processing_statistics(chunk_results)
+    app.logger.info(f"Live upload {upload_id}: merged {len(chunk_results)} segments into {len(merged_transcription)} characters")
+    return merged_transcription
+
 @app.route('/speakers', methods=['GET'])
 @login_required
 def get_speakers():
@@ -4369,7 +6010,7 @@ def generate_summary_endpoint(recording_id):
             return jsonify({'error': 'No valid transcription available for summary generation'}), 400
             
         # Check if already processing
-        if recording.status in ['PROCESSING', 'SUMMARIZING']:
+        if recording.status in ['CONVERTING', 'PROCESSING', 'SUMMARIZING']:
             return jsonify({'error': 'Recording is already being processed'}), 400
             
         # Check if OpenRouter client is available
@@ -4483,6 +6124,7 @@ def update_speakers(recording_id):
                     if not re.match(r'^SPEAKER_\d+$', str(speaker), re.IGNORECASE):
                         final_speakers.add(speaker)
             recording.participants = ', '.join(sorted(list(final_speakers)))
+            sync_recording_participants(recording)
 
         else:
             # Handle plain text transcript
@@ -4500,6 +6142,7 @@ def update_speakers(recording_id):
             recording.transcription = transcription_text
             if new_participants:
                 recording.participants = ', '.join(new_participants)
+                sync_recording_participants(recording)
             speaker_names_used = new_participants
 
         # Update speaker usage statistics
@@ -4507,6 +6150,7 @@ def update_speakers(recording_id):
             update_speaker_usage(speaker_names_used)
         
         db.session.commit()
+        schedule_chunk_refresh(recording.id)
 
         if regenerate_summary:
             app.logger.info(f"Regenerating summary for recording {recording_id} after speaker update.")
@@ -4688,7 +6332,7 @@ def auto_identify_speakers(recording_id):
         current_speaker_map = data.get('current_speaker_map', {})
         
         # Extract all speaker labels from transcription
-        formatted_transcription = format_transcription_for_llm(recording.transcription)
+        formatted_transcription = get_formatted_transcription(recording)
         all_labels = re.findall(r'\[(SPEAKER_\d+)\]', formatted_transcription)
         seen = set()
         speaker_labels = [x for x in all_labels if not (x in seen or seen.add(x))]
@@ -4707,7 +6351,7 @@ def auto_identify_speakers(recording_id):
             return jsonify({'success': True, 'speaker_map': {}, 'message': 'All speakers are already identified'})
 
         # Call the helper function with only unidentified speakers
-        speaker_map = identify_unidentified_speakers_from_text(recording.transcription, unidentified_speakers)
+        speaker_map = identify_unidentified_speakers_from_text(formatted_transcription, unidentified_speakers)
 
         return jsonify({'success': True, 'speaker_map': speaker_map})
 
@@ -4718,6 +6362,146 @@ def auto_identify_speakers(recording_id):
         app.logger.error(f"Error during auto speaker identification for recording {recording_id}: {e}", exc_info=True)
         return jsonify({'error': f'An unexpected error occurred: {e}'}), 500
 
+# --- Server-Held Chat Sessions ---
+def load_chat_history(session):
+    """Return (summary, recent messages) stored on an InquireSession or RecordingChatSession."""
+    return session.history_summary, json.loads(session.chat_history) if session.chat_history else []
+
+def read_chat_history_row(model, session_id):
+    """Stored (chat_history, history_summary) of a chat session, read from the database, or None."""
+    return db.session.execute(
+        select(model.chat_history, model.history_summary).where(model.id == session_id)
+    ).first()
+
+def write_chat_history_row(model, session_id, old_row, **values):
+    """
+    Store new history values only if the session still holds old_row.
+    
+    Requests and compaction jobs in any worker can rewrite the same session;
+    the conditional update makes the loser re-read instead of overwriting.
+    
+    Returns:
+        bool: Whether the values were written
+    """
+    result = db.session.execute(
+        update(model)
+        .where(model.id == session_id,
+               model.chat_history.is_not_distinct_from(old_row.chat_history),
+               model.history_summary.is_not_distinct_from(old_row.history_summary))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+def save_chat_exchange(model, session_id, user_message, response_text):
+    """Append one user/assistant exchange to a chat session, compacting it in the background when too long."""
+    exchange = [
+        {'role': 'user', 'content': user_message[:MAX_MESSAGE_CHARS]},
+        {'role': 'assistant', 'content': strip_thinking(response_text)[:MAX_MESSAGE_CHARS]}
+    ]
+    for _ in range(CHAT_HISTORY_WRITE_ATTEMPTS):
+        row = read_chat_history_row(model, session_id)
+        if row is None:
+            return
+        messages = (json.loads(row.chat_history) if row.chat_history else []) + exchange
+        if write_chat_history_row(model, session_id, row, chat_history=json.dumps(messages),
+                                  last_used=datetime.utcnow()):
+            break
+    else:
+        app.logger.warning(f"Could not save chat exchange of {model.__tablename__} {session_id}: kept changing")
+        return
+    if compaction_split(messages, CHAT_HISTORY_TOKEN_BUDGET, CHAT_HISTORY_KEEP_MESSAGES):
+        schedule_history_compaction(model, session_id)
+
+def schedule_history_compaction(model, session_id):
+    """Summarize a chat session's oldest turns in the background, at most one job per session."""
+    key = (model.__tablename__, session_id)
+    with _history_compaction_lock:
+        if key in _history_compactions_in_progress:
+            return
+        _history_compactions_in_progress.add(key)
+    thread = threading.Thread(target=compact_chat_history_task, args=(app.app_context(), model, session_id), daemon=True)
+    thread.start()
+
+def compact_chat_history_task(app_context, model, session_id):
+    """Fold the oldest turns of a chat session into its summary."""
+    with app_context:
+        try:
+            session = db.session.get(model, session_id)
+            if not session:
+                return
+            summary, messages = load_chat_history(session)
+            count = compaction_split(messages, CHAT_HISTORY_TOKEN_BUDGET, CHAT_HISTORY_KEEP_MESSAGES)
+            if not count:
+                return
+            
+            response = call_llm_completion(
+                messages=summary_request(summary, messages[:count]),
+                temperature=0.2,
+                max_tokens=max(CHAT_HISTORY_TOKEN_BUDGET // 4, 200)
+            )
+            new_summary = response.choices[0].message.content.strip()
+            
+            # Messages may have been appended meanwhile (by any worker); only the summarized prefix is replaced
+            for _ in range(CHAT_HISTORY_WRITE_ATTEMPTS):
+                row = read_chat_history_row(model, session_id)
+                if row is None:
+                    return
+                current = json.loads(row.chat_history) if row.chat_history else []
+                if row.history_summary != summary or current[:count] != messages[:count]:
+                    app.logger.info(f"Chat history of {model.__tablename__} {session_id} changed during compaction; skipped")
+                    return
+                if write_chat_history_row(model, session_id, row, history_summary=new_summary,
+                                          chat_history=json.dumps(current[count:])):
+                    app.logger.info(f"Compacted {count} messages of {model.__tablename__} {session_id} into its summary")
+                    return
+            app.logger.warning(f"Could not store compacted history of {model.__tablename__} {session_id}: kept changing")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Error compacting chat history of {model.__tablename__} {session_id}: {e}")
+        finally:
+            with _history_compaction_lock:
+                _history_compactions_in_progress.discard((model.__tablename__, session_id))
+
+def retrieve_recording_excerpts(user_id, recording_id, queries):
+    """
+    Select the passages of one recording most relevant to a chat message.
+    
+    The best chunks of the recording are found with the Inquire Mode search and
+    widened by their neighbouring chunks, so answers see each passage in context.
+    
+    Args:
+        user_id (int): Owner of the recording
+        recording_id (int): Recording to search
+        queries (list): The message and any earlier messages it follows up on
+    
+    Returns:
+        str: The passages in transcript order, gaps marked with [...], or None if
+        the recording has no chunks or nothing matched
+    """
+    results = multi_query_search_chunks(
+        user_id, queries, {'recording': {'recording_ids': [recording_id]}}, CHAT_RETRIEVAL_CHUNKS
+    )['recording']
+    if not results:
+        return None
+    
+    indexes = expand_chunk_indexes([chunk.chunk_index for chunk, _, _ in results[:CHAT_RETRIEVAL_CHUNKS]], CHAT_RETRIEVAL_NEIGHBORS)
+    chunks = TranscriptChunk.query.filter(
+        TranscriptChunk.recording_id == recording_id,
+        TranscriptChunk.chunk_index.in_(indexes)
+    ).order_by(TranscriptChunk.chunk_index).all()
+    
+    pieces = []
+    previous_index = None
+    for chunk in chunks:
+        if previous_index is not None and chunk.chunk_index != previous_index + 1:
+            pieces.append("[...]")
+        timing = f"[{chunk.start_time:.1f}s-{chunk.end_time:.1f}s] " if chunk.start_time is not None and chunk.end_time is not None else ""
+        pieces.append(f"{timing}{chunk.content}")
+        previous_index = chunk.chunk_index
+    return "\n\n".join(pieces) if pieces else None
+
 # --- Chat with Transcription ---
 @app.route('/chat', methods=['POST'])
 @login_required
@@ -4729,7 +6513,7 @@ def chat_with_transcription():
         
         recording_id = data.get('recording_id')
         user_message = data.get('message')
-        message_history = data.get('message_history', [])
+        session_id = data.get('session_id')
         
         if not recording_id:
             return jsonify({'error': 'No recording ID provided'}), 400
@@ -4748,6 +6532,24 @@ def chat_with_transcription():
         # Check if OpenRouter client is available
         if client is None:
             return jsonify({'error': 'Chat service is not available (OpenRouter client not configured)'}), 503
+        
+        # The conversation is held on the server; a new session starts from any history the client sent
+        if session_id:
+            chat_session = RecordingChatSession.query.filter_by(
+                id=session_id, user_id=current_user.id, recording_id=recording.id
+            ).first()
+            if not chat_session:
+                return jsonify({'error': 'Chat session not found'}), 404
+        else:
+            chat_session = RecordingChatSession(
+                user_id=current_user.id,
+                recording_id=recording.id,
+                chat_history=json.dumps(clean_history(data.get('message_history', [])))
+            )
+            db.session.add(chat_session)
+            db.session.commit()
+        session_id = chat_session.id
+        history_summary, history = load_chat_history(chat_session)
             
         # Prepare the system prompt with the transcription
         user_chat_output_language = current_user.output_language if current_user.is_authenticated else None
@@ -4760,38 +6562,69 @@ def chat_with_transcription():
         user_title = current_user.job_title if current_user.is_authenticated and current_user.job_title else "a professional"
         user_company = current_user.company if current_user.is_authenticated and current_user.company else "their organization"
 
-        formatted_transcription = format_transcription_for_llm(recording.transcription)
+        # Stored length of the rendering, so the deferred transcript is only loaded when it goes into the prompt
+        transcript_chars = recording.formatted_transcription_chars
+        if transcript_chars is None:
+            transcript_chars = len(get_formatted_transcription(recording) or "")
         
         # Get configurable transcript length limit for chat
         transcript_limit = SystemSetting.get_setting('transcript_length_limit', 30000)
-        if transcript_limit == -1:
-            # No limit
-            chat_transcript = formatted_transcription
+        
+        # Long transcripts are answered from their most relevant passages, so the prompt size
+        # no longer grows with the meeting length
+        excerpts = None
+        if ENABLE_INQUIRE_MODE and CHAT_RETRIEVAL_MIN_CHARS > 0 and (
+            transcript_chars > CHAT_RETRIEVAL_MIN_CHARS
+            or (transcript_limit != -1 and transcript_chars > transcript_limit)
+        ):
+            retrieval_started = time.perf_counter()
+            previous_questions = [message['content'] for message in history if message['role'] == 'user'][-1:]
+            excerpts = retrieve_recording_excerpts(current_user.id, recording.id, [user_message] + previous_questions)
+            if excerpts:
+                app.logger.info(
+                    f"Chat for recording {recording.id}: using {len(excerpts)} characters of retrieved passages instead of "
+                    f"{transcript_chars} transcript characters ({(time.perf_counter() - retrieval_started) * 1000:.0f} ms)"
+                )
+        
+        if excerpts:
+            transcript_section = """The meeting transcript is too long to include in full. The passages most relevant to each request are provided right before it."""
         else:
-            chat_transcript = formatted_transcription[:transcript_limit]
+            formatted_transcription = get_formatted_transcription(recording) or ""
+            if transcript_limit == -1:
+                # No limit
+                chat_transcript = formatted_transcription
+            else:
+                chat_transcript = formatted_transcription[:transcript_limit]
+            transcript_section = f"""Following is the meeting transcript:
+<<start transcript>>
+{chat_transcript or "No transcript available."}
+<<end transcript>>"""
         
         system_prompt = f"""You are a professional meeting and audio transcription analyst assisting {user_name}, who is a(n) {user_title} at {user_company}. {language_instruction} Analyze the following meeting information and respond to the specific request.
 
 Following are the meeting participants and their roles:
 {recording.participants or "No specific participants information provided."}
 
-Following is the meeting transcript:
-<<start transcript>>
-{chat_transcript or "No transcript available."}
-<<end transcript>>
+{transcript_section}
 
 Additional context and notes about the meeting:
 {recording.notes or "none"}
 """
         
-        # Prepare messages array with system prompt and conversation history
+        # Stable prefix first (system prompt, summary, earlier turns) so provider prompt caching applies
         messages = [{"role": "system", "content": system_prompt}]
-        if message_history:
-            messages.extend(message_history)
+        messages.extend(history_messages(history_summary, history))
+        if excerpts:
+            messages.append({"role": "system", "content": f"""Transcript passages relevant to the next request, in order ([...] marks skipped parts):
+<<start transcript excerpts>>
+{excerpts}
+<<end transcript excerpts>>"""})
         messages.append({"role": "user", "content": user_message})
 
         def generate():
             try:
+                yield f"data: {json.dumps({'session_id': session_id})}\n\n"
+                
                 # Enable streaming
                 stream = call_llm_completion(
                     messages=messages,
@@ -4801,8 +6634,12 @@ Additional context and notes about the meeting:
                 )
                 
                 # Use helper function to process streaming with thinking tag support
-                for response in process_streaming_with_thinking(stream):
+                response_parts = []
+                for response in process_streaming_with_thinking(stream, response_parts):
                     yield response
+                
+                with app.app_context():
+                    save_chat_exchange(RecordingChatSession, session_id, user_message, ''.join(response_parts))
 
             except Exception as e:
                 app.logger.error(f"Error during chat stream generation: {str(e)}")
@@ -4832,7 +6669,7 @@ def reprocess_transcription(recording_id):
         if not recording.audio_path or not os.path.exists(recording.audio_path):
             return jsonify({'error': 'Audio file not found for reprocessing'}), 404
 
-        if recording.status in ['PROCESSING', 'SUMMARIZING']:
+        if recording.status in ['CONVERTING', 'PROCESSING', 'SUMMARIZING']:
             return jsonify({'error': 'Recording is already being processed'}), 400
 
         # --- Convert file if necessary before reprocessing ---
@@ -4882,8 +6719,9 @@ def reprocess_transcription(recording_id):
         recording.summary = None
         recording.status = 'PROCESSING'
 
-        # Clear existing events since they depend on the transcription
-        Event.query.filter_by(recording_id=recording_id).delete()
+        # Clear existing events since they depend on the transcription (one by one so the change feed sees them)
+        for event in Event.query.filter_by(recording_id=recording_id).all():
+            db.session.delete(event)
 
         db.session.commit()
 
@@ -4990,7 +6828,7 @@ def reprocess_summary(recording_id):
             return jsonify({'error': 'No valid transcription available for summary generation'}), 400
             
         # Check if already processing
-        if recording.status in ['PROCESSING', 'SUMMARIZING']:
+        if recording.status in ['CONVERTING', 'PROCESSING', 'SUMMARIZING']:
             return jsonify({'error': 'Recording is already being processed'}), 400
             
         # Check if OpenRouter client is available
@@ -5002,7 +6840,8 @@ def reprocess_summary(recording_id):
         recording.status = 'SUMMARIZING'
 
         # Clear existing events since they might be re-extracted during summary generation
-        Event.query.filter_by(recording_id=recording_id).delete()
+        for event in Event.query.filter_by(recording_id=recording_id).all():
+            db.session.delete(event)
 
         db.session.commit()
 
@@ -5046,7 +6885,7 @@ def reset_status(recording_id):
             return jsonify({'error': 'You do not have permission to modify this recording'}), 403
 
         # Allow resetting if it's stuck or failed
-        if recording.status in ['PROCESSING', 'SUMMARIZING', 'FAILED']:
+        if recording.status in ['CONVERTING', 'PROCESSING', 'SUMMARIZING', 'FAILED']:
             recording.status = 'FAILED'
             recording.error_message = "Manually reset from stuck or failed state."
             db.session.commit()
@@ -5497,7 +7336,7 @@ def admin_get_stats():
     
     # Get recordings by status
     completed_recordings = Recording.query.filter_by(status='COMPLETED').count()
-    processing_recordings = Recording.query.filter(Recording.status.in_(['PROCESSING', 'SUMMARIZING'])).count()
+    processing_recordings = Recording.query.filter(Recording.status.in_(['CONVERTING', 'PROCESSING', 'SUMMARIZING'])).count()
     pending_recordings = Recording.query.filter_by(status='PENDING').count()
     failed_recordings = Recording.query.filter_by(status='FAILED').count()
     
@@ -5846,6 +7685,101 @@ def inquire():
     # Render the inquire page with user context for theming
     return render_template('inquire.html', use_asr_endpoint=USE_ASR_ENDPOINT, current_user=current_user)
 
+# Recording attributes that the list and status endpoints can return, in to_dict() order.
+# Each maps to the columns or relationships it reads, so unrequested ones are never loaded.
+RECORDING_FIELD_SOURCES = {
+    'id': ('id',),
+    'title': ('title',),
+    'participants': ('participants',),
+    'notes': ('notes',),
+    'notes_html': ('notes',),
+    'transcription': ('transcription',),
+    'summary': ('summary',),
+    'summary_html': ('summary',),
+    'status': ('status',),
+    'created_at': ('created_at',),
+    'completed_at': ('completed_at',),
+    'processing_time_seconds': ('processing_time_seconds',),
+    'meeting_date': ('meeting_date',),
+    'file_size': ('file_size',),
+    'original_filename': ('original_filename',),
+    'user_id': ('user_id',),
+    'is_inbox': ('is_inbox',),
+    'is_highlighted': ('is_highlighted',),
+    'mime_type': ('mime_type',),
+    'tags': ('tag_associations',),
+    'events': ('events',),
+}
+RECORDING_RELATIONSHIP_LOADS = {
+    'tag_associations': selectinload(Recording.tag_associations).selectinload(RecordingTag.tag),
+    'events': selectinload(Recording.events),
+}
+
+# view=summary: what a list row or card shows, without the long texts
+# view=list: everything except the rendered Markdown (the default for list endpoints)
+# view=full: everything, as returned by Recording.to_dict()
+RECORDING_VIEWS = {
+    'summary': ('id', 'title', 'participants', 'status', 'created_at', 'completed_at', 'processing_time_seconds',
+                'meeting_date', 'file_size', 'original_filename', 'user_id', 'is_inbox', 'is_highlighted',
+                'mime_type', 'tags', 'events'),
+    'list': tuple(field for field in RECORDING_FIELD_SOURCES if field not in ('notes_html', 'summary_html')),
+    'full': tuple(RECORDING_FIELD_SOURCES),
+}
+
+def parse_recording_fields(default_view):
+    """
+    Read the sparse fieldset requested with ?fields=a,b or ?view=summary|list|full.
+    
+    Returns:
+        (fields, error): the requested field names in response order, or an error message
+    """
+    fields_param = request.args.get('fields', '').strip()
+    if fields_param:
+        requested = {field.strip() for field in fields_param.split(',') if field.strip()}
+        unknown = requested - set(RECORDING_FIELD_SOURCES)
+        if unknown:
+            return None, f"Unknown fields: {', '.join(sorted(unknown))}"
+        # id is always included so clients can merge partial records
+        return tuple(field for field in RECORDING_FIELD_SOURCES if field in requested or field == 'id'), None
+    view = request.args.get('view', default_view)
+    if view not in RECORDING_VIEWS:
+        return None, f"Invalid view. Must be one of: {', '.join(RECORDING_VIEWS)}"
+    return RECORDING_VIEWS[view], None
+
+def recording_load_options(fields):
+    """Query options that load only the columns and relationships the fields read."""
+    sources = {source for field in fields for source in RECORDING_FIELD_SOURCES[field]}
+    columns = [getattr(Recording, source) for source in sources if source not in RECORDING_RELATIONSHIP_LOADS]
+    return [load_only(*columns)] + [load for source, load in RECORDING_RELATIONSHIP_LOADS.items() if source in sources]
+
+def serialize_recording_fields(recording, fields, tag_counts):
+    """Serialize the given fields of a recording loaded with recording_load_options(fields)."""
+    item = {}
+    for field in fields:
+        if field == 'notes_html':
+            item[field] = md_to_html(recording.notes) if recording.notes else ""
+        elif field == 'summary_html':
+            item[field] = md_to_html(recording.summary) if recording.summary else ""
+        elif field in ('created_at', 'completed_at'):
+            item[field] = local_datetime_filter(getattr(recording, field))
+        elif field == 'meeting_date':
+            item[field] = f"{recording.meeting_date.isoformat()}T00:00:00" if recording.meeting_date else None
+        elif field == 'tags':
+            item[field] = [tag.to_dict(tag_counts.get(tag.id, 0)) for tag in recording.tags]
+        elif field == 'events':
+            item[field] = [event.to_dict() for event in recording.events]
+        else:
+            item[field] = getattr(recording, field)
+    return item
+
+def serialize_recording_list(recordings, fields=RECORDING_VIEWS['list']):
+    """Serialize recordings loaded with recording_load_options(fields), counting their tags' recordings in one query."""
+    tag_counts = {}
+    if 'tags' in fields:
+        tag_counts = tag_recording_counts(association.tag_id for recording in recordings
+                                          for association in recording.tag_associations)
+    return [serialize_recording_fields(recording, fields, tag_counts) for recording in recordings]
+
 @app.route('/recordings', methods=['GET'])
 def get_recordings():
     try:
@@ -5853,10 +7787,14 @@ def get_recordings():
         if not current_user.is_authenticated:
             return jsonify([])  # Return empty array if not logged in
             
+        fields, error = parse_recording_fields('list')
+        if error:
+            return jsonify({'error': error}), 400
+            
         # Filter recordings by the current user
-        stmt = select(Recording).where(Recording.user_id == current_user.id).order_by(Recording.created_at.desc())
+        stmt = select(Recording).where(Recording.user_id == current_user.id).options(*recording_load_options(fields)).order_by(Recording.created_at.desc())
         recordings = db.session.execute(stmt).scalars().all()
-        return jsonify([recording.to_dict() for recording in recordings])
+        return jsonify(serialize_recording_list(recordings, fields))
     except Exception as e:
         app.logger.error(f"Error fetching recordings: {e}")
         return jsonify({'error': str(e)}), 500
@@ -5871,6 +7809,9 @@ def get_recordings_paginated():
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 25, type=int), 100)  # Cap at 100 per page
         search_query = request.args.get('q', '').strip()
+        fields, error = parse_recording_fields('list')
+        if error:
+            return jsonify({'error': error}), 400
         
         # Build base query
         stmt = select(Recording).where(Recording.user_id == current_user.id)
@@ -6083,7 +8024,7 @@ def get_recordings_paginated():
         
         # Apply pagination
         offset = (page - 1) * per_page
-        stmt = stmt.offset(offset).limit(per_page)
+        stmt = stmt.offset(offset).limit(per_page).options(*recording_load_options(fields))
         
         # Execute query
         recordings = db.session.execute(stmt).scalars().all()
@@ -6094,7 +8035,7 @@ def get_recordings_paginated():
         has_prev = page > 1
         
         return jsonify({
-            'recordings': [recording.to_dict() for recording in recordings],
+            'recordings': serialize_recording_list(recordings, fields),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -6115,18 +8056,85 @@ def get_recordings_paginated():
 def get_inbox_recordings():
     """Get recordings that are in the inbox and currently processing."""
     try:
+        fields, error = parse_recording_fields('list')
+        if error:
+            return jsonify({'error': error}), 400
+        
         stmt = select(Recording).where(
             Recording.user_id == current_user.id,
             Recording.is_inbox == True,
-            Recording.status.in_(['PENDING', 'PROCESSING', 'SUMMARIZING'])
-        ).order_by(Recording.created_at.desc())
+            Recording.status.in_(['PENDING', 'CONVERTING', 'PROCESSING', 'SUMMARIZING'])
+        ).options(*recording_load_options(fields)).order_by(Recording.created_at.desc())
         
         recordings = db.session.execute(stmt).scalars().all()
-        return jsonify([recording.to_dict() for recording in recordings])
+        return jsonify(serialize_recording_list(recordings, fields))
     except Exception as e:
         app.logger.error(f"Error fetching inbox recordings: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/recordings/changes', methods=['GET'])
+@login_required
+@limiter.limit("1250 per hour")  # Clients poll this instead of re-downloading pages
+def get_recording_changes():
+    """
+    Delta sync: recordings, tags, shares and events changed since a cursor.
+    
+    Without ?since= (or with a cursor older than the retained change log) the
+    response only carries reset=true and the current cursor; the client reloads
+    through the list endpoints and polls from there. Recordings are serialized
+    with ?view=/?fields= (default summary).
+    """
+    try:
+        fields, error = parse_recording_fields('summary')
+        if error:
+            return jsonify({'error': error}), 400
+        limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+        since = request.args.get('since', type=int)
+        
+        pruned_through = SystemSetting.get_setting(CHANGE_FEED_PRUNED_KEY, 0) or 0
+        latest = max(db.session.execute(select(db.func.max(RecordingChange.id))).scalar() or 0, pruned_through)
+        if since is None or since < pruned_through or since > latest:
+            return jsonify({'reset': True, 'cursor': latest, 'has_more': False})
+        
+        rows = db.session.execute(
+            select(RecordingChange.id, RecordingChange.entity_type, RecordingChange.entity_id, RecordingChange.action)
+            .where(RecordingChange.user_id == current_user.id, RecordingChange.id > since)
+            .order_by(RecordingChange.id)
+            .limit(limit + 1)
+        ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        # Without more rows for this user, skip ahead past other users' changes too
+        cursor = rows[-1].id if has_more else max(latest, rows[-1].id if rows else since)
+        
+        changes = compact_changes((row.entity_type, row.entity_id, row.action) for row in rows)
+        response = {'reset': False, 'cursor': cursor, 'has_more': has_more}
+        loaders = {
+            'recording': lambda ids: serialize_recording_list(db.session.execute(
+                select(Recording).where(Recording.id.in_(ids), Recording.user_id == current_user.id)
+                .options(*recording_load_options(fields))
+            ).scalars().all(), fields),
+            'tag': lambda ids: serialize_tags(Tag.query.filter(Tag.id.in_(ids), Tag.user_id == current_user.id).all()),
+            'share': lambda ids: [share.to_dict() for share in Share.query.filter(
+                Share.id.in_(ids), Share.user_id == current_user.id
+            ).options(joinedload(Share.recording).load_only(Recording.title)).all()],
+            'event': lambda ids: [event.to_dict() for event in Event.query.join(Recording).filter(
+                Event.id.in_(ids), Recording.user_id == current_user.id
+            ).all()],
+        }
+        for entity_type in ENTITY_TYPES:
+            upserted, deleted = split_actions(changes[entity_type])
+            items = loaders[entity_type](upserted) if upserted else []
+            # Entities that vanished after their last logged change are reported as deleted
+            found = {item['id'] for item in items}
+            deleted = sorted(set(deleted) | (set(upserted) - found))
+            response[f'{entity_type}s'] = items
+            response[f'deleted_{entity_type}s'] = deleted
+        return jsonify(response)
+    except Exception as e:
+        app.logger.error(f"Error fetching recording changes: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/save', methods=['POST'])
 @login_required
 def save_metadata():
@@ -6145,7 +8153,9 @@ def save_metadata():
 
         # Update fields if provided (with sanitization for notes and summary)
         if 'title' in data: recording.title = data['title']
-        if 'participants' in data: recording.participants = data['participants']
+        if 'participants' in data:
+            recording.participants = data['participants']
+            sync_recording_participants(recording)
         if 'notes' in data: recording.notes = sanitize_html(data['notes']) if data['notes'] else data['notes']
         if 'summary' in data: recording.summary = sanitize_html(data['summary']) if data['summary'] else data['summary']
         if 'is_inbox' in data: recording.is_inbox = data['is_inbox']
@@ -6165,6 +8175,14 @@ def save_metadata():
 
         # Do not update transcription or status here
         db.session.commit()
+        
+        if 'meeting_date' in data and embedding_index_cache is not None:
+            embedding_index_cache.set_meeting_date(recording.user_id, recording.id, recording.meeting_date)
+            recording_index_cache.set_meeting_date(recording.user_id, recording.id, recording.meeting_date)
+        if any(field in data for field in ('title', 'participants', 'summary')) and recording.status == 'COMPLETED':
+            # Refresh the recording's profile embedding (unchanged chunks are reused)
+            schedule_chunk_refresh(recording.id)
+        
         return jsonify({'success': True, 'recording': recording.to_dict()})
 
     except Exception as e:
@@ -6198,6 +8216,7 @@ def update_transcription(recording_id):
 
         db.session.commit()
         app.logger.info(f"Transcription for recording {recording_id} was updated.")
+        schedule_chunk_refresh(recording.id)
         
         return jsonify({'success': True, 'message': 'Transcription updated successfully.', 'recording': recording.to_dict()})
 
@@ -6253,242 +8272,342 @@ def toggle_highlight(recording_id):
         return jsonify({'error': 'An unexpected error occurred.'}), 500
 
 
-@app.route('/upload', methods=['POST'])
-@login_required
-def upload_file():
-    try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
+def upload_size_limit():
+    """Largest accepted upload in bytes, or None while chunked Whisper transcription lifts the limit."""
+    if ENABLE_CHUNKING and chunking_service and not USE_ASR_ENDPOINT:
+        return None
+    return app.config.get('MAX_CONTENT_LENGTH')
 
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+# ffmpeg is CPU-bound; bound the conversions running at once so uploads cannot starve transcription and requests
+AUDIO_CONVERSION_SLOT_DIR = os.path.join(tempfile.gettempdir(), 'speakr-conversion-slots')
 
-        original_filename = file.filename
-        safe_filename = secure_filename(original_filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{safe_filename}")
+@contextmanager
+def audio_conversion_slot(poll_seconds=0.5):
+    """
+    Hold one of the AUDIO_CONVERSION_CONCURRENCY conversion slots shared by all workers.
+    
+    Each slot is a lock file; holding its flock holds the slot, and the kernel
+    releases it if the worker dies mid-conversion. Waits until a slot is free.
+    """
+    os.makedirs(AUDIO_CONVERSION_SLOT_DIR, exist_ok=True)
+    while True:
+        for slot in range(max(AUDIO_CONVERSION_CONCURRENCY, 1)):
+            lock_file = open(os.path.join(AUDIO_CONVERSION_SLOT_DIR, f'slot-{slot}.lock'), 'w')
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            try:
+                yield
+            finally:
+                # Closing the file releases the lock
+                lock_file.close()
+            return
+        time.sleep(poll_seconds)
 
-        # Get original file size
-        file.seek(0, os.SEEK_END)
-        original_file_size = file.tell()
-        file.seek(0)
+def fail_conversion(recording, message):
+    """Mark a recording whose audio could not be converted as failed."""
+    recording.status = 'FAILED'
+    recording.error_message = message
+    recording.transcription = f"Processing failed: {message}"
+    db.session.commit()
 
-        # Check size limit before saving - only enforce if chunking is disabled or using ASR endpoint
-        max_content_length = app.config.get('MAX_CONTENT_LENGTH')
-        
-        # Skip size check if chunking is enabled and using OpenAI Whisper API
-        should_enforce_size_limit = True
-        if ENABLE_CHUNKING and chunking_service and not USE_ASR_ENDPOINT:
-            should_enforce_size_limit = False
-            # Get chunking mode for better logging
-            mode, limit_value = chunking_service.parse_chunk_limit()
-            if mode == 'size':
-                app.logger.info(f"Size-based chunking enabled ({limit_value}MB limit) - skipping {original_file_size/1024/1024:.1f}MB size limit check")
-            else:
-                app.logger.info(f"Duration-based chunking enabled ({limit_value}s limit) - skipping {original_file_size/1024/1024:.1f}MB size limit check")
-        
-        if should_enforce_size_limit and max_content_length and original_file_size > max_content_length:
-            raise RequestEntityTooLarge()
+def convert_upload_if_needed(recording, filepath, original_filename):
+    """
+    Convert an uploaded file to MP3 when chunked transcription or the ASR endpoint needs it.
+    
+    Runs in the processing task rather than the upload request. The recording
+    is CONVERTING while it waits for one of the AUDIO_CONVERSION_CONCURRENCY
+    conversion slots and while ffmpeg runs.
+    
+    Returns:
+        Path of the file to transcribe (the converted MP3 or the original), or
+        None if conversion failed and the recording was marked as failed
+    """
+    # --- Convert files only when chunking is needed ---
+    filename_lower = original_filename.lower()
+
+    # Check if chunking will be needed for this file
+    needs_chunking_for_processing = (chunking_service and 
+                                   ENABLE_CHUNKING and 
+                                   not USE_ASR_ENDPOINT and
+                                   chunking_service.needs_chunking(filepath, USE_ASR_ENDPOINT))
+
+    # Define supported formats based on whether chunking is needed
+    if needs_chunking_for_processing:
+        # For chunking: only support formats that work well with chunking
+        supported_formats = ('.wav', '.mp3', '.flac')
+        convertible_formats = ('.amr', '.3gp', '.3gpp', '.m4a', '.aac', '.ogg', '.wma', '.webm')
+    else:
+        # For direct transcription: support WebM and other formats directly
+        supported_formats = ('.wav', '.mp3', '.flac', '.webm', '.m4a', '.aac', '.ogg')
+        convertible_formats = ('.amr', '.3gp', '.3gpp', '.wma')
+
+    # Special handling for problematic AAC files when using ASR endpoint
+    is_problematic_aac = (USE_ASR_ENDPOINT and 
+                         (filename_lower.endswith('.aac') or 
+                          'aac' in filename_lower.lower()))
+
+    # Convert if file is not in supported formats OR is problematic AAC for ASR
+    should_convert = ((not filename_lower.endswith(supported_formats) and needs_chunking_for_processing) or 
+                     is_problematic_aac)
+
+    if should_convert:
+        if is_problematic_aac:
+            app.logger.info(f"Converting AAC-encoded file {filename_lower} to high-quality MP3 for ASR endpoint compatibility.")
+        elif filename_lower.endswith(convertible_formats):
+            app.logger.info(f"Converting {filename_lower} format to high-quality MP3 for chunking processing.")
+        else:
+            app.logger.info(f"Attempting to convert unknown format ({filename_lower}) to high-quality MP3 for chunking.")
 
-        file.save(filepath)
-        app.logger.info(f"File saved to {filepath}")
+        recording.status = 'CONVERTING'
+        db.session.commit()
 
-        # --- Convert files only when chunking is needed ---
-        filename_lower = original_filename.lower()
-        
-        # Check if chunking will be needed for this file
-        needs_chunking_for_processing = (chunking_service and 
-                                       ENABLE_CHUNKING and 
-                                       not USE_ASR_ENDPOINT and
-                                       chunking_service.needs_chunking(filepath, USE_ASR_ENDPOINT))
-        
-        # Define supported formats based on whether chunking is needed
-        if needs_chunking_for_processing:
-            # For chunking: only support formats that work well with chunking
-            supported_formats = ('.wav', '.mp3', '.flac')
-            convertible_formats = ('.amr', '.3gp', '.3gpp', '.m4a', '.aac', '.ogg', '.wma', '.webm')
-        else:
-            # For direct transcription: support WebM and other formats directly
-            supported_formats = ('.wav', '.mp3', '.flac', '.webm', '.m4a', '.aac', '.ogg')
-            convertible_formats = ('.amr', '.3gp', '.3gpp', '.wma')
-        
-        # Special handling for problematic AAC files when using ASR endpoint
-        is_problematic_aac = (USE_ASR_ENDPOINT and 
-                             (filename_lower.endswith('.aac') or 
-                              'aac' in filename_lower.lower()))
-        
-        # Convert if file is not in supported formats OR is problematic AAC for ASR
-        should_convert = ((not filename_lower.endswith(supported_formats) and needs_chunking_for_processing) or 
-                         is_problematic_aac)
-        
-        if should_convert:
-            if is_problematic_aac:
-                app.logger.info(f"Converting AAC-encoded file {filename_lower} to high-quality MP3 for ASR endpoint compatibility.")
-            elif filename_lower.endswith(convertible_formats):
-                app.logger.info(f"Converting {filename_lower} format to high-quality MP3 for chunking processing.")
-            else:
-                app.logger.info(f"Attempting to convert unknown format ({filename_lower}) to high-quality MP3 for chunking.")
-            
-            base_filepath, _ = os.path.splitext(filepath)
-            temp_mp3_filepath = f"{base_filepath}_temp.mp3"
-            mp3_filepath = f"{base_filepath}.mp3"
+        base_filepath, _ = os.path.splitext(filepath)
+        temp_mp3_filepath = f"{base_filepath}_temp.mp3"
+        mp3_filepath = f"{base_filepath}.mp3"
 
-            try:
-                # Convert to high-quality MP3 (128kbps, 44.1kHz) for better transcription accuracy
+        try:
+            # Convert to high-quality MP3 (128kbps, 44.1kHz) for better transcription accuracy
+            with audio_conversion_slot():
                 subprocess.run(
                     ['ffmpeg', '-i', filepath, '-y', '-acodec', 'libmp3lame', '-b:a', '128k', '-ar', '44100', '-ac', '1', temp_mp3_filepath],
                     check=True, capture_output=True, text=True
                 )
-                app.logger.info(f"Successfully converted {filepath} to {temp_mp3_filepath} (128kbps MP3)")
-                
-                # If the original file is not the same as the final mp3 file, remove it
-                if filepath.lower() != mp3_filepath.lower():
-                    os.remove(filepath)
-                
-                # Rename the temporary file to the final filename
-                os.rename(temp_mp3_filepath, mp3_filepath)
-                
-                filepath = mp3_filepath
-            except FileNotFoundError:
-                app.logger.error("ffmpeg command not found. Please ensure ffmpeg is installed and in the system's PATH.")
-                return jsonify({'error': 'Audio conversion tool (ffmpeg) not found on server.'}), 500
-            except subprocess.CalledProcessError as e:
-                app.logger.error(f"ffmpeg conversion failed for {filepath}: {e.stderr}")
-                return jsonify({'error': f'Failed to convert audio file: {e.stderr}'}), 500
-        elif not filename_lower.endswith(supported_formats):
-            # File is not supported and chunking is not needed - log but don't convert
-            app.logger.info(f"File format {filename_lower} will be processed directly without conversion (chunking not needed)")
+            app.logger.info(f"Successfully converted {filepath} to {temp_mp3_filepath} (128kbps MP3)")
 
-        # Get final file size (of original or converted file)
-        final_file_size = os.path.getsize(filepath)
+            # If the original file is not the same as the final mp3 file, remove it
+            if filepath.lower() != mp3_filepath.lower():
+                os.remove(filepath)
 
-        # Determine MIME type of the final file
-        mime_type, _ = mimetypes.guess_type(filepath)
-        app.logger.info(f"Final MIME type: {mime_type} for file {filepath}")
+            # Rename the temporary file to the final filename
+            os.rename(temp_mp3_filepath, mp3_filepath)
 
-        # Get notes from the form
-        notes = request.form.get('notes')
-        
-        # Get selected tags if provided (multiple tags support)
-        selected_tags = []
-        tag_index = 0
-        while True:
-            tag_id_key = f'tag_ids[{tag_index}]'
-            tag_id = request.form.get(tag_id_key)
-            if not tag_id:
-                break
-            
-            tag = Tag.query.filter_by(id=tag_id, user_id=current_user.id).first()
+            filepath = mp3_filepath
+            recording.audio_path = filepath
+            recording.file_size = os.path.getsize(filepath)
+            recording.mime_type, _ = mimetypes.guess_type(filepath)
+            recording.status = 'PENDING'
+            db.session.commit()
+        except FileNotFoundError:
+            app.logger.error("ffmpeg command not found. Please ensure ffmpeg is installed and in the system's PATH.")
+            fail_conversion(recording, 'Audio conversion tool (ffmpeg) not found on server.')
+            return None
+        except subprocess.CalledProcessError as e:
+            app.logger.error(f"ffmpeg conversion failed for {filepath}: {e.stderr}")
+            fail_conversion(recording, f'Failed to convert audio file: {e.stderr}')
+            return None
+    elif not filename_lower.endswith(supported_formats):
+        # File is not supported and chunking is not needed - log but don't convert
+        app.logger.info(f"File format {filename_lower} will be processed directly without conversion (chunking not needed)")
+
+    return filepath
+
+def process_upload_task(app_context, recording_id, filepath, original_filename, start_time, **kwargs):
+    """Background task for a new upload: convert the file if needed, then transcribe and summarize it."""
+    with app_context:
+        recording = db.session.get(Recording, recording_id)
+        if not recording:
+            app.logger.error(f"Error: Recording {recording_id} not found for processing.")
+            return
+        live_upload_id = kwargs.get('live_upload_id')
+        upload = db.session.get(UploadSession, live_upload_id) if live_upload_id and live_transcription_enabled() else None
+        if upload and upload.live_chunks:
+            # Live segments are cut from the original file, so only its untranscribed tail is left
+            app.logger.info(f"Skipping conversion of live upload {live_upload_id}, transcribed during the recording")
+        else:
+            try:
+                filepath = convert_upload_if_needed(recording, filepath, original_filename)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Conversion FAILED for recording {recording_id}: {e}", exc_info=True)
+                fail_conversion(db.session.get(Recording, recording_id), f"Audio conversion failed: {e}")
+                return
+    if filepath:
+        transcribe_audio_task(app_context, recording_id, filepath, os.path.basename(filepath), start_time, **kwargs)
+
+def start_uploaded_recording(filepath, original_filename, form, user_id, live_upload_id=None):
+    """
+    Turn a file saved in the upload folder into a recording and start processing it.
+    
+    Creates the Recording with the notes, tags and ASR options from form (the
+    upload form fields, or the same fields stored with a resumable upload) and
+    starts the background task, which converts the file if needed and reuses the
+    segments transcribed during a live upload (live_upload_id).
+    
+    Returns:
+        The new recording
+    """
+    # Size and MIME type of the uploaded file; updated if it gets converted
+    final_file_size = os.path.getsize(filepath)
+    mime_type, _ = mimetypes.guess_type(filepath)
+
+    # Get notes from the form
+    notes = form.get('notes')
+
+    # Get selected tags if provided (multiple tags support)
+    selected_tags = []
+    tag_index = 0
+    while True:
+        tag_id_key = f'tag_ids[{tag_index}]'
+        tag_id = form.get(tag_id_key)
+        if not tag_id:
+            break
+
+        tag = Tag.query.filter_by(id=tag_id, user_id=user_id).first()
+        if tag:
+            selected_tags.append(tag)
+        tag_index += 1
+
+    # For backward compatibility with single tag uploads
+    if not selected_tags:
+        single_tag_id = form.get('tag_id')
+        if single_tag_id:
+            tag = Tag.query.filter_by(id=single_tag_id, user_id=user_id).first()
             if tag:
                 selected_tags.append(tag)
-            tag_index += 1
-        
-        # For backward compatibility with single tag uploads
-        if not selected_tags:
-            single_tag_id = request.form.get('tag_id')
-            if single_tag_id:
-                tag = Tag.query.filter_by(id=single_tag_id, user_id=current_user.id).first()
-                if tag:
-                    selected_tags.append(tag)
-        
-        # Get ASR advanced options if provided
-        language = request.form.get('language', '')
-        min_speakers = request.form.get('min_speakers') or None
-        max_speakers = request.form.get('max_speakers') or None
-        
-        # Convert to int if provided
-        if min_speakers:
-            try:
-                min_speakers = int(min_speakers)
-            except (ValueError, TypeError):
-                min_speakers = None
-        if max_speakers:
-            try:
-                max_speakers = int(max_speakers)
-            except (ValueError, TypeError):
-                max_speakers = None
-        
-        # Apply precedence hierarchy: user input > tag defaults > environment variables > auto-detect
-        
-        # Apply tag defaults if tags are selected and values are not explicitly provided by user
-        # Use first tag's defaults (highest priority)
-        if selected_tags:
-            first_tag = selected_tags[0]
-            if not language and first_tag.default_language:
-                language = first_tag.default_language
-            if min_speakers is None and first_tag.default_min_speakers:
-                min_speakers = first_tag.default_min_speakers
-            if max_speakers is None and first_tag.default_max_speakers:
-                max_speakers = first_tag.default_max_speakers
-        
-        # Apply environment variable defaults if still no values are set
-        if min_speakers is None and ASR_MIN_SPEAKERS:
-            try:
-                min_speakers = int(ASR_MIN_SPEAKERS)
-            except (ValueError, TypeError):
-                min_speakers = None
-        if max_speakers is None and ASR_MAX_SPEAKERS:
-            try:
-                max_speakers = int(ASR_MAX_SPEAKERS)
-            except (ValueError, TypeError):
-                max_speakers = None
-
-        # Create initial database entry
-        now = datetime.utcnow()
-        recording = Recording(
-            audio_path=filepath,
-            original_filename=original_filename,
-            title=f"Recording - {original_filename}",
-            file_size=final_file_size,
-            status='PENDING',
-            meeting_date=now.date(),
-            user_id=current_user.id,
-            mime_type=mime_type,
-            notes=notes,
-            processing_source='upload'  # Track that this was manually uploaded
+
+    # Get ASR advanced options if provided
+    language = form.get('language', '')
+    min_speakers = form.get('min_speakers') or None
+    max_speakers = form.get('max_speakers') or None
+
+    # Convert to int if provided
+    if min_speakers:
+        try:
+            min_speakers = int(min_speakers)
+        except (ValueError, TypeError):
+            min_speakers = None
+    if max_speakers:
+        try:
+            max_speakers = int(max_speakers)
+        except (ValueError, TypeError):
+            max_speakers = None
+
+    # Apply precedence hierarchy: user input > tag defaults > environment variables > auto-detect
+
+    # Apply tag defaults if tags are selected and values are not explicitly provided by user
+    # Use first tag's defaults (highest priority)
+    if selected_tags:
+        first_tag = selected_tags[0]
+        if not language and first_tag.default_language:
+            language = first_tag.default_language
+        if min_speakers is None and first_tag.default_min_speakers:
+            min_speakers = first_tag.default_min_speakers
+        if max_speakers is None and first_tag.default_max_speakers:
+            max_speakers = first_tag.default_max_speakers
+
+    # Apply environment variable defaults if still no values are set
+    if min_speakers is None and ASR_MIN_SPEAKERS:
+        try:
+            min_speakers = int(ASR_MIN_SPEAKERS)
+        except (ValueError, TypeError):
+            min_speakers = None
+    if max_speakers is None and ASR_MAX_SPEAKERS:
+        try:
+            max_speakers = int(ASR_MAX_SPEAKERS)
+        except (ValueError, TypeError):
+            max_speakers = None
+
+    # Create initial database entry
+    now = datetime.utcnow()
+    recording = Recording(
+        audio_path=filepath,
+        original_filename=original_filename,
+        title=f"Recording - {original_filename}",
+        file_size=final_file_size,
+        status='PENDING',
+        meeting_date=now.date(),
+        user_id=user_id,
+        mime_type=mime_type,
+        notes=notes,
+        processing_source='upload'  # Track that this was manually uploaded
+    )
+    db.session.add(recording)
+    db.session.commit()
+
+    # Add tags to recording if selected (preserve order)
+    for order, tag in enumerate(selected_tags, 1):
+        new_association = RecordingTag(
+            recording_id=recording.id,
+            tag_id=tag.id,
+            order=order,
+            added_at=datetime.utcnow()
         )
-        db.session.add(recording)
+        db.session.add(new_association)
+
+    if selected_tags:
         db.session.commit()
+        tag_names = [tag.name for tag in selected_tags]
+        app.logger.info(f"Added {len(selected_tags)} tags to recording {recording.id}: {', '.join(tag_names)}")
+
+    app.logger.info(f"Initial recording record created with ID: {recording.id}")
+
+    # --- Start transcription & summarization in background thread ---
+    start_time = datetime.utcnow()
+
+    # Pass ASR parameters and first tag to the transcription task (for compatibility with existing functions)
+    first_tag = selected_tags[0] if selected_tags else None
+    if USE_ASR_ENDPOINT:
+        app.logger.info(f"Starting ASR transcription thread for recording {recording.id} with params: language={language}, min_speakers={min_speakers}, max_speakers={max_speakers}, tag_id={first_tag.id if first_tag else None}")
+        thread = threading.Thread(
+            target=process_upload_task,
+            args=(app.app_context(), recording.id, filepath, original_filename, start_time),
+            kwargs={'language': language, 'min_speakers': min_speakers, 'max_speakers': max_speakers, 'tag_id': first_tag.id if first_tag else None}
+        )
+    else:
+        app.logger.info(f"Starting Whisper transcription thread for recording {recording.id} with tag_id={first_tag.id if first_tag else None}")
+        thread = threading.Thread(
+            target=process_upload_task,
+            args=(app.app_context(), recording.id, filepath, original_filename, start_time),
+            kwargs={'tag_id': first_tag.id if first_tag else None, 'live_upload_id': live_upload_id}
+        )
+    thread.start()
+    app.logger.info(f"Background processing thread started for recording ID: {recording.id}")
+
+    return recording
+
+@app.route('/upload', methods=['POST'])
+@login_required
+def upload_file():
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+
+        original_filename = file.filename
+        safe_filename = secure_filename(original_filename)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{safe_filename}")
+
+        # Get original file size
+        file.seek(0, os.SEEK_END)
+        original_file_size = file.tell()
+        file.seek(0)
+
+        # Check size limit before saving - only enforce if chunking is disabled or using ASR endpoint
+        max_upload_size = upload_size_limit()
         
-        # Add tags to recording if selected (preserve order)
-        for order, tag in enumerate(selected_tags, 1):
-            new_association = RecordingTag(
-                recording_id=recording.id,
-                tag_id=tag.id,
-                order=order,
-                added_at=datetime.utcnow()
-            )
-            db.session.add(new_association)
-        
-        if selected_tags:
-            db.session.commit()
-            tag_names = [tag.name for tag in selected_tags]
-            app.logger.info(f"Added {len(selected_tags)} tags to recording {recording.id}: {', '.join(tag_names)}")
+        # Skip size check if chunking is enabled and using OpenAI Whisper API
+        if max_upload_size is None:
+            # Get chunking mode for better logging
+            mode, limit_value = chunking_service.parse_chunk_limit()
+            if mode == 'size':
+                app.logger.info(f"Size-based chunking enabled ({limit_value}MB limit) - skipping {original_file_size/1024/1024:.1f}MB size limit check")
+            else:
+                app.logger.info(f"Duration-based chunking enabled ({limit_value}s limit) - skipping {original_file_size/1024/1024:.1f}MB size limit check")
         
-        app.logger.info(f"Initial recording record created with ID: {recording.id}")
+        if max_upload_size and original_file_size > max_upload_size:
+            raise RequestEntityTooLarge()
 
-        # --- Start transcription & summarization in background thread ---
-        start_time = datetime.utcnow()
-        
-        # Pass ASR parameters and first tag to the transcription task (for compatibility with existing functions)
-        first_tag = selected_tags[0] if selected_tags else None
-        if USE_ASR_ENDPOINT:
-            app.logger.info(f"Starting ASR transcription thread for recording {recording.id} with params: language={language}, min_speakers={min_speakers}, max_speakers={max_speakers}, tag_id={first_tag.id if first_tag else None}")
-            thread = threading.Thread(
-                target=transcribe_audio_task,
-                args=(app.app_context(), recording.id, filepath, os.path.basename(filepath), start_time),
-                kwargs={'language': language, 'min_speakers': min_speakers, 'max_speakers': max_speakers, 'tag_id': first_tag.id if first_tag else None}
-            )
-        else:
-            app.logger.info(f"Starting Whisper transcription thread for recording {recording.id} with tag_id={first_tag.id if first_tag else None}")
-            thread = threading.Thread(
-                target=transcribe_audio_task,
-                args=(app.app_context(), recording.id, filepath, os.path.basename(filepath), start_time),
-                kwargs={'tag_id': first_tag.id if first_tag else None}
-            )
-        thread.start()
-        app.logger.info(f"Background processing thread started for recording ID: {recording.id}")
+        file.save(filepath)
+        app.logger.info(f"File saved to {filepath}")
 
+        # Conversion and transcription happen in the background
+        recording = start_uploaded_recording(filepath, original_filename, request.form, current_user.id)
         return jsonify(recording.to_dict()), 202
 
     except RequestEntityTooLarge:
@@ -6504,14 +8623,347 @@ def upload_file():
         return jsonify({'error': 'An unexpected error occurred during upload.'}), 500
 
 
+# --- Resumable Uploads ---
+# Protocol: POST /api/uploads opens a session, PUT /api/uploads/<id> with a
+# Content-Range header appends the next byte range, GET returns the offset to
+# resume from, and POST /api/uploads/<id>/complete creates the recording.
+upload_hashes = UploadHashes()
+
+def get_user_upload(upload_id):
+    """Upload session of the current user, or None."""
+    return UploadSession.query.filter_by(id=upload_id, user_id=current_user.id).first()
+
+def upload_too_large_response():
+    max_size_mb = app.config['MAX_CONTENT_LENGTH'] / (1024 * 1024)
+    return jsonify({
+        'error': f'File too large. Maximum size is {max_size_mb:.0f} MB.',
+        'max_size_mb': max_size_mb
+    }), 413
+
+@app.route('/api/uploads', methods=['POST'])
+@login_required
+def create_upload_session():
+    """
+    Open a resumable upload.
+    
+    JSON body: filename, size (bytes) and optionally fields, an object with the
+    same fields as the /upload form (notes, tag_ids[0], language, ...). An
+    Idempotency-Key header (or idempotency_key field) makes retries return the
+    existing session instead of opening a new one. With live set instead of
+    size, the upload grows until it is completed (a recording in progress).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        filename = (data.get('filename') or '').strip()
+        live = bool(data.get('live'))
+        size = 0 if live else data.get('size')
+        if not filename:
+            return jsonify({'error': 'filename is required'}), 400
+        if not live and (not isinstance(size, int) or size <= 0):
+            return jsonify({'error': 'size must be a positive number of bytes'}), 400
+        
+        idempotency_key = (request.headers.get('Idempotency-Key') or data.get('idempotency_key') or '').strip() or None
+        if idempotency_key:
+            if len(idempotency_key) > 100:
+                return jsonify({'error': 'Idempotency key must be at most 100 characters'}), 400
+            existing = UploadSession.query.filter_by(user_id=current_user.id, idempotency_key=idempotency_key).first()
+            if existing:
+                return jsonify(existing.to_dict())
+        
+        max_upload_size = upload_size_limit()
+        if max_upload_size and size > max_upload_size:
+            return upload_too_large_response()
+        
+        fields = data.get('fields') or {}
+        if not isinstance(fields, dict):
+            return jsonify({'error': 'fields must be an object'}), 400
+        
+        safe_filename = secure_filename(filename)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{secrets.token_hex(4)}_{safe_filename}")
+        upload = UploadSession(
+            user_id=current_user.id,
+            idempotency_key=idempotency_key,
+            original_filename=filename,
+            file_path=filepath,
+            total_size=size,
+            live=live,
+            options=json.dumps({key: str(value) for key, value in fields.items() if value is not None})
+        )
+        # Ranges are written into this file in place, so completing is a rename
+        open(upload.part_path, 'wb').close()
+        db.session.add(upload)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent retry with the same key won the race
+            db.session.rollback()
+            os.remove(upload.part_path)
+            existing = UploadSession.query.filter_by(user_id=current_user.id, idempotency_key=idempotency_key).first()
+            return jsonify(existing.to_dict())
+        
+        app.logger.info(f"Opened upload session {upload.id} for {filename} ({size} bytes)")
+        return jsonify(upload.to_dict()), 201
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Error opening upload session: {e}", exc_info=True)
+        return jsonify({'error': 'An unexpected error occurred during upload.'}), 500
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_upload_session(upload_id):
+    """State of an upload, including the offset to resume from."""
+    upload = get_user_upload(upload_id)
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(upload.to_dict())
+
+def append_upload_range(upload, start, end):
+    """
+    Write the request body of a PUT range into an upload's part file.
+    
+    Runs under the part file's flock, which serializes the ranges of one upload
+    across all worker processes, so the committed offset read here cannot move
+    until this range has been written and recorded.
+    
+    Returns:
+        A 409 response if the range cannot be appended, otherwise None
+    """
+    with part_file_lock(upload.part_path):
+        if not os.path.exists(upload.part_path):
+            # Moved or deleted by the request that held the lock before us
+            raise FileNotFoundError(upload.part_path)
+        db.session.refresh(upload)
+        if upload.status != 'uploading':
+            return jsonify({'error': f'Upload is {upload.status}', **upload.to_dict()}), 409
+        offset = upload.received_bytes
+        if start > offset:
+            return jsonify({'error': 'Range does not continue at the current offset', **upload.to_dict()}), 409
+        if end < offset:
+            return None
+        
+        # Skip the part of a retried range that is already on disk
+        skip = offset - start
+        while skip > 0:
+            block = request.stream.read(min(skip, 1024 * 1024))
+            if not block:
+                break
+            skip -= len(block)
+        
+        hasher = upload_hashes.at_offset(upload.id, upload.part_path, offset)
+        written = write_range(upload.part_path, offset, request.stream, end - offset + 1, hasher)
+        
+        # The lock makes a concurrent move unlikely; the condition still guards against one
+        values = {'received_bytes': offset + written, 'updated_at': datetime.utcnow()}
+        if upload.live:
+            values['total_size'] = offset + written
+        result = db.session.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload.id, UploadSession.received_bytes == offset)
+            .values(**values)
+        )
+        db.session.commit()
+        if result.rowcount != 1:
+            db.session.refresh(upload)
+            return jsonify({'error': 'Upload was modified concurrently', **upload.to_dict()}), 409
+        upload_hashes.store(upload.id, offset + written, hasher)
+    return None
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+@login_required
+def put_upload_range(upload_id):
+    """
+    Append a byte range (Content-Range: bytes start-end/total) to an upload.
+    
+    Ranges must continue at the current offset; a retried range that was already
+    received is acknowledged without being written again. The response carries
+    the new offset, which is short of the range end if the body was cut off.
+    Live uploads take open-ended ranges (bytes start-end/*) and start
+    transcribing completed segments in the background.
+    """
+    try:
+        upload = get_user_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        content_range = parse_content_range(request.headers.get('Content-Range'))
+        if content_range is None:
+            return jsonify({'error': 'A valid Content-Range header (bytes start-end/total) is required'}), 400
+        start, end, total = content_range
+        if upload.live:
+            max_upload_size = upload_size_limit()
+            if max_upload_size and end >= max_upload_size:
+                return upload_too_large_response()
+        elif (total is not None and total != upload.total_size) or end >= upload.total_size:
+            return jsonify({'error': 'Content-Range does not match the upload size'}), 400
+        
+        # End the read transaction opened above so the offset is read under the lock
+        db.session.commit()
+        try:
+            response = append_upload_range(upload, start, end)
+        except FileNotFoundError:
+            # Completed or cancelled by another request while this range was on its way
+            db.session.rollback()
+            upload = get_user_upload(upload_id)
+            if not upload:
+                return jsonify({'error': 'Upload not found'}), 404
+            return jsonify({'error': f'Upload is {upload.status}', **upload.to_dict()}), 409
+        if response is not None:
+            return response
+        
+        if upload.live and live_transcription_enabled() and live_transcriptions.due(upload.id):
+            threading.Thread(target=live_transcription_task, args=(app.app_context(), upload.id)).start()
+        db.session.refresh(upload)
+        return jsonify(upload.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Error writing range for upload {upload_id}: {e}", exc_info=True)
+        return jsonify({'error': 'An unexpected error occurred during upload.'}), 500
+
+def release_upload_claim(upload_id, recording=None):
+    """
+    Recover an upload whose completion failed after the session was claimed.
+    
+    If its recording was created and started, the upload is marked completed
+    with it. Otherwise the assembled file is moved back, a recording row left
+    by the failed attempt is dropped and the session returns to 'uploading',
+    so the client can retry the completion instead of getting 409 until the
+    session expires.
+    """
+    try:
+        upload = db.session.get(UploadSession, upload_id)
+        if not upload or upload.status != 'completing':
+            return
+        if recording is not None:
+            upload.status = 'completed'
+            upload.recording_id = recording.id
+        else:
+            for orphan in Recording.query.filter_by(user_id=upload.user_id, audio_path=upload.file_path).all():
+                db.session.delete(orphan)
+            if os.path.exists(upload.file_path) and not os.path.exists(upload.part_path):
+                os.replace(upload.file_path, upload.part_path)
+            upload.status = 'uploading'
+        upload.updated_at = datetime.utcnow()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Could not release upload {upload_id} after a failed completion: {e}", exc_info=True)
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_upload_session(upload_id):
+    """
+    Finish an upload and create its recording, like POST /upload.
+    
+    An optional sha256 in the JSON body is checked against the hash computed
+    while the ranges arrived; on mismatch the upload restarts from offset 0.
+    Optional fields in the body replace the form fields given when the upload
+    was opened. Completing an already completed upload returns its recording again.
+    """
+    claimed = False
+    recording = None
+    try:
+        upload = get_user_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        if upload.status == 'completed':
+            recording = db.session.get(Recording, upload.recording_id) if upload.recording_id else None
+            if not recording:
+                return jsonify({'error': 'The recording created by this upload no longer exists'}), 410
+            return jsonify(recording.to_dict())
+        if upload.received_bytes != upload.total_size or upload.received_bytes == 0:
+            return jsonify({'error': 'Upload is incomplete', **upload.to_dict()}), 409
+        data = request.get_json(silent=True) or {}
+        fields = data.get('fields')
+        if fields is not None and not isinstance(fields, dict):
+            return jsonify({'error': 'fields must be an object'}), 400
+        
+        # Claim the session so a retried request cannot create a second recording
+        claimed = db.session.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload.id, UploadSession.status == 'uploading')
+            .values(status='completing', updated_at=datetime.utcnow())
+        ).rowcount == 1
+        db.session.commit()
+        db.session.refresh(upload)
+        if not claimed:
+            return jsonify({'error': f'Upload is {upload.status}', **upload.to_dict()}), 409
+        
+        # Waits for a range still being written by another request
+        with part_file_lock(upload.part_path):
+            sha256 = upload_hashes.at_offset(upload.id, upload.part_path, upload.total_size).hexdigest()
+            upload_hashes.discard(upload.id)
+            expected = (data.get('sha256') or '').strip().lower()
+            if expected and expected != sha256:
+                # Corrupted in transit: start over rather than transcribe a damaged file
+                open(upload.part_path, 'wb').close()
+                upload.received_bytes = 0
+                upload.status = 'uploading'
+                db.session.commit()
+                app.logger.warning(f"Checksum mismatch for upload {upload.id}; restarting from offset 0")
+                return jsonify({'error': 'Checksum mismatch; upload the file again', **upload.to_dict()}), 422
+            
+            os.replace(upload.part_path, upload.file_path)
+        app.logger.info(f"Upload {upload.id} assembled at {upload.file_path} (sha256 {sha256})")
+        
+        if fields is not None:
+            upload.options = json.dumps({key: str(value) for key, value in fields.items() if value is not None})
+        recording = start_uploaded_recording(upload.file_path, upload.original_filename,
+                                             json.loads(upload.options or '{}'), current_user.id,
+                                             live_upload_id=upload.id if upload.live else None)
+        upload.status = 'completed'
+        upload.sha256 = sha256
+        upload.recording_id = recording.id
+        db.session.commit()
+        return jsonify(recording.to_dict()), 202
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Error completing upload {upload_id}: {e}", exc_info=True)
+        if claimed:
+            release_upload_claim(upload_id, recording)
+        return jsonify({'error': 'An unexpected error occurred during upload.'}), 500
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+@login_required
+def cancel_upload_session(upload_id):
+    """Cancel an unfinished upload (e.g. a discarded live recording) and delete the received data."""
+    try:
+        upload = get_user_upload(upload_id)
+        if not upload:
+            return jsonify({'error': 'Upload not found'}), 404
+        if upload.status != 'uploading':
+            return jsonify({'error': f'Upload is {upload.status}', **upload.to_dict()}), 409
+        
+        try:
+            # Ranges waiting for the lock find the part file gone and give up
+            with part_file_lock(upload.part_path):
+                os.remove(upload.part_path)
+        except FileNotFoundError:
+            pass
+        db.session.delete(upload)
+        db.session.commit()
+        upload_hashes.discard(upload_id)
+        live_transcriptions.discard(upload_id)
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Error cancelling upload {upload_id}: {e}", exc_info=True)
+        return jsonify({'error': 'An unexpected error occurred.'}), 500
+
 # Status Endpoint
 @app.route('/status/<int:recording_id>', methods=['GET'])
 @login_required
 @limiter.limit("1250 per hour")  # Allow frequent polling for status checks
 def get_status(recording_id):
-    """Endpoint to check the transcription/summarization status."""
+    """Endpoint to check the transcription/summarization status (accepts ?fields= or ?view=)."""
     try:
-        recording = db.session.get(Recording, recording_id)
+        fields, error = parse_recording_fields('full')
+        if error:
+            return jsonify({'error': error}), 400
+
+        # Load only the requested columns (plus the owner for the permission check)
+        stmt = select(Recording).where(Recording.id == recording_id).options(
+            *recording_load_options(fields + ('user_id',))
+        ).execution_options(populate_existing=True)
+        recording = db.session.execute(stmt).scalar_one_or_none()
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
@@ -6519,10 +8971,7 @@ def get_status(recording_id):
         if recording.user_id and recording.user_id != current_user.id:
             return jsonify({'error': 'You do not have permission to view this recording'}), 403
 
-        # Ensure events are loaded (refresh the recording to get latest relationships)
-        db.session.refresh(recording)
-
-        return jsonify(recording.to_dict())
+        return jsonify(serialize_recording_list([recording], fields)[0])
     except Exception as e:
         app.logger.error(f"Error fetching status for recording {recording_id}: {e}", exc_info=True)
         return jsonify({'error': 'An unexpected error occurred.'}), 500
@@ -6590,10 +9039,14 @@ def delete_recording(recording_id):
                 app.logger.info(f"Deleting {chunk_count} transcript chunks with embeddings for recording {recording_id}")
 
         # Delete the database record (cascade will handle chunks/embeddings)
+        owner_id = recording.user_id
         db.session.delete(recording)
         db.session.commit()
         app.logger.info(f"Deleted recording record ID: {recording_id}")
         
+        if embedding_index_cache is not None:
+            embedding_index_cache.remove_recording(owner_id, recording_id)
+        
         if ENABLE_INQUIRE_MODE and chunk_count > 0:
             app.logger.info(f"Successfully deleted embeddings and chunks for recording {recording_id}")
 
@@ -6708,7 +9161,7 @@ def inquire_chat():
             return jsonify({'error': 'No data provided'}), 400
         
         user_message = data.get('message')
-        message_history = data.get('message_history', [])
+        session_id = data.get('session_id')
         
         if not user_message:
             return jsonify({'error': 'No message provided'}), 400
@@ -6717,6 +9170,26 @@ def inquire_chat():
         if client is None:
             return jsonify({'error': 'Chat service is not available (OpenRouter client not configured)'}), 503
         
+        # The conversation is held on the server; a new session starts from any history the client sent
+        if session_id:
+            inquire_session = InquireSession.query.filter_by(id=session_id, user_id=current_user.id).first()
+            if not inquire_session:
+                return jsonify({'error': 'Inquire session not found'}), 404
+        else:
+            inquire_session = InquireSession(
+                user_id=current_user.id,
+                filter_tags=json.dumps(data.get('filter_tags', [])),
+                filter_speakers=json.dumps(data.get('filter_speakers', [])),
+                filter_date_from=datetime.fromisoformat(data['filter_date_from']).date() if data.get('filter_date_from') else None,
+                filter_date_to=datetime.fromisoformat(data['filter_date_to']).date() if data.get('filter_date_to') else None,
+                filter_recording_ids=json.dumps(data.get('filter_recording_ids', [])),
+                chat_history=json.dumps(clean_history(data.get('message_history', [])))
+            )
+            db.session.add(inquire_session)
+            db.session.commit()
+        session_id = inquire_session.id
+        history_summary, history = load_chat_history(inquire_session)
+        
         # Build filters from request
         filters = {}
         if data.get('filter_tags'):
@@ -6750,73 +9223,14 @@ def inquire_chat():
             nonlocal user_id, user_name, user_title, user_company, user_output_language, data, filters
             
             try:
+                yield f"data: {json.dumps({'session_id': session_id})}\n\n"
+                
                 # Send initial status
                 yield create_status_response('processing', 'Analyzing your query...')
                 
-                # Step 1: Router - Determine if RAG lookup is needed
-                router_prompt = f"""Analyze this user query to determine if it requires searching through transcription content or if it's a simple formatting/clarification request.
-
-User query: "{user_message}"
-
-Respond with ONLY "RAG" if the query requires searching transcriptions (asking about content, conversations, specific information from recordings).
-Respond with ONLY "DIRECT" if it's a formatting request, clarification about previous responses, or doesn't require searching transcriptions.
-
-Examples:
-- "What did Beth say about the budget?" → RAG
-- "Can you format this in separate headings?" → DIRECT  
-- "Who mentioned the timeline?" → RAG
-- "Make this more structured" → DIRECT"""
-
-                try:
-                    router_response = call_llm_completion(
-                        messages=[
-                            {"role": "system", "content": "You are a query router. Respond with only 'RAG' or 'DIRECT'."},
-                            {"role": "user", "content": router_prompt}
-                        ],
-                        temperature=0.1,
-                        max_tokens=10
-                    )
-                    
-                    route_decision = router_response.choices[0].message.content.strip().upper()
-                    app.logger.info(f"Router decision: {route_decision}")
-                    
-                    if route_decision == "DIRECT":
-                        # Direct response without RAG lookup
-                        yield create_status_response('responding', 'Generating direct response...')
-                        
-                        direct_prompt = f"""You are assisting {user_name}. Respond to their request directly using proper markdown formatting.
-
-User request: "{user_message}"
-
-Previous conversation context (if relevant):
-{json.dumps(message_history[-2:] if message_history else [])}
-
-Use proper markdown formatting including headings (##), bold (**text**), bullet points (-), etc."""
-
-                        stream = call_llm_completion(
-                            messages=[
-                                {"role": "system", "content": direct_prompt},
-                                {"role": "user", "content": user_message}
-                            ],
-                            temperature=0.7,
-                            max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
-                            stream=True
-                        )
-                        
-                        # Use helper function to process streaming with thinking tag support
-                        for response in process_streaming_with_thinking(stream):
-                            yield response
-                        return
-                        
-                except Exception as e:
-                    app.logger.warning(f"Router failed, defaulting to RAG: {e}")
-                
-                # Step 2: Query enrichment - generate better search terms based on user intent
-                yield create_status_response('enriching', 'Enriching search query...')
-                
-                # Use captured user context for personalized search terms
-                
-                enrichment_prompt = f"""You are a query enhancement assistant. Given a user's question about transcribed meetings/recordings, generate 3-5 alternative search terms or phrases that would help find relevant content in a semantic search system.
+                # Query enrichment - generate better search terms based on user intent
+                def enrich_query():
+                    enrichment_prompt = f"""You are a query enhancement assistant. Given a user's question about transcribed meetings/recordings, generate 3-5 alternative search terms or phrases that would help find relevant content in a semantic search system.
 
 User context:
 - Name: {user_name}
@@ -6838,131 +9252,150 @@ Examples:
 - Use their job title and company context when relevant
 
 Respond with only a JSON array of strings: ["term1", "term2", "term3", ...]"""
+                    
+                    try:
+                        enrichment_response = call_llm_completion(
+                            messages=[
+                                {"role": "system", "content": "You are a query enhancement assistant. Respond only with valid JSON arrays of search terms."},
+                                {"role": "user", "content": enrichment_prompt}
+                            ],
+                            temperature=0.3,
+                            max_tokens=200
+                        )
+                        enriched_terms = json.loads(enrichment_response.choices[0].message.content.strip())
+                        app.logger.info(f"Enriched search terms: {enriched_terms}")
+                        return [term for term in enriched_terms[:3] if isinstance(term, str) and term]  # Top 3 enriched terms
+                    except Exception as e:
+                        app.logger.warning(f"Query enrichment failed, using original query: {e}")
+                        return []
                 
-                try:
-                    enrichment_response = call_llm_completion(
-                        messages=[
-                            {"role": "system", "content": "You are a query enhancement assistant. Respond only with valid JSON arrays of search terms."},
-                            {"role": "user", "content": enrichment_prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=200
+                # Step 1: Route locally; when unsure, the LLM router, the enrichment and a
+                # speculative search for the raw question run concurrently
+                has_previous_answer = bool(history_summary) or any(message['role'] == 'assistant' for message in history)
+                route_decision = route_query_locally(user_message, has_previous_answer)
+                router_future = None if route_decision else inquire_executor.submit(route_query_with_llm, user_message)
+                enrichment_future = inquire_executor.submit(enrich_query) if route_decision != DIRECT else None
+                
+                context_chunks = data.get('context_chunks', 8)
+                search_depth = max(8, context_chunks)
+                
+                with app.app_context():
+                    # Speakers named in the question; used as an automatic filter if the plain search misses them
+                    available_speakers = get_user_speaker_names(user_id)
+                    speaker_matcher = name_matcher(tuple(available_speakers))
+                    named_speakers = speaker_matcher.find_in_order(user_message)
+                    
+                    # All filter variants are answered by one batched search over the same query embeddings
+                    filter_variants = {'base': filters}
+                    if named_speakers and not data.get('filter_speakers'):  # Only if no speaker filter already applied
+                        filter_variants['speakers'] = dict(filters, speaker_names=named_speakers)
+                    if 'speaker_names' in filters:
+                        filter_variants['broader'] = {key: value for key, value in filters.items() if key != 'speaker_names'}
+                
+                speculative_future = None
+                if route_decision != DIRECT:
+                    speculative_future = inquire_executor.submit(
+                        run_with_app_context, multi_query_search_chunks, user_id, [user_message], filter_variants, search_depth
                     )
+                if router_future is not None:
+                    route_decision = router_future.result()
+                
+                if route_decision == DIRECT:
+                    # No retrieval needed: drop the work that has not started and ignore the rest
+                    for future in (speculative_future, enrichment_future):
+                        if future is not None:
+                            future.cancel()
                     
-                    enriched_terms = json.loads(enrichment_response.choices[0].message.content.strip())
-                    app.logger.info(f"Enriched search terms: {enriched_terms}")
+                    # Direct response without RAG lookup
+                    yield create_status_response('responding', 'Generating direct response...')
                     
-                    # Combine original query with enriched terms for search
-                    search_queries = [user_message] + enriched_terms[:3]  # Use original + top 3 enriched terms
+                    direct_prompt = f"""You are assisting {user_name}. Respond to their request directly using proper markdown formatting, drawing on the previous conversation where relevant.
+
+Use proper markdown formatting including headings (##), bold (**text**), bullet points (-), etc."""
+
+                    stream = call_llm_completion(
+                        messages=[{"role": "system", "content": direct_prompt}]
+                        + history_messages(history_summary, history)
+                        + [{"role": "user", "content": user_message}],
+                        temperature=0.7,
+                        max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
+                        stream=True
+                    )
                     
-                except Exception as e:
-                    app.logger.warning(f"Query enrichment failed, using original query: {e}")
-                    search_queries = [user_message]
+                    # Use helper function to process streaming with thinking tag support
+                    response_parts = []
+                    for response in process_streaming_with_thinking(stream, response_parts):
+                        yield response
+                    with app.app_context():
+                        save_chat_exchange(InquireSession, session_id, user_message, ''.join(response_parts))
+                    return
+                
+                yield create_status_response('enriching', 'Enriching search query...')
+                enriched_terms = enrichment_future.result()
+                search_queries = [user_message] + enriched_terms
                 
                 # Step 2: Semantic search with multiple queries
                 yield create_status_response('searching', 'Searching transcriptions...')
                 
-                all_chunks = []
-                seen_chunk_ids = set()
+                variant_results = speculative_future.result()
+                if enriched_terms:
+                    # Only the enriched terms are searched now; max fusion lets the two result sets merge exactly
+                    with app.app_context():
+                        enriched_results = multi_query_search_chunks(user_id, enriched_terms, filter_variants, search_depth)
+                    variant_results = {
+                        name: merge_fused_results([variant_results[name], enriched_results[name]], key=lambda chunk: chunk.id)
+                        for name in filter_variants
+                    }
                 
                 for query in search_queries:
-                    with app.app_context():
-                        chunk_results = semantic_search_chunks(user_id, query, filters, 8)
-                        app.logger.info(f"Search query '{query}' returned {len(chunk_results)} chunks")
-                    
-                    for chunk, similarity in chunk_results:
-                        if chunk and chunk.id not in seen_chunk_ids:
-                            all_chunks.append((chunk, similarity))
-                            seen_chunk_ids.add(chunk.id)
+                    matched_count = sum(1 for _, _, matched in variant_results['base'] if query in matched)
+                    app.logger.info(f"Search query '{query}' returned {matched_count} chunks")
                 
-                # Sort by similarity and take top results
-                all_chunks.sort(key=lambda x: x[1], reverse=True)
-                chunk_results = all_chunks[:data.get('context_chunks', 8)]
+                all_chunks = [(chunk, similarity) for chunk, similarity, _ in variant_results['base']]
+                chunk_results = all_chunks[:context_chunks]
                 
                 app.logger.info(f"Final chunk results: {len(chunk_results)} chunks with similarities: {[f'{s:.3f}' for _, s in chunk_results]}")
                 
-                # Step 2.5: Auto-detect mentioned speakers and apply filters if needed
-                with app.app_context():
-                    # Get available speakers
-                    recordings_with_participants = Recording.query.filter_by(user_id=user_id).filter(
-                        Recording.participants.isnot(None),
-                        Recording.participants != ''
-                    ).all()
-                    
-                    available_speakers = set()
-                    for recording in recordings_with_participants:
-                        if recording.participants:
-                            participants = [p.strip() for p in recording.participants.split(',') if p.strip()]
-                            available_speakers.update(participants)
+                # Step 2.5: Apply the speaker filter if mentioned speakers are missing from the results
+                speakers_in_results = set()
+                if named_speakers:
+                    for chunk, _ in chunk_results:
+                        if chunk:
+                            speakers_in_results |= speaker_matcher.find(chunk.speaker_name)
+                            if chunk.recording:
+                                speakers_in_results |= speaker_matcher.find(chunk.recording.participants)
+                mentioned_speakers = [speaker for speaker in named_speakers if speaker not in speakers_in_results]
+                
+                if mentioned_speakers and 'speakers' in filter_variants:
+                    app.logger.info(f"Auto-detected mentioned speakers not in results: {mentioned_speakers}")
+                    yield create_status_response('filtering', f'Detected mention of {", ".join(mentioned_speakers)}, applying speaker filter...')
                     
-                    # Check if any speakers are mentioned in the user query but missing from results
-                    mentioned_speakers = []
-                    for speaker in available_speakers:
-                        if speaker.lower() in user_message.lower():
-                            # Check if this speaker appears in current chunk results
-                            speaker_in_results = False
-                            for chunk, _ in chunk_results:
-                                if chunk and (
-                                    (chunk.speaker_name and speaker.lower() in chunk.speaker_name.lower()) or
-                                    (chunk.recording and chunk.recording.participants and speaker.lower() in chunk.recording.participants.lower())
-                                ):
-                                    speaker_in_results = True
-                                    break
-                            
-                            if not speaker_in_results:
-                                mentioned_speakers.append(speaker)
+                    auto_filtered_chunks = variant_results['speakers']
+                    app.logger.info(f"Auto-filtered search with speakers {named_speakers} returned {len(auto_filtered_chunks)} chunks")
                     
-                    # If we found mentioned speakers not in results, automatically apply speaker filter
-                    if mentioned_speakers and not data.get('filter_speakers'):  # Only if no speaker filter already applied
-                        app.logger.info(f"Auto-detected mentioned speakers not in results: {mentioned_speakers}")
-                        yield create_status_response('filtering', f'Detected mention of {", ".join(mentioned_speakers)}, applying speaker filter...')
-                        
-                        # Apply automatic speaker filter
-                        auto_filters = filters.copy()
-                        auto_filters['speaker_names'] = mentioned_speakers
-                        
-                        # Re-run semantic search with speaker filter
-                        auto_filtered_chunks = []
-                        auto_filtered_seen_ids = set()
-                        
-                        for query in search_queries:
-                            with app.app_context():
-                                auto_filtered_results = semantic_search_chunks(user_id, query, auto_filters, data.get('context_chunks', 8))
-                                app.logger.info(f"Auto-filtered search for '{query}' with speakers {mentioned_speakers} returned {len(auto_filtered_results)} chunks")
-                            
-                            for chunk, similarity in auto_filtered_results:
-                                if chunk and chunk.id not in auto_filtered_seen_ids:
-                                    auto_filtered_chunks.append((chunk, similarity))
-                                    auto_filtered_seen_ids.add(chunk.id)
-                        
-                        # If auto-filter found better results, use them
-                        if len(auto_filtered_chunks) > 0:
-                            auto_filtered_chunks.sort(key=lambda x: x[1], reverse=True)
-                            chunk_results = auto_filtered_chunks[:data.get('context_chunks', 8)]
-                            app.logger.info(f"Auto speaker filter found {len(chunk_results)} relevant chunks, using filtered results")
-                            filters = auto_filters  # Update filters for context building
+                    # If auto-filter found better results, use them
+                    if len(auto_filtered_chunks) > 0:
+                        chunk_results = [(chunk, similarity) for chunk, similarity, _ in auto_filtered_chunks[:context_chunks]]
+                        app.logger.info(f"Auto speaker filter found {len(chunk_results)} relevant chunks, using filtered results")
+                        filters = filter_variants['speakers']  # Update filters for context building
                 
-                # Step 3: Evaluate results and re-query if needed
+                # Step 3: Evaluate results and fall back to a broader search if needed
                 if len(chunk_results) < 2:  # If we got very few results, try a broader search
                     yield create_status_response('requerying', 'Expanding search scope...')
                     
-                    # Try without speaker filter if it was applied
-                    broader_filters = filters.copy()
-                    if 'speaker_names' in broader_filters:
-                        del broader_filters['speaker_names']
+                    # Drop the speaker filter if it was applied
+                    if 'speaker_names' in filters:
                         app.logger.info("Retrying search without speaker filter...")
                         
-                        for query in search_queries:
-                            with app.app_context():
-                                chunk_results_broader = semantic_search_chunks(user_id, query, broader_filters, 6)
-                            for chunk, similarity in chunk_results_broader:
-                                if chunk and chunk.id not in seen_chunk_ids:
-                                    all_chunks.append((chunk, similarity))
-                                    seen_chunk_ids.add(chunk.id)
+                        seen_chunk_ids = {chunk.id for chunk, _ in all_chunks}
+                        for chunk, similarity, _ in variant_results.get('broader', []):
+                            if chunk.id not in seen_chunk_ids:
+                                all_chunks.append((chunk, similarity))
+                                seen_chunk_ids.add(chunk.id)
                         
                         # Re-sort and limit
                         all_chunks.sort(key=lambda x: x[1], reverse=True)
-                        chunk_results = all_chunks[:data.get('context_chunks', 8)]
+                        chunk_results = all_chunks[:context_chunks]
                         app.logger.info(f"Broader search returned {len(chunk_results)} total chunks")
                 
                 # Build context from retrieved chunks
@@ -7021,11 +9454,9 @@ Respond with only a JSON array of strings: ["term1", "term2", "term3", ...]"""
                         if prev_chunk_index is not None and chunk.chunk_index != prev_chunk_index + 1:
                             context_piece += "\\n[... gap in transcript - non-consecutive chunks ...]\\n\\n"
                         
-                        # Add speaker information if available
+                        # Diarized chunks already label every speaker turn in their content
                         speaker_info = ""
-                        if chunk.speaker_name:
-                            speaker_info = f"{chunk.speaker_name}: "
-                        elif chunk.start_time is not None:
+                        if not chunk.speaker_name and chunk.start_time is not None:
                             speaker_info = f"[{chunk.start_time:.1f}s]: "
                         
                         # Add timing info if available
@@ -7066,38 +9497,18 @@ Respond with only a JSON array of strings: ["term1", "term2", "term3", ...]"""
                 
                 context_text = "\n\n".join(context_pieces) if context_pieces else "No relevant context found."
                 
-                # Get transcript length limit setting and available speakers
+                # Get transcript length limit setting (available speakers were loaded for mention detection)
                 with app.app_context():
                     transcript_limit = SystemSetting.get_setting('transcript_length_limit', 30000)
-                    
-                    # Get all available speakers for this user
-                    recordings_with_participants = Recording.query.filter_by(user_id=user_id).filter(
-                        Recording.participants.isnot(None),
-                        Recording.participants != ''
-                    ).all()
-                    
-                    available_speakers = set()
-                    for recording in recordings_with_participants:
-                        if recording.participants:
-                            participants = [p.strip() for p in recording.participants.split(',') if p.strip()]
-                            available_speakers.update(participants)
-                    
-                    available_speakers = sorted(list(available_speakers))
                 
+                # The system prompt only changes with the user's speakers; the per-question context is sent
+                # last, so the system prompt and conversation history form a stable, cacheable prefix
                 system_prompt = f"""You are a professional meeting and audio transcription analyst assisting {user_name}, who is a(n) {user_title} at {user_company}. {language_instruction}
 
-You are analyzing transcriptions from multiple recordings{filter_text}. The following context has been retrieved based on semantic similarity to the user's question:
-
-<<start context>>
-{context_text}
-<<end context>>
-
-The system has automatically analyzed your query and retrieved the most relevant context from your transcriptions. The search returned {len(chunk_results)} chunks from {len(recording_ids_in_context)} recording(s).
+You are analyzing transcriptions from multiple recordings. Before each question, the system automatically analyzes the query and provides the most relevant context retrieved from the transcriptions by semantic similarity.
 
 **Available speakers in your recordings**: {', '.join(available_speakers) if available_speakers else 'None available'}
 
-**Recording IDs in context**: {list(recording_ids_in_context)}
-
 IMPORTANT FORMATTING INSTRUCTIONS:
 You MUST use proper markdown formatting in your responses. Structure your response as follows:
 
@@ -7128,11 +9539,23 @@ Brief summary with **key points** highlighted...
 
 Order your response with notes from the most recent meetings first. Always use proper markdown formatting and structure by source recording for maximum clarity and readability."""
         
-                # Prepare messages array
-                messages = [{"role": "system", "content": system_prompt}]
-                if message_history:
-                    messages.extend(message_history)
-                messages.append({"role": "user", "content": user_message})
+                def build_messages(context):
+                    context_prompt = f"""Context for the next question, from transcriptions{filter_text}:
+
+<<start context>>
+{context}
+<<end context>>
+
+The search returned {len(chunk_results)} chunks from {len(recording_ids_in_context)} recording(s).
+
+**Recording IDs in context**: {list(recording_ids_in_context)}"""
+                    return (
+                        [{"role": "system", "content": system_prompt}]
+                        + history_messages(history_summary, history)
+                        + [{"role": "system", "content": context_prompt}, {"role": "user", "content": user_message}]
+                    )
+                
+                messages = build_messages(context_text)
 
                 # Enable streaming
                 stream = call_llm_completion(
@@ -7142,133 +9565,70 @@ Order your response with notes from the most recent meetings first. Always use p
                     stream=True
                 )
                 
-                # Buffer content to detect full transcript requests
-                response_buffer = ""
-                
-                # Buffer content to detect full transcript requests
-                response_buffer = ""
-                content_buffer = ""
-                in_thinking = False
-                thinking_buffer = ""
+                # The model may answer with a request for a full transcript instead
+                processor = StreamProcessor(
+                    detectors={'full_transcript': MarkerLineDetector("REQUEST_FULL_TRANSCRIPT:")},
+                    flush_interval=STREAM_FLUSH_INTERVAL_MS / 1000,
+                    flush_chars=STREAM_FLUSH_CHARS
+                )
+                for frame in processor.frames(stream):
+                    yield frame
                 
-                for chunk in stream:
-                    content = chunk.choices[0].delta.content
-                    if content:
-                        response_buffer += content
-                        content_buffer += content
+                if processor.detected:
+                    _, requested_id = processor.detected
+                    try:
+                        recording_id = int(requested_id)
+                    except ValueError:
+                        app.logger.warning(f"Invalid transcript request format: {requested_id}")
+                        recording_id = None
+                    
+                    if recording_id is None:
+                        # Continue with normal streaming
+                        for frame in processor.frames(stream):
+                            yield frame
+                    else:
+                        app.logger.info(f"Agent requested full transcript for recording {recording_id}")
                         
-                        # Check if this is a full transcript request
-                        if response_buffer.strip().startswith("REQUEST_FULL_TRANSCRIPT:"):
-                            lines = response_buffer.split('\n')
-                            request_line = lines[0].strip()
-                            
-                            if ':' in request_line:
-                                try:
-                                    recording_id = int(request_line.split(':')[1])
-                                    app.logger.info(f"Agent requested full transcript for recording {recording_id}")
-                                    
-                                    # Fetch full transcript
-                                    yield create_status_response('fetching', f'Retrieving full transcript for recording {recording_id}...')
-                                    
-                                    with app.app_context():
-                                        recording = db.session.get(Recording, recording_id)
-                                        if recording and recording.user_id == user_id and recording.transcription:
-                                            # Apply transcript length limit
-                                            if transcript_limit == -1:
-                                                full_transcript = recording.transcription
-                                            else:
-                                                full_transcript = recording.transcription[:transcript_limit]
-                                            
-                                            # Add full transcript to context
-                                            full_context = f"{context_text}\n\n<<FULL TRANSCRIPT - {recording.title}>>\n{full_transcript}\n<<END FULL TRANSCRIPT>>"
-                                            
-                                            # Update system prompt with full transcript
-                                            updated_system_prompt = system_prompt.replace(
-                                                f"<<start context>>\n{context_text}\n<<end context>>",
-                                                f"<<start context>>\n{full_context}\n<<end context>>"
-                                            )
-                                            
-                                            # Create new messages with updated context
-                                            updated_messages = [{"role": "system", "content": updated_system_prompt}]
-                                            if message_history:
-                                                updated_messages.extend(message_history)
-                                            updated_messages.append({"role": "user", "content": user_message})
-                                            
-                                            # Generate new response with full context
-                                            yield create_status_response('responding', 'Analyzing full transcript...')
-                                            
-                                            new_stream = call_llm_completion(
-                                                messages=updated_messages,
-                                                temperature=0.7,
-                                                max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
-                                                stream=True
-                                            )
-                                            
-                                            # Use helper function to process streaming with thinking tag support
-                                            for response in process_streaming_with_thinking(new_stream):
-                                                yield response
-                                            return
-                                        else:
-                                            # Recording not found or no permission
-                                            error_msg = f"\n\nError: Unable to access full transcript for recording {recording_id}. Recording may not exist or you may not have permission."
-                                            yield f"data: {json.dumps({'delta': error_msg})}\n\n"
-                                            yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
-                                            return
-                                            
-                                except (ValueError, IndexError):
-                                    app.logger.warning(f"Invalid transcript request format: {request_line}")
-                                    # Continue with normal streaming
-                                    pass
+                        # Fetch full transcript
+                        yield create_status_response('fetching', f'Retrieving full transcript for recording {recording_id}...')
                         
-                        # Process the buffer to detect and handle thinking tags
-                        while True:
-                            if not in_thinking:
-                                # Look for opening thinking tag
-                                think_start = re.search(r'<think(?:ing)?>', content_buffer, re.IGNORECASE)
-                                if think_start:
-                                    # Send any content before the thinking tag
-                                    before_thinking = content_buffer[:think_start.start()]
-                                    if before_thinking:
-                                        yield f"data: {json.dumps({'delta': before_thinking})}\n\n"
-                                    
-                                    # Start capturing thinking content
-                                    in_thinking = True
-                                    content_buffer = content_buffer[think_start.end():]
-                                    thinking_buffer = ""
-                                else:
-                                    # No thinking tag found, send accumulated content
-                                    if content_buffer:
-                                        yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
-                                    content_buffer = ""
-                                    break
+                        with app.app_context():
+                            recording = db.session.get(Recording, recording_id)
+                            if recording and recording.user_id == user_id and recording.transcription:
+                                # Apply transcript length limit to the LLM-ready text
+                                full_transcript = get_formatted_transcription(recording)
+                                if transcript_limit != -1:
+                                    full_transcript = full_transcript[:transcript_limit]
+                                
+                                # Add full transcript to context
+                                full_context = f"{context_text}\n\n<<FULL TRANSCRIPT - {recording.title}>>\n{full_transcript}\n<<END FULL TRANSCRIPT>>"
+                                updated_messages = build_messages(full_context)
+                                
+                                # Generate new response with full context
+                                yield create_status_response('responding', 'Analyzing full transcript...')
+                                
+                                new_stream = call_llm_completion(
+                                    messages=updated_messages,
+                                    temperature=0.7,
+                                    max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
+                                    stream=True
+                                )
+                                
+                                # Use helper function to process streaming with thinking tag support
+                                response_parts = []
+                                for response in process_streaming_with_thinking(new_stream, response_parts):
+                                    yield response
+                                save_chat_exchange(InquireSession, session_id, user_message, ''.join(response_parts))
+                                return
                             else:
-                                # We're inside a thinking tag, look for closing tag
-                                think_end = re.search(r'</think(?:ing)?>', content_buffer, re.IGNORECASE)
-                                if think_end:
-                                    # Capture thinking content up to the closing tag
-                                    thinking_buffer += content_buffer[:think_end.start()]
-                                    
-                                    # Send the thinking content as a special type
-                                    if thinking_buffer.strip():
-                                        yield f"data: {json.dumps({'thinking': thinking_buffer.strip()})}\n\n"
-                                    
-                                    # Continue processing after the closing tag
-                                    in_thinking = False
-                                    content_buffer = content_buffer[think_end.end():]
-                                    thinking_buffer = ""
-                                else:
-                                    # Still inside thinking tag, accumulate content
-                                    thinking_buffer += content_buffer
-                                    content_buffer = ""
-                                    break
+                                # Recording not found or no permission
+                                error_msg = f"\n\nError: Unable to access full transcript for recording {recording_id}. Recording may not exist or you may not have permission."
+                                yield f"data: {json.dumps({'delta': error_msg})}\n\n"
+                                yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
+                                return
                 
-                # Handle any remaining content
-                if in_thinking and thinking_buffer:
-                    # Unclosed thinking tag - send as thinking content
-                    yield f"data: {json.dumps({'thinking': thinking_buffer.strip()})}\n\n"
-                elif content_buffer:
-                    # Regular content
-                    yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
+                with app.app_context():
+                    save_chat_exchange(InquireSession, session_id, user_message, processor.text)
                 
                 yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
                 
@@ -7314,20 +9674,8 @@ def get_available_filters():
         # Get user's tags
         tags = Tag.query.filter_by(user_id=current_user.id).all()
         
-        # Get unique speakers from user's recordings participants field
-        recordings_with_participants = Recording.query.filter_by(user_id=current_user.id).filter(
-            Recording.participants.isnot(None),
-            Recording.participants != ''
-        ).all()
-        
-        speaker_names = set()
-        for recording in recordings_with_participants:
-            if recording.participants:
-                # Split participants by comma and clean up
-                participants = [p.strip() for p in recording.participants.split(',') if p.strip()]
-                speaker_names.update(participants)
-        
-        speaker_names = sorted(list(speaker_names))
+        # Get unique speakers from the participant index
+        speaker_names = get_user_speaker_names(current_user.id)
         
         # Get user's recordings for recording-specific filtering
         recordings = Recording.query.filter_by(user_id=current_user.id).filter(
@@ -7335,7 +9683,7 @@ def get_available_filters():
         ).order_by(Recording.created_at.desc()).all()
         
         return jsonify({
-            'tags': [tag.to_dict() for tag in tags],
+            'tags': serialize_tags(tags),
             'speakers': speaker_names,
             'recordings': [{'id': r.id, 'title': r.title, 'meeting_date': f"{r.meeting_date.isoformat()}T00:00:00" if r.meeting_date else None} for r in recordings]
         })
@@ -7352,51 +9700,22 @@ def migrate_existing_recordings_api():
         return jsonify({'error': 'Unauthorized. Admin access required.'}), 403
     
     try:
-        # Count recordings that need processing
-        completed_recordings = Recording.query.filter_by(status='COMPLETED').all()
-        recordings_needing_processing = []
-        
-        for recording in completed_recordings:
-            if recording.transcription:  # Has transcription
-                chunk_count = TranscriptChunk.query.filter_by(recording_id=recording.id).count()
-                if chunk_count == 0:  # No chunks yet
-                    recordings_needing_processing.append(recording)
-        
-        if len(recordings_needing_processing) == 0:
+        remaining = recordings_needing_chunks_query().count()
+        if remaining == 0:
             return jsonify({
                 'success': True,
                 'message': 'All recordings are already processed for inquire mode',
                 'processed': 0,
-                'total': len(completed_recordings)
+                'remaining': 0
             })
         
-        # Process in small batches to avoid timeout
-        batch_size = min(5, len(recordings_needing_processing))  # Process max 5 at a time
-        processed = 0
-        errors = 0
-        
-        for i in range(min(batch_size, len(recordings_needing_processing))):
-            recording = recordings_needing_processing[i]
-            try:
-                success = process_recording_chunks(recording.id)
-                if success:
-                    processed += 1
-                else:
-                    errors += 1
-            except Exception as e:
-                app.logger.error(f"Error processing recording {recording.id} for migration: {e}")
-                errors += 1
-        
-        remaining = max(0, len(recordings_needing_processing) - batch_size)
-        
+        started = start_inquire_backfill()
         return jsonify({
             'success': True,
-            'message': f'Processed {processed} recordings. {remaining} remaining.',
-            'processed': processed,
-            'errors': errors,
+            'message': f'Processing {remaining} recordings in the background.' if started else 'Processing is already running.',
             'remaining': remaining,
-            'total': len(recordings_needing_processing)
-        })
+            'backfill': get_inquire_backfill_status()
+        }), 202
         
     except Exception as e:
         app.logger.error(f"Error in migration API: {e}")
@@ -7519,31 +9838,16 @@ def admin_update_auto_process_config():
 @app.route('/admin/inquire/process-recordings', methods=['POST'])
 @login_required
 def admin_process_recordings_for_inquire():
-    """Process all remaining recordings for inquire mode (chunk and embed them)."""
+    """Start chunking and embedding the remaining recordings for inquire mode in the background."""
     if not current_user.is_admin:
         return jsonify({'error': 'Unauthorized'}), 403
     
     try:
-        # Get optional parameters from request
         data = request.json or {}
-        batch_size = data.get('batch_size', 10)
         max_recordings = data.get('max_recordings', None)
         
-        # Find recordings that need processing
-        completed_recordings = Recording.query.filter_by(status='COMPLETED').all()
-        recordings_needing_processing = []
-        
-        for recording in completed_recordings:
-            if recording.transcription:  # Has transcription
-                chunk_count = TranscriptChunk.query.filter_by(recording_id=recording.id).count()
-                if chunk_count == 0:  # No chunks yet
-                    recordings_needing_processing.append(recording)
-                    if max_recordings and len(recordings_needing_processing) >= max_recordings:
-                        break
-        
-        total_to_process = len(recordings_needing_processing)
-        
-        if total_to_process == 0:
+        need_processing = recordings_needing_chunks_query().count()
+        if need_processing == 0:
             return jsonify({
                 'success': True,
                 'message': 'All recordings are already processed for inquire mode.',
@@ -7551,42 +9855,43 @@ def admin_process_recordings_for_inquire():
                 'total': 0
             })
         
-        # Process recordings in batches
-        processed = 0
-        failed = []
-        
-        for recording in recordings_needing_processing:
-            try:
-                success = process_recording_chunks(recording.id)
-                if success:
-                    processed += 1
-                    app.logger.info(f"Admin API: Processed chunks for recording: {recording.title} ({recording.id})")
-                else:
-                    failed.append({'id': recording.id, 'title': recording.title, 'reason': 'Processing returned false'})
-            except Exception as e:
-                app.logger.error(f"Admin API: Failed to process recording {recording.id}: {e}")
-                failed.append({'id': recording.id, 'title': recording.title, 'reason': str(e)})
-            
-            # Commit after each batch
-            if processed % batch_size == 0:
-                db.session.commit()
-        
-        # Final commit
-        db.session.commit()
+        if not start_inquire_backfill(max_recordings):
+            return jsonify({'error': 'Processing is already running.', 'backfill': get_inquire_backfill_status()}), 409
         
+        total = min(need_processing, max_recordings) if max_recordings else need_processing
         return jsonify({
             'success': True,
-            'message': f'Processed {processed} out of {total_to_process} recordings.',
-            'processed': processed,
-            'total': total_to_process,
-            'failed': failed
-        })
+            'message': f'Processing {total} recordings in the background.',
+            'total': total,
+            'backfill': get_inquire_backfill_status()
+        }), 202
         
     except Exception as e:
         app.logger.error(f"Error in admin process recordings endpoint: {e}")
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/admin/inquire/backfill', methods=['GET'])
+@login_required
+def admin_inquire_backfill_status():
+    """Progress of the background inquire mode backfill."""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify({
+        'backfill': get_inquire_backfill_status(),
+        'need_processing': recordings_needing_chunks_query().count()
+    })
+
+@app.route('/admin/inquire/backfill/stop', methods=['POST'])
+@login_required
+def admin_stop_inquire_backfill():
+    """Stop the background backfill after its current batch; the next run resumes from the checkpoint."""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    stop_inquire_backfill()
+    return jsonify({'success': True, 'backfill': get_inquire_backfill_status()})
+
 @app.route('/admin/inquire/status', methods=['GET'])
 @login_required  
 def admin_inquire_status():
@@ -7611,14 +9916,7 @@ def admin_inquire_status():
         ).distinct().count()
         
         # Count recordings that still need processing
-        completed_recordings = Recording.query.filter_by(status='COMPLETED').all()
-        need_processing = 0
-        
-        for recording in completed_recordings:
-            if recording.transcription:  # Has transcription
-                chunk_count = TranscriptChunk.query.filter_by(recording_id=recording.id).count()
-                if chunk_count == 0:  # No chunks yet
-                    need_processing += 1
+        need_processing = recordings_needing_chunks_query().count()
         
         # Get total chunks and embeddings count
         total_chunks = TranscriptChunk.query.count()
@@ -7629,22 +9927,32 @@ def admin_inquire_status():
             'processed_for_inquire': processed_recordings,
             'need_processing': need_processing,
             'total_chunks': total_chunks,
-            'embeddings_available': EMBEDDINGS_AVAILABLE
+            'embeddings_available': EMBEDDINGS_AVAILABLE,
+            'embedding_service': get_embedding_service_stats(),
+            'backfill': get_inquire_backfill_status(),
+            'router': router_stats.snapshot()
         })
         
     except Exception as e:
         app.logger.error(f"Error getting inquire status: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.before_request
+def refresh_settings_cache():
+    """Pick up settings changed by other workers before the request body is read (throttled by the cache)."""
+    settings_cache.refresh()
+
 with app.app_context():
     # Set dynamic MAX_CONTENT_LENGTH based on database setting
-    max_file_size_mb = SystemSetting.get_setting('max_file_size_mb', 250)
-    app.config['MAX_CONTENT_LENGTH'] = max_file_size_mb * 1024 * 1024
-    app.logger.info(f"Set MAX_CONTENT_LENGTH to {max_file_size_mb}MB from database setting")
+    settings_cache.refresh(force=True)
 
     # Initialize file monitor after app setup
     initialize_file_monitor()
 
+    # Start (or connect to) the shared embedding service in the background so the model is warm before the first query
+    if ENABLE_INQUIRE_MODE and EMBEDDINGS_AVAILABLE and EMBEDDING_SERVICE:
+        threading.Thread(target=get_embedding_model, daemon=True).start()
+
 if __name__ == '__main__':
     # Consider using waitress or gunicorn for production
     # waitress-serve --host 0.0.0.0 --port 8899 app:app
@@ -420,6 +420,77 @@ class AudioChunkingService:
                 except Exception as e:
                     logger.warning(f"Error cleaning up temporary WAV file: {e}")
     
+    def segment_duration(self, preferred_seconds: float) -> float:
+        """
+        Length of the segments transcribed while a recording is still being uploaded.
+
+        Uses preferred_seconds unless the configured chunk limit (or the API's
+        duration limit) requires shorter segments. Size limits are converted to
+        a duration using the 128kbps MP3 that segments are encoded to.
+
+        Args:
+            preferred_seconds: Desired segment length in seconds
+
+        Returns:
+            Segment length in seconds
+        """
+        mode, limit_value = self.parse_chunk_limit()
+        if mode == 'size':
+            limit_seconds = limit_value * 1024 * 1024 * 0.95 * 8 / 128000
+        else:
+            limit_seconds = limit_value
+        return max(30.0, min(preferred_seconds, limit_seconds, 1400))
+
+    def extract_segment(self, file_path: str, start_time: float, duration: Optional[float],
+                        temp_dir: str, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Encode part of an audio file, which may still be growing, as an MP3 chunk.
+
+        Args:
+            file_path: Path to the source audio file
+            start_time: Segment start in seconds
+            duration: Segment length in seconds, or None for everything after start_time
+            temp_dir: Directory to store the chunk file
+            index: Chunk index used in the filename and the returned info
+
+        Returns:
+            Chunk information dictionary like those of create_chunks (end_time and
+            duration reflect the audio actually decoded, which is shorter than
+            requested if the file ends earlier), or None if no audio was decoded
+        """
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        chunk_filename = f"{base_name}_segment_{index:03d}.mp3"
+        chunk_path = os.path.join(temp_dir, chunk_filename)
+
+        # Seek on the input so earlier audio is skipped without being decoded
+        cmd = ['ffmpeg', '-ss', str(start_time), '-i', file_path]
+        if duration is not None:
+            cmd += ['-t', str(duration)]
+        cmd += ['-codec:a', 'libmp3lame', '-b:a', '128k', '-ar', '44100', '-ac', '1', '-y', chunk_path]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.exists(chunk_path):
+            logger.warning(f"ffmpeg could not extract segment {index} at {start_time:.1f}s: {result.stderr[-500:]}")
+            return None
+
+        actual_duration = self.get_audio_duration(chunk_path) or 0
+        if actual_duration <= 0:
+            os.remove(chunk_path)
+            return None
+
+        chunk_size = os.path.getsize(chunk_path)
+        logger.info(f"Extracted segment {index}: {start_time:.1f}s-{start_time + actual_duration:.1f}s ({chunk_size/1024/1024:.1f}MB)")
+        return {
+            'index': index,
+            'path': chunk_path,
+            'filename': chunk_filename,
+            'start_time': start_time,
+            'end_time': start_time + actual_duration,
+            'duration': actual_duration,
+            'size_bytes': chunk_size,
+            'size_mb': chunk_size / (1024 * 1024)
+        }
+
     def merge_transcriptions(self, chunk_results: List[Dict[str, Any]]) -> str:
         """
         Merge transcription results from multiple chunks, handling overlaps.
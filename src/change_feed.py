@@ -0,0 +1,50 @@
+"""
+Recording Change Feed
+
+Every insert, update and delete of a user's recordings, tags, shares and
+calendar events appends a row to a change log whose auto-incrementing id is
+the sync cursor. Clients keep the last cursor they saw and ask for the
+changes after it; the feed collapses repeated changes of the same entity to
+the latest one and returns the current state of changed entities plus
+tombstones (ids) for deleted ones, so an offline client catches up in one
+request instead of re-downloading its library.
+
+Rows older than the retention period are pruned. A client whose cursor
+predates the pruned range, or that has no cursor yet, is told to reset:
+reload everything through the list endpoints and continue from the returned
+cursor.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+# Entity types in the order they appear in responses
+ENTITY_TYPES = ('recording', 'tag', 'share', 'event')
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+
+
+def compact_changes(rows: Iterable[Tuple[str, int, str]]) -> Dict[str, Dict[int, str]]:
+    """
+    Reduce change rows to the latest action per entity.
+
+    Args:
+        rows: (entity_type, entity_id, action) in cursor order
+
+    Returns:
+        {entity_type: {entity_id: action}} for every entity type
+    """
+    latest = {entity_type: {} for entity_type in ENTITY_TYPES}
+    for entity_type, entity_id, action in rows:
+        latest[entity_type][entity_id] = action
+    return latest
+
+
+def split_actions(actions: Dict[int, str]) -> Tuple[list, list]:
+    """Split {entity_id: action} into sorted (upserted ids, deleted ids)."""
+    upserted = sorted(entity_id for entity_id, action in actions.items() if action == UPSERT)
+    deleted = sorted(entity_id for entity_id, action in actions.items() if action == DELETE)
+    return upserted, deleted
@@ -0,0 +1,102 @@
+"""
+Chat History Compaction
+
+Chat sessions are held on the server: each session stores its recent turns
+verbatim plus a running summary of everything older. Once the verbatim turns
+exceed a token budget, the oldest ones are folded into the summary, so the
+history sent with every request stays bounded however long the conversation
+runs.
+
+Prompts are assembled stable-first: the system prompt, then the summary, then
+the turns in order, and only then anything that changes on every request. Each
+request therefore repeats the previous request's prefix, which keeps
+provider-side prompt caching effective between compactions.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+DEFAULT_HISTORY_TOKEN_BUDGET = 4000
+DEFAULT_KEEP_RECENT_MESSAGES = 4
+
+# Longest single message kept in a session; longer content is truncated
+MAX_MESSAGE_CHARS = 20000
+
+_ROLES = ('user', 'assistant')
+_THINKING = re.compile(r'<think(?:ing)?>.*?(?:</think(?:ing)?>|$)', re.IGNORECASE | re.DOTALL)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Approximate model tokens in text (about four characters per token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def history_tokens(messages: Sequence[dict]) -> int:
+    """Approximate model tokens in a list of chat messages."""
+    return sum(estimate_tokens(message.get('content')) + 4 for message in messages)
+
+
+def strip_thinking(text: str) -> str:
+    """Remove <think>/<thinking> sections so only the visible answer is kept in history."""
+    return _THINKING.sub('', text or '').strip()
+
+
+def clean_history(messages) -> List[dict]:
+    """
+    Reduce client-supplied history to well-formed user/assistant messages.
+
+    Unknown roles, empty contents and extra fields (such as rendered HTML) are
+    dropped, and long contents are truncated to MAX_MESSAGE_CHARS.
+    """
+    cleaned = []
+    for message in messages if isinstance(messages, list) else []:
+        if not isinstance(message, dict) or message.get('role') not in _ROLES:
+            continue
+        content = message.get('content')
+        if isinstance(content, str) and content.strip():
+            cleaned.append({'role': message['role'], 'content': content[:MAX_MESSAGE_CHARS]})
+    return cleaned
+
+
+def compaction_split(messages: Sequence[dict], token_budget: int = DEFAULT_HISTORY_TOKEN_BUDGET,
+                     keep_recent: int = DEFAULT_KEEP_RECENT_MESSAGES) -> int:
+    """
+    Decide how many of the oldest messages to fold into the summary.
+
+    Nothing is compacted while the history fits in token_budget. Beyond that,
+    the oldest messages are taken until the rest fits in half the budget (so
+    compaction does not recur on every turn), always keeping the last
+    keep_recent messages and never leaving an assistant reply first.
+
+    Returns:
+        Number of leading messages to summarize (0 for none)
+    """
+    if history_tokens(messages) <= token_budget:
+        return 0
+    limit = max(len(messages) - keep_recent, 0)
+    remaining = history_tokens(messages)
+    count = 0
+    while count < limit and remaining > token_budget // 2:
+        remaining -= history_tokens(messages[count:count + 1])
+        count += 1
+    while count < len(messages) and messages[count]['role'] != 'user':
+        count += 1
+    return count if count < len(messages) else 0
+
+
+def summary_request(previous_summary: Optional[str], messages: Sequence[dict]) -> List[dict]:
+    """Build the LLM messages that fold older turns into the running summary."""
+    transcript = '\n\n'.join(f"{message['role'].upper()}: {message['content']}" for message in messages)
+    existing = f"Summary so far:\n{previous_summary}\n\n" if previous_summary else ""
+    return [
+        {"role": "system", "content": "You condense chat conversations. Keep every fact, name, number, date, "
+                                      "decision and open question the assistant may need later; drop pleasantries "
+                                      "and formatting. Respond with the updated summary only."},
+        {"role": "user", "content": f"{existing}Conversation to add:\n{transcript}"},
+    ]
+
+
+def history_messages(summary: Optional[str], messages: Sequence[dict]) -> List[dict]:
+    """Session history as LLM messages: the summary of older turns (if any), then the recent turns."""
+    prefix = [{"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}] if summary else []
+    return prefix + [dict(message) for message in messages]
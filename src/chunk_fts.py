@@ -0,0 +1,146 @@
+"""
+Full-Text Index for Transcript Chunks
+
+Maintains an SQLite FTS5 index over ``transcript_chunk.content`` and answers
+BM25-ranked keyword queries against it. The index is an external-content table
+kept in sync by triggers, so chunk inserts and deletes from any code path (or
+any worker process) are reflected without application changes.
+
+Lexical search complements the embedding model: exact names, acronyms, ticket
+numbers and figures rank well under BM25 even when a small sentence embedding
+model blurs them.
+"""
+
+import re
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'transcript_chunk_fts'
+
+# Upper bound on distinct query terms sent to FTS5
+MAX_QUERY_TERMS = 32
+
+_TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+_CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        content, content='transcript_chunk', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transcript_chunk BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transcript_chunk BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF content ON transcript_chunk BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+
+def ensure_chunk_fts(engine) -> bool:
+    """
+    Create the FTS5 index and its sync triggers if needed, backfilling existing chunks.
+
+    Returns:
+        True if the index is available, False if the database is not SQLite or
+        was built without FTS5
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    try:
+        with engine.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': FTS_TABLE}
+            ).first() is not None
+            if exists:
+                # Older installs may predate a trigger
+                for statement in _CREATE_STATEMENTS[1:]:
+                    conn.execute(text(statement))
+            else:
+                for statement in _CREATE_STATEMENTS:
+                    conn.execute(text(statement))
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                logger.info("Created full-text index for transcript chunks")
+            conn.commit()
+        return True
+    except Exception as e:
+        logger.warning(f"Full-text chunk index unavailable (SQLite FTS5 missing?): {e}")
+        return False
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted term and terms are OR-ed, so BM25 rather than
+    strict conjunction decides the ranking and user input can never be parsed
+    as FTS5 syntax.
+
+    Returns:
+        The MATCH expression, or None if the text contains no words
+    """
+    terms = []
+    for term in _TERM_PATTERN.findall(query.lower()):
+        if term not in terms:
+            terms.append(term)
+    if not terms:
+        return None
+    return ' OR '.join(f'"{term}"' for term in terms[:MAX_QUERY_TERMS])
+
+
+def search_chunk_fts(conn, user_id: int, query: str, top_k: int = 5,
+                     recording_ids: Optional[Iterable[int]] = None,
+                     date_from=None, date_to=None) -> List[Tuple[int, float]]:
+    """
+    BM25-ranked keyword search over one user's chunks.
+
+    Args:
+        conn: SQLAlchemy connection or session
+        user_id: Owner of the chunks
+        query: Free-text query
+        top_k: Number of results to return
+        recording_ids: Only search chunks of these recordings
+        date_from: Only search recordings whose meeting date is on or after this date
+        date_to: Only search recordings whose meeting date is on or before this date
+
+    Returns:
+        List of (chunk_id, BM25 relevance) with higher relevance first
+    """
+    match = build_match_query(query)
+    if match is None or top_k <= 0:
+        return []
+
+    params = {'match': match, 'user_id': user_id, 'top_k': top_k}
+    conditions = [f"{FTS_TABLE} MATCH :match", "c.user_id = :user_id"]
+    joins = ''
+    if recording_ids is not None:
+        params['recording_ids'] = list(recording_ids)
+        if not params['recording_ids']:
+            return []
+        conditions.append("c.recording_id IN :recording_ids")
+    if date_from is not None or date_to is not None:
+        # Meeting dates are stored as ISO strings, which compare in date order
+        joins = ' JOIN recording r ON r.id = c.recording_id'
+        if date_from is not None:
+            conditions.append("r.meeting_date >= :date_from")
+            params['date_from'] = date_from.isoformat()
+        if date_to is not None:
+            conditions.append("r.meeting_date <= :date_to")
+            params['date_to'] = date_to.isoformat()
+
+    # bm25() is negative, lower meaning more relevant
+    statement = text(
+        f"SELECT c.id, bm25({FTS_TABLE}) AS score FROM {FTS_TABLE}"
+        f" JOIN transcript_chunk c ON c.id = {FTS_TABLE}.rowid{joins}"
+        f" WHERE {' AND '.join(conditions)} ORDER BY score LIMIT :top_k"
+    )
+    if 'recording_ids' in params:
+        statement = statement.bindparams(bindparam('recording_ids', expanding=True))
+    return [(int(row[0]), -float(row[1])) for row in conn.execute(statement, params)]
@@ -0,0 +1,503 @@
+"""
+In-memory Embedding Index for Inquire Mode Semantic Search
+
+This module keeps one contiguous matrix of L2-normalised (or int8-quantized)
+chunk embeddings per user, together with parallel arrays of chunk ids, recording
+ids and meeting dates. A search is a single matrix-vector product (or one
+matrix-matrix product for a batch of queries) followed by an argpartition
+top-k, and filters are applied as boolean masks over the metadata arrays, so the
+database only has to return the handful of chunk rows that actually win.
+
+Indexes are built lazily, patched in place when a recording is re-chunked, and
+evicted least-recently-used once the configured memory budget is exceeded.
+"""
+
+import copy
+import threading
+import logging
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Sentinel ordinal for chunks whose recording has no meeting date
+NO_DATE = -1
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of ``matrix`` with every row scaled to unit length."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+# --- Embedding storage formats ---
+
+# Formats for TranscriptChunk.embedding (stored in TranscriptChunk.embedding_dtype)
+STORAGE_DTYPES = ('float32', 'float16', 'int8')
+
+# int8 vectors are stored as a float32 scale header followed by the int8 codes
+INT8_HEADER = np.dtype('<f4').itemsize
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 scalar quantization.
+
+    Returns:
+        (codes, scales) where ``codes * scales[:, None]`` approximates ``matrix``
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def encode_embedding(vector: np.ndarray, dtype: str = 'float32') -> bytes:
+    """Serialize one embedding vector in the given storage format."""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    if dtype == 'float16':
+        return vector.astype('<f2').tobytes()
+    if dtype == 'int8':
+        codes, scales = quantize_int8(vector)
+        return scales.astype('<f4').tobytes() + codes.tobytes()
+    return vector.astype('<f4').tobytes()
+
+
+def decode_embedding(data: bytes, dtype: Optional[str] = None) -> np.ndarray:
+    """Deserialize an embedding to float32; ``None`` dtype means legacy float32."""
+    if dtype == 'float16':
+        return np.frombuffer(data, dtype='<f2').astype(np.float32)
+    if dtype == 'int8':
+        scale = np.frombuffer(data[:INT8_HEADER], dtype='<f4')[0]
+        return np.frombuffer(data[INT8_HEADER:], dtype=np.int8).astype(np.float32) * scale
+    return np.frombuffer(data, dtype='<f4').astype(np.float32, copy=False)
+
+
+def prepare_matrix(embeddings: np.ndarray, dtype: str = 'float32') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn raw embeddings into an index matrix plus per-row score factors.
+
+    float32 rows are normalised (factor 1). int8 rows keep their codes and use
+    1 / ||codes|| as factor, so ``(codes @ q) * factor`` is the cosine similarity
+    of the quantized vector - the quantization scale cancels out.
+    """
+    if dtype == 'int8':
+        codes, _ = quantize_int8(embeddings)
+        norms = np.linalg.norm(codes.astype(np.float32), axis=1)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(codes), (1.0 / norms).astype(np.float32)
+    matrix = normalize_rows(embeddings)
+    return matrix, np.ones(len(matrix), dtype=np.float32)
+
+
+def score_rows(matrix: np.ndarray, row_factors: np.ndarray, query: np.ndarray,
+               rows: Optional[np.ndarray] = None, block_size: int = 8192) -> np.ndarray:
+    """
+    Cosine similarity of a unit-length query against (a subset of) index rows.
+
+    ``query`` may also be a (dim, n_queries) matrix of unit-length columns, in
+    which case one (rows, n_queries) score matrix is returned.
+
+    Quantized matrices are scored directly from their codes, converting one
+    block at a time so the full float32 matrix never exists in memory.
+    """
+    if matrix.dtype != np.int8:
+        block = matrix if rows is None else matrix[rows]
+        return np.asarray(block @ query, dtype=np.float32)
+
+    count = matrix.shape[0] if rows is None else len(rows)
+    scores = np.empty((count,) + query.shape[1:], dtype=np.float32)
+    for start in range(0, count, block_size):
+        selection = slice(start, start + block_size) if rows is None else rows[start:start + block_size]
+        factors = row_factors[selection]
+        if query.ndim == 2:
+            factors = factors[:, None]
+        scores[start:start + block_size] = (matrix[selection].astype(np.float32) @ query) * factors
+    return scores
+
+
+def date_to_ordinal(value) -> int:
+    """Convert a ``date`` (or None) to the integer stored in the dates array."""
+    return value.toordinal() if value is not None else NO_DATE
+
+
+def build_row_mask(row_recording_ids: np.ndarray, row_dates: np.ndarray,
+                   recording_ids: Optional[Iterable[int]] = None,
+                   date_from=None, date_to=None) -> Optional[np.ndarray]:
+    """
+    Build a boolean row mask from recording and meeting date constraints.
+
+    Args:
+        row_recording_ids: Recording id of each index row
+        row_dates: Meeting date ordinal of each index row
+        recording_ids: Only keep rows belonging to these recordings
+        date_from: Only keep rows whose meeting date is on or after this date
+        date_to: Only keep rows whose meeting date is on or before this date
+
+    Returns:
+        Boolean array with one entry per row, or None if no constraint applies
+    """
+    mask = None
+
+    if recording_ids is not None:
+        allowed = np.fromiter(recording_ids, dtype=np.int64)
+        mask = np.isin(row_recording_ids, allowed)
+
+    if date_from is not None or date_to is not None:
+        date_mask = row_dates != NO_DATE
+        if date_from is not None:
+            date_mask &= row_dates >= date_from.toordinal()
+        if date_to is not None:
+            date_mask &= row_dates <= date_to.toordinal()
+        mask = date_mask if mask is None else (mask & date_mask)
+
+    return mask
+
+
+def top_k_positions(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Return the positions of the ``top_k`` highest scores, best first."""
+    k = min(top_k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        best = np.argpartition(-scores, k - 1)[:k]
+    else:
+        best = np.arange(len(scores))
+    return best[np.argsort(-scores[best], kind='stable')]
+
+
+class UserEmbeddingIndex:
+    """Contiguous embedding matrix plus metadata arrays for one user's chunks."""
+
+    def __init__(self, user_id: int, chunk_ids: Sequence[int], recording_ids: Sequence[int],
+                 meeting_dates: Sequence[int], embeddings: Optional[np.ndarray], dim: Optional[int] = None,
+                 created_after=None, dtype: str = 'float32'):
+        """
+        Initialize the index.
+
+        Args:
+            user_id: Owner of the indexed chunks
+            chunk_ids: TranscriptChunk ids, one per row
+            recording_ids: Recording id of each row
+            meeting_dates: Meeting date ordinal of each row (NO_DATE if unknown)
+            embeddings: Raw (un-normalised) embedding matrix, shape (rows, dim)
+            dim: Embedding dimension, only needed when the index starts empty
+            created_after: Only chunks created after this datetime are covered.
+                Set when the index is the in-memory delta on top of an on-disk
+                ANN index that already covers the older chunks.
+            dtype: 'float32', or 'int8' to hold quantized codes (4x less memory)
+        """
+        self.user_id = user_id
+        self.created_after = created_after
+        self.dtype = 'int8' if dtype == 'int8' else 'float32'
+        # Opaque database version the index was built against (set by the caller)
+        self.version = None
+        self._lock = threading.Lock()
+        # [(data tuple, row order sorted by recording id, sorted recording ids)], built on
+        # demand; a list so snapshots share it with the live index
+        self._recording_order = [None]
+
+        if embeddings is None or len(chunk_ids) == 0:
+            matrix = np.zeros((0, dim or 0), dtype=np.int8 if self.dtype == 'int8' else np.float32)
+            row_factors = np.zeros(0, dtype=np.float32)
+        else:
+            matrix, row_factors = prepare_matrix(embeddings, self.dtype)
+
+        # Arrays are always swapped as one tuple so readers never see a torn update
+        self._data = (
+            np.asarray(chunk_ids, dtype=np.int64),
+            np.asarray(recording_ids, dtype=np.int64),
+            np.asarray(meeting_dates, dtype=np.int32),
+            matrix,
+            row_factors,
+        )
+
+    # --- Introspection ---
+
+    def __len__(self) -> int:
+        return len(self._data[0])
+
+    @property
+    def chunk_ids(self) -> np.ndarray:
+        return self._data[0]
+
+    @property
+    def dim(self) -> int:
+        return self._data[3].shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint of the index arrays in bytes."""
+        return sum(array.nbytes for array in self._data)
+
+    def signature(self) -> Tuple[int, int]:
+        """
+        Return (row count, max chunk id) of the rows currently in the index.
+        """
+        chunk_ids = self._data[0]
+        return (len(chunk_ids), int(chunk_ids.max()) if len(chunk_ids) else 0)
+
+    def snapshot(self) -> 'UserEmbeddingIndex':
+        """
+        Read-only view of the rows as they are now.
+
+        Row positions from rows_for_recordings() and masks from build_mask()
+        only line up with the rows they were computed on, so a search that
+        combines them must run on one snapshot: incremental updates to this
+        index (from other threads) do not change the snapshot's rows.
+        """
+        return copy.copy(self)
+
+    # --- Filtering and search ---
+
+    def rows_for_recordings(self, recording_ids: Iterable[int]) -> np.ndarray:
+        """
+        Row positions belonging to the given recordings, in ascending order.
+
+        Uses binary search over a row order sorted by recording id, which is
+        computed once per index state, so the cost grows with the number of
+        matching rows rather than with the size of the index.
+        """
+        data = self._data
+        cached = self._recording_order[0]
+        if cached is None or cached[0] is not data:
+            order = np.argsort(data[1], kind='stable')
+            cached = (data, order, data[1][order])
+            self._recording_order[0] = cached
+        _, order, sorted_ids = cached
+
+        wanted = np.unique(np.fromiter(recording_ids, dtype=np.int64))
+        starts = np.searchsorted(sorted_ids, wanted, side='left')
+        ends = np.searchsorted(sorted_ids, wanted, side='right')
+        spans = [order[start:end] for start, end in zip(starts, ends) if end > start]
+        if not spans:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(spans))
+
+    def build_mask(self, recording_ids: Optional[Iterable[int]] = None,
+                   date_from=None, date_to=None) -> Optional[np.ndarray]:
+        """Build a boolean row mask for this index (see build_row_mask)."""
+        _, row_recording_ids, row_dates, _, _ = self._data
+        return build_row_mask(row_recording_ids, row_dates, recording_ids, date_from, date_to)
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5,
+               mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Score every (masked) row against the query and return the best matches.
+
+        Args:
+            query_embedding: Raw query vector
+            top_k: Number of results to return
+            mask: Optional boolean row mask from build_mask()
+
+        Returns:
+            List of (chunk_id, cosine similarity) sorted by descending similarity
+        """
+        chunk_ids, _, _, matrix, row_factors = self._data
+        if len(chunk_ids) == 0 or top_k <= 0:
+            return []
+
+        query = normalize_rows(query_embedding)[0]
+
+        if mask is not None:
+            rows = np.flatnonzero(mask)
+            if len(rows) == 0:
+                return []
+        else:
+            rows = None
+        scores = score_rows(matrix, row_factors, query, rows)
+
+        best = top_k_positions(scores, top_k)
+        row_ids = rows[best] if rows is not None else best
+        return [(int(chunk_ids[row]), float(score)) for row, score in zip(row_ids, scores[best])]
+
+    def search_many(self, query_embeddings: np.ndarray, top_k: int = 5,
+                    masks: Sequence[Optional[np.ndarray]] = (None,),
+                    rows: Optional[np.ndarray] = None) -> List[List[List[Tuple[int, float]]]]:
+        """
+        Score several queries under several filter masks with one matrix product.
+
+        Rows allowed by any mask are scored once against every query; each mask
+        then only selects from the shared score matrix.
+
+        Args:
+            query_embeddings: (n_queries, dim) raw query vectors
+            top_k: Number of results per query and mask
+            masks: Boolean row masks from build_mask() (None means unfiltered)
+            rows: Only score these row positions (e.g. from rows_for_recordings())
+
+        Returns:
+            results[mask position][query position] as in search()
+        """
+        chunk_ids, _, _, matrix, row_factors = self._data
+        queries = normalize_rows(query_embeddings)
+        empty = [[[] for _ in range(len(queries))] for _ in masks]
+        if len(chunk_ids) == 0 or top_k <= 0 or len(queries) == 0:
+            return empty
+
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            if all(mask is not None for mask in masks):
+                rows = rows[np.logical_or.reduce([mask[rows] for mask in masks])]
+            if len(rows) == 0:
+                return empty
+        elif any(mask is None for mask in masks):
+            rows = None
+        else:
+            rows = np.flatnonzero(np.logical_or.reduce(masks))
+            if len(rows) == 0:
+                return empty
+        scores = score_rows(matrix, row_factors, np.ascontiguousarray(queries.T), rows)
+        row_ids = np.arange(len(chunk_ids)) if rows is None else rows
+
+        results = []
+        for mask in masks:
+            # Positions within the scored rows that this mask keeps
+            positions = np.arange(len(row_ids)) if mask is None else np.flatnonzero(mask[row_ids])
+            per_query = []
+            for column in range(len(queries)):
+                column_scores = scores[positions, column]
+                best = top_k_positions(column_scores, top_k)
+                per_query.append([
+                    (int(chunk_ids[row_ids[positions[i]]]), float(column_scores[i])) for i in best
+                ])
+            results.append(per_query)
+        return results
+
+    # --- Incremental maintenance ---
+
+    def replace_recording(self, recording_id: int, chunk_ids: Sequence[int],
+                          embeddings: Optional[np.ndarray], meeting_date=None):
+        """Drop all rows of a recording and append its freshly generated chunks."""
+        with self._lock:
+            old_chunk_ids, old_recording_ids, old_dates, old_matrix, old_factors = self._data
+            keep = old_recording_ids != recording_id
+
+            if embeddings is None or len(chunk_ids) == 0:
+                new_matrix = np.zeros((0, old_matrix.shape[1]), dtype=old_matrix.dtype)
+                new_factors = np.zeros(0, dtype=np.float32)
+                chunk_ids = []
+            else:
+                new_matrix, new_factors = prepare_matrix(embeddings, self.dtype)
+                if old_matrix.shape[1] and new_matrix.shape[1] != old_matrix.shape[1]:
+                    raise ValueError(
+                        f"Embedding dimension mismatch: index has {old_matrix.shape[1]}, got {new_matrix.shape[1]}"
+                    )
+
+            count = len(chunk_ids)
+            self._data = (
+                np.concatenate([old_chunk_ids[keep], np.asarray(chunk_ids, dtype=np.int64)]),
+                np.concatenate([old_recording_ids[keep], np.full(count, recording_id, dtype=np.int64)]),
+                np.concatenate([old_dates[keep], np.full(count, date_to_ordinal(meeting_date), dtype=np.int32)]),
+                np.ascontiguousarray(np.vstack([old_matrix[keep], new_matrix]) if old_matrix.shape[1] else new_matrix),
+                np.concatenate([old_factors[keep], new_factors]),
+            )
+
+    def remove_recording(self, recording_id: int):
+        """Drop every row belonging to a recording."""
+        with self._lock:
+            chunk_ids, recording_ids, dates, matrix, row_factors = self._data
+            keep = recording_ids != recording_id
+            if keep.all():
+                return
+            self._data = (chunk_ids[keep], recording_ids[keep], dates[keep],
+                          np.ascontiguousarray(matrix[keep]), row_factors[keep])
+
+    def set_meeting_date(self, recording_id: int, meeting_date):
+        """Update the meeting date of every row belonging to a recording."""
+        with self._lock:
+            chunk_ids, recording_ids, dates, matrix, row_factors = self._data
+            dates = dates.copy()
+            dates[recording_ids == recording_id] = date_to_ordinal(meeting_date)
+            self._data = (chunk_ids, recording_ids, dates, matrix, row_factors)
+
+
+class EmbeddingIndexCache:
+    """Per-process LRU cache of UserEmbeddingIndex objects bounded by memory."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for all cached indexes combined. The most
+                recently used index is always kept, even if it alone exceeds it.
+        """
+        self.max_bytes = max_bytes
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[UserEmbeddingIndex]:
+        """Return the cached index for a user (marking it recently used), or None."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None:
+                self._indexes.move_to_end(user_id)
+            return index
+
+    def put(self, index: UserEmbeddingIndex):
+        """Insert or replace a user's index and evict older ones over budget."""
+        with self._lock:
+            self._indexes[index.user_id] = index
+            self._indexes.move_to_end(index.user_id)
+            self._evict_locked()
+
+    def invalidate(self, user_id: int):
+        """Forget a user's index; it will be rebuilt on the next search."""
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def replace_recording(self, user_id: int, recording_id: int, chunk_ids: Sequence[int],
+                          embeddings: Optional[np.ndarray], meeting_date=None):
+        """Patch a cached index after a recording was re-chunked (no-op if not loaded)."""
+        index = self.get(user_id)
+        if index is None:
+            return
+        try:
+            index.replace_recording(recording_id, chunk_ids, embeddings, meeting_date)
+        except ValueError as e:
+            logger.warning(f"Dropping embedding index for user {user_id}: {e}")
+            self.invalidate(user_id)
+            return
+        with self._lock:
+            self._evict_locked()
+
+    def remove_recording(self, user_id: int, recording_id: int):
+        index = self.get(user_id)
+        if index is not None:
+            index.remove_recording(recording_id)
+
+    def set_meeting_date(self, user_id: int, recording_id: int, meeting_date):
+        index = self.get(user_id)
+        if index is not None:
+            index.set_meeting_date(recording_id, meeting_date)
+
+    def stats(self) -> dict:
+        """Return a summary of cached indexes for status endpoints."""
+        with self._lock:
+            return {
+                'users': len(self._indexes),
+                'rows': sum(len(index) for index in self._indexes.values()),
+                'bytes': sum(index.nbytes for index in self._indexes.values()),
+                'max_bytes': self.max_bytes,
+            }
+
+    def _evict_locked(self):
+        total = sum(index.nbytes for index in self._indexes.values())
+        while total > self.max_bytes and len(self._indexes) > 1:
+            user_id, index = self._indexes.popitem(last=False)
+            total -= index.nbytes
+            logger.info(f"Evicted embedding index for user {user_id} ({index.nbytes / 1024 / 1024:.1f}MB)")
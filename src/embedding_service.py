@@ -0,0 +1,432 @@
+"""
+Shared Embedding Inference Service for Inquire Mode
+
+Runs the sentence transformer in one dedicated local process that every web
+worker (and background thread) talks to over a Unix socket, instead of each
+gunicorn worker loading its own copy of the model. Requests from concurrent
+callers are micro-batched into single ``encode`` calls, the model is warmed up
+before the socket accepts connections, and throughput counters are available
+through the ``stats`` message.
+
+The service is started on demand by the first worker that needs it (guarded by
+a lock file so only one is spawned), or can be run explicitly:
+
+    python -m src.embedding_service --address /tmp/speakr-embeddings.sock
+"""
+
+import os
+import sys
+import time
+import fcntl
+import queue
+import logging
+import argparse
+import threading
+import subprocess
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+DEFAULT_ADDRESS = '/tmp/speakr-embeddings.sock'
+BACKENDS = ('torch', 'onnx')
+
+
+def load_authkey(address: str) -> bytes:
+    """
+    Shared secret for the service socket.
+
+    EMBEDDING_SERVICE_AUTHKEY wins; otherwise a random key is created next to
+    the socket with owner-only permissions on first use.
+    """
+    configured = os.environ.get('EMBEDDING_SERVICE_AUTHKEY')
+    if configured:
+        return configured.encode()
+
+    key_path = f"{address}.key"
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(key_path, 'rb') as f:
+            return f.read()
+    with os.fdopen(fd, 'wb') as f:
+        key = os.urandom(32).hex().encode()
+        f.write(key)
+    return key
+
+
+def load_model(model_name: str = DEFAULT_MODEL, backend: str = 'torch', threads: int = 0, quantize: bool = False):
+    """
+    Load a sentence transformer tuned for CPU inference.
+
+    Args:
+        model_name: Sentence transformer model name
+        backend: 'torch', or 'onnx' (needs sentence-transformers >= 3.2 with onnxruntime)
+        threads: Intra-op CPU threads (0 keeps the library default)
+        quantize: Use int8 weights (dynamic quantization for torch, the qint8 export for onnx)
+    """
+    if threads > 0:
+        # Read by onnxruntime/OpenMP when the session is created
+        os.environ.setdefault('OMP_NUM_THREADS', str(threads))
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == 'onnx':
+        try:
+            model_kwargs = {'file_name': 'onnx/model_qint8_avx512_vnni.onnx'} if quantize else None
+            return SentenceTransformer(model_name, backend='onnx', model_kwargs=model_kwargs)
+        except TypeError:
+            logger.warning("Installed sentence-transformers has no ONNX backend; using torch")
+        except Exception as e:
+            logger.warning(f"Could not load ONNX model ({e}); using torch")
+
+    import torch
+
+    if threads > 0:
+        torch.set_num_threads(threads)
+    model = SentenceTransformer(model_name, device='cpu')
+    if quantize:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+class _EncodeJob:
+    """Texts from one request waiting for their slice of a batch."""
+
+    __slots__ = ('texts', 'enqueued_at', 'done', 'embeddings', 'error')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.enqueued_at = time.time()
+        self.done = threading.Event()
+        self.embeddings = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Collects encode requests from concurrent callers into shared model calls.
+
+    A batch closes when it holds ``max_batch`` texts or ``max_wait_ms`` has
+    passed since its first request, whichever comes first.
+    """
+
+    def __init__(self, model, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0, 'texts': 0, 'batches': 0,
+            'encode_seconds': 0.0, 'queue_wait_seconds': 0.0, 'errors': 0,
+        }
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self._thread.start()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as part of the next batch; blocks until the result is ready."""
+        job = _EncodeJob(list(texts))
+        self._queue.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.embeddings
+
+    def _run(self):
+        while True:
+            jobs = [self._queue.get()]
+            count = len(jobs[0].texts)
+            deadline = jobs[0].enqueued_at + self.max_wait
+            while count < self.max_batch:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                jobs.append(job)
+                count += len(job.texts)
+            self._encode_batch(jobs)
+
+    def _encode_batch(self, jobs: List[_EncodeJob]):
+        texts = [text for job in jobs for text in job.texts]
+        started = time.time()
+        try:
+            embeddings = np.asarray(
+                self.model.encode(texts, batch_size=self.max_batch, convert_to_numpy=True), dtype=np.float32
+            )
+            error = None
+        except Exception as e:
+            embeddings, error = None, e
+        elapsed = time.time() - started
+
+        offset = 0
+        for job in jobs:
+            if error is None:
+                job.embeddings = embeddings[offset:offset + len(job.texts)]
+            job.error = error
+            offset += len(job.texts)
+            job.done.set()
+
+        with self._stats_lock:
+            self._stats['requests'] += len(jobs)
+            self._stats['texts'] += len(texts)
+            self._stats['batches'] += 1
+            self._stats['encode_seconds'] += elapsed
+            self._stats['queue_wait_seconds'] += sum(started - job.enqueued_at for job in jobs)
+            if error is not None:
+                self._stats['errors'] += 1
+
+    def stats(self) -> dict:
+        """Throughput counters since startup."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['uptime_seconds'] = round(time.time() - self.started_at, 1)
+        stats['queued_requests'] = self._queue.qsize()
+        stats['avg_batch_texts'] = round(stats['texts'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['avg_queue_wait_ms'] = round(1000 * stats['queue_wait_seconds'] / stats['requests'], 2) if stats['requests'] else 0.0
+        stats['texts_per_second'] = round(stats['texts'] / stats['encode_seconds'], 1) if stats['encode_seconds'] else 0.0
+        return stats
+
+
+class EmbeddingServer:
+    """Serves encode/stats/ping messages on a Unix socket, one thread per connection."""
+
+    def __init__(self, address: str, authkey: bytes, model, max_batch: int = 32,
+                 max_wait_ms: float = 5.0, info: Optional[dict] = None):
+        self.address = address
+        self.batcher = MicroBatcher(model, max_batch, max_wait_ms)
+        self.info = dict(info or {}, pid=os.getpid(), max_batch=max_batch, max_wait_ms=max_wait_ms)
+        if os.path.exists(address):
+            # Left behind by a crashed service; callers hold the start lock
+            os.unlink(address)
+        self._listener = Listener(address, family='AF_UNIX', authkey=authkey)
+
+    def serve_forever(self):
+        logger.info(f"Embedding service listening on {self.address}")
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                # Listener closed
+                return
+            except Exception as e:
+                # Failed authentication or a client that vanished mid-handshake
+                logger.warning(f"Rejected embedding service connection: {e}")
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def close(self):
+        self._listener.close()
+
+    def _handle(self, conn):
+        try:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                op = message.get('op')
+                try:
+                    if op == 'encode':
+                        reply = {'ok': True, 'embeddings': self.batcher.encode(message['texts'])}
+                    elif op == 'stats':
+                        reply = {'ok': True, 'stats': dict(self.batcher.stats(), **self.info)}
+                    elif op == 'ping':
+                        reply = {'ok': True}
+                    else:
+                        reply = {'ok': False, 'error': f"Unknown operation: {op}"}
+                except Exception as e:
+                    reply = {'ok': False, 'error': str(e)}
+                conn.send(reply)
+        finally:
+            conn.close()
+
+
+class EmbeddingServiceError(Exception):
+    """Raised when the embedding service cannot be reached or fails a request."""
+    pass
+
+
+class EmbeddingServiceUnavailable(EmbeddingServiceError):
+    """Raised when the embedding service cannot be reached at all (not running, hung or rejecting us)."""
+    pass
+
+
+class EmbeddingClient:
+    """
+    Client for the embedding service with the same ``encode`` call as a model.
+
+    Connections are not thread-safe, so each thread keeps its own.
+    """
+
+    def __init__(self, address: str, authkey: bytes, timeout: float = 60.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _request(self, message: dict, retry: bool = True) -> dict:
+        conn = getattr(self._local, 'conn', None)
+        try:
+            if conn is None:
+                conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+                self._local.conn = conn
+            conn.send(message)
+            if not conn.poll(self.timeout):
+                raise TimeoutError(f"No reply from embedding service within {self.timeout}s")
+            reply = conn.recv()
+        except (OSError, EOFError, TimeoutError, AuthenticationError) as e:
+            self._local.conn = None
+            if conn is not None:
+                conn.close()
+            if retry and not isinstance(e, (TimeoutError, AuthenticationError)):
+                # The service may have restarted since this connection was opened
+                return self._request(message, retry=False)
+            raise EmbeddingServiceUnavailable(f"Embedding service unavailable: {e}") from e
+
+        if not reply.get('ok'):
+            raise EmbeddingServiceError(reply.get('error', 'Unknown embedding service error'))
+        return reply
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        """Encode a list of texts (extra model keyword arguments are ignored)."""
+        return self._request({'op': 'encode', 'texts': list(texts)})['embeddings']
+
+    def stats(self) -> dict:
+        return self._request({'op': 'stats'})['stats']
+
+    def ping(self) -> bool:
+        try:
+            self._request({'op': 'ping'}, retry=False)
+            return True
+        except EmbeddingServiceError:
+            return False
+
+
+class ServiceBackedModel:
+    """
+    Model stand-in that encodes through the embedding service and survives its death.
+
+    When the service cannot be reached it is started again (as on first use);
+    if that fails, the model is loaded in this process with ``load_local`` and
+    used from then on, so callers holding this object keep working either way.
+    """
+
+    def __init__(self, address: str, service_args: List[str], load_local, client: Optional[EmbeddingClient] = None):
+        self.address = address
+        self.service_args = list(service_args)
+        self.load_local = load_local
+        self._model = client
+        self._lock = threading.Lock()
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        model = self._model
+        if model is not None:
+            try:
+                return model.encode(texts, **kwargs)
+            except EmbeddingServiceUnavailable as e:
+                logger.warning(f"{e}; restarting the embedding service")
+        return self._recover(model).encode(texts, **kwargs)
+
+    def stats(self) -> dict:
+        if not isinstance(self._model, EmbeddingClient):
+            raise EmbeddingServiceError("Embedding service unavailable; using the model in this process")
+        return self._model.stats()
+
+    def _recover(self, failed):
+        with self._lock:
+            # Another thread may have recovered while this one waited
+            if self._model is failed:
+                client = ensure_service_running(self.address, self.service_args)
+                if client is None:
+                    logger.warning("Embedding service could not be restarted; loading the model in this process")
+                    self._model = self.load_local()
+                else:
+                    self._model = client
+            return self._model
+
+
+def ensure_service_running(address: str, service_args: List[str], timeout: float = 180.0) -> Optional[EmbeddingClient]:
+    """
+    Return a client for the service at ``address``, starting the service if nobody is serving it.
+
+    Only one process spawns the service; others wait on the start lock and then
+    connect. The call blocks until the model has been loaded and warmed up.
+
+    Args:
+        address: Unix socket path
+        service_args: Extra command line arguments for ``python -m src.embedding_service``
+        timeout: Seconds to wait for the service to come up
+
+    Returns:
+        A connected client, or None if the service did not start in time
+    """
+    client = EmbeddingClient(address, load_authkey(address))
+    if client.ping():
+        return client
+
+    with open(f"{address}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if client.ping():
+            return client
+
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'src.embedding_service', '--address', address] + list(service_args),
+            cwd=project_root,
+            start_new_session=True
+        )
+        logger.info(f"Started embedding service (pid {process.pid}) on {address}")
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if process.poll() is not None:
+                logger.error(f"Embedding service exited during startup with code {process.returncode}")
+                return None
+            if client.ping():
+                return client
+            time.sleep(0.25)
+
+    logger.error(f"Embedding service did not become ready within {timeout}s")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared embedding inference service for Inquire Mode')
+    parser.add_argument('--address', default=DEFAULT_ADDRESS, help=f'Unix socket path (default: {DEFAULT_ADDRESS})')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help=f'Sentence transformer model (default: {DEFAULT_MODEL})')
+    parser.add_argument('--backend', choices=BACKENDS, default='torch', help='Inference backend (default: torch)')
+    parser.add_argument('--threads', type=int, default=0, help='CPU threads for inference (default: library default)')
+    parser.add_argument('--quantize', action='store_true', help='Use int8 weights')
+    parser.add_argument('--max-batch', type=int, default=32, help='Maximum texts per batch (default: 32)')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help='How long a batch waits for more requests (default: 5)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    started = time.time()
+    model = load_model(args.model, args.backend, args.threads, args.quantize)
+    # Warm up before accepting connections so the first real query is not slow
+    model.encode(['warm up'], convert_to_numpy=True)
+    logger.info(f"Loaded embedding model {args.model} ({getattr(model, 'backend', 'torch')}, quantized={args.quantize}) "
+                f"in {time.time() - started:.1f}s")
+
+    server = EmbeddingServer(
+        args.address, load_authkey(args.address), model, args.max_batch, args.max_wait_ms,
+        info={'model': args.model, 'backend': getattr(model, 'backend', 'torch'), 'threads': args.threads,
+              'quantized': args.quantize}
+    )
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
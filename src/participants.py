@@ -0,0 +1,72 @@
+"""
+Recording Participants
+
+Helpers for the normalized recording-participant index. Recordings store
+their participants as a comma-separated display string; the index keeps one
+row per (recording, name) so speaker filters are equality joins and a user's
+speaker list is a single DISTINCT query.
+
+NameMatcher finds which of a set of speaker names occur in free text with one
+precompiled regular expression, replacing per-name substring scans.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set
+
+# Longest name stored in RecordingParticipant.name
+MAX_PARTICIPANT_NAME_LENGTH = 100
+
+
+def parse_participants(participants: Optional[str]) -> List[str]:
+    """Split a comma-separated participants string into unique, trimmed names in order."""
+    names = []
+    seen = set()
+    for name in (participants or '').split(','):
+        name = name.strip()[:MAX_PARTICIPANT_NAME_LENGTH]
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+class NameMatcher:
+    """Case-insensitive whole-word matcher for a fixed set of names."""
+
+    def __init__(self, names: Iterable[str]):
+        self._canonical = {}
+        for name in names:
+            if name and name.strip():
+                self._canonical.setdefault(name.strip().lower(), name)
+        if self._canonical:
+            # Longest names first so "Ann Lee" wins over "Ann"
+            alternatives = sorted(self._canonical, key=len, reverse=True)
+            self._pattern = re.compile(
+                r'(?<!\w)(?:' + '|'.join(re.escape(name) for name in alternatives) + r')(?!\w)',
+                re.IGNORECASE
+            )
+        else:
+            self._pattern = None
+
+    def find(self, text: Optional[str]) -> Set[str]:
+        """Names (in their original spelling) that occur in text."""
+        if not text or self._pattern is None:
+            return set()
+        return {self._canonical[match.group(0).lower()] for match in self._pattern.finditer(text)}
+
+    def find_in_order(self, text: Optional[str]) -> List[str]:
+        """Like find(), in order of first occurrence."""
+        if not text or self._pattern is None:
+            return []
+        names = []
+        for match in self._pattern.finditer(text):
+            name = self._canonical[match.group(0).lower()]
+            if name not in names:
+                names.append(name)
+        return names
+
+
+@lru_cache(maxsize=64)
+def name_matcher(names: tuple) -> NameMatcher:
+    """Cached NameMatcher for a tuple of names, so each user's pattern is compiled once."""
+    return NameMatcher(names)
@@ -0,0 +1,198 @@
+"""
+Local Query Router for Inquire Mode
+
+Decides whether an Inquire Mode message needs a transcript search ("RAG") or
+can be answered from the conversation alone ("DIRECT") without an LLM call.
+Clear cases are settled by keyword heuristics: a request to rework the
+previous answer points to DIRECT (only when the session has one), questions
+about what was said in meetings point to RAG. The remaining messages are classified by the nearest
+centroid of labelled example queries in the embedding model's space. When the
+two centroids are too close to call, no decision is returned and the caller
+falls back to the LLM router.
+
+RouterStats keeps the counters that are needed to tune the thresholds:
+decision latency, how often the LLM fallback is used and how often sampled
+local decisions agree with the LLM router.
+"""
+
+import re
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+RAG = 'RAG'
+DIRECT = 'DIRECT'
+
+RAG_EXAMPLES = [
+    "What did Beth say about the budget?",
+    "Who mentioned the timeline?",
+    "When is the product launch planned?",
+    "What were the action items from the planning meeting?",
+    "Summarize the discussion about hiring",
+    "Did anyone raise concerns about security?",
+    "What decisions were made about pricing last week?",
+    "Which customers were discussed in the sales call?",
+    "What is the status of the migration project?",
+    "Find where we talked about the contract renewal",
+    "What feedback did the client give?",
+    "How much did they say the project would cost?",
+    "What did I promise to send after the call?",
+    "List the risks that came up in our meetings",
+    "What are the next steps for the marketing campaign?",
+]
+
+DIRECT_EXAMPLES = [
+    "Can you format this in separate headings?",
+    "Make this more structured",
+    "Put that in a table",
+    "Rewrite your answer as bullet points",
+    "Make it shorter",
+    "Translate that into Spanish",
+    "Explain your last response in simpler terms",
+    "Thanks, that's helpful",
+    "Can you make the previous answer more formal?",
+    "Use numbered lists instead",
+    "Hello",
+    "What can you help me with?",
+    "Combine the two lists above",
+    "Expand on the second point",
+    "Turn this into an email",
+]
+
+# A reference to something the assistant already produced
+_PREVIOUS_ANSWER = re.compile(
+    r"\b(?:your|the|that|this|last|previous|above)\s+(?:answer|response|reply|summary|list|table|output|message|text)\b"
+    r"|\b(?:above|you (?:just )?(?:said|wrote|listed))\b",
+    re.IGNORECASE
+)
+# A pronoun pointing back at something already in the conversation
+_REFERENCE = re.compile(r"\b(?:it|this|that|these|those|them)\b", re.IGNORECASE)
+# A request to change the presentation rather than the content
+_FORMATTING = re.compile(
+    r"\b(?:re)?format\b|\b(?:rewrite|rephrase|restructure|shorten|simplify|translate)\b"
+    r"|\b(?:shorter|longer|bullet(?:ed)? points?|bullets|headings?|numbered list|markdown)\b"
+    r"|\b(?:as|in|into) a table\b|\bmore (?:structured|concise|detailed|formal|casual)\b",
+    re.IGNORECASE
+)
+# A question about what was said or decided in recordings
+_CONTENT = re.compile(
+    r"\b(?:who|when|where|why|how much|how many)\b"
+    r"|\b(?:say|said|says|mention(?:ed|s)?|discuss(?:ed|es)?|talk(?:ed)? about|decided|agreed|promised|asked)\b"
+    r"|\b(?:meetings?|recordings?|transcripts?|calls?|conversations?|interviews?)\b",
+    re.IGNORECASE
+)
+
+
+def heuristic_route(query: str, has_previous_answer: bool = False) -> Optional[str]:
+    """
+    Route a query by keywords alone, or return None if the cues are missing or conflicting.
+
+    A formatting request is only DIRECT when it refers back to an answer and the
+    session has one; "List the action items in bullet points" still needs a search.
+    """
+    formatting = bool(_FORMATTING.search(query))
+    refers_back = bool(_PREVIOUS_ANSWER.search(query) or (formatting and _REFERENCE.search(query)))
+    content_cues = bool(_CONTENT.search(query))
+    if refers_back and not content_cues:
+        return DIRECT if has_previous_answer else None
+    if content_cues and not (refers_back or formatting):
+        return RAG
+    return None
+
+
+class QueryRouter:
+    """Keyword heuristics plus nearest-centroid classification over labelled examples."""
+
+    def __init__(self, model=None, min_margin: float = 0.05):
+        """
+        Args:
+            model: Sentence embedding model with an encode() method, or None for heuristics only
+            min_margin: Smallest difference between the two centroid similarities
+                that counts as a confident decision
+        """
+        self.model = model
+        self.min_margin = min_margin
+        self._centroids = None
+        self._lock = threading.Lock()
+
+    def _get_centroids(self) -> np.ndarray:
+        """Unit-length RAG and DIRECT centroids, encoded on first use."""
+        if self._centroids is None:
+            with self._lock:
+                if self._centroids is None:
+                    centroids = []
+                    for examples in (RAG_EXAMPLES, DIRECT_EXAMPLES):
+                        embeddings = np.asarray(self.model.encode(examples), dtype=np.float32)
+                        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+                        centroid = embeddings.mean(axis=0)
+                        centroids.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+                    self._centroids = np.stack(centroids)
+        return self._centroids
+
+    def route(self, query: str, has_previous_answer: bool = False) -> Tuple[Optional[str], float, str]:
+        """
+        Classify a query locally.
+
+        Args:
+            query: The user's message
+            has_previous_answer: Whether the session already holds an assistant answer
+
+        Returns:
+            (decision, confidence, method): decision is RAG, DIRECT or None when the
+            caller should ask the LLM router; confidence is 1.0 for heuristic
+            decisions and the centroid similarity margin otherwise; method is
+            'heuristic' or 'centroid'
+        """
+        decision = heuristic_route(query, has_previous_answer)
+        if decision is not None:
+            return decision, 1.0, 'heuristic'
+        if self.model is None:
+            return None, 0.0, 'centroid'
+
+        embedding = np.asarray(self.model.encode([query]), dtype=np.float32)[0]
+        embedding /= max(np.linalg.norm(embedding), 1e-12)
+        rag_similarity, direct_similarity = (self._get_centroids() @ embedding).tolist()
+        margin = abs(rag_similarity - direct_similarity)
+        if margin < self.min_margin:
+            return None, margin, 'centroid'
+        return (RAG if rag_similarity > direct_similarity else DIRECT), margin, 'centroid'
+
+
+class RouterStats:
+    """Thread-safe counters for tuning the local router."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {'heuristic': 0, 'centroid': 0, 'llm': 0}
+        self._latency_ms = {'heuristic': 0.0, 'centroid': 0.0, 'llm': 0.0}
+        self._audited = 0
+        self._agreed = 0
+
+    def record_decision(self, method: str, latency_ms: float) -> int:
+        """Count one routing decision made by method; returns the total number of decisions."""
+        with self._lock:
+            self._counts[method] += 1
+            self._latency_ms[method] += latency_ms
+            return sum(self._counts.values())
+
+    def record_audit(self, agreed: bool):
+        """Count one local decision that was checked against the LLM router."""
+        with self._lock:
+            self._audited += 1
+            self._agreed += int(agreed)
+
+    def snapshot(self) -> dict:
+        """Decision counts, mean latencies, fallback rate and LLM agreement rate."""
+        with self._lock:
+            total = sum(self._counts.values())
+            return {
+                'decisions': dict(self._counts),
+                'mean_latency_ms': {
+                    method: round(self._latency_ms[method] / count, 2) if count else None
+                    for method, count in self._counts.items()
+                },
+                'fallback_rate': round(self._counts['llm'] / total, 3) if total else None,
+                'audited': self._audited,
+                'agreement_rate': round(self._agreed / self._audited, 3) if self._audited else None,
+            }
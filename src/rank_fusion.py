@@ -0,0 +1,92 @@
+"""
+Rank Fusion for Multi-Query Search
+
+Combines the ranked result lists of several searches, such as the enriched
+variants of an Inquire Mode question or the lexical and vector retrievers, into
+one list while remembering which search found each chunk. Pure Python, so it also serves deployments without the
+optional embedding dependencies.
+"""
+
+from typing import List, Sequence, Tuple
+
+
+def fuse_results(per_query_results: Sequence[Sequence[Tuple[int, float]]], method: str = 'max',
+                 rrf_k: int = 60) -> List[Tuple[int, float, dict]]:
+    """
+    Fuse the ranked results of several queries into one list.
+
+    Args:
+        per_query_results: One best-first list of (chunk_id, similarity) per query
+        method: 'max' keeps each chunk's best similarity; 'rrf' sums reciprocal
+            ranks (1 / (rrf_k + rank)), favouring chunks several queries agree on
+        rrf_k: Damping constant for reciprocal rank fusion
+
+    Returns:
+        List of (chunk_id, fused score, {query position: similarity}) sorted by
+        descending fused score
+    """
+    if method not in ('max', 'rrf'):
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    fused = {}
+    provenance = {}
+    for query_position, results in enumerate(per_query_results):
+        for rank, (chunk_id, similarity) in enumerate(results, start=1):
+            matched = provenance.setdefault(chunk_id, {})
+            if query_position in matched:
+                continue
+            matched[query_position] = similarity
+            if method == 'max':
+                fused[chunk_id] = max(fused.get(chunk_id, similarity), similarity)
+            else:
+                fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return [(chunk_id, score, provenance[chunk_id]) for chunk_id, score in ordered]
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[Sequence[Tuple[int, float]]],
+                           rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """
+    Fuse lists from retrievers whose scores are not comparable (e.g. BM25 and cosine).
+
+    Only ranks are used. Scores are scaled to 0..1, where 1.0 means every
+    retriever ranked the chunk first, so they stay comparable across queries.
+
+    Returns:
+        List of (chunk_id, fused score) sorted by descending score
+    """
+    if not result_lists:
+        return []
+    scale = (rrf_k + 1) / len(result_lists)
+    return [(chunk_id, score * scale) for chunk_id, score, _ in fuse_results(result_lists, 'rrf', rrf_k)]
+
+
+def merge_fused_results(fused_lists: Sequence[Sequence[Tuple[object, float, dict]]],
+                        key=None) -> List[Tuple[object, float, dict]]:
+    """
+    Merge 'max'-fused result lists of searches run separately for different queries.
+
+    Because 'max' fusion scores a chunk by its best single-query score, merging
+    by maximum gives the same ranking as fusing all queries in one search. Used
+    to combine a speculative search for the raw question with the later search
+    for its enriched variants.
+
+    Args:
+        fused_lists: Lists of (item, fused score, matched) as returned by a search
+        key: Function mapping an item to its identity; defaults to the item itself
+
+    Returns:
+        List of (item, best score, union of matched) sorted by descending score
+    """
+    key = key or (lambda item: item)
+    merged = {}
+    for results in fused_lists:
+        for item, score, matched in results:
+            identity = key(item)
+            if identity in merged:
+                best_item, best_score, best_matched = merged[identity]
+                merged[identity] = (best_item, max(best_score, score), {**best_matched, **matched})
+            else:
+                merged[identity] = (item, score, dict(matched))
+    return sorted(merged.values(), key=lambda entry: entry[1], reverse=True)
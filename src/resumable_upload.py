@@ -0,0 +1,167 @@
+"""
+Resumable Uploads
+
+Helpers for the chunked upload protocol: the client opens an upload session,
+sends the file as consecutive byte ranges (PUT with a Content-Range header)
+and completes the session, which turns the file into a recording. After a
+network failure the client asks for the session's offset and continues from
+there instead of starting over.
+
+Ranges are written straight into a part file next to the final path in the
+upload folder, so completing an upload is a rename rather than a copy. The
+SHA-256 of the file is computed while the ranges arrive; each process keeps
+the running hash of the uploads it is receiving and rebuilds it from the part
+file when a range lands on a process that did not see the previous ones.
+Ranges of one upload are serialized across all worker processes with an
+exclusive flock on its part file.
+
+A live upload is opened before its size is known: a recording is uploaded in
+timesliced segments while it is still being made, with open-ended ranges
+('bytes start-end/*'), so that its completed portions can be transcribed
+before the recording ends.
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+BLOCK_SIZE = 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+def parse_content_range(header: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Parse a 'bytes start-end/total' Content-Range header.
+
+    Returns:
+        (start, end, total) with end inclusive and total None for '*', or
+        None if the header is missing or malformed
+    """
+    match = _CONTENT_RANGE.match((header or '').strip())
+    if not match:
+        return None
+    start, end = int(match.group(1)), int(match.group(2))
+    total = None if match.group(3) == '*' else int(match.group(3))
+    if end < start or (total is not None and end >= total):
+        return None
+    return start, end, total
+
+
+def file_sha256(path: str, length: Optional[int] = None) -> 'hashlib._Hash':
+    """Hash of the first length bytes of a file (all of it if length is None)."""
+    hasher = hashlib.sha256()
+    remaining = length
+    with open(path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            block = f.read(BLOCK_SIZE if remaining is None else min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return hasher
+
+
+@contextmanager
+def part_file_lock(path: str):
+    """
+    Hold an exclusive, cross-process lock on an upload's part file.
+
+    flock locks belong to the open file, so this also serializes threads of
+    the same process. Raises FileNotFoundError if the part file is gone
+    (the upload was completed or cancelled).
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def write_range(path: str, start: int, stream: BinaryIO, length: int, hasher=None) -> int:
+    """
+    Copy up to length bytes from stream into path at offset start, block by block.
+
+    start must be the committed offset, read while holding part_file_lock():
+    bytes past it are left over from an attempt that was cut off and are
+    discarded first, and nothing before it is ever touched. A client that
+    disconnects mid-range leaves the bytes received so far, so the returned
+    count may be smaller than length.
+
+    Returns:
+        Number of bytes written
+    """
+    written = 0
+    with open(path, 'r+b') as f:
+        f.truncate(start)
+        f.seek(start)
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            f.write(block)
+            if hasher is not None:
+                hasher.update(block)
+            written += len(block)
+    return written
+
+
+class UploadHashes:
+    """Running SHA-256 per upload in this process, rebuilt from disk when out of step."""
+
+    def __init__(self):
+        self._hashes = {}  # upload id -> (offset, hasher)
+        self._lock = threading.Lock()
+
+    def at_offset(self, upload_id: str, path: str, offset: int):
+        """Hasher covering exactly the first offset bytes of the part file."""
+        cached = self._hashes.get(upload_id)
+        if cached and cached[0] == offset:
+            return cached[1].copy()
+        return file_sha256(path, offset) if os.path.exists(path) else hashlib.sha256()
+
+    def store(self, upload_id: str, offset: int, hasher):
+        self._hashes[upload_id] = (offset, hasher)
+
+    def discard(self, upload_id: str):
+        with self._lock:
+            self._hashes.pop(upload_id, None)
+
+
+class LiveTranscriptions:
+    """Live uploads this process is transcribing, and when each was last checked for new audio."""
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._locks = {}
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def lock(self, upload_id: str) -> threading.Lock:
+        """Lock held while segments of one upload are transcribed in this process."""
+        with self._lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def due(self, upload_id: str, now: Optional[float] = None) -> bool:
+        """Whether check_interval has passed since the last check of an upload; counts as a check if so."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            last = self._checked.get(upload_id)
+            if last is not None and now - last < self.check_interval:
+                return False
+            self._checked[upload_id] = now
+            return True
+
+    def discard(self, upload_id: str):
+        with self._lock:
+            self._locks.pop(upload_id, None)
+            self._checked.pop(upload_id, None)
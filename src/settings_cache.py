@@ -0,0 +1,105 @@
+"""
+System Settings Cache
+
+Keeps every SystemSetting of the process in memory, already converted to its
+declared type, so reading a setting on a hot path costs a dictionary lookup
+instead of a database query.
+
+Workers share nothing but the database, so changes are propagated through a
+single settings-version counter that is incremented in the same transaction
+as every settings write. Each process compares its cached version with the
+stored one at most once per check interval and reloads all settings when the
+counter has moved; an admin change therefore applies to every worker within
+one interval, and to the worker that made it immediately.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_CHECK_INTERVAL = 1.0  # seconds
+
+BOOLEAN_TRUE_VALUES = ('true', '1', 'yes')
+
+
+def convert_setting_value(value: Optional[str], setting_type: str):
+    """
+    Convert a stored setting string to its declared type.
+
+    Returns:
+        The typed value, or None if the value is missing or cannot be
+        converted (callers then use their default)
+    """
+    if setting_type == 'integer':
+        try:
+            return int(value) if value is not None else None
+        except (ValueError, TypeError):
+            return None
+    if setting_type == 'boolean':
+        return value.lower() in BOOLEAN_TRUE_VALUES if value else None
+    if setting_type == 'float':
+        try:
+            return float(value) if value is not None else None
+        except (ValueError, TypeError):
+            return None
+    return value
+
+
+class SettingsCache:
+    """Typed in-process copy of the system settings, invalidated by a shared version counter."""
+
+    def __init__(self, load_version: Callable[[], Optional[int]],
+                 load_settings: Callable[[], Iterable[Tuple[str, Optional[str], str]]],
+                 check_interval: float = DEFAULT_CHECK_INTERVAL,
+                 on_reload: Optional[Callable[['SettingsCache'], None]] = None):
+        """
+        Args:
+            load_version: Returns the stored settings version
+            load_settings: Returns (key, value, setting_type) for every setting
+            check_interval: Smallest number of seconds between two version checks
+            on_reload: Called after every reload, e.g. to apply settings to app config
+        """
+        self.load_version = load_version
+        self.load_settings = load_settings
+        self.check_interval = check_interval
+        self.on_reload = on_reload
+        self.version = None
+        self.reloads = 0
+        self._values: Optional[Dict[str, object]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        """Typed value of a setting, or default if it is not set."""
+        self.refresh()
+        value = self._values.get(key)
+        return default if value is None else value
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the settings if the stored version moved since the last load.
+
+        The stored version is read at most once per check interval unless
+        force is set. Returns True if the settings were reloaded.
+        """
+        now = time.monotonic()
+        if not force and self._values is not None and now - self._checked_at < self.check_interval:
+            return False
+        with self._lock:
+            if not force and self._values is not None and now - self._checked_at < self.check_interval:
+                return False
+            version = self.load_version()
+            self._checked_at = time.monotonic()
+            if self._values is not None and version == self.version and not force:
+                return False
+            self._values = {key: convert_setting_value(value, setting_type)
+                            for key, value, setting_type in self.load_settings()}
+            self.version = version
+            self.reloads += 1
+        if self.on_reload:
+            self.on_reload(self)
+        return True
+
+    def invalidate(self):
+        """Force a version check on the next read, e.g. after this process changed a setting."""
+        self._checked_at = 0.0
@@ -0,0 +1,225 @@
+"""
+Streaming Response Processor
+
+Turns a streamed LLM completion into the server-sent events the chat
+endpoints send to the browser: 'delta' frames with the visible answer and
+'thinking' frames with the content of <think>/<thinking> sections.
+
+Tags are recognised by an incremental state machine, so each token is looked
+at once and only a possible partial tag at its end is carried over to the next
+token. Visible text is coalesced into frames of at most one per flush window
+instead of one frame per provider token, which saves server CPU and browser
+re-renders.
+
+Detectors watch the beginning of the visible answer for a marker (such as a
+request for a full transcript). While a detector is undecided the answer is
+held back; once it matches, processing pauses so the caller can act on it.
+"""
+
+import json
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_FLUSH_INTERVAL = 0.05  # seconds
+DEFAULT_FLUSH_CHARS = 256
+
+_OPEN_TAGS = ('<think>', '<thinking>')
+_CLOSE_TAGS = ('</think>', '</thinking>')
+
+
+def sse_frame(payload: dict) -> str:
+    """Format one server-sent event."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+class ThinkingTagParser:
+    """Incrementally splits streamed text into visible and thinking parts."""
+
+    def __init__(self):
+        self.in_thinking = False
+        self._pending = ''  # possible partial tag at the end of the last token
+        self._thinking = []
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Consume one token of streamed text.
+
+        Returns:
+            List of ('delta', text) and ('thinking', text) events; a thinking
+            event is produced once its section is closed
+        """
+        data = self._pending + text
+        self._pending = ''
+        events = []
+        position = 0
+        while True:
+            start = data.find('<', position)
+            if start == -1:
+                self._emit(data[position:], events)
+                break
+            self._emit(data[position:start], events)
+            rest = data[start:start + 12].lower()
+            tags = _CLOSE_TAGS if self.in_thinking else _OPEN_TAGS
+            tag = next((tag for tag in tags if rest.startswith(tag)), None)
+            if tag:
+                if self.in_thinking:
+                    self._close_thinking(events)
+                self.in_thinking = not self.in_thinking
+                position = start + len(tag)
+            elif any(tag.startswith(rest) for tag in tags):
+                self._pending = data[start:]
+                break
+            else:
+                self._emit('<', events)
+                position = start + 1
+        return events
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """Flush the remaining text at the end of the stream; an unclosed thinking section is still reported."""
+        events = []
+        self._emit(self._pending, events)
+        self._pending = ''
+        if self.in_thinking:
+            self._close_thinking(events)
+            self.in_thinking = False
+        return events
+
+    def _emit(self, text: str, events: List[Tuple[str, str]]):
+        if not text:
+            return
+        if self.in_thinking:
+            self._thinking.append(text)
+        elif events and events[-1][0] == 'delta':
+            events[-1] = ('delta', events[-1][1] + text)
+        else:
+            events.append(('delta', text))
+
+    def _close_thinking(self, events: List[Tuple[str, str]]):
+        thinking = ''.join(self._thinking).strip()
+        self._thinking = []
+        if thinking:
+            events.append(('thinking', thinking))
+
+
+class MarkerLineDetector:
+    """Detects an answer whose first line starts with marker and captures the rest of that line."""
+
+    def __init__(self, marker: str):
+        self.marker = marker
+
+    def inspect(self, text: str, final: bool):
+        """
+        Look at the visible answer so far.
+
+        Returns:
+            None while undecided, False if the answer does not start with the
+            marker, otherwise the text following the marker on its line
+        """
+        stripped = text.lstrip()
+        if len(stripped) < len(self.marker):
+            return None if self.marker.startswith(stripped) and not final else False
+        if not stripped.startswith(self.marker):
+            return False
+        line_end = stripped.find('\n')
+        if line_end == -1 and not final:
+            return None
+        return stripped[len(self.marker):line_end if line_end != -1 else None].strip()
+
+
+class StreamProcessor:
+    """
+    Converts a streamed completion into coalesced SSE frames.
+
+    Usage:
+        processor = StreamProcessor(detectors={'name': MarkerLineDetector('MARKER:')})
+        for frame in processor.frames(stream):
+            yield frame
+        if processor.detected:
+            ...  # act on it, or call processor.frames(stream) again to continue
+    """
+
+    def __init__(self, detectors: Optional[Dict[str, object]] = None,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, flush_chars: int = DEFAULT_FLUSH_CHARS):
+        self.parser = ThinkingTagParser()
+        self.detectors = dict(detectors or {})
+        self.flush_interval = flush_interval
+        self.flush_chars = flush_chars
+        self.detected = None  # (detector name, result) once a detector matched
+        self._held = []  # visible text held back while a detector is undecided
+        self._buffer = []  # visible text waiting for the next frame
+        self._visible = []
+
+    @property
+    def text(self) -> str:
+        """Visible answer sent so far."""
+        return ''.join(self._visible)
+
+    def frames(self, stream: Iterable) -> Iterator[str]:
+        """
+        Yield SSE frames for a completion stream of OpenAI-style chunks.
+
+        Stops early, with self.detected set, when a detector matches; calling
+        frames() again with the same stream continues after the held-back text.
+        """
+        self.detected = None
+        self._buffer = [] if self.detectors else self._held
+        if not self.detectors:
+            self._held = []
+        last_flush = time.monotonic()
+
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            for kind, text in self.parser.feed(content):
+                if kind == 'thinking':
+                    yield from self._flush()
+                    yield sse_frame({'thinking': text})
+                elif self._accept(text, final=False):
+                    return
+            if self._buffer and (sum(len(text) for text in self._buffer) >= self.flush_chars
+                                 or time.monotonic() - last_flush >= self.flush_interval):
+                yield from self._flush()
+                last_flush = time.monotonic()
+
+        for kind, text in self.parser.finish():
+            if kind == 'thinking':
+                yield from self._flush()
+                yield sse_frame({'thinking': text})
+            elif self._accept(text, final=False):
+                return
+        if self.detectors and self._accept('', final=True):
+            return
+        yield from self._flush()
+
+    def _accept(self, text: str, final: bool) -> bool:
+        """Queue visible text, holding it back while a detector is undecided; True once a detector matches."""
+        if not self.detectors:
+            if text:
+                self._buffer.append(text)
+            return False
+        self._held.append(text)
+        held = ''.join(self._held)
+        for name, detector in list(self.detectors.items()):
+            result = detector.inspect(held, final)
+            if result is False:
+                del self.detectors[name]
+            elif result is not None:
+                self.detected = (name, result)
+                self.detectors = {}
+                self._held = [held]
+                return True
+        if not self.detectors:
+            self._buffer.append(held)
+            self._held = []
+        return False
+
+    def _flush(self) -> Iterator[str]:
+        """Send the queued visible text as one frame."""
+        text = ''.join(self._buffer)
+        self._buffer = []
+        if text:
+            self._visible.append(text)
+            yield sse_frame({'delta': text})
@@ -0,0 +1,273 @@
+"""
+Transcript Chunking for Inquire Mode
+
+Splits a recording's transcription into the chunks that get embedded and
+searched. Diarized ASR transcriptions (a JSON array of segments with speaker,
+sentence, start_time and end_time) are chunked by walking the segments: whole
+speaker turns are packed into token-bounded chunks, so a chunk boundary falls
+between turns whenever possible and every chunk knows its time span and
+speakers. Plain-text transcriptions are split into sentences with a regex and
+packed the same way.
+
+Chunk lengths are measured in approximate tokens (words and punctuation marks)
+so they stay well inside the embedding model's input window.
+"""
+
+import re
+import json
+import hashlib
+from typing import Iterable, List, Optional
+
+# all-MiniLM-L6-v2 truncates input after 256 word pieces
+DEFAULT_MAX_TOKENS = 128
+DEFAULT_OVERLAP_TOKENS = 24
+
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Longest value stored in TranscriptChunk.speaker_name
+MAX_SPEAKER_NAME_LENGTH = 100
+
+
+def count_word_tokens(text: str) -> int:
+    """Approximate embedding-model tokens: one per word or punctuation mark (chunk sizing only)."""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def content_hash(text: str) -> str:
+    """Stable fingerprint of a chunk's text, used to reuse embeddings across re-chunking."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def expand_chunk_indexes(indexes: Iterable[int], neighbors: int = 1) -> List[int]:
+    """Sorted chunk indexes within neighbors positions of any of the given ones."""
+    expanded = set()
+    for index in indexes:
+        expanded.update(range(max(index - neighbors, 0), index + neighbors + 1))
+    return sorted(expanded)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text at sentence-ending punctuation followed by whitespace, and at line breaks."""
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence and sentence.strip()]
+
+
+def _split_long_text(text: str, max_tokens: int) -> List[str]:
+    """Split text into pieces of at most max_tokens, at sentence boundaries first, then between words."""
+    pieces = []
+    for sentence in split_sentences(text):
+        if count_word_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        piece = []
+        piece_tokens = 0
+        for word in words:
+            word_tokens = count_word_tokens(word)
+            if piece and piece_tokens + word_tokens > max_tokens:
+                pieces.append(' '.join(piece))
+                piece, piece_tokens = [], 0
+            piece.append(word)
+            piece_tokens += word_tokens
+        if piece:
+            pieces.append(' '.join(piece))
+    return pieces
+
+
+def parse_transcript_segments(transcription: str) -> Optional[List[dict]]:
+    """
+    Parse a diarized JSON transcription into segments.
+
+    Returns:
+        List of {'speaker', 'text', 'start_time', 'end_time'} dicts, or None if
+        the transcription is plain text
+    """
+    stripped = transcription.lstrip()
+    if not stripped.startswith('['):
+        return None
+    try:
+        data = json.loads(stripped)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if not isinstance(data, list) or not all(isinstance(segment, dict) for segment in data):
+        return None
+
+    segments = []
+    for segment in data:
+        text = (segment.get('sentence') or segment.get('text') or '').strip()
+        if text:
+            segments.append({
+                'speaker': segment.get('speaker'),
+                'text': text,
+                'start_time': segment.get('start_time', segment.get('start')),
+                'end_time': segment.get('end_time', segment.get('end')),
+            })
+    return segments
+
+
+def _split_long_segment(segment: dict, max_tokens: int) -> List[dict]:
+    """Split one oversized segment, interpolating its timestamps by text position."""
+    pieces = _split_long_text(segment['text'], max_tokens)
+    start, end = segment['start_time'], segment['end_time']
+    timed = isinstance(start, (int, float)) and isinstance(end, (int, float))
+    total = sum(len(piece) for piece in pieces) or 1
+
+    parts = []
+    offset = 0
+    for piece in pieces:
+        part = dict(segment, text=piece)
+        if timed:
+            part['start_time'] = start + (end - start) * offset / total
+            part['end_time'] = start + (end - start) * (offset + len(piece)) / total
+        offset += len(piece)
+        parts.append(part)
+    return parts
+
+
+def _render_segment_chunk(segments: List[dict]) -> dict:
+    """Build a chunk with one "Speaker: text" line per speaker turn."""
+    lines = []
+    speakers = []
+    for segment in segments:
+        speaker = segment['speaker']
+        if speaker and speaker not in speakers:
+            speakers.append(speaker)
+        if lines and lines[-1][0] == speaker:
+            lines[-1][1].append(segment['text'])
+        else:
+            lines.append((speaker, [segment['text']]))
+
+    content = '\n'.join(
+        f"{speaker}: {' '.join(texts)}" if speaker else ' '.join(texts) for speaker, texts in lines
+    )
+    speaker_name = ', '.join(speakers)
+    if len(speaker_name) > MAX_SPEAKER_NAME_LENGTH:
+        speaker_name = speaker_name[:MAX_SPEAKER_NAME_LENGTH - 3] + '...'
+
+    starts = [segment['start_time'] for segment in segments if isinstance(segment['start_time'], (int, float))]
+    ends = [segment['end_time'] for segment in segments if isinstance(segment['end_time'], (int, float))]
+    return {
+        'content': content,
+        'start_time': float(min(starts)) if starts else None,
+        'end_time': float(max(ends)) if ends else None,
+        'speaker_name': speaker_name or None,
+    }
+
+
+def chunk_segments(segments: List[dict], max_tokens: int = DEFAULT_MAX_TOKENS,
+                   overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[dict]:
+    """
+    Pack transcript segments into chunks on speaker-turn boundaries.
+
+    Consecutive turns share a chunk while they fit in max_tokens. A turn longer
+    than max_tokens is split between its segments (or inside an oversized
+    segment), and only those mid-turn splits repeat up to overlap_tokens of
+    trailing segments in the next chunk.
+
+    Returns:
+        List of {'content', 'start_time', 'end_time', 'speaker_name'} dicts
+    """
+    turns = []
+    for segment in segments:
+        if turns and turns[-1][-1]['speaker'] == segment['speaker']:
+            turns[-1].append(segment)
+        else:
+            turns.append([segment])
+
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for turn in turns:
+        turn_tokens = sum(count_word_tokens(segment['text']) for segment in turn)
+        if current and current_tokens + turn_tokens > max_tokens:
+            chunks.append(_render_segment_chunk(current))
+            current, current_tokens = [], 0
+
+        if turn_tokens <= max_tokens:
+            current.extend(turn)
+            current_tokens += turn_tokens
+            continue
+
+        # Oversized turn: split between segments, carrying a little context across
+        parts = []
+        for segment in turn:
+            if count_word_tokens(segment['text']) > max_tokens:
+                parts.extend(_split_long_segment(segment, max_tokens))
+            else:
+                parts.append(segment)
+        for part in parts:
+            part_tokens = count_word_tokens(part['text'])
+            if current and current_tokens + part_tokens > max_tokens:
+                chunks.append(_render_segment_chunk(current))
+                overlap, overlap_count = [], 0
+                for previous in reversed(current):
+                    previous_tokens = count_word_tokens(previous['text'])
+                    if previous['speaker'] != part['speaker'] or overlap_count + previous_tokens > overlap_tokens:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_count += previous_tokens
+                if overlap_count + part_tokens > max_tokens:
+                    overlap, overlap_count = [], 0
+                current, current_tokens = overlap, overlap_count
+            current.append(part)
+            current_tokens += part_tokens
+
+    if current:
+        chunks.append(_render_segment_chunk(current))
+    return chunks
+
+
+def chunk_text(text: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+               overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[dict]:
+    """
+    Pack the sentences of a plain-text transcription into token-bounded chunks.
+
+    Up to overlap_tokens of trailing sentences are repeated at the start of the
+    next chunk. Timing and speaker fields are None.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for sentence in _split_long_text(text, max_tokens):
+        sentence_tokens = count_word_tokens(sentence)
+        if current and current_tokens + sentence_tokens > max_tokens:
+            chunks.append(' '.join(current))
+            overlap, overlap_count = [], 0
+            for previous in reversed(current):
+                previous_tokens = count_word_tokens(previous)
+                if overlap_count + previous_tokens > overlap_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_count += previous_tokens
+            if overlap_count + sentence_tokens > max_tokens:
+                overlap, overlap_count = [], 0
+            current, current_tokens = overlap, overlap_count
+        current.append(sentence)
+        current_tokens += sentence_tokens
+
+    if current:
+        chunks.append(' '.join(current))
+    return [{'content': chunk, 'start_time': None, 'end_time': None, 'speaker_name': None} for chunk in chunks]
+
+
+def chunk_transcription(transcription: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+                        overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[dict]:
+    """
+    Split a transcription into chunks for embedding and retrieval.
+
+    Args:
+        transcription: Diarized JSON segments or plain text
+        max_tokens: Approximate token budget per chunk
+        overlap_tokens: Approximate tokens repeated where a chunk boundary cuts through a passage
+
+    Returns:
+        List of {'content', 'start_time', 'end_time', 'speaker_name'} dicts
+    """
+    if not transcription or not transcription.strip():
+        return []
+    segments = parse_transcript_segments(transcription)
+    if segments is not None:
+        return chunk_segments(segments, max_tokens, overlap_tokens)
+    return chunk_text(transcription, max_tokens, overlap_tokens)
@@ -107,6 +107,8 @@ document.addEventListener('DOMContentLoaded', async () => {
             const isRecording = ref(false);
             const mediaRecorder = ref(null);
             const audioChunks = ref([]);
+            const liveUpload = ref(null); // { id, offset, sending } while a recording is uploaded as it is made
+            const LIVE_UPLOAD_TIMESLICE_MS = 10000;
             const audioBlobURL = ref(null);
             const recordingTime = ref(0);
             const recordingInterval = ref(null);
@@ -237,6 +239,7 @@ document.addEventListener('DOMContentLoaded', async () => {
             const showChat = ref(false);
             const isChatMaximized = ref(false);
             const chatMessages = ref([]);
+            const chatSessionId = ref(null);
             const chatInput = ref('');
             const isChatLoading = ref(false);
             const chatMessagesRef = ref(null);
@@ -771,6 +774,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                 if (!status || status === 'COMPLETED') return '';
                 const statusMap = {
                     'PENDING': t('status.queued'),
+                    'CONVERTING': t('status.converting'),
                     'PROCESSING': t('status.processing'),
                     'TRANSCRIBING': t('status.transcribing'),
                     'SUMMARIZING': t('status.summarizing'),
@@ -783,6 +787,7 @@ document.addEventListener('DOMContentLoaded', async () => {
             const getStatusClass = (status) => {
                 switch(status) {
                     case 'PENDING': return 'status-pending';
+                    case 'CONVERTING': return 'status-processing';
                     case 'PROCESSING': return 'status-processing';
                     case 'SUMMARIZING': return 'status-summarizing';
                     case 'COMPLETED': return '';
@@ -1404,6 +1409,7 @@ document.addEventListener('DOMContentLoaded', async () => {
             const updateReprocessingProgress = (status, queueItem) => {
                 switch (status) {
                     case 'PENDING':
+                    case 'CONVERTING':
                         processingProgress.value = 20;
                         processingMessage.value = `Waiting to start ${queueItem.reprocessType} reprocessing...`;
                         break;
@@ -2002,6 +2008,22 @@ document.addEventListener('DOMContentLoaded', async () => {
                 if (isMobileScreen.value) {
                     isSidebarCollapsed.value = true;
                 }
+                loadRecordingDetails(recording);
+            };
+
+            // List items only carry the summary view; fetch the full record for the selected recording
+            const loadRecordingDetails = async (recording) => {
+                if (!recording || !recording.id || 'summary_html' in recording) return;
+                try {
+                    const response = await fetch(`/status/${recording.id}`);
+                    if (!response.ok) return;
+                    const data = await response.json();
+                    const index = recordings.value.findIndex(r => r.id === recording.id);
+                    if (index !== -1) Object.assign(recordings.value[index], data);
+                    if (selectedRecording.value?.id === recording.id) Object.assign(selectedRecording.value, data);
+                } catch (error) {
+                    console.error(`Failed to load details for recording ${recording.id}:`, error);
+                }
             };
 
             // --- File Upload ---
@@ -2074,6 +2096,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                             notes: notes,
                             tags: tags,
                             asrOptions: asrOptions,
+                            liveUploadId: file.liveUploadId || null,
                             status: 'queued', 
                             recordingId: null, 
                             clientId: clientId, 
@@ -2103,6 +2126,56 @@ document.addEventListener('DOMContentLoaded', async () => {
                 processingMessage.value = '';
             };
 
+            // Upload a file in byte ranges, resuming from the server's offset after network errors.
+            // A recording uploaded live while it was made only sends what the server is missing.
+            // Returns the response of the request that failed or of the final /complete call.
+            const uploadResumable = async (fileItem, fields) => {
+                const file = fileItem.file;
+                let response = fileItem.liveUploadId ? await fetch(`/api/uploads/${fileItem.liveUploadId}`).catch(() => null) : null;
+                if (!response || !response.ok) {
+                    response = await fetch('/api/uploads', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': `upload-${fileItem.clientId}` },
+                        body: JSON.stringify({ filename: file.name, size: file.size, fields })
+                    });
+                }
+                if (!response.ok) return response;
+                let upload = await response.json();
+                const total = upload.live ? '*' : file.size;
+
+                let failures = 0;
+                while (upload.offset < file.size) {
+                    const end = Math.min(upload.offset + upload.chunk_size, file.size) - 1;
+                    try {
+                        response = await fetch(`/api/uploads/${upload.upload_id}`, {
+                            method: 'PUT',
+                            headers: {
+                                'Content-Type': 'application/octet-stream',
+                                'Content-Range': `bytes ${upload.offset}-${end}/${total}`
+                            },
+                            body: file.slice(upload.offset, end + 1)
+                        });
+                        // A 409 carries the server's offset, so the loop continues from there
+                        if (!response.ok && response.status !== 409) return response;
+                        upload = await response.json();
+                        failures = 0;
+                    } catch (error) {
+                        if (++failures > 5) throw error;
+                        console.warn(`Upload of ${file.name} interrupted, resuming (attempt ${failures}):`, error);
+                        await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+                        const state = await fetch(`/api/uploads/${upload.upload_id}`).catch(() => null);
+                        if (state && state.ok) upload = await state.json();
+                    }
+                    processingProgress.value = 10 + Math.round(20 * upload.offset / file.size);
+                }
+
+                return fetch(`/api/uploads/${upload.upload_id}/complete`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ fields })
+                });
+            };
+
             const startProcessingQueue = async () => {
                 console.log("Attempting to start processing queue...");
                 if (isProcessingActive.value) {
@@ -2133,10 +2206,10 @@ document.addEventListener('DOMContentLoaded', async () => {
                     processingProgress.value = 5;
 
                     try {
-                        const formData = new FormData();
-                        formData.append('file', nextFileItem.file);
+                        // Same fields as the /upload form, sent with the resumable upload session
+                        const fields = {};
                         if (nextFileItem.notes) {
-                            formData.append('notes', nextFileItem.notes);
+                            fields.notes = nextFileItem.notes;
                         }
                         
                         // Add tags if selected (multiple tags)
@@ -2144,7 +2217,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                         const tagsToUse = nextFileItem.tags || selectedTags.value || [];
                         tagsToUse.forEach((tag, index) => {
                             const tagId = tag.id || tag; // Handle both tag objects and tag IDs
-                            formData.append(`tag_ids[${index}]`, tagId);
+                            fields[`tag_ids[${index}]`] = tagId;
                         });
                         
                         // Add ASR advanced options if ASR endpoint is enabled
@@ -2156,21 +2229,21 @@ document.addEventListener('DOMContentLoaded', async () => {
                             const maxSpeakers = asrOpts.max_speakers || uploadMaxSpeakers.value;
                             
                             if (language) {
-                                formData.append('language', language);
+                                fields.language = language;
                             }
                             // Only send speaker limits if they're actually set
                             if (minSpeakers && minSpeakers !== '') {
-                                formData.append('min_speakers', minSpeakers.toString());
+                                fields.min_speakers = minSpeakers.toString();
                             }
                             if (maxSpeakers && maxSpeakers !== '') {
-                                formData.append('max_speakers', maxSpeakers.toString());
+                                fields.max_speakers = maxSpeakers.toString();
                             }
                         }
 
                         processingMessage.value = 'Uploading file...';
                         processingProgress.value = 10;
 
-                        const response = await fetch('/upload', { method: 'POST', body: formData });
+                        const response = await uploadResumable(nextFileItem, fields);
                         const data = await response.json();
 
                         if (!response.ok) {
@@ -2432,6 +2505,9 @@ document.addEventListener('DOMContentLoaded', async () => {
                                 const maxProgress = fileItem.willAutoSummarize ? 65 : 75;
                                 processingProgress.value = Math.round(Math.min(maxProgress, processingProgress.value + Math.random() * 5));
                             }
+                        } else if (data.status === 'CONVERTING') {
+                            processingMessage.value = 'Converting audio...';
+                            processingProgress.value = 35;
                         } else if (data.status === 'SUMMARIZING') {
                             console.log(`Auto-summary started for ${fileItem.file.name}`);
                             processingMessage.value = 'Generating summary...';
@@ -2471,7 +2547,8 @@ document.addEventListener('DOMContentLoaded', async () => {
                 try {
                     const params = new URLSearchParams({
                         page: page.toString(),
-                        per_page: perPage.value.toString()
+                        per_page: perPage.value.toString(),
+                        view: 'summary'
                     });
                     
                     if (searchQuery.trim()) {
@@ -2508,7 +2585,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                     }
 
                     // Handle incomplete recordings for processing queue
-                    const incompleteRecordings = data.recordings.filter(r => ['PENDING', 'PROCESSING', 'SUMMARIZING'].includes(r.status));
+                    const incompleteRecordings = data.recordings.filter(r => ['PENDING', 'CONVERTING', 'PROCESSING', 'SUMMARIZING'].includes(r.status));
                     if (incompleteRecordings.length > 0 && !isProcessingActive.value) {
                         console.warn(`Found ${incompleteRecordings.length} incomplete recording(s) on load.`);
                         for (const recording of incompleteRecordings) {
@@ -3035,7 +3112,10 @@ document.addEventListener('DOMContentLoaded', async () => {
                     
                     console.log(`Recording with estimated bitrate: ${actualBitrate.value} bps`);
                     
-                    mediaRecorder.value.ondataavailable = event => audioChunks.value.push(event.data);
+                    mediaRecorder.value.ondataavailable = event => {
+                        audioChunks.value.push(event.data);
+                        sendLiveSegments();
+                    };
                     mediaRecorder.value.onstop = () => {
                         const audioBlob = new Blob(audioChunks.value, { type: 'audio/webm' });
                         audioBlobURL.value = URL.createObjectURL(audioBlob);
@@ -3085,8 +3165,9 @@ document.addEventListener('DOMContentLoaded', async () => {
                         }
                     }
                     
-                    // Start recording and timer
-                    mediaRecorder.value.start();
+                    // Start recording and timer; timesliced data is uploaded while recording
+                    startLiveUpload();
+                    mediaRecorder.value.start(LIVE_UPLOAD_TIMESLICE_MS);
                     isRecording.value = true;
                     recordingTime.value = 0;
                     recordingInterval.value = setInterval(() => recordingTime.value++, 1000);
@@ -3114,6 +3195,53 @@ document.addEventListener('DOMContentLoaded', async () => {
                 }
             };
 
+            // Open a live upload so the server can transcribe the recording while it is being made.
+            // If this fails, the recording is uploaded as a whole afterwards.
+            const startLiveUpload = async () => {
+                liveUpload.value = null;
+                try {
+                    const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
+                    const response = await fetch('/api/uploads', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': `live-${timestamp}` },
+                        body: JSON.stringify({ filename: `recording-${timestamp}.webm`, live: true })
+                    });
+                    if (!response.ok) return;
+                    const upload = await response.json();
+                    liveUpload.value = { id: upload.upload_id, offset: upload.offset, sending: false };
+                    sendLiveSegments();
+                } catch (error) {
+                    console.warn('Could not start live upload, the recording will be uploaded when it ends:', error);
+                }
+            };
+
+            // Send the recorded data the server does not have yet; failures are retried with the next segment
+            const sendLiveSegments = async () => {
+                const live = liveUpload.value;
+                if (!live || live.sending) return;
+                live.sending = true;
+                try {
+                    const recorded = new Blob(audioChunks.value);
+                    while (live.offset < recorded.size) {
+                        const response = await fetch(`/api/uploads/${live.id}`, {
+                            method: 'PUT',
+                            headers: {
+                                'Content-Type': 'application/octet-stream',
+                                'Content-Range': `bytes ${live.offset}-${recorded.size - 1}/*`
+                            },
+                            body: recorded.slice(live.offset)
+                        });
+                        const data = await response.json();
+                        if ((!response.ok && response.status !== 409) || data.offset === undefined || data.offset <= live.offset) break;
+                        live.offset = data.offset;
+                    }
+                } catch (error) {
+                    console.warn('Live upload interrupted, retrying with the next segment:', error);
+                } finally {
+                    live.sending = false;
+                }
+            };
+
             const stopRecording = () => {
                 if (mediaRecorder.value && isRecording.value) {
                     mediaRecorder.value.stop();
@@ -3132,9 +3260,12 @@ document.addEventListener('DOMContentLoaded', async () => {
                 const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
                 const recordedFile = new File(audioChunks.value, `recording-${timestamp}.webm`, { type: 'audio/webm' });
 
-                // Pass notes, tags, and ASR options along with the file
+                // Pass notes, tags, and ASR options along with the file; a live upload only needs its tail sent
+                const liveUploadId = liveUpload.value ? liveUpload.value.id : null;
+                liveUpload.value = null;
                 addFilesToQueue([{ 
                     file: recordedFile, 
+                    liveUploadId: liveUploadId,
                     notes: recordingNotes.value,
                     tags: selectedTags.value,
                     asrOptions: {
@@ -3150,6 +3281,10 @@ document.addEventListener('DOMContentLoaded', async () => {
             };
 
             const discardRecording = () => {
+                if (liveUpload.value) {
+                    fetch(`/api/uploads/${liveUpload.value.id}`, { method: 'DELETE' }).catch(() => {});
+                    liveUpload.value = null;
+                }
                 if (audioBlobURL.value) {
                     URL.revokeObjectURL(audioBlobURL.value);
                 }
@@ -3707,7 +3842,8 @@ document.addEventListener('DOMContentLoaded', async () => {
                 let assistantMessage = null;
 
                 try {
-                    const messageHistory = chatMessages.value
+                    // The server keeps the conversation; history is only sent to seed a new session
+                    const messageHistory = chatSessionId.value ? [] : chatMessages.value
                         .slice(0, -1)
                         .map(msg => ({ role: msg.role, content: msg.content }));
 
@@ -3716,6 +3852,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({
                             recording_id: selectedRecording.value.id,
+                            session_id: chatSessionId.value,
                             message: message,
                             message_history: messageHistory
                         })
@@ -3746,6 +3883,9 @@ document.addEventListener('DOMContentLoaded', async () => {
                                     if (jsonStr) {
                                         try {
                                             const data = JSON.parse(jsonStr);
+                                            if (data.session_id) {
+                                                chatSessionId.value = data.session_id;
+                                            }
                                             if (data.thinking) {
                                                 // Check scroll position BEFORE updating content
                                                 const shouldScroll = isChatScrolledToBottom();
@@ -4555,6 +4695,7 @@ document.addEventListener('DOMContentLoaded', async () => {
             const clearChat = () => {
                 if (chatMessages.value.length > 0) {
                     chatMessages.value = [];
+                    chatSessionId.value = null;
                     showToast('Chat cleared', 'fa-broom');
                 }
             };
@@ -4824,6 +4965,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                     }
                     
                     chatMessages.value = [];
+                    chatSessionId.value = null;
                     showChat.value = false;
                     selectedTab.value = 'summary';
                     
@@ -5025,7 +5167,7 @@ document.addEventListener('DOMContentLoaded', async () => {
 
             const pollInboxRecordings = async () => {
                 try {
-                    const response = await fetch('/api/inbox_recordings');
+                    const response = await fetch('/api/inbox_recordings?view=summary');
                     if (!response.ok) {
                         // Silently fail, as this is a background task
                         return;
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test suite for the memory-mapped IVF index used by Inquire Mode search.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ann_index import AnnIndexStore
+from src.embedding_index import date_to_ordinal
+
+
+class TestAnnIndexStore(unittest.TestCase):
+    """Test cases for AnnIndexStore and IVFIndex."""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.store = AnnIndexStore(self.base_dir)
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(size=(2000, 16)).astype(np.float32)
+        self.chunk_ids = np.arange(1, 2001)
+        self.recording_ids = self.chunk_ids % 40
+        self.dates = [date_to_ordinal(date(2024, 1, 1 + int(r % 20))) for r in self.recording_ids]
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def publish(self, **kwargs):
+        return self.store.publish(7, self.chunk_ids, self.recording_ids, self.dates, self.vectors, **kwargs)
+
+    def test_probing_every_list_matches_exact_search(self):
+        """With nprobe equal to nlist the IVF search must be exact."""
+        self.publish(created_until=datetime(2024, 5, 1))
+        index = self.store.get(7)
+        self.assertIsInstance(index.vectors, np.memmap)
+        self.assertEqual(index.created_until, datetime(2024, 5, 1))
+
+        query = np.random.default_rng(1).normal(size=16).astype(np.float32)
+        self.assertEqual(
+            [cid for cid, _ in index.search(query, 10, nprobe=index.nlist)],
+            [cid for cid, _ in index.exact_search(query, 10)]
+        )
+
+    def test_selective_filters_are_scored_exactly(self):
+        """A mask below the exact threshold should return the true best rows."""
+        self.publish()
+        index = self.store.get(7)
+        query = np.random.default_rng(2).normal(size=16).astype(np.float32)
+        mask = index.build_mask(recording_ids=[3, 5], date_to=date(2024, 1, 10))
+        results = index.search(query, 5, mask=mask, nprobe=1)
+        self.assertEqual(results, index.exact_search(query, 5, mask=mask))
+        self.assertTrue(all(cid % 40 in (3, 5) for cid, _ in results))
+
+    def test_int8_generation(self):
+        """int8 generations should store codes and rank close to float32."""
+        self.publish(dtype='int8')
+        index = self.store.get(7)
+        self.assertEqual(index.vectors.dtype, np.int8)
+        query = np.random.default_rng(3).normal(size=16).astype(np.float32)
+        expected = self.vectors @ query / np.linalg.norm(self.vectors, axis=1)
+        best = set((self.chunk_ids[np.argsort(-expected)[:10]]).tolist())
+        found = {cid for cid, _ in index.exact_search(query, 10)}
+        self.assertGreaterEqual(len(found & best), 9)
+
+    def test_publish_swaps_generation(self):
+        """Publishing again should switch readers to the new generation and prune old ones."""
+        first = self.publish()
+        self.assertEqual(self.store.current_generation(7), first)
+        self.store.publish(7, self.chunk_ids[:100], self.recording_ids[:100], self.dates[:100], self.vectors[:100])
+        self.store.publish(7, self.chunk_ids[:50], self.recording_ids[:50], self.dates[:50], self.vectors[:50])
+        self.assertEqual(len(self.store.get(7)), 50)
+        generations = [name for name in os.listdir(self.store.user_dir(7)) if name.startswith('gen_')]
+        self.assertEqual(len(generations), 2)
+        self.assertNotIn(first, generations)
+
+    def test_build_lock_is_exclusive(self):
+        """Only one builder may hold a user's lock at a time."""
+        with self.store.build_lock(7) as first:
+            self.assertTrue(first)
+            # flock locks are per open file description, so a second open conflicts
+            with self.store.build_lock(7) as second:
+                self.assertFalse(second)
+
+    def test_missing_index(self):
+        self.assertIsNone(self.store.get(99))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test suite for the recording change feed.
+"""
+
+import sys
+import os
+import unittest
+import uuid
+from datetime import datetime
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app, db, User, Recording, Tag, RecordingTag, Event
+from src.change_feed import DELETE, UPSERT, compact_changes, split_actions
+
+
+class TestCompactChanges(unittest.TestCase):
+    """Test cases for compact_changes and split_actions."""
+
+    def test_latest_action_wins(self):
+        changes = compact_changes([
+            ('recording', 1, UPSERT), ('tag', 7, UPSERT), ('recording', 1, UPSERT),
+            ('recording', 2, UPSERT), ('recording', 2, DELETE), ('event', 3, DELETE), ('event', 3, UPSERT),
+        ])
+        self.assertEqual(changes['recording'], {1: UPSERT, 2: DELETE})
+        self.assertEqual(changes['event'], {3: UPSERT})
+        self.assertEqual(changes['share'], {})
+
+    def test_split_actions(self):
+        self.assertEqual(split_actions({5: UPSERT, 2: DELETE, 1: UPSERT}), ([1, 5], [2]))
+
+
+class TestChangeFeedEndpoint(unittest.TestCase):
+    """End-to-end checks of /api/recordings/changes."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        suffix = uuid.uuid4().hex[:8]
+        user = User(username=f'feed_{suffix}', email=f'feed_{suffix}@example.com', password='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.client = app.test_client()
+        with self.client.session_transaction() as session:
+            session['_user_id'] = str(self.user_id)
+
+    def tearDown(self):
+        db.session.rollback()
+        db.session.delete(db.session.get(User, self.user_id))
+        db.session.commit()
+        self.context.pop()
+
+    def changes(self, since=None):
+        query = '' if since is None else f'?since={since}'
+        response = self.client.get(f'/api/recordings/changes{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_sync_reports_upserts_and_tombstones(self):
+        initial = self.changes()
+        self.assertTrue(initial['reset'])
+
+        recording = Recording(user_id=self.user_id, title='Budget review', status='COMPLETED')
+        tag = Tag(name='finance', user_id=self.user_id)
+        db.session.add_all([recording, tag])
+        db.session.commit()
+        db.session.add(RecordingTag(recording_id=recording.id, tag_id=tag.id))
+        db.session.add(Event(recording_id=recording.id, title='Follow-up', start_datetime=datetime(2026, 1, 5)))
+        db.session.commit()
+        recording.title = 'Budget review (final)'
+        db.session.commit()
+
+        delta = self.changes(initial['cursor'])
+        self.assertFalse(delta['reset'])
+        self.assertEqual([item['title'] for item in delta['recordings']], ['Budget review (final)'])
+        self.assertNotIn('transcription', delta['recordings'][0])
+        self.assertEqual(delta['tags'][0]['recording_count'], 1)
+        self.assertEqual([item['title'] for item in delta['events']], ['Follow-up'])
+
+        recording_id = recording.id
+        db.session.delete(recording)
+        db.session.commit()
+        tombstones = self.changes(delta['cursor'])
+        self.assertEqual(tombstones['deleted_recordings'], [recording_id])
+        self.assertEqual(len(tombstones['deleted_events']), 1)
+        self.assertEqual(tombstones['recordings'], [])
+
+        self.assertEqual(self.changes(tombstones['cursor'])['recordings'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
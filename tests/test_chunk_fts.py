@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test suite for the SQLite FTS5 index over transcript chunks.
+"""
+
+import sys
+import os
+import unittest
+from datetime import date
+
+from sqlalchemy import create_engine, text
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.chunk_fts import build_match_query, ensure_chunk_fts, search_chunk_fts
+
+
+class TestChunkFts(unittest.TestCase):
+    """Test cases for ensure_chunk_fts and search_chunk_fts."""
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE recording (id INTEGER PRIMARY KEY, meeting_date DATE)"))
+            conn.execute(text(
+                "CREATE TABLE transcript_chunk (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                "recording_id INTEGER, content TEXT)"
+            ))
+            conn.execute(text("INSERT INTO recording VALUES (1, '2024-01-05'), (2, '2024-02-10')"))
+            # Existing rows must be picked up by the initial backfill
+            conn.execute(text(
+                "INSERT INTO transcript_chunk VALUES "
+                "(1, 1, 1, 'We reviewed the budget for the third quarter.'), "
+                "(2, 1, 2, 'Ticket PRJ-4821 blocks the release, says Zbigniew.'), "
+                "(3, 2, 2, 'Zbigniew belongs to another user.')"
+            ))
+        self.assertTrue(ensure_chunk_fts(self.engine))
+
+    def search(self, query, **kwargs):
+        with self.engine.connect() as conn:
+            return search_chunk_fts(conn, 1, query, 5, **kwargs)
+
+    def test_exact_terms_are_found_for_the_user_only(self):
+        """Names and ticket numbers should match, scoped to the chunk owner."""
+        self.assertEqual([cid for cid, _ in self.search('What did Zbigniew say?')], [2])
+        self.assertEqual([cid for cid, _ in self.search('prj 4821')], [2])
+        self.assertEqual(self.search('nothing relevant here'), [])
+
+    def test_filters(self):
+        """Recording and meeting date constraints should restrict results."""
+        self.assertEqual([cid for cid, _ in self.search('budget Zbigniew', recording_ids=[1])], [1])
+        self.assertEqual([cid for cid, _ in self.search('budget Zbigniew', date_from=date(2024, 2, 1))], [2])
+        self.assertEqual(self.search('budget', recording_ids=[]), [])
+
+    def test_triggers_keep_index_in_sync(self):
+        """Inserted, updated and deleted chunks should be reflected immediately."""
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO transcript_chunk VALUES (4, 1, 1, 'Kubernetes migration plan')"))
+            conn.execute(text("UPDATE transcript_chunk SET content = 'Budget approved' WHERE id = 1"))
+            conn.execute(text("DELETE FROM transcript_chunk WHERE id = 2"))
+        self.assertEqual([cid for cid, _ in self.search('kubernetes')], [4])
+        self.assertEqual(self.search('quarter'), [])
+        self.assertEqual(self.search('Zbigniew'), [])
+        # Re-running on an existing index is a no-op
+        self.assertTrue(ensure_chunk_fts(self.engine))
+        self.assertEqual([cid for cid, _ in self.search('budget')], [1])
+
+    def test_match_query_is_escaped(self):
+        """FTS5 syntax in user input must be treated as plain words."""
+        self.assertEqual(build_match_query('NEAR("a" OR b*) a'), '"near" OR "a" OR "or" OR "b"')
+        self.assertIsNone(build_match_query('?!'))
+
+
+if __name__ == '__main__':
+    unittest.main()
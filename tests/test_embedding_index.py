@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test suite for the in-memory embedding index used by Inquire Mode search.
+"""
+
+import sys
+import os
+import unittest
+from datetime import date
+
+import numpy as np
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.embedding_index import (
+    EmbeddingIndexCache, UserEmbeddingIndex, date_to_ordinal, decode_embedding, encode_embedding
+)
+
+
+def make_index(user_id=1, rows=50, dim=8, seed=0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(rows, dim)).astype(np.float32)
+    chunk_ids = list(range(100, 100 + rows))
+    recording_ids = [i % 5 for i in range(rows)]
+    dates = [date_to_ordinal(date(2024, 1, 1 + (i % 5))) if i % 5 else date_to_ordinal(None) for i in range(rows)]
+    return UserEmbeddingIndex(user_id, chunk_ids, recording_ids, dates, embeddings), embeddings
+
+
+def brute_force(embeddings, query, chunk_ids, top_k):
+    scores = [
+        float(np.dot(row, query) / (np.linalg.norm(row) * np.linalg.norm(query)))
+        for row in embeddings
+    ]
+    order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:top_k]
+    return [(chunk_ids[i], scores[i]) for i in order]
+
+
+class TestUserEmbeddingIndex(unittest.TestCase):
+    """Test cases for UserEmbeddingIndex."""
+
+    def test_search_matches_brute_force_cosine(self):
+        """Top-k results should match a per-row cosine similarity scan."""
+        index, embeddings = make_index()
+        query = np.random.default_rng(1).normal(size=8).astype(np.float32)
+        expected = brute_force(embeddings, query, list(range(100, 150)), 5)
+        results = index.search(query, top_k=5)
+        self.assertEqual([cid for cid, _ in results], [cid for cid, _ in expected])
+        for (_, got), (_, want) in zip(results, expected):
+            self.assertAlmostEqual(got, want, places=5)
+
+    def test_recording_and_date_masks(self):
+        """Masks should restrict results to matching recordings and dates."""
+        index, _ = make_index()
+        query = np.ones(8, dtype=np.float32)
+
+        mask = index.build_mask(recording_ids={2, 3})
+        results = index.search(query, top_k=50, mask=mask)
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all((cid - 100) % 5 in (2, 3) for cid, _ in results))
+
+        # Recording 0 has no meeting date, so it must never pass a date filter
+        mask = index.build_mask(date_from=date(2024, 1, 1), date_to=date(2024, 1, 2))
+        results = index.search(query, top_k=50, mask=mask)
+        self.assertTrue(results)
+        self.assertTrue(all((cid - 100) % 5 == 1 for cid, _ in results))
+
+        self.assertEqual(index.search(query, top_k=5, mask=index.build_mask(recording_ids=[99])), [])
+
+    def test_search_many_matches_individual_searches(self):
+        """Batched queries under several masks should equal one search per query and mask."""
+        for dtype in ('float32', 'int8'):
+            _, embeddings = make_index()
+            index = UserEmbeddingIndex(1, list(range(100, 150)), [i % 5 for i in range(50)],
+                                       [date_to_ordinal(None)] * 50, embeddings, dtype=dtype)
+            queries = np.random.default_rng(5).normal(size=(3, 8)).astype(np.float32)
+            masks = [None, index.build_mask(recording_ids={1, 2}), index.build_mask(recording_ids=[99])]
+            results = index.search_many(queries, top_k=4, masks=masks)
+            for mask, per_query in zip(masks, results):
+                for query, got in zip(queries, per_query):
+                    want = index.search(query, top_k=4, mask=mask)
+                    self.assertEqual([cid for cid, _ in got], [cid for cid, _ in want])
+            self.assertEqual(results[2], [[], [], []])
+
+    def test_search_restricted_to_recording_rows(self):
+        """Scoring only the rows of some recordings should equal masking the full index."""
+        index, _ = make_index()
+        query = np.random.default_rng(3).normal(size=(2, 8)).astype(np.float32)
+        rows = index.rows_for_recordings([3, 1, 99])
+        self.assertEqual(sorted(rows.tolist()), [i for i in range(50) if i % 5 in (1, 3)])
+
+        dated = index.build_mask(date_from=date(2024, 1, 3))
+        got = index.search_many(query, top_k=4, masks=[None, dated], rows=rows)
+        want = index.search_many(query, top_k=4, masks=[index.build_mask(recording_ids={1, 3}),
+                                                          index.build_mask(recording_ids={1, 3}, date_from=date(2024, 1, 3))])
+        self.assertEqual(got, want)
+
+        # The cached sort order follows incremental updates
+        index.replace_recording(3, [900], np.ones((1, 8), dtype=np.float32))
+        self.assertEqual(index.chunk_ids[index.rows_for_recordings([3])].tolist(), [900])
+        self.assertEqual(len(index.rows_for_recordings([])), 0)
+
+    def test_snapshot_is_unaffected_by_updates(self):
+        """Rows and masks taken from a snapshot must line up with its search after the index changes."""
+        index, _ = make_index()
+        query = np.ones((1, 8), dtype=np.float32)
+        snapshot = index.snapshot()
+        rows = snapshot.rows_for_recordings([3])
+        mask = snapshot.build_mask(recording_ids={3})
+
+        index.remove_recording(0)
+        index.replace_recording(3, [900], np.ones((1, 8), dtype=np.float32))
+        self.assertEqual(len(snapshot), 50)
+        got = snapshot.search_many(query, top_k=20, masks=[mask], rows=rows)
+        self.assertEqual(sorted(cid for cid, _ in got[0][0]), [cid for cid in range(100, 150) if (cid - 100) % 5 == 3])
+        self.assertEqual(index.chunk_ids[index.rows_for_recordings([3])].tolist(), [900])
+
+    def test_replace_and_remove_recording(self):
+        """Incremental updates should swap a recording's rows and keep the signature current."""
+        index, _ = make_index()
+        index.replace_recording(4, [500, 501], np.ones((2, 8), dtype=np.float32), date(2024, 2, 1))
+        self.assertEqual(index.signature(), (42, 501))
+        results = index.search(np.ones(8, dtype=np.float32), top_k=2)
+        self.assertEqual({cid for cid, _ in results}, {500, 501})
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+        index.remove_recording(4)
+        self.assertEqual(len(index), 40)
+
+    def test_empty_index(self):
+        """An index without rows should accept its first recording."""
+        index = UserEmbeddingIndex(1, [], [], [], None)
+        self.assertEqual(index.search(np.ones(4, dtype=np.float32)), [])
+        index.replace_recording(7, [1], np.ones((1, 4), dtype=np.float32))
+        self.assertEqual(index.search(np.ones(4, dtype=np.float32), top_k=3)[0][0], 1)
+
+
+class TestQuantizedEmbeddings(unittest.TestCase):
+    """Test cases for float16/int8 embedding storage."""
+
+    def test_encode_decode_round_trip(self):
+        """Each storage format should decode to float32 close to the original vector."""
+        vector = np.random.default_rng(3).normal(size=384).astype(np.float32)
+        self.assertEqual(decode_embedding(encode_embedding(vector)).tobytes(), vector.tobytes())
+        # Legacy rows have no dtype and are raw float32
+        self.assertTrue(np.array_equal(decode_embedding(vector.tobytes(), None), vector))
+
+        for dtype, size, tolerance in (('float16', 384 * 2, 1e-2), ('int8', 384 + 4, 2e-2)):
+            data = encode_embedding(vector, dtype)
+            decoded = decode_embedding(data, dtype)
+            self.assertEqual(len(data), size)
+            self.assertEqual(decoded.dtype, np.float32)
+            self.assertLess(np.max(np.abs(decoded - vector)), tolerance * np.max(np.abs(vector)))
+
+    def test_int8_index_ranks_like_float32(self):
+        """An int8 index should return nearly the same neighbours with close scores."""
+        rng = np.random.default_rng(4)
+        embeddings = rng.normal(size=(500, 32)).astype(np.float32)
+        chunk_ids = list(range(500))
+        args = (1, chunk_ids, [0] * 500, [date_to_ordinal(None)] * 500, embeddings)
+        exact = UserEmbeddingIndex(*args)
+        quantized = UserEmbeddingIndex(*args, dtype='int8')
+        self.assertLess(quantized.nbytes, exact.nbytes / 2)
+
+        query = rng.normal(size=32).astype(np.float32)
+        expected = exact.search(query, top_k=10)
+        results = quantized.search(query, top_k=10)
+        self.assertGreaterEqual(len({cid for cid, _ in results} & {cid for cid, _ in expected}), 9)
+        self.assertAlmostEqual(results[0][1], expected[0][1], places=2)
+
+        # Incremental updates are quantized the same way
+        quantized.replace_recording(9, [900], query.reshape(1, -1))
+        self.assertEqual(quantized.search(query, top_k=1)[0][0], 900)
+
+
+class TestEmbeddingIndexCache(unittest.TestCase):
+    """Test cases for EmbeddingIndexCache."""
+
+    def test_lru_eviction_under_budget(self):
+        """Least recently used indexes should be evicted once over budget."""
+        first, _ = make_index(user_id=1)
+        cache = EmbeddingIndexCache(max_bytes=int(first.nbytes * 2.5))
+        cache.put(first)
+        cache.put(make_index(user_id=2)[0])
+        cache.get(1)
+        cache.put(make_index(user_id=3)[0])
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(3))
+
+    def test_dimension_mismatch_invalidates(self):
+        """A patch with a different embedding size should drop the cached index."""
+        cache = EmbeddingIndexCache()
+        cache.put(make_index(user_id=1)[0])
+        cache.replace_recording(1, 1, [900], np.ones((1, 4), dtype=np.float32))
+        self.assertIsNone(cache.get(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared embedding service (micro-batching server and client).
+"""
+
+import sys
+import os
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.embedding_service import (EmbeddingClient, EmbeddingServer, EmbeddingServiceError, MicroBatcher,
+                                   ServiceBackedModel)
+
+
+class FakeModel:
+    """Deterministic stand-in for a sentence transformer that records its batch sizes."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def encode(self, texts, **kwargs):
+        if any(text == 'boom' for text in texts):
+            raise ValueError('model failure')
+        time.sleep(self.delay)
+        self.batch_sizes.append(len(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test cases for MicroBatcher."""
+
+    def test_concurrent_requests_share_batches(self):
+        """Requests arriving within the wait window should be encoded together."""
+        model = FakeModel(delay=0.05)
+        batcher = MicroBatcher(model, max_batch=64, max_wait_ms=30)
+        results = {}
+
+        def worker(i):
+            results[i] = batcher.encode(['x' * i, 'y'])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every caller gets back exactly its own rows
+        for i in range(1, 9):
+            self.assertEqual(results[i][:, 0].tolist(), [i, 1])
+        self.assertLess(len(model.batch_sizes), 8)
+        stats = batcher.stats()
+        self.assertEqual((stats['requests'], stats['texts']), (8, 16))
+        self.assertGreater(stats['avg_batch_texts'], 2)
+
+
+class TestEmbeddingServer(unittest.TestCase):
+    """Test cases for EmbeddingServer and EmbeddingClient over a Unix socket."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.address = os.path.join(self.tmp_dir, 'embed.sock')
+        self.server = EmbeddingServer(self.address, b'secret', FakeModel(), max_wait_ms=1, info={'model': 'fake'})
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_encode_and_stats(self):
+        client = EmbeddingClient(self.address, b'secret')
+        self.assertTrue(client.ping())
+        embeddings = client.encode(['abc', 'de'])
+        self.assertEqual(embeddings.dtype, np.float32)
+        self.assertEqual(embeddings[:, 0].tolist(), [3, 2])
+        stats = client.stats()
+        self.assertEqual(stats['texts'], 2)
+        self.assertEqual(stats['model'], 'fake')
+
+    def test_errors_are_reported_to_the_caller(self):
+        client = EmbeddingClient(self.address, b'secret')
+        with self.assertRaises(EmbeddingServiceError):
+            client.encode(['boom'])
+        # The connection stays usable after a failed request
+        self.assertEqual(client.encode(['ok'])[0, 0], 2)
+
+    def test_unreachable_service(self):
+        self.assertFalse(EmbeddingClient(self.address, b'wrong key').ping())
+        self.assertFalse(EmbeddingClient(os.path.join(self.tmp_dir, 'missing.sock'), b'secret').ping())
+
+
+
+def serve(address):
+    EmbeddingServer(address, b'secret', FakeModel(), max_wait_ms=1).serve_forever()
+
+
+class TestServiceBackedModel(unittest.TestCase):
+    """A model backed by the service must keep working after the service process dies."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.address = os.path.join(self.tmp_dir, 'embed.sock')
+        self.processes = []
+        self.client = self.start_service()
+
+    def tearDown(self):
+        for process in self.processes:
+            process.kill()
+            process.join()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def start_service(self, *args):
+        process = multiprocessing.get_context('fork').Process(target=serve, args=(self.address,), daemon=True)
+        process.start()
+        self.processes.append(process)
+        client = EmbeddingClient(self.address, b'secret')
+        deadline = time.time() + 10
+        while not client.ping() and time.time() < deadline:
+            time.sleep(0.05)
+        return client
+
+    def kill_service(self):
+        self.processes[0].kill()
+        self.processes[0].join()
+
+    def test_dead_service_is_restarted(self):
+        load_local = mock.Mock()
+        model = ServiceBackedModel(self.address, [], load_local, self.client)
+        self.assertEqual(model.encode(['abc'])[0, 0], 3)
+        self.kill_service()
+
+        with mock.patch('src.embedding_service.ensure_service_running', side_effect=self.start_service) as restart:
+            self.assertEqual(model.encode(['abcd'])[0, 0], 4)
+            self.assertEqual(model.encode(['ab'])[0, 0], 2)
+        restart.assert_called_once_with(self.address, [])
+        load_local.assert_not_called()
+        self.assertEqual(model.stats()['texts'], 2)
+
+    def test_falls_back_to_local_model_when_restart_fails(self):
+        model = ServiceBackedModel(self.address, [], FakeModel, self.client)
+        self.kill_service()
+
+        with mock.patch('src.embedding_service.ensure_service_running', return_value=None):
+            self.assertEqual(model.encode(['abc'])[0, 0], 3)
+        with self.assertRaises(EmbeddingServiceError):
+            model.stats()
+
+    def test_model_errors_do_not_restart_the_service(self):
+        model = ServiceBackedModel(self.address, [], mock.Mock(), self.client)
+        with mock.patch('src.embedding_service.ensure_service_running') as restart:
+            with self.assertRaises(EmbeddingServiceError):
+                model.encode(['boom'])
+        restart.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test suite for the stored LLM rendering of recording transcriptions.
+"""
+
+import sys
+import os
+import json
+import unittest
+import uuid
+
+from sqlalchemy import update
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app, db, User, Recording, get_formatted_transcription, set_formatted_transcription
+
+
+def segments(*sentences):
+    return json.dumps([{'speaker': f'SPEAKER_0{i % 2}', 'sentence': sentence} for i, sentence in enumerate(sentences)])
+
+
+class TestFormattedTranscription(unittest.TestCase):
+    """The rendering follows every change of Recording.transcription."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        suffix = uuid.uuid4().hex[:8]
+        user = User(username=f'format_{suffix}', email=f'format_{suffix}@example.com', password='x')
+        db.session.add(user)
+        db.session.flush()
+        self.user_id = user.id
+        recording = Recording(user_id=user.id, title='Standup', status='COMPLETED',
+                              transcription=segments('Hello.', 'Hi there.'))
+        db.session.add(recording)
+        db.session.commit()
+        self.recording_id = recording.id
+
+    def tearDown(self):
+        db.session.rollback()
+        for recording in Recording.query.filter_by(user_id=self.user_id).all():
+            db.session.delete(recording)
+        db.session.delete(db.session.get(User, self.user_id))
+        db.session.commit()
+        self.context.pop()
+
+    def reload(self):
+        db.session.expire_all()
+        return db.session.get(Recording, self.recording_id)
+
+    def test_new_recording_is_rendered(self):
+        recording = self.reload()
+        self.assertEqual(recording.formatted_transcription, '[SPEAKER_00]: Hello.\n[SPEAKER_01]: Hi there.')
+        self.assertEqual(recording.formatted_transcription_chars, len(recording.formatted_transcription))
+        self.assertGreater(recording.formatted_transcription_tokens, 0)
+
+    def test_edit_re_renders_and_updates_length(self):
+        recording = self.reload()
+        recording.transcription = segments('A much longer opening sentence than before.')
+        db.session.commit()
+        recording = self.reload()
+        self.assertEqual(recording.formatted_transcription, '[SPEAKER_00]: A much longer opening sentence than before.')
+        self.assertEqual(recording.formatted_transcription_chars, len(recording.formatted_transcription))
+
+    def test_clearing_the_transcription_clears_the_rendering(self):
+        recording = self.reload()
+        recording.transcription = None
+        db.session.commit()
+        recording = self.reload()
+        self.assertIsNone(recording.formatted_transcription)
+        self.assertIsNone(recording.formatted_transcription_chars)
+        self.assertIsNone(recording.formatted_transcription_tokens)
+        self.assertIsNone(get_formatted_transcription(recording))
+
+    def test_rows_stored_before_rendering_fall_back(self):
+        # Written around the ORM, as rows from before the column existed
+        db.session.execute(update(Recording).where(Recording.id == self.recording_id).values(
+            formatted_transcription=None, formatted_transcription_chars=None, formatted_transcription_tokens=None))
+        db.session.commit()
+        recording = self.reload()
+        formatted = get_formatted_transcription(recording)
+        self.assertEqual(formatted, '[SPEAKER_00]: Hello.\n[SPEAKER_01]: Hi there.')
+        # Persisted with the caller's next commit
+        db.session.commit()
+        self.assertEqual(self.reload().formatted_transcription_chars, len(formatted))
+
+    def test_plain_text_is_kept_as_is(self):
+        recording = Recording(user_id=self.user_id, title='Notes', status='COMPLETED')
+        set_formatted_transcription(recording, 'plain text')
+        self.assertEqual((recording.formatted_transcription, recording.formatted_transcription_chars), ('plain text', 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
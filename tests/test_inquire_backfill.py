@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Inquire Mode backfill job: checkpoint/resume, stop requests
+and the lease that keeps runs in different workers from overlapping.
+"""
+
+import sys
+import os
+import unittest
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import (app, db, User, Recording, TranscriptChunk, InquireBackfillJob, BackfillRun,
+                     claim_inquire_backfill, get_inquire_backfill_status, run_inquire_backfill,
+                     stop_inquire_backfill)
+
+
+class TestInquireBackfill(unittest.TestCase):
+    """The backfill state is shared through the database, not held per process."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        suffix = uuid.uuid4().hex[:8]
+        user = User(username=f'backfill_{suffix}', email=f'backfill_{suffix}@example.com', password='x')
+        db.session.add(user)
+        db.session.flush()
+        self.user_id = user.id
+        recordings = [Recording(user_id=user.id, title=f'Meeting {i}', status='COMPLETED',
+                                transcription=f'We agreed on item {i} of the plan.') for i in range(4)]
+        db.session.add_all(recordings)
+        db.session.flush()
+        self.recording_ids = [recording.id for recording in recordings]
+        db.session.execute(update(InquireBackfillJob).where(InquireBackfillJob.id == 1).values(
+            owner=None, lease_until=None, stop_requested=False, checkpoint=0, error=None))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.rollback()
+        for recording in Recording.query.filter_by(user_id=self.user_id).all():
+            db.session.delete(recording)
+        db.session.delete(db.session.get(User, self.user_id))
+        db.session.execute(update(InquireBackfillJob).where(InquireBackfillJob.id == 1).values(
+            owner=None, lease_until=None, stop_requested=False, checkpoint=0, error=None))
+        db.session.commit()
+        self.context.pop()
+
+    def chunk_counts(self):
+        rows = db.session.query(TranscriptChunk.recording_id, func.count(TranscriptChunk.id)).filter(
+            TranscriptChunk.recording_id.in_(self.recording_ids)
+        ).group_by(TranscriptChunk.recording_id)
+        return dict(rows.all())
+
+    def test_limited_run_resumes_from_checkpoint(self):
+        status = run_inquire_backfill(max_recordings=2, batch_chunks=1, pause_seconds=0)
+        self.assertEqual(status['processed'], 2)
+        self.assertEqual(status['checkpoint'], self.recording_ids[1])
+        self.assertEqual(set(self.chunk_counts()), set(self.recording_ids[:2]))
+        self.assertFalse(get_inquire_backfill_status()['running'])
+
+        status = run_inquire_backfill(batch_chunks=1, pause_seconds=0)
+        self.assertGreaterEqual(status['processed'], 2)
+        self.assertEqual(self.chunk_counts(), {recording_id: 1 for recording_id in self.recording_ids})
+        # The whole backlog was walked, so the next run starts over
+        self.assertEqual(get_inquire_backfill_status()['checkpoint'], 0)
+
+    def test_stop_request_halts_after_current_batch(self):
+        reports = []
+
+        def progress(status):
+            reports.append(status)
+            stop_inquire_backfill()
+
+        status = run_inquire_backfill(progress=progress, batch_chunks=1, pause_seconds=0)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(status['processed'], 1)
+        self.assertEqual(len(self.chunk_counts()), 1)
+        stored = get_inquire_backfill_status()
+        self.assertFalse(stored['running'])
+        self.assertFalse(stored['stop_requested'])
+        self.assertEqual(stored['checkpoint'], status['checkpoint'])
+
+    def test_live_lease_blocks_a_second_run(self):
+        owner = claim_inquire_backfill()
+        self.assertIsNotNone(owner)
+        self.assertTrue(get_inquire_backfill_status()['running'])
+        self.assertIsNone(claim_inquire_backfill())
+        self.assertIsNone(run_inquire_backfill(pause_seconds=0))
+        self.assertEqual(self.chunk_counts(), {})
+
+        # A worker that died stops renewing its lease; its job is taken over once it expires
+        db.session.execute(update(InquireBackfillJob).where(InquireBackfillJob.id == 1).values(
+            lease_until=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+        status = get_inquire_backfill_status()
+        self.assertFalse(status['running'])
+        self.assertIsNotNone(status['error'])
+        self.assertIsNotNone(run_inquire_backfill(batch_chunks=1, pause_seconds=0))
+
+        # The old run finds its lease gone and stops instead of storing more chunks
+        stale = BackfillRun(owner)
+        self.assertFalse(stale.save())
+        self.assertTrue(stale.stopping)
+        db.session.rollback()
+
+
+if __name__ == '__main__':
+    unittest.main()
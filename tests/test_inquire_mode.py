@@ -95,7 +95,7 @@ def test_chunking_functions():
             
             # Test chunking
             test_text = "This is a test sentence. This is another sentence for testing. And here's a third sentence to make sure chunking works properly with longer text that should be split into multiple chunks."
-            chunks = chunk_transcription(test_text, max_chunk_length=100, overlap=20)
+            chunks = chunk_transcription(test_text, max_tokens=20, overlap_tokens=5)
             
             if len(chunks) > 1:
                 print(f"✅ Chunking works: {len(chunks)} chunks created")
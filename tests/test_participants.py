@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test suite for participant parsing and speaker name matching.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.participants import NameMatcher, name_matcher, parse_participants
+
+
+class TestParseParticipants(unittest.TestCase):
+    """Test cases for splitting the participants display string."""
+
+    def test_names_are_trimmed_and_deduplicated(self):
+        self.assertEqual(parse_participants(' Alice, Bob ,, alice,Carol '), ['Alice', 'Bob', 'Carol'])
+
+    def test_empty_values(self):
+        self.assertEqual(parse_participants(None), [])
+        self.assertEqual(parse_participants(' , '), [])
+
+
+class TestNameMatcher(unittest.TestCase):
+    """Test cases for finding speaker names in free text."""
+
+    def test_matches_whole_names_case_insensitively(self):
+        matcher = NameMatcher(['Alice', 'Al', 'Bob Smith'])
+        self.assertEqual(matcher.find('What did alice and BOB SMITH agree on?'), {'Alice', 'Bob Smith'})
+        # "Al" must not match inside "also" or "Alice"
+        self.assertEqual(matcher.find('Alice also said so'), {'Alice'})
+
+    def test_longest_name_wins_and_order_is_kept(self):
+        matcher = NameMatcher(['Ann', 'Ann Lee', 'Zed'])
+        self.assertEqual(matcher.find_in_order('Zed asked Ann Lee'), ['Zed', 'Ann Lee'])
+
+    def test_special_characters_and_no_names(self):
+        self.assertEqual(NameMatcher(['C.J. (PM)']).find('ask c.j. (pm) later'), {'C.J. (PM)'})
+        self.assertEqual(NameMatcher([]).find('anything'), set())
+        self.assertIs(name_matcher(('Alice',)), name_matcher(('Alice',)))
+
+
+if __name__ == '__main__':
+    unittest.main()
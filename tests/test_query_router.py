@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test suite for the local Inquire Mode query router.
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.query_router import DIRECT, RAG, DIRECT_EXAMPLES, RAG_EXAMPLES, QueryRouter, RouterStats, heuristic_route
+
+
+class KeywordModel:
+    """Embeds text by which of the training examples share a word with it."""
+
+    def __init__(self):
+        self.vocabulary = sorted({word.lower().strip('?,.!') for text in RAG_EXAMPLES + DIRECT_EXAMPLES
+                                  for word in text.split()})
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        vectors = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                word = word.lower().strip('?,.!')
+                if word in self.vocabulary:
+                    vectors[row, self.vocabulary.index(word)] = 1.0
+        return vectors
+
+
+class TestHeuristicRoute(unittest.TestCase):
+    """Test cases for the keyword heuristics."""
+
+    def test_formatting_requests_are_direct(self):
+        self.assertEqual(heuristic_route("Can you format this in separate headings?", True), DIRECT)
+        self.assertEqual(heuristic_route("Put it in a table", True), DIRECT)
+        self.assertEqual(heuristic_route("Make your last answer more concise", True), DIRECT)
+
+    def test_reworking_needs_a_previous_answer(self):
+        self.assertIsNone(heuristic_route("Can you format this in separate headings?"))
+        self.assertIsNone(heuristic_route("Make your last answer more concise", False))
+
+    def test_formatted_content_requests_are_undecided(self):
+        for query in ("List the action items from Monday in bullet points",
+                      "What are the next steps for the marketing campaign, as a table?",
+                      "Summarize the hiring plan with headings",
+                      "What is our pricing strategy? Use markdown"):
+            for has_previous_answer in (False, True):
+                self.assertIsNone(heuristic_route(query, has_previous_answer), query)
+
+    def test_content_questions_are_rag(self):
+        self.assertEqual(heuristic_route("What did Beth say about the budget?"), RAG)
+        self.assertEqual(heuristic_route("Who mentioned the timeline?"), RAG)
+
+    def test_mixed_or_missing_cues_are_undecided(self):
+        self.assertIsNone(heuristic_route("Summarize the meeting in bullet points"))
+        self.assertIsNone(heuristic_route("Thanks"))
+
+
+class TestQueryRouter(unittest.TestCase):
+    """Test cases for QueryRouter."""
+
+    def test_heuristic_decision_skips_the_model(self):
+        model = KeywordModel()
+        decision, confidence, method = QueryRouter(model).route("Who mentioned the timeline?")
+        self.assertEqual((decision, confidence, method), (RAG, 1.0, 'heuristic'))
+        self.assertEqual(model.calls, 0)
+
+    def test_centroid_decision(self):
+        router = QueryRouter(KeywordModel(), min_margin=0.01)
+        self.assertEqual(router.route("List the action items for the campaign")[0], RAG)
+        self.assertEqual(router.route("Thanks, that helps")[0], DIRECT)
+
+    def test_low_margin_defers_to_llm(self):
+        router = QueryRouter(KeywordModel(), min_margin=0.01)
+        decision, confidence, method = router.route("Banana")
+        self.assertIsNone(decision)
+        self.assertEqual(method, 'centroid')
+
+    def test_without_model_only_heuristics_decide(self):
+        router = QueryRouter(None)
+        self.assertEqual(router.route("Make it shorter", has_previous_answer=True)[0], DIRECT)
+        self.assertIsNone(router.route("Make it shorter")[0])
+        self.assertIsNone(router.route("Thanks")[0])
+
+
+class TestRouterStats(unittest.TestCase):
+    """Test cases for RouterStats."""
+
+    def test_snapshot(self):
+        stats = RouterStats()
+        self.assertIsNone(stats.snapshot()['fallback_rate'])
+        stats.record_decision('heuristic', 0.5)
+        stats.record_decision('centroid', 4.0)
+        self.assertEqual(stats.record_decision('llm', 400.0), 3)
+        stats.record_audit(True)
+        stats.record_audit(False)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['decisions'], {'heuristic': 1, 'centroid': 1, 'llm': 1})
+        self.assertEqual(snapshot['mean_latency_ms']['llm'], 400.0)
+        self.assertAlmostEqual(snapshot['fallback_rate'], 0.333)
+        self.assertEqual(snapshot['agreement_rate'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test suite for fusing the ranked results of several searches.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rank_fusion import fuse_results, merge_fused_results, reciprocal_rank_fusion
+
+
+class TestFuseResults(unittest.TestCase):
+    """Test cases for fuse_results."""
+
+    def setUp(self):
+        self.per_query = [
+            [(1, 0.9), (2, 0.5), (3, 0.4)],
+            [(3, 0.8), (2, 0.7)],
+        ]
+
+    def test_max_fusion_keeps_best_similarity(self):
+        """Each chunk should appear once with its best score and the queries that found it."""
+        fused = fuse_results(self.per_query, 'max')
+        self.assertEqual([(cid, score) for cid, score, _ in fused], [(1, 0.9), (3, 0.8), (2, 0.7)])
+        self.assertEqual(fused[1][2], {0: 0.4, 1: 0.8})
+
+    def test_rrf_rewards_agreement(self):
+        """Chunks found by several queries should outrank a single first place."""
+        fused = fuse_results(self.per_query, 'rrf', rrf_k=1)
+        self.assertEqual([cid for cid, _, _ in fused], [3, 2, 1])
+        self.assertAlmostEqual(fused[0][1], 1 / 4 + 1 / 2)
+
+    def test_reciprocal_rank_fusion_scale(self):
+        """Scores should reach 1.0 only for a chunk every retriever ranked first."""
+        fused = reciprocal_rank_fusion([[(7, 0.3), (8, 0.2)], [(7, 12.5)]])
+        self.assertEqual(fused[0], (7, 1.0))
+        self.assertLess(fused[1][1], 0.5)
+        self.assertEqual(reciprocal_rank_fusion([]), [])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            fuse_results(self.per_query, 'sum')
+
+    def test_merge_matches_single_search(self):
+        """Merging separately fused queries should equal fusing them together."""
+        first = [(i, s, {'a': m[0]}) for i, s, m in fuse_results(self.per_query[:1])]
+        second = [(i, s, {'b': m[0]}) for i, s, m in fuse_results(self.per_query[1:])]
+        merged = merge_fused_results([first, second])
+        together = fuse_results(self.per_query)
+        self.assertEqual([(cid, score) for cid, score, _ in merged], [(cid, score) for cid, score, _ in together])
+        self.assertEqual(merged[2][2], {'a': 0.5, 'b': 0.7})
+
+
+if __name__ == '__main__':
+    unittest.main()
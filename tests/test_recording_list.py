@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Query-count regression test for the recording list serializer.
+"""
+
+import sys
+import os
+import unittest
+import uuid
+from datetime import datetime
+
+from sqlalchemy import event, select
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import (app, db, User, Recording, Tag, RecordingTag, Event,
+                     RECORDING_VIEWS, recording_load_options, serialize_recording_list, serialize_tags)
+
+PAGE_SIZE = 40
+# Recordings, tag associations, tags, events and tag counts
+MAX_QUERIES_PER_PAGE = 5
+
+
+class TestRecordingListSerializer(unittest.TestCase):
+    """The list serializer must not issue queries per recording."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        suffix = uuid.uuid4().hex[:8]
+        user = User(username=f'list_{suffix}', email=f'list_{suffix}@example.com', password='x')
+        db.session.add(user)
+        db.session.flush()
+        self.user_id = user.id
+        tags = [Tag(name=f'tag {i}', user_id=self.user_id) for i in range(3)]
+        db.session.add_all(tags)
+        db.session.flush()
+        for i in range(PAGE_SIZE):
+            recording = Recording(user_id=self.user_id, title=f'Meeting {i}', summary='**Summary**',
+                                  notes='- note', status='COMPLETED', completed_at=datetime.utcnow())
+            db.session.add(recording)
+            db.session.flush()
+            for order, tag in enumerate(tags[:i % 4]):
+                db.session.add(RecordingTag(recording_id=recording.id, tag_id=tag.id, order=order))
+            db.session.add(Event(recording_id=recording.id, title=f'Follow-up {i}',
+                                 start_datetime=datetime(2026, 1, 1, 9, 0)))
+        db.session.commit()
+        db.session.expunge_all()
+
+    def tearDown(self):
+        db.session.rollback()
+        user = db.session.get(User, self.user_id)
+        for recording in Recording.query.filter_by(user_id=user.id).all():
+            db.session.delete(recording)
+        db.session.delete(user)
+        db.session.commit()
+        self.context.pop()
+
+    def test_page_query_count_is_bounded(self):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            stmt = (select(Recording).where(Recording.user_id == self.user_id)
+                    .options(*recording_load_options(RECORDING_VIEWS['list'])).order_by(Recording.id).limit(PAGE_SIZE))
+            recordings = db.session.execute(stmt).scalars().all()
+            items = serialize_recording_list(recordings)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        self.assertEqual(len(items), PAGE_SIZE)
+        self.assertLessEqual(len(statements), MAX_QUERIES_PER_PAGE, '\n'.join(statements))
+
+    def test_list_items_match_full_serialization(self):
+        recording = db.session.execute(
+            select(Recording).where(Recording.user_id == self.user_id, Recording.title == 'Meeting 3')
+            .options(*recording_load_options(RECORDING_VIEWS['list']))
+        ).scalar_one()
+        item = serialize_recording_list([recording])[0]
+        full = recording.to_dict()
+        self.assertNotIn('summary_html', item)
+        self.assertEqual(item, {key: value for key, value in full.items() if key not in ('notes_html', 'summary_html')})
+        self.assertEqual([tag['recording_count'] for tag in item['tags']], [30, 20, 10])
+
+    def test_summary_view_skips_long_columns(self):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        fields = RECORDING_VIEWS['summary']
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            stmt = (select(Recording).where(Recording.user_id == self.user_id)
+                    .options(*recording_load_options(fields)).order_by(Recording.id).limit(PAGE_SIZE))
+            items = serialize_recording_list(db.session.execute(stmt).scalars().all(), fields)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        self.assertEqual(set(items[0]), set(fields))
+        self.assertLessEqual(len(statements), MAX_QUERIES_PER_PAGE)
+        self.assertNotIn('recording.summary', statements[0])
+        self.assertNotIn('recording.transcription', statements[0])
+
+    def test_tag_counts_use_one_query(self):
+        tags = Tag.query.filter_by(user_id=self.user_id).order_by(Tag.name).all()
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            items = serialize_tags(tags)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        self.assertEqual([item['recording_count'] for item in items], [30, 20, 10])
+        self.assertEqual(len(statements), 1)
+
+    def test_localdatetime_filter_formats_datetimes(self):
+        formatted = app.jinja_env.filters['localdatetime'](datetime(2024, 1, 1, 12, 0))
+        self.assertIn('2024', formatted)
+        self.assertEqual(app.jinja_env.filters['localdatetime'](None), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
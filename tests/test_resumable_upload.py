@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test suite for resumable chunked uploads.
+"""
+
+import sys
+import os
+import fcntl
+import hashlib
+import io
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app, db, User, Recording, UploadSession
+from src.resumable_upload import LiveTranscriptions, UploadHashes, parse_content_range, part_file_lock, write_range
+
+
+class TestRangeHelpers(unittest.TestCase):
+    """Test cases for Content-Range parsing and range writes."""
+
+    def test_parse_content_range(self):
+        self.assertEqual(parse_content_range('bytes 0-99/200'), (0, 99, 200))
+        self.assertEqual(parse_content_range('bytes 100-199/*'), (100, 199, None))
+        self.assertIsNone(parse_content_range('bytes 100-99/200'))
+        self.assertIsNone(parse_content_range('bytes 0-200/200'))
+        self.assertIsNone(parse_content_range('items 0-1/2'))
+        self.assertIsNone(parse_content_range(None))
+
+    def test_partial_body_is_kept_and_hash_rebuilt(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'upload.part')
+            open(path, 'wb').close()
+            hashes = UploadHashes()
+
+            hasher = hashes.at_offset('u1', path, 0)
+            self.assertEqual(write_range(path, 0, io.BytesIO(b'hello '), 6, hasher), 6)
+            hashes.store('u1', 6, hasher)
+            # The client drops the connection after three of five bytes
+            hasher = hashes.at_offset('u1', path, 6)
+            self.assertEqual(write_range(path, 6, io.BytesIO(b'wor'), 5, hasher), 3)
+
+            # A process that never saw the first range rebuilds the hash from disk
+            rebuilt = UploadHashes().at_offset('u1', path, 9)
+            self.assertEqual(rebuilt.hexdigest(), hashlib.sha256(b'hello wor').hexdigest())
+            self.assertEqual(hasher.hexdigest(), rebuilt.hexdigest())
+
+    def test_leftovers_past_the_committed_offset_are_dropped(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'upload.part')
+            with open(path, 'wb') as f:
+                f.write(b'hello garbage')
+            self.assertEqual(write_range(path, 6, io.BytesIO(b'wo'), 5), 2)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'hello wo')
+
+    def test_part_file_lock_excludes_other_open_files(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'upload.part')
+            open(path, 'wb').close()
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                with part_file_lock(path):
+                    with self.assertRaises(BlockingIOError):
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+            with self.assertRaises(FileNotFoundError):
+                with part_file_lock(os.path.join(folder, 'missing.part')):
+                    pass
+
+
+class TestLiveTranscriptions(unittest.TestCase):
+    """Test cases for the live transcription check throttle."""
+
+    def test_checks_are_throttled_per_upload(self):
+        live = LiveTranscriptions(check_interval=30)
+        self.assertTrue(live.due('a', now=100))
+        self.assertFalse(live.due('a', now=110))
+        self.assertTrue(live.due('b', now=110))
+        self.assertTrue(live.due('a', now=131))
+        live.discard('a')
+        self.assertTrue(live.due('a', now=132))
+
+
+class TestUploadEndpoints(unittest.TestCase):
+    """End-to-end checks of the /api/uploads session and range handling."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        suffix = uuid.uuid4().hex[:8]
+        user = User(username=f'upload_{suffix}', email=f'upload_{suffix}@example.com', password='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.csrf_enabled = app.config.get('WTF_CSRF_ENABLED', True)
+        app.config['WTF_CSRF_ENABLED'] = False
+        self.client = app.test_client()
+        with self.client.session_transaction() as session:
+            session['_user_id'] = str(self.user_id)
+
+    def tearDown(self):
+        db.session.rollback()
+        for upload in UploadSession.query.filter_by(user_id=self.user_id).all():
+            if os.path.exists(upload.part_path):
+                os.remove(upload.part_path)
+            db.session.delete(upload)
+        db.session.delete(db.session.get(User, self.user_id))
+        db.session.commit()
+        app.config['WTF_CSRF_ENABLED'] = self.csrf_enabled
+        self.context.pop()
+
+    def put_range(self, upload_id, start, body, total):
+        return self.client.put(f'/api/uploads/{upload_id}', data=body, headers={
+            'Content-Range': f'bytes {start}-{start + len(body) - 1}/{total}',
+            'Content-Type': 'application/octet-stream',
+        })
+
+    def test_retries_resume_from_server_offset(self):
+        payload = b'0123456789' * 3
+        headers = {'Idempotency-Key': f'test-{uuid.uuid4().hex}'}
+        created = self.client.post('/api/uploads', json={'filename': 'a.mp3', 'size': len(payload)}, headers=headers)
+        self.assertEqual(created.status_code, 201)
+        upload_id = created.get_json()['upload_id']
+
+        retried = self.client.post('/api/uploads', json={'filename': 'a.mp3', 'size': len(payload)}, headers=headers)
+        self.assertEqual(retried.status_code, 200)
+        self.assertEqual(retried.get_json()['upload_id'], upload_id)
+
+        self.assertEqual(self.put_range(upload_id, 0, payload[:12], len(payload)).get_json()['offset'], 12)
+        gap = self.put_range(upload_id, 20, payload[20:], len(payload))
+        self.assertEqual(gap.status_code, 409)
+        self.assertEqual(gap.get_json()['offset'], 12)
+
+        # Resending a range that overlaps received bytes only appends the new part
+        self.assertEqual(self.put_range(upload_id, 10, payload[10:], len(payload)).get_json()['offset'], len(payload))
+        state = self.client.get(f'/api/uploads/{upload_id}').get_json()
+        self.assertEqual(state['offset'], len(payload))
+        with open(db.session.get(UploadSession, upload_id).part_path, 'rb') as f:
+            self.assertEqual(f.read(), payload)
+
+    def test_checksum_mismatch_restarts_upload(self):
+        payload = b'audio bytes'
+        upload_id = self.client.post('/api/uploads', json={'filename': 'b.wav', 'size': len(payload)}).get_json()['upload_id']
+        self.put_range(upload_id, 0, payload, len(payload))
+
+        response = self.client.post(f'/api/uploads/{upload_id}/complete', json={'sha256': '0' * 64})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.client.get(f'/api/uploads/{upload_id}').get_json()['offset'], 0)
+
+    def test_failed_completion_can_be_retried(self):
+        payload = b'meeting audio'
+        upload_id = self.client.post('/api/uploads', json={'filename': 'c.mp3', 'size': len(payload)}).get_json()['upload_id']
+        self.put_range(upload_id, 0, payload, len(payload))
+        upload = db.session.get(UploadSession, upload_id)
+
+        def fail_after_creating(filepath, original_filename, form, user_id, live_upload_id=None):
+            db.session.add(Recording(user_id=user_id, audio_path=filepath, original_filename=original_filename))
+            db.session.commit()
+            raise RuntimeError('tag lookup failed')
+
+        with mock.patch('src.app.start_uploaded_recording', side_effect=fail_after_creating):
+            self.assertEqual(self.client.post(f'/api/uploads/{upload_id}/complete', json={}).status_code, 500)
+
+        state = self.client.get(f'/api/uploads/{upload_id}').get_json()
+        self.assertEqual((state['status'], state['offset']), ('uploading', len(payload)))
+        self.assertEqual(Recording.query.filter_by(user_id=self.user_id).count(), 0)
+        with open(upload.part_path, 'rb') as f:
+            self.assertEqual(f.read(), payload)
+        self.assertFalse(os.path.exists(upload.file_path))
+
+    @mock.patch('src.app.live_transcription_enabled', return_value=False)
+    def test_live_upload_grows_until_completed(self, _):
+        upload = self.client.post('/api/uploads', json={'filename': 'live.webm', 'live': True}).get_json()
+        self.assertTrue(upload['live'])
+        self.assertEqual(self.client.post(f"/api/uploads/{upload['upload_id']}/complete", json={}).status_code, 409)
+
+        for start in (0, 4):
+            response = self.client.put(f"/api/uploads/{upload['upload_id']}", data=b'abcd', headers={
+                'Content-Range': f'bytes {start}-{start + 3}/*', 'Content-Type': 'application/octet-stream'})
+        self.assertEqual((response.get_json()['offset'], response.get_json()['size']), (8, 8))
+
+        self.assertEqual(self.client.delete(f"/api/uploads/{upload['upload_id']}").status_code, 200)
+        self.assertEqual(self.client.get(f"/api/uploads/{upload['upload_id']}").status_code, 404)
+        late = self.client.put(f"/api/uploads/{upload['upload_id']}", data=b'abcd', headers={
+            'Content-Range': 'bytes 8-11/*', 'Content-Type': 'application/octet-stream'})
+        self.assertEqual(late.status_code, 404)
+
+    def test_unknown_upload(self):
+        self.assertEqual(self.client.get('/api/uploads/missing').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test suite for resolving Inquire Mode search results to chunk rows.
+"""
+
+import sys
+import os
+import unittest
+import uuid
+from datetime import date
+from unittest import mock
+
+import numpy as np
+from sqlalchemy import update
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app, db, User, Recording, TranscriptChunk, multi_query_search_chunks, resolve_filter_variants
+from src.embedding_index import UserEmbeddingIndex, date_to_ordinal
+
+
+class FakeModel:
+    def encode(self, texts):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+class TestStaleIndexIds(unittest.TestCase):
+    """Ids from a stale index must never surface chunks the user cannot see."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        self.user_ids = []
+        self.chunk_ids = {}
+        for name, meeting_date in (('owner', date(2026, 3, 2)), ('other', date(2026, 3, 2))):
+            suffix = uuid.uuid4().hex[:8]
+            user = User(username=f'{name}_{suffix}', email=f'{name}_{suffix}@example.com', password='x')
+            db.session.add(user)
+            db.session.flush()
+            recording = Recording(user_id=user.id, title=f'{name} meeting', status='COMPLETED', meeting_date=meeting_date)
+            db.session.add(recording)
+            db.session.flush()
+            chunks = [TranscriptChunk(recording_id=recording.id, user_id=user.id, chunk_index=i, content=f'{name} {i}')
+                      for i in range(3)]
+            db.session.add_all(chunks)
+            db.session.flush()
+            self.user_ids.append(user.id)
+            self.chunk_ids[name] = [chunk.id for chunk in chunks]
+        db.session.commit()
+        # numpy is only bound in src.app when the embedding stack imports
+        for target, value in (('EMBEDDINGS_AVAILABLE', True), ('CHUNK_FTS_AVAILABLE', False), ('np', np)):
+            patcher = mock.patch(f'src.app.{target}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for target, value in (('get_embedding_model', FakeModel()), ('select_candidate_recordings', None)):
+            patcher = mock.patch(f'src.app.{target}', return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        db.session.rollback()
+        for user_id in self.user_ids:
+            for recording in Recording.query.filter_by(user_id=user_id).all():
+                db.session.delete(recording)
+            db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        self.context.pop()
+
+    def search(self, scored_ids, filters=None, top_k=2):
+        with mock.patch('src.app.search_user_embeddings', side_effect=scored_ids) as search:
+            results = multi_query_search_chunks(self.user_ids[0], ['budget'], {'default': filters}, top_k)
+        return [chunk.id for chunk, _, _ in results['default']], search
+
+    def test_reused_id_of_another_user_is_dropped(self):
+        owner, other = self.chunk_ids['owner'], self.chunk_ids['other']
+        found, _ = self.search(lambda *args: {'default': [[(other[0], 0.9), (owner[0], 0.8)]]}, top_k=5)
+        self.assertEqual(found, [owner[0]])
+
+    def test_ids_outside_the_filters_are_dropped(self):
+        owner = self.chunk_ids['owner']
+        scored = lambda *args: {'default': [[(owner[0], 0.9)]]}
+        found, _ = self.search(scored, {'date_from': date(2026, 4, 1)})
+        self.assertEqual(found, [])
+        found, _ = self.search(scored, {'date_from': date(2026, 3, 1), 'date_to': date(2026, 3, 31)})
+        self.assertEqual(found, [owner[0]])
+
+    def test_search_goes_deeper_when_stale_ids_fill_the_results(self):
+        owner, other = self.chunk_ids['owner'], self.chunk_ids['other']
+        ranked = [(other[0], 0.95), (other[1], 0.9), (owner[0], 0.8), (owner[1], 0.7)]
+
+        def scored_ids(user_id, query_embeddings, resolved_filters, top_k, candidate_recordings=None):
+            return {'default': [ranked[:top_k]]}
+
+        found, search = self.search(scored_ids)
+        self.assertEqual(found, owner[:2])
+        self.assertEqual([call.args[3] for call in search.call_args_list], [2, 4])
+
+    def test_date_filters_follow_edits_made_by_other_workers(self):
+        owner_id = self.user_ids[0]
+        recording_id = Recording.query.filter_by(user_id=owner_id).one().id
+        # This worker's cached index still holds the old meeting date
+        index = UserEmbeddingIndex(owner_id, self.chunk_ids['owner'], [recording_id] * 3,
+                                   [date_to_ordinal(date(2026, 3, 2))] * 3, np.ones((3, 4), dtype=np.float32))
+        db.session.execute(update(Recording).where(Recording.id == recording_id).values(meeting_date=date(2026, 5, 4)))
+        db.session.commit()
+
+        may = resolve_filter_variants(owner_id, {'may': {'date_from': date(2026, 5, 1)}})['may']
+        self.assertEqual(may['recording_ids'], {recording_id})
+        self.assertEqual(int(index.build_mask(**may).sum()), 3)
+        march = resolve_filter_variants(owner_id, {'march': {'date_to': date(2026, 3, 31)}})['march']
+        self.assertFalse(index.build_mask(**march).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test suite for the system settings cache.
+"""
+
+import sys
+import os
+import unittest
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.settings_cache import SettingsCache, convert_setting_value
+
+
+class FakeStore:
+    """Settings table plus version counter, counting the queries made against it."""
+
+    def __init__(self):
+        self.version = 1
+        self.rows = [('transcript_length_limit', '30000', 'integer'), ('recording_disclaimer', 'Be nice', 'string')]
+        self.version_reads = 0
+        self.loads = 0
+
+    def load_version(self):
+        self.version_reads += 1
+        return self.version
+
+    def load_settings(self):
+        self.loads += 1
+        return list(self.rows)
+
+
+class TestConvertSettingValue(unittest.TestCase):
+    """Test cases for convert_setting_value."""
+
+    def test_types(self):
+        self.assertEqual(convert_setting_value('42', 'integer'), 42)
+        self.assertEqual(convert_setting_value('1.5', 'float'), 1.5)
+        self.assertIs(convert_setting_value('Yes', 'boolean'), True)
+        self.assertIs(convert_setting_value('false', 'boolean'), False)
+        self.assertEqual(convert_setting_value('text', 'string'), 'text')
+
+    def test_missing_or_invalid_values(self):
+        self.assertIsNone(convert_setting_value('abc', 'integer'))
+        self.assertIsNone(convert_setting_value(None, 'float'))
+        self.assertIsNone(convert_setting_value('', 'boolean'))
+
+
+class TestSettingsCache(unittest.TestCase):
+    """Test cases for SettingsCache."""
+
+    def test_reads_are_served_from_memory(self):
+        store = FakeStore()
+        cache = SettingsCache(store.load_version, store.load_settings, check_interval=60)
+        self.assertEqual(cache.get('transcript_length_limit', 1), 30000)
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+        self.assertEqual(cache.get('recording_disclaimer'), 'Be nice')
+        self.assertEqual((store.version_reads, store.loads), (1, 1))
+
+    def test_reload_only_when_version_moves(self):
+        store = FakeStore()
+        cache = SettingsCache(store.load_version, store.load_settings, check_interval=0)
+        cache.get('transcript_length_limit')
+        cache.get('transcript_length_limit')
+        self.assertEqual(store.loads, 1)
+        store.rows[0] = ('transcript_length_limit', '-1', 'integer')
+        store.version += 1
+        self.assertEqual(cache.get('transcript_length_limit'), -1)
+        self.assertEqual(store.loads, 2)
+
+    def test_invalidate_forces_version_check(self):
+        store = FakeStore()
+        cache = SettingsCache(store.load_version, store.load_settings, check_interval=60)
+        cache.get('transcript_length_limit')
+        store.rows.append(('max_file_size_mb', '500', 'integer'))
+        store.version += 1
+        self.assertIsNone(cache.get('max_file_size_mb'))
+        cache.invalidate()
+        self.assertEqual(cache.get('max_file_size_mb'), 500)
+
+    def test_on_reload_callback(self):
+        store = FakeStore()
+        applied = []
+        cache = SettingsCache(store.load_version, store.load_settings, check_interval=60,
+                              on_reload=lambda c: applied.append(c.get('transcript_length_limit')))
+        self.assertTrue(cache.refresh(force=True))
+        self.assertFalse(cache.refresh())
+        self.assertEqual(applied, [30000])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test suite for the streaming response processor.
+"""
+
+import sys
+import os
+import json
+import unittest
+from types import SimpleNamespace
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.stream_processor import MarkerLineDetector, StreamProcessor, ThinkingTagParser
+
+
+def completion(*parts):
+    """A fake streamed completion yielding one chunk per part."""
+    return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))]) for part in parts])
+
+
+def events(frames):
+    return [json.loads(frame[len('data: '):]) for frame in frames]
+
+
+class TestThinkingTagParser(unittest.TestCase):
+    """Test cases for the incremental tag state machine."""
+
+    def test_tags_split_across_tokens(self):
+        parser = ThinkingTagParser()
+        result = []
+        for token in ['Hel', 'lo <th', 'ink>sec', 'ret</THI', 'NK> world']:
+            result.extend(parser.feed(token))
+        result.extend(parser.finish())
+        self.assertEqual(result, [('delta', 'Hel'), ('delta', 'lo '), ('thinking', 'secret'), ('delta', ' world')])
+
+    def test_other_markup_passes_through(self):
+        parser = ThinkingTagParser()
+        result = parser.feed('a <b>bold</b> and x < y') + parser.finish()
+        self.assertEqual(''.join(text for _, text in result), 'a <b>bold</b> and x < y')
+
+    def test_unclosed_thinking_is_reported(self):
+        parser = ThinkingTagParser()
+        self.assertEqual(parser.feed('<thinking>still going'), [])
+        self.assertEqual(parser.finish(), [('thinking', 'still going')])
+
+
+class TestStreamProcessor(unittest.TestCase):
+    """Test cases for StreamProcessor."""
+
+    def test_deltas_are_coalesced(self):
+        processor = StreamProcessor(flush_interval=60, flush_chars=1000)
+        result = events(processor.frames(completion(*['word '] * 50)))
+        self.assertEqual(result, [{'delta': 'word ' * 50}])
+        self.assertEqual(processor.text, 'word ' * 50)
+
+    def test_size_window_flushes(self):
+        processor = StreamProcessor(flush_interval=60, flush_chars=10)
+        result = events(processor.frames(completion(*['abcd'] * 6)))
+        self.assertEqual(len(result), 2)
+        self.assertEqual(''.join(event['delta'] for event in result), 'abcd' * 6)
+
+    def test_thinking_frames_keep_their_order(self):
+        processor = StreamProcessor(flush_interval=60)
+        result = events(processor.frames(completion('before', '<think>plan</think>', 'after')))
+        self.assertEqual(result, [{'delta': 'before'}, {'thinking': 'plan'}, {'delta': 'after'}])
+
+    def test_detector_pauses_on_marker(self):
+        processor = StreamProcessor(detectors={'full': MarkerLineDetector('REQUEST_FULL_TRANSCRIPT:')})
+        self.assertEqual(list(processor.frames(completion('REQUEST_FULL', '_TRANSCRIPT:1', '2\n')))[:1], [])
+        self.assertEqual(processor.detected, ('full', '12'))
+
+    def test_detector_releases_other_answers(self):
+        processor = StreamProcessor(detectors={'full': MarkerLineDetector('REQUEST_FULL_TRANSCRIPT:')})
+        result = events(processor.frames(completion('RE', 'QUIRED: yes')))
+        self.assertIsNone(processor.detected)
+        self.assertEqual(result, [{'delta': 'REQUIRED: yes'}])
+
+    def test_processing_resumes_after_detection(self):
+        stream = completion('REQUEST_FULL_TRANSCRIPT:abc\n', 'rest')
+        processor = StreamProcessor(detectors={'full': MarkerLineDetector('REQUEST_FULL_TRANSCRIPT:')})
+        self.assertEqual(list(processor.frames(stream)), [])
+        self.assertEqual(processor.detected, ('full', 'abc'))
+        self.assertEqual(events(processor.frames(stream)), [{'delta': 'REQUEST_FULL_TRANSCRIPT:abc\nrest'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
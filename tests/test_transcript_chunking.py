@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test suite for segment-aware transcript chunking.
+"""
+
+import sys
+import os
+import json
+import unittest
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.transcript_chunking import chunk_transcription, content_hash, count_word_tokens, expand_chunk_indexes, split_sentences
+
+
+def segment(speaker, sentence, start, end):
+    return {'speaker': speaker, 'sentence': sentence, 'start_time': start, 'end_time': end}
+
+
+class TestSegmentChunking(unittest.TestCase):
+    """Test cases for chunking diarized JSON transcriptions."""
+
+    def test_turns_are_packed_with_metadata(self):
+        """Short turns share a chunk, labelled per speaker, with the chunk's time span."""
+        transcription = json.dumps([
+            segment('Alice', 'Did we approve the budget?', 0.0, 2.5),
+            segment('Bob', 'Yes, on Monday.', 2.5, 4.0),
+            segment('Bob', 'Finance signed off.', 4.0, 6.0),
+        ])
+        chunks = chunk_transcription(transcription)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]['content'], "Alice: Did we approve the budget?\nBob: Yes, on Monday. Finance signed off.")
+        self.assertEqual((chunks[0]['start_time'], chunks[0]['end_time']), (0.0, 6.0))
+        self.assertEqual(chunks[0]['speaker_name'], 'Alice, Bob')
+        self.assertNotIn('"sentence"', chunks[0]['content'])
+
+    def test_chunks_break_on_speaker_turns(self):
+        """A turn that does not fit starts a new chunk instead of being cut."""
+        turn = ' '.join(['word'] * 8) + '.'
+        transcription = json.dumps([
+            segment('Alice', turn, 0, 10),
+            segment('Bob', turn, 10, 20),
+            segment('Carol', turn, 20, 30),
+        ])
+        chunks = chunk_transcription(transcription, max_tokens=20, overlap_tokens=5)
+        self.assertEqual([chunk['speaker_name'] for chunk in chunks], ['Alice, Bob', 'Carol'])
+        self.assertEqual((chunks[1]['start_time'], chunks[1]['end_time']), (20.0, 30.0))
+
+    def test_long_turn_is_split_within_budget(self):
+        """Monologues longer than the budget are split with interpolated timestamps."""
+        sentences = ' '.join(f'Sentence number {i} is here.' for i in range(30))
+        chunks = chunk_transcription(json.dumps([segment('Alice', sentences, 0.0, 300.0)]), max_tokens=30, overlap_tokens=6)
+        self.assertGreater(len(chunks), 3)
+        for chunk in chunks:
+            self.assertLessEqual(count_word_tokens(chunk['content']), 30 + 2)
+            self.assertEqual(chunk['speaker_name'], 'Alice')
+            self.assertTrue(chunk['content'].startswith('Alice: '))
+        self.assertEqual(chunks[0]['start_time'], 0.0)
+        self.assertAlmostEqual(chunks[-1]['end_time'], 300.0)
+        self.assertTrue(all(a['start_time'] <= b['start_time'] for a, b in zip(chunks, chunks[1:])))
+
+    def test_edit_only_changes_affected_chunk_hashes(self):
+        """Editing one turn leaves the other chunks' content hashes intact, so their embeddings are reused."""
+        turns = [segment(speaker, ' '.join([speaker.lower()] * 8) + '.', i * 10, i * 10 + 10)
+                 for i, speaker in enumerate(['Alice', 'Bob', 'Carol', 'Dave', 'Erin', 'Frank'])]
+        before = chunk_transcription(json.dumps(turns), max_tokens=20, overlap_tokens=5)
+        turns[3] = dict(turns[3], sentence='Dave changed his mind entirely.')
+        after = chunk_transcription(json.dumps(turns), max_tokens=20, overlap_tokens=5)
+
+        old_hashes = {content_hash(chunk['content']) for chunk in before}
+        changed = [chunk for chunk in after if content_hash(chunk['content']) not in old_hashes]
+        self.assertEqual(len(before), len(after))
+        self.assertEqual(len(changed), 1)
+        self.assertIn('Dave changed his mind', changed[0]['content'])
+
+
+class TestPlainTextChunking(unittest.TestCase):
+    """Test cases for chunking plain-text transcriptions."""
+
+    def test_sentences_are_packed_with_overlap(self):
+        text = ' '.join(f'This is sentence {i}.' for i in range(20))
+        chunks = chunk_transcription(text, max_tokens=15, overlap_tokens=5)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(chunk['start_time'] is None and chunk['speaker_name'] is None for chunk in chunks))
+        # The last sentence of one chunk opens the next
+        self.assertEqual(split_sentences(chunks[0]['content'])[-1], split_sentences(chunks[1]['content'])[0])
+        self.assertEqual(chunk_transcription('Short one.'), [
+            {'content': 'Short one.', 'start_time': None, 'end_time': None, 'speaker_name': None}
+        ])
+
+    def test_empty_and_non_segment_json(self):
+        self.assertEqual(chunk_transcription(''), [])
+        self.assertEqual(chunk_transcription('[1, 2]')[0]['content'], '[1, 2]')
+
+
+class TestExpandChunkIndexes(unittest.TestCase):
+    """Test cases for widening retrieved chunks by their neighbours."""
+
+    def test_neighbours_are_merged_and_clipped(self):
+        self.assertEqual(expand_chunk_indexes([5, 0, 6], neighbors=1), [0, 1, 4, 5, 6, 7])
+        self.assertEqual(expand_chunk_indexes([3], neighbors=0), [3])
+        self.assertEqual(expand_chunk_indexes([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
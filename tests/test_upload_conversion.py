@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test suite for the background conversion stage of uploads.
+"""
+
+import sys
+import os
+import fcntl
+import subprocess
+import tempfile
+import threading
+import unittest
+import uuid
+from unittest import mock
+
+# Add the app directory to the path so we can import from src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app, db, User, Recording, UploadSession, audio_conversion_slot, convert_upload_if_needed, process_upload_task
+
+
+def fake_ffmpeg(cmd, **kwargs):
+    with open(cmd[-1], 'wb') as f:
+        f.write(b'mp3 data')
+
+
+class TestConvertUpload(unittest.TestCase):
+    """Conversion runs outside the request and reports through the recording status."""
+
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+        self.folder = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.folder.name, 'memo.amr')
+        with open(self.filepath, 'wb') as f:
+            f.write(b'#!AMR\n')
+        suffix = uuid.uuid4().hex[:8]
+        user = User(username=f'convert_{suffix}', email=f'convert_{suffix}@example.com', password='x')
+        db.session.add(user)
+        db.session.flush()
+        self.recording = Recording(user_id=user.id, audio_path=self.filepath, original_filename='memo.amr', status='PENDING')
+        db.session.add(self.recording)
+        db.session.commit()
+        self.user_id = user.id
+        needs_chunking = mock.patch('src.app.chunking_service.needs_chunking', return_value=True)
+        needs_chunking.start()
+        self.addCleanup(needs_chunking.stop)
+
+    def tearDown(self):
+        db.session.rollback()
+        UploadSession.query.filter_by(user_id=self.user_id).delete()
+        db.session.delete(db.session.get(Recording, self.recording.id))
+        db.session.delete(db.session.get(User, self.user_id))
+        db.session.commit()
+        self.folder.cleanup()
+        self.context.pop()
+
+    @mock.patch('src.app.subprocess.run', side_effect=fake_ffmpeg)
+    def test_converted_file_replaces_upload(self, run):
+        filepath = convert_upload_if_needed(self.recording, self.filepath, 'memo.amr')
+
+        self.assertTrue(filepath.endswith('memo.mp3'))
+        self.assertFalse(os.path.exists(self.filepath))
+        self.assertEqual(run.call_args[0][0][0], 'ffmpeg')
+        self.assertEqual((self.recording.status, self.recording.audio_path, self.recording.mime_type),
+                         ('PENDING', filepath, 'audio/mpeg'))
+
+    @mock.patch('src.app.subprocess.run', side_effect=subprocess.CalledProcessError(1, 'ffmpeg', stderr='Invalid data'))
+    def test_failed_conversion_fails_recording(self, _):
+        self.assertIsNone(convert_upload_if_needed(self.recording, self.filepath, 'memo.amr'))
+        self.assertEqual(self.recording.status, 'FAILED')
+        self.assertIn('Invalid data', self.recording.error_message)
+
+    @mock.patch('src.app.subprocess.run')
+    def test_supported_format_is_not_converted(self, run):
+        mp3_path = os.path.join(self.folder.name, 'talk.mp3')
+        open(mp3_path, 'wb').close()
+        self.assertEqual(convert_upload_if_needed(self.recording, mp3_path, 'talk.mp3'), mp3_path)
+        run.assert_not_called()
+
+
+    @mock.patch('src.app.live_transcription_enabled', return_value=True)
+    @mock.patch('src.app.transcribe_audio_task')
+    @mock.patch('src.app.subprocess.run', side_effect=fake_ffmpeg)
+    def test_transcribed_live_upload_is_not_converted(self, run, transcribe, _):
+        webm_path = os.path.join(self.folder.name, 'recording-1.webm')
+        open(webm_path, 'wb').close()
+        upload = UploadSession(user_id=self.user_id, original_filename='recording-1.webm', file_path=webm_path,
+                               total_size=0, live=True, live_chunks='[{"start_time": 0, "end_time": 60}]')
+        db.session.add(upload)
+        db.session.commit()
+
+        process_upload_task(app.app_context(), self.recording.id, webm_path, 'recording-1.webm', None,
+                            live_upload_id=upload.id)
+
+        run.assert_not_called()
+        self.assertEqual(transcribe.call_args[0][2], webm_path)
+        self.assertEqual(db.session.get(Recording, self.recording.id).status, 'PENDING')
+
+    @mock.patch('src.app.live_transcription_enabled', return_value=True)
+    @mock.patch('src.app.transcribe_audio_task')
+    @mock.patch('src.app.subprocess.run', side_effect=fake_ffmpeg)
+    def test_live_upload_without_segments_is_converted(self, run, transcribe, _):
+        upload = UploadSession(user_id=self.user_id, original_filename='memo.amr', file_path=self.filepath,
+                               total_size=0, live=True)
+        db.session.add(upload)
+        db.session.commit()
+
+        process_upload_task(app.app_context(), self.recording.id, self.filepath, 'memo.amr', None,
+                            live_upload_id=upload.id)
+
+        run.assert_called_once()
+        self.assertTrue(transcribe.call_args[0][2].endswith('memo.mp3'))
+
+
+class TestConversionSlots(unittest.TestCase):
+    """The conversion limit applies across worker processes, not per process."""
+
+    def test_slot_held_elsewhere_blocks_until_released(self):
+        with tempfile.TemporaryDirectory() as slots, mock.patch('src.app.AUDIO_CONVERSION_SLOT_DIR', slots), \
+                mock.patch('src.app.AUDIO_CONVERSION_CONCURRENCY', 1):
+            # Another worker holds the only slot
+            holder = open(os.path.join(slots, 'slot-0.lock'), 'w')
+            fcntl.flock(holder.fileno(), fcntl.LOCK_EX)
+            entered = threading.Event()
+
+            def convert():
+                with audio_conversion_slot(poll_seconds=0.01):
+                    entered.set()
+
+            thread = threading.Thread(target=convert)
+            thread.start()
+            self.assertFalse(entered.wait(0.2))
+            holder.close()
+            self.assertTrue(entered.wait(2))
+            thread.join()
+
+            # Released again once the conversion is done
+            with open(os.path.join(slots, 'slot-0.lock'), 'w') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+if __name__ == '__main__':
+    unittest.main()